@@ -39,6 +39,9 @@ const { UniversalFeatures, DEFAULT_FEATURES } = require('./universal-features');
 const { ActiveTradeMonitor, getMonitor } = require('./active-trade-monitor');
 const { apiInterceptor } = require('./freqtrade-api-interceptor');
 const { universalStakeOverride } = require('./universal-stake-override');
+const { getStrategyPerformance, getCachedBacktest } = require('./lib/backtest-cache');
+const { requestProfile, getProfileStatus, getProfilePath } = require('./lib/bot-profiler');
+const { readMemoryReport, summarizeMemoryReport, requestAllocationTrace } = require('./lib/bot-memory');
 // Cache FreqTrade JWTs per bot to avoid re-auth on every proxied call
 const freqtradeTokenCache = new Map();
 
@@ -1065,6 +1068,11 @@ app.get('/api/strategies/enhanced', authenticateToken, async (req, res) => {
       }
     ];
 
+    // Cached backtest figures (strategy_utils/backtest_cache.py), never runs a backtest
+    for (const strategy of strategies) {
+      strategy.performance = await getStrategyPerformance(strategy.name, MAIN_STRATEGIES_SOURCE_DIR);
+    }
+
     console.log(`[API] Returning ${strategies.length} enhanced strategies`);
     res.json({ success: true, strategies });
   } catch (e) {
@@ -1483,7 +1491,8 @@ app.get('/api/strategies', authenticateToken, async (req, res) => {
             name: strategyName,
             className: className,
             description: description,
-            fileName: file
+            fileName: file,
+            performance: await getStrategyPerformance(className, MAIN_STRATEGIES_SOURCE_DIR)
           });
         } catch (err) {
           console.warn(`[API] Error reading strategy file ${file}: ${err.message}`);
@@ -1505,6 +1514,25 @@ app.get('/api/strategies', authenticateToken, async (req, res) => {
   }
 });
 
+// Latest cached backtest of a strategy (summary, equity curve, trades)
+app.get('/api/strategies/:strategyName/backtest', authenticateToken, async (req, res) => {
+  try {
+    const { strategyName } = req.params;
+    if (!/^\w+$/.test(strategyName)) {
+      return res.status(400).json({ success: false, message: 'Invalid strategy name' });
+    }
+
+    const backtest = await getCachedBacktest(strategyName, MAIN_STRATEGIES_SOURCE_DIR);
+    if (!backtest) {
+      return res.status(404).json({ success: false, message: `No cached backtest for ${strategyName}` });
+    }
+    res.json({ success: true, backtest });
+  } catch (e) {
+    console.error(`[API] Error getting cached backtest ${req.params.strategyName}:`, e.message);
+    res.status(500).json({ success: false, message: e.message });
+  }
+});
+
 // Get current strategy for a specific bot
 app.get('/api/bots/:instanceId/strategy', authenticateToken, checkInstanceOwnership, async (req, res) => {
   try {
@@ -1545,6 +1573,122 @@ app.get('/api/bots/:instanceId/strategy', authenticateToken, checkInstanceOwners
   }
 });
 
+// Pairs the bot's strategy currently analyzes in full (written by strategy_utils/screener.py
+// on every new candle into the bot's user data dir)
+app.get('/api/bots/:instanceId/screener', authenticateToken, checkInstanceOwnership, async (req, res) => {
+  try {
+    const { instanceId } = req.params;
+    const user = req.user || {};
+    const userId = user.uid || user.id;
+    const instanceDir = req.instanceDir || path.join(BOT_BASE_DIR, userId, instanceId);
+
+    // Pool bots use the bot dir as user data dir, legacy bots its user_data subdir
+    const candidates = [
+      path.join(instanceDir, 'pair_screener.json'),
+      path.join(instanceDir, 'user_data', 'pair_screener.json')
+    ];
+    for (const statePath of candidates) {
+      if (await fs.pathExists(statePath)) {
+        const screener = JSON.parse(await fs.readFile(statePath, 'utf8'));
+        return res.json({ success: true, instanceId, screener });
+      }
+    }
+
+    // Strategy without a pre-screener, backtest-only bot, or no candle analyzed yet
+    res.json({ success: true, instanceId, screener: null });
+  } catch (e) {
+    console.error(`[API] Error getting pair screener for bot ${req.params.instanceId}:`, e.message);
+    res.status(500).json({ success: false, message: e.message });
+  }
+});
+
+// On-demand profiling of a running bot: the strategy's profiler (strategy_utils/profiler.py)
+// picks up the request within a few seconds and samples its stacks for the given time
+app.post('/api/bots/:instanceId/profile', authenticateToken, checkInstanceOwnership, async (req, res) => {
+  try {
+    const { instanceId } = req.params;
+    const { seconds, intervalMs } = req.body || {};
+    const user = req.user || {};
+    const userId = user.uid || user.id;
+    const instanceDir = req.instanceDir || path.join(BOT_BASE_DIR, userId, instanceId);
+
+    const request = await requestProfile(instanceDir, { seconds, intervalMs });
+    console.log(`[API] Requested ${request.seconds}s profile of bot ${instanceId}`);
+    res.status(202).json({ success: true, instanceId, request });
+  } catch (e) {
+    console.error(`[API] Error requesting profile of bot ${req.params.instanceId}:`, e.message);
+    res.status(500).json({ success: false, message: e.message });
+  }
+});
+
+app.get('/api/bots/:instanceId/profile', authenticateToken, checkInstanceOwnership, async (req, res) => {
+  try {
+    const { instanceId } = req.params;
+    const user = req.user || {};
+    const userId = user.uid || user.id;
+    const instanceDir = req.instanceDir || path.join(BOT_BASE_DIR, userId, instanceId);
+
+    res.json({ success: true, instanceId, ...await getProfileStatus(instanceDir) });
+  } catch (e) {
+    console.error(`[API] Error getting profiler status of bot ${req.params.instanceId}:`, e.message);
+    res.status(500).json({ success: false, message: e.message });
+  }
+});
+
+// Collapsed stacks of one profile (text/plain, one "stack count" per line)
+app.get('/api/bots/:instanceId/profile/:file', authenticateToken, checkInstanceOwnership, async (req, res) => {
+  try {
+    const { instanceId, file } = req.params;
+    const user = req.user || {};
+    const userId = user.uid || user.id;
+    const instanceDir = req.instanceDir || path.join(BOT_BASE_DIR, userId, instanceId);
+
+    const profilePath = await getProfilePath(instanceDir, file);
+    if (!profilePath) {
+      return res.status(404).json({ success: false, message: 'Profile not found' });
+    }
+    res.type('text/plain');
+    res.sendFile(profilePath);
+  } catch (e) {
+    console.error(`[API] Error getting profile ${req.params.file} of bot ${req.params.instanceId}:`, e.message);
+    res.status(500).json({ success: false, message: e.message });
+  }
+});
+
+// What the bot holds in memory: per pair dataframe, column, candle history and strategy cache
+// (written every minute by strategy_utils/memory.py), plus the last allocation trace
+app.get('/api/bots/:instanceId/memory', authenticateToken, checkInstanceOwnership, async (req, res) => {
+  try {
+    const { instanceId } = req.params;
+    const user = req.user || {};
+    const userId = user.uid || user.id;
+    const instanceDir = req.instanceDir || path.join(BOT_BASE_DIR, userId, instanceId);
+
+    const report = await readMemoryReport(instanceDir);
+    res.json({ success: true, instanceId, summary: summarizeMemoryReport(report), report });
+  } catch (e) {
+    console.error(`[API] Error getting memory report of bot ${req.params.instanceId}:`, e.message);
+    res.status(500).json({ success: false, message: e.message });
+  }
+});
+
+app.post('/api/bots/:instanceId/memory/trace', authenticateToken, checkInstanceOwnership, async (req, res) => {
+  try {
+    const { instanceId } = req.params;
+    const { seconds, top } = req.body || {};
+    const user = req.user || {};
+    const userId = user.uid || user.id;
+    const instanceDir = req.instanceDir || path.join(BOT_BASE_DIR, userId, instanceId);
+
+    const request = await requestAllocationTrace(instanceDir, { seconds, top });
+    console.log(`[API] Requested ${request.seconds}s allocation trace of bot ${instanceId}`);
+    res.status(202).json({ success: true, instanceId, request });
+  } catch (e) {
+    console.error(`[API] Error requesting allocation trace of bot ${req.params.instanceId}:`, e.message);
+    res.status(500).json({ success: false, message: e.message });
+  }
+});
+
 // Update strategy for a specific bot and restart it
 app.put('/api/bots/:instanceId/strategy', authenticateToken, checkInstanceOwnership, async (req, res) => {
   try {
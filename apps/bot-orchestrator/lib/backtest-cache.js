@@ -0,0 +1,138 @@
+/**
+ * Backtest Result Cache Reader
+ *
+ * Serves the results data/strategies/strategy_utils/backtest_cache.py stores,
+ * so the strategy selector can show performance figures without starting a
+ * backtest. The Python runner writes:
+ * - catalogue.json: latest summary per strategy, with the sha256 of every code
+ *   file (strategy + imported strategy_utils modules) the result depends on
+ * - entries/<key[:2]>/<key>.json: full result incl. equity curve and trades
+ *
+ * A cached result is reported as stale when one of its code files changed
+ * since the backtest ran, or when it was backtested with another freqtrade
+ * version than the bots run now. That version is FREQTRADE_VERSION, or
+ * freqtrade.__version__ in the pool image, asked once per process.
+ */
+
+const crypto = require('crypto');
+const fs = require('fs-extra');
+const path = require('path');
+const util = require('util');
+const { execFile } = require('child_process');
+
+const execFilePromise = util.promisify(execFile);
+
+const BACKTEST_CACHE_DIR = path.resolve(
+  process.env.BACKTEST_CACHE_DIR || path.join(__dirname, '../../../data/backtest_cache')
+);
+
+const POOL_IMAGE = process.env.POOL_IMAGE || 'freqtrade-pool:latest';
+
+const CATALOGUE_TTL = 30000; // 30 seconds
+
+let catalogueCache = { loadedAt: 0, catalogue: {} };
+let freqtradeVersion = null;
+
+async function loadCatalogue() {
+  if (Date.now() - catalogueCache.loadedAt < CATALOGUE_TTL) {
+    return catalogueCache.catalogue;
+  }
+  let catalogue = {};
+  try {
+    catalogue = await fs.readJson(path.join(BACKTEST_CACHE_DIR, 'catalogue.json'));
+  } catch (err) {
+    if (err.code !== 'ENOENT') {
+      console.warn(`[BacktestCache] Could not read catalogue: ${err.message}`);
+    }
+  }
+  catalogueCache = { loadedAt: Date.now(), catalogue };
+  return catalogue;
+}
+
+async function fileSha256(filePath) {
+  try {
+    return crypto.createHash('sha256').update(await fs.readFile(filePath)).digest('hex');
+  } catch (err) {
+    return null;
+  }
+}
+
+/**
+ * freqtrade version the bots run, or null when it cannot be determined
+ */
+function currentFreqtradeVersion() {
+  if (process.env.FREQTRADE_VERSION) {
+    return Promise.resolve(process.env.FREQTRADE_VERSION);
+  }
+  if (!freqtradeVersion) {
+    freqtradeVersion = execFilePromise('docker', [
+      'run', '--rm', '--entrypoint', 'python', POOL_IMAGE,
+      '-c', 'import freqtrade; print(freqtrade.__version__)'
+    ], { timeout: 60000 })
+      .then(({ stdout }) => stdout.trim() || null)
+      .catch((err) => {
+        console.warn(`[BacktestCache] Could not determine the freqtrade version of ${POOL_IMAGE}: ${err.message}`);
+        return null;
+      });
+  }
+  return freqtradeVersion;
+}
+
+/**
+ * Whether a cached result was backtested with another freqtrade version, or
+ * any of its code files differs from the file on disk now
+ */
+async function isStale(record, strategiesDir) {
+  const version = await currentFreqtradeVersion();
+  if (version && record.freqtrade_version !== version) {
+    return true;
+  }
+  for (const [relativePath, sha256] of Object.entries(record.code_files || {})) {
+    const filePath = path.isAbsolute(relativePath) ? relativePath : path.join(strategiesDir, relativePath);
+    if (await fileSha256(filePath) !== sha256) {
+      return true;
+    }
+  }
+  return false;
+}
+
+/**
+ * Cached performance of one strategy as shown in the strategy list, or null
+ */
+async function getStrategyPerformance(strategyName, strategiesDir) {
+  const record = (await loadCatalogue())[strategyName];
+  if (!record) {
+    return null;
+  }
+  return {
+    key: record.key,
+    backtestedAt: record.created_at,
+    timerange: record.timerange,
+    pairs: record.pairs,
+    summary: record.summary,
+    stale: await isStale(record, strategiesDir)
+  };
+}
+
+/**
+ * Latest full cached result (summary, equity curve, trades) of a strategy, or null
+ */
+async function getCachedBacktest(strategyName, strategiesDir) {
+  const record = (await loadCatalogue())[strategyName];
+  if (!record || !/^[0-9a-f]{64}$/.test(record.key)) {
+    return null;
+  }
+  const entryPath = path.join(BACKTEST_CACHE_DIR, 'entries', record.key.slice(0, 2), `${record.key}.json`);
+  if (!await fs.pathExists(entryPath)) {
+    return null;
+  }
+  const entry = await fs.readJson(entryPath);
+  return { ...entry, stale: await isStale(entry, strategiesDir) };
+}
+
+module.exports = {
+  BACKTEST_CACHE_DIR,
+  loadCatalogue,
+  getStrategyPerformance,
+  getCachedBacktest
+};
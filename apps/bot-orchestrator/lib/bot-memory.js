@@ -0,0 +1,92 @@
+/**
+ * Bot Memory Reports
+ *
+ * Reads the memory report data/strategies/strategy_utils/memory.py writes into
+ * each running bot's user data dir (memory_report.json, every minute):
+ * - process: rss_bytes / peak_rss_bytes of the bot's freqtrade process
+ * - totals: bytes in analyzed dataframes, raw candle history and strategy caches
+ * - analyzed / candle_history: rows and bytes per pair and timeframe
+ * - columns: bytes per dataframe column, caches: bytes per strategy attribute
+ * - tracemalloc: result of the last requested allocation trace
+ *
+ * container-pool.js uses the summaries to place bots by their real footprint
+ * and to rank bots for eviction. Allocation traces are requested by writing
+ * memory_request.json next to the report.
+ */
+
+const fs = require('fs-extra');
+const path = require('path');
+const { userDataDir } = require('./bot-profiler');
+
+const REPORT_FILE = 'memory_report.json';
+const REQUEST_FILE = 'memory_request.json';
+const MAX_TRACE_SECONDS = 900;
+const MB = 1024 * 1024;
+
+/**
+ * Full memory report of a bot, or null if the bot has not written one
+ */
+async function readMemoryReport(instanceDir) {
+  const reportPath = path.join(await userDataDir(instanceDir), REPORT_FILE);
+  try {
+    return await fs.readJson(reportPath);
+  } catch (err) {
+    if (err.code !== 'ENOENT') {
+      console.warn(`[BotMemory] Could not read ${reportPath}: ${err.message}`);
+    }
+    return null;
+  }
+}
+
+/**
+ * Figures used for placement and eviction, in MB. A report is stale once the
+ * bot missed three report intervals (stopped, crashed or hanging).
+ */
+function summarizeMemoryReport(report) {
+  if (!report) {
+    return null;
+  }
+  const totals = report.totals || {};
+  const proc = report.process || {};
+  const intervalMs = (report.interval_seconds || 60) * 1000;
+  const toMB = bytes => Math.round(((bytes || 0) / MB) * 10) / 10;
+  return {
+    strategy: report.strategy,
+    updatedAt: report.updated_at,
+    stale: Date.now() - new Date(report.updated_at).getTime() > 3 * intervalMs,
+    rssMB: toMB(proc.rss_bytes),
+    peakRssMB: toMB(proc.peak_rss_bytes),
+    analyzedMB: toMB(totals.analyzed_bytes),
+    candleHistoryMB: toMB(totals.candle_history_bytes),
+    cacheMB: toMB(totals.cache_bytes),
+    pairs: Object.keys(report.analyzed || {}).length
+  };
+}
+
+async function getBotMemory(instanceDir) {
+  return summarizeMemoryReport(await readMemoryReport(instanceDir));
+}
+
+/**
+ * Ask the bot to trace its allocations for a while; the result shows up in
+ * the report's tracemalloc section once the trace is done
+ */
+async function requestAllocationTrace(instanceDir, { seconds = 60, top = 25 } = {}) {
+  const request = {
+    seconds: Math.min(Math.max(Number(seconds) || 60, 1), MAX_TRACE_SECONDS),
+    top: Math.min(Math.max(parseInt(top, 10) || 25, 1), 500),
+    requested_at: new Date().toISOString()
+  };
+  const requestPath = path.join(await userDataDir(instanceDir), REQUEST_FILE);
+  const tmpPath = `${requestPath}.tmp`;
+  await fs.writeJson(tmpPath, request);
+  await fs.move(tmpPath, requestPath, { overwrite: true });
+  return request;
+}
+
+module.exports = {
+  readMemoryReport,
+  summarizeMemoryReport,
+  getBotMemory,
+  requestAllocationTrace
+};
@@ -0,0 +1,93 @@
+/**
+ * Bot Profiler Control
+ *
+ * Drives the on-demand sampling profiler in data/strategies/strategy_utils/profiler.py.
+ * The profiler runs inside the bot's freqtrade process and watches the bot's
+ * user data dir:
+ * - profile_request.json: written here to start profiling ({seconds, interval_ms}),
+ *   removed by the bot once it starts sampling (within a few seconds)
+ * - profiles/status.json: state of the current or last profile
+ * - profiles/<UTC time>-<instanceId>.collapsed: collapsed stacks
+ *   (instance;strategy;pair;thread;frames count), for flamegraph.pl or speedscope
+ *
+ * Pool bots use the bot dir as user data dir, legacy bots its user_data subdir.
+ */
+
+const fs = require('fs-extra');
+const path = require('path');
+
+const REQUEST_FILE = 'profile_request.json';
+const PROFILES_DIR = 'profiles';
+const MAX_SECONDS = 600;
+const PROFILE_NAME = /^[0-9TZ]+-[A-Za-z0-9_.-]+\.collapsed$/;
+
+/**
+ * User data dir of a bot: the bot dir itself (pool) or its user_data subdir (legacy)
+ */
+async function userDataDir(instanceDir) {
+  const legacyDir = path.join(instanceDir, 'user_data');
+  return await fs.pathExists(legacyDir) ? legacyDir : instanceDir;
+}
+
+/**
+ * Ask the bot to profile itself; returns the request as written
+ */
+async function requestProfile(instanceDir, { seconds = 30, intervalMs = 10 } = {}) {
+  const request = {
+    seconds: Math.min(Math.max(Number(seconds) || 30, 1), MAX_SECONDS),
+    interval_ms: Math.max(Number(intervalMs) || 10, 1),
+    requested_at: new Date().toISOString()
+  };
+  const requestPath = path.join(await userDataDir(instanceDir), REQUEST_FILE);
+  const tmpPath = `${requestPath}.tmp`;
+  await fs.writeJson(tmpPath, request);
+  await fs.move(tmpPath, requestPath, { overwrite: true });
+  return request;
+}
+
+/**
+ * Pending request, status of the current/last profile and the stored profiles (newest first)
+ */
+async function getProfileStatus(instanceDir) {
+  const dataDir = await userDataDir(instanceDir);
+  const profilesDir = path.join(dataDir, PROFILES_DIR);
+  let status = null;
+  try {
+    status = await fs.readJson(path.join(profilesDir, 'status.json'));
+  } catch (err) {
+    if (err.code !== 'ENOENT') {
+      console.warn(`[BotProfiler] Could not read profiler status in ${profilesDir}: ${err.message}`);
+    }
+  }
+  let profiles = [];
+  if (await fs.pathExists(profilesDir)) {
+    const names = (await fs.readdir(profilesDir)).filter(name => PROFILE_NAME.test(name)).sort().reverse();
+    profiles = await Promise.all(names.map(async name => {
+      const stat = await fs.stat(path.join(profilesDir, name));
+      return { file: name, bytes: stat.size, modifiedAt: stat.mtime.toISOString() };
+    }));
+  }
+  return {
+    pending: await fs.pathExists(path.join(dataDir, REQUEST_FILE)),
+    status,
+    profiles
+  };
+}
+
+/**
+ * Path of a stored profile, or null for unknown or malformed names
+ */
+async function getProfilePath(instanceDir, file) {
+  if (!PROFILE_NAME.test(file)) {
+    return null;
+  }
+  const profilePath = path.join(await userDataDir(instanceDir), PROFILES_DIR, file);
+  return await fs.pathExists(profilePath) ? profilePath : null;
+}
+
+module.exports = {
+  userDataDir,
+  requestProfile,
+  getProfileStatus,
+  getProfilePath
+};
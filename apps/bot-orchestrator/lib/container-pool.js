@@ -29,6 +29,7 @@ const path = require('path');
 const { spawn, exec, execSync } = require('child_process');
 const util = require('util');
 const execPromise = util.promisify(exec);
+const { getBotMemory } = require('./bot-memory');
 
 // Normalize a filesystem path to an absolute, Docker-friendly format
 // - Resolves relative segments to absolute
@@ -45,6 +46,8 @@ function normalizePath(p) {
 const MAX_BOTS_PER_CONTAINER = parseInt(process.env.MAX_BOTS_PER_CONTAINER) || 3;
 const POOL_CONTAINER_PREFIX = process.env.POOL_CONTAINER_PREFIX || 'freqtrade-pool';
 const POOL_BASE_PORT = parseInt(process.env.POOL_BASE_PORT) || 9000;
+// Memory a pool's bots may use together, from their memory reports (0 = only count bots)
+const POOL_MEMORY_BUDGET_MB = parseInt(process.env.POOL_MEMORY_BUDGET_MB) || 0;
 // Pool mode uses custom supervisord-enabled image
 const POOL_IMAGE = process.env.POOL_IMAGE || 'freqtrade-pool:latest';
 // Bot instances stored under monorepo data directory
@@ -115,6 +118,7 @@ class ContainerPoolManager {
     this.maxBotsPerContainer = options.maxBotsPerContainer || MAX_BOTS_PER_CONTAINER;
     this.poolPrefix = options.poolPrefix || POOL_CONTAINER_PREFIX;
     this.basePort = options.basePort || POOL_BASE_PORT;
+    this.memoryBudgetMB = options.memoryBudgetMB || POOL_MEMORY_BUDGET_MB;
     this.poolImage = options.poolImage || POOL_IMAGE;
     // CRITICAL: Normalize all directory paths to absolute forward-slash format (prevents WSL backslash issues)
     this.botBaseDir = normalizePath(options.botBaseDir || BOT_BASE_DIR);
@@ -228,6 +232,113 @@ class ContainerPoolManager {
     return userPools;
   }
   
+  /**
+   * Find a pool with a free slot whose bots leave room for one more bot
+   * Without a memory budget this is findAvailablePool(). With one, the new
+   * bot's footprint is estimated from running bots with the same strategy and
+   * the fullest pool that still fits is chosen, so pools fill up before new
+   * ones are created.
+   * @param {string} userId - User ID to find pool for
+   * @param {Object} botConfig - Bot configuration (strategy)
+   * @returns {Promise<PoolContainer|null>}
+   */
+  async findPoolForBot(userId, botConfig = {}) {
+    if (!this.memoryBudgetMB) {
+      return this.findAvailablePool(userId);
+    }
+    const candidates = this.getUserPools(userId)
+      .filter(pool => pool.status === 'running' && pool.bots.length < pool.capacity);
+    if (candidates.length === 0) {
+      return null;
+    }
+
+    const expectedMB = await this.estimateBotMemoryMB(botConfig.strategy);
+    let best = null;
+    for (const pool of candidates) {
+      const { totalMB } = await this.getPoolMemory(pool);
+      if (totalMB + expectedMB <= this.memoryBudgetMB && (!best || totalMB > best.totalMB)) {
+        best = { pool, totalMB };
+      }
+    }
+    if (!best) {
+      console.log(`[ContainerPool] No pool of user ${userId} has ${expectedMB}MB left for a ${botConfig.strategy || 'new'} bot`);
+      return null;
+    }
+    return best.pool;
+  }
+
+  /**
+   * Memory of a pool's bots from their memory reports
+   * Bots without a fresh report count as the pool's average reporting bot;
+   * docker's figure for the whole container is used when it is higher.
+   * @param {PoolContainer} pool
+   * @returns {Promise<{totalMB: number, bots: Object}>}
+   */
+  async getPoolMemory(pool) {
+    const bots = {};
+    let reportedMB = 0;
+    let reported = 0;
+    for (const instanceId of pool.bots) {
+      const memory = await getBotMemory(path.join(pool.poolDir, 'bots', instanceId));
+      bots[instanceId] = memory;
+      if (memory && !memory.stale) {
+        reportedMB += memory.rssMB;
+        reported += 1;
+      }
+    }
+    const unreported = pool.bots.length - reported;
+    const estimatedMB = reported ? reportedMB + unreported * (reportedMB / reported) : 0;
+    const totalMB = Math.round(Math.max(estimatedMB, pool.metrics?.memoryUsageMB || 0));
+    return { totalMB, bots };
+  }
+
+  /**
+   * Expected memory of a new bot: median of running bots with the same
+   * strategy, else of all running bots, else 0
+   * @param {string} strategy - Strategy name
+   * @returns {Promise<number>}
+   */
+  async estimateBotMemoryMB(strategy) {
+    const same = [];
+    const all = [];
+    for (const pool of this.pools.values()) {
+      if (pool.status !== 'running') continue;
+      const { bots } = await this.getPoolMemory(pool);
+      for (const memory of Object.values(bots)) {
+        if (!memory || memory.stale) continue;
+        all.push(memory.rssMB);
+        if (strategy && memory.strategy === strategy) {
+          same.push(memory.rssMB);
+        }
+      }
+    }
+    const values = (same.length ? same : all).sort((a, b) => a - b);
+    return values.length ? values[Math.floor(values.length / 2)] : 0;
+  }
+
+  /**
+   * Bots of a pool, heaviest first, for choosing which to move or stop when
+   * the pool runs out of memory. Bots without a fresh report come last.
+   * @param {string} poolId - Pool container ID
+   * @returns {Promise<Object[]>}
+   */
+  async getEvictionCandidates(poolId) {
+    const pool = this.pools.get(poolId);
+    if (!pool) {
+      return [];
+    }
+    const { bots } = await this.getPoolMemory(pool);
+    return Object.entries(bots)
+      .map(([instanceId, memory]) => ({
+        instanceId,
+        strategy: memory?.strategy || null,
+        rssMB: memory && !memory.stale ? memory.rssMB : null,
+        analyzedMB: memory?.analyzedMB ?? null,
+        pairs: memory?.pairs ?? null
+      }))
+      .sort((a, b) => (b.rssMB ?? -1) - (a.rssMB ?? -1));
+  }
+
   /**
    * Get the next pool number for a user
    * @param {string} userId - User ID
@@ -393,7 +504,7 @@ class ContainerPoolManager {
     }
     
     // Find or create a pool with capacity FOR THIS USER
-    let pool = this.findAvailablePool(userId);
+    let pool = await this.findPoolForBot(userId, botConfig);
     if (!pool) {
       console.log(`[ContainerPool] No available pool for user ${userId}, creating new one`);
       pool = await this.createPoolContainer(userId);
@@ -1036,6 +1147,15 @@ class ContainerPoolManager {
         if (cpuMatch) {
           pool.metrics.cpuPercent = parseFloat(cpuMatch[1]);
         }
+
+        const { totalMB, bots } = await this.getPoolMemory(pool);
+        pool.metrics.botMemoryMB = Object.fromEntries(
+          Object.entries(bots).map(([instanceId, memory]) => [instanceId, memory ? memory.rssMB : null]));
+        if (this.memoryBudgetMB && totalMB > this.memoryBudgetMB) {
+          const heaviest = (await this.getEvictionCandidates(id)).slice(0, 3)
+            .map(bot => `${bot.instanceId} (${bot.strategy || '?'}, ${bot.rssMB ?? '?'}MB)`);
+          console.warn(`[ContainerPool] ${id} uses ${totalMB}MB of ${this.memoryBudgetMB}MB; heaviest bots: ${heaviest.join(', ')}`);
+        }
         
         pool.metrics.lastUpdated = new Date().toISOString();
         
@@ -153,7 +153,8 @@ const poolProvisioner = {
       max_open_trades,
       timeframe,
       exchange,
-      stake_currency
+      stake_currency,
+      dry_run = true
     } = params;
     
     console.log(`[PoolProvisioner] Provisioning bot ${instanceId} for user ${userId}`);
@@ -200,9 +201,10 @@ const poolProvisioner = {
       stake_currency: finalStakeCurrency,
       stake_amount: finalStakeAmount,
       tradable_balance_ratio: 1,
-      dry_run: true,
+      dry_run: dry_run !== false,
+      // Ignored by live bots - their balance is the exchange account's
       dry_run_wallet: {
-        "USD": finalInitialBalance
+        [finalStakeCurrency]: finalInitialBalance
       },
       cancel_open_orders_on_exit: false,
       trading_mode: "spot",
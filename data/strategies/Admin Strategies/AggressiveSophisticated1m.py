@@ -113,7 +113,7 @@ class AggressiveSophisticated1m(IStrategy):
              # print("Warning: Wallets object not available for custom_stake_amount.")
              return proposed_stake
 
-        open_trades = self.wallets.get_open_trades()
+        open_trades = Trade.get_trades_proxy(is_open=True)
         trade_count = len(open_trades) if open_trades else 0
 
         # Get max_open_trades from config
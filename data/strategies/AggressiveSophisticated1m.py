@@ -7,9 +7,15 @@ from freqtrade.persistence import Trade
 from pandas import DataFrame
 from functools import reduce
 from datetime import datetime, timedelta
+from strategy_utils.bounded_history import BoundedHistoryMixin
+from strategy_utils.indicator_snapshots import IndicatorSnapshotMixin
+from strategy_utils.memory import MemoryReportMixin
+from strategy_utils.profiler import ProfilerMixin
+from strategy_utils.regime import RegimeService, RegimeServiceMixin
+from strategy_utils.stoploss_cache import cached_stoploss
 
 # --- Strategy Class ---
-class AggressiveSophisticated1m(IStrategy):
+class AggressiveSophisticated1m(ProfilerMixin, MemoryReportMixin, BoundedHistoryMixin, IndicatorSnapshotMixin, RegimeServiceMixin, IStrategy):
     """
     AggressiveSophisticated1m Strategy
     ------------------------------------
@@ -96,6 +102,8 @@ class AggressiveSophisticated1m(IStrategy):
     # Number of candles the strategy requires before producing valid signals
     # Adjust based on the longest indicator period used (e.g., slow EMA, slow MACD)
     startup_candle_count: int = 70 # Example, ensure it covers ema_slow_period
+    # Longest lookback (ema_slow_period up to 70) - analyzed dataframes keep this plus a margin
+    history_lookback = 70
 
     # --- Custom Stake Amount ---
     def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
@@ -113,7 +121,7 @@ class AggressiveSophisticated1m(IStrategy):
              # print("Warning: Wallets object not available for custom_stake_amount.")
              return proposed_stake
 
-        open_trades = self.wallets.get_open_trades()
+        open_trades = Trade.get_trades_proxy(is_open=True)
         trade_count = len(open_trades) if open_trades else 0
 
         # Get max_open_trades from config
@@ -143,6 +151,8 @@ class AggressiveSophisticated1m(IStrategy):
         return final_stake
 
     # --- Custom Stoploss ---
+    # Depends only on the last analyzed candle - recomputed once per candle
+    @cached_stoploss(candle=True, profit='none')
     def custom_stoploss(self, pair: str, trade: 'Trade', current_time: datetime,
                         current_rate: float, current_profit: float, **kwargs) -> float:
         """
@@ -245,10 +255,12 @@ class AggressiveSophisticated1m(IStrategy):
         dataframe['bb_width'] = ((dataframe['bb_upperband'] - dataframe['bb_lowerband']) / dataframe['bb_middleband']) * 100
 
         # --- Trend Strength Indicators ---
-        # ADX
-        dataframe['adx'] = ta.ADX(dataframe, timeperiod=self.adx_period.value)
-        dataframe['plus_di'] = ta.PLUS_DI(dataframe, timeperiod=self.adx_period.value)
-        dataframe['minus_di'] = ta.MINUS_DI(dataframe, timeperiod=self.adx_period.value)
+        # ADX, +DI/-DI and the regime label (0: Uncertain, 1: Uptrend, 2: Downtrend, 3: Range)
+        # come from the shared regime service - computed once per candle for all pool bots
+        regimes = RegimeService.for_strategy(self, adx_period=self.adx_period.value,
+                                             trend_threshold=self.adx_trend_threshold.value,
+                                             range_threshold=self.adx_range_threshold.value)
+        dataframe = regimes.apply(dataframe, metadata['pair'], columns=('adx', 'plus_di', 'minus_di', 'regime'))
 
         # --- Trend Context Indicators ---
         # EMAs
@@ -259,19 +271,6 @@ class AggressiveSophisticated1m(IStrategy):
         # Volume Moving Average
         dataframe['volume_ma'] = ta.SMA(dataframe['volume'], timeperiod=20) # Use a fixed period or make hyperoptable
 
-        # --- Regime Filter Example ---
-        # Conditions for regime identification
-        is_trending = dataframe['adx'] > self.adx_trend_threshold.value
-        is_ranging = dataframe['adx'] < self.adx_range_threshold.value
-        # Add volatility conditions if desired (e.g., based on bb_width or normalized ATR)
-        # is_high_vol = dataframe['bb_width'] > dataframe['bb_width'].rolling(50).mean() # Example
-
-        # Assign regime: 0: Uncertain, 1: Uptrend, 2: Downtrend, 3: Range
-        dataframe['regime'] = 0
-        dataframe.loc[is_trending & (dataframe['plus_di'] > dataframe['minus_di']), 'regime'] = 1 # Uptrend
-        dataframe.loc[is_trending & (dataframe['minus_di'] > dataframe['plus_di']), 'regime'] = 2 # Downtrend
-        dataframe.loc[is_ranging, 'regime'] = 3 # Range
-
         # --- Signal Preparation ---
         # Initialize columns for entry/exit signals
         dataframe['enter_long'] = 0
@@ -3,16 +3,23 @@ from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, Boolea
 from pandas import DataFrame
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
-import logging
 from typing import Optional
 from freqtrade.persistence import Trade
 from datetime import datetime, timedelta
+from strategy_utils.async_logging import get_strategy_logger
+from strategy_utils.batch_indicators import BatchIndicators
+from strategy_utils.bounded_history import BoundedHistoryMixin
+from strategy_utils.indicator_snapshots import IndicatorSnapshotMixin
+from strategy_utils.lazy_signals import LazySignalsMixin
+from strategy_utils.memory import MemoryReportMixin
+from strategy_utils.profiler import ProfilerMixin
+from strategy_utils.screener import PairScreenerMixin
 import numpy as np
 
-logger = logging.getLogger(__name__)
+logger = get_strategy_logger(__name__)
 
 
-class DCAStrategy(IStrategy):
+class DCAStrategy(ProfilerMixin, MemoryReportMixin, BoundedHistoryMixin, PairScreenerMixin, LazySignalsMixin, IndicatorSnapshotMixin, IStrategy):
     """
     Dollar Cost Averaging (DCA) Strategy with Smart Entry and Risk Management
     
@@ -30,6 +37,8 @@ class DCAStrategy(IStrategy):
     # Basic configuration
     timeframe = '1h'  # Longer timeframe for DCA approach
     can_short = False
+    # Pairs without volume or below sma_200 skip full analysis (see entry_precondition)
+    screener_indicators = BatchIndicators().sma('sma_200', 200)
     
     # ROI configuration for DCA strategy
     minimal_roi = {
@@ -56,6 +65,8 @@ class DCAStrategy(IStrategy):
     ignore_roi_if_entry_signal = False
     process_only_new_candles = True
     startup_candle_count: int = 100
+    # sma_200 is the longest lookback - analyzed dataframes keep this plus a margin
+    history_lookback = 200
 
     # === DCA CONFIGURATION PARAMETERS ===
     
@@ -103,6 +114,16 @@ class DCAStrategy(IStrategy):
         """No additional pairs needed for this strategy"""
         return []
 
+    def entry_precondition(self, latest: dict) -> np.ndarray:
+        """
+        Necessary part of the entry conditions, checked for all pairs at once
+        before full analysis: volume on the candle and the market trend filter
+        """
+        passed = latest['volume'] > 0
+        if self.use_market_trend_filter.value:
+            passed &= latest['close'] > latest['sma_200']
+        return passed
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Add indicators for DCA strategy
@@ -180,8 +201,9 @@ class DCAStrategy(IStrategy):
                 optimal_stake = min(base_stake, max_allowed, max_stake)
                 optimal_stake = max(optimal_stake, min_stake or 0)
                 
-                logger.info(f"Initial position for {pair}: {optimal_stake:.2f} "
-                           f"({(optimal_stake/total_stake)*100:.1f}% of portfolio)")
+                logger.info("Initial position for %s: %.2f (%.1f%% of portfolio)",
+                            pair, optimal_stake, (optimal_stake / total_stake) * 100,
+                            key=pair, every=300)
                 
                 return optimal_stake
                 
@@ -220,8 +242,8 @@ class DCAStrategy(IStrategy):
             dca_size = min(base_dca_size, max_allowed, max_stake)
             dca_size = max(dca_size, min_stake or 0)
             
-            logger.info(f"DCA Level {dca_level} for {pair}: {dca_size:.2f} "
-                       f"(multiplier: {multiplier:.1f})")
+            logger.info("DCA Level %s for %s: %.2f (multiplier: %.1f)",
+                        dca_level, pair, dca_size, multiplier, key=(pair, dca_level), every=300)
             
             return dca_size
             
@@ -464,10 +486,8 @@ class DCAStrategy(IStrategy):
             discount_pct = min(0.01, (atr * 0.5) / proposed_rate)
             better_price = proposed_rate * (1 - discount_pct)
             
-            logger.info(f"DCA order price adjustment for {pair}: "
-                       f"Market: {proposed_rate:.6f}, "
-                       f"DCA: {better_price:.6f} "
-                       f"({discount_pct*100:.1f}% discount)")
+            logger.info("DCA order price adjustment for %s: Market: %.6f, DCA: %.6f (%.1f%% discount)",
+                        pair, proposed_rate, better_price, discount_pct * 100, key=pair, every=60)
             
             return better_price
             
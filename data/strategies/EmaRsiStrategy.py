@@ -4,9 +4,13 @@ from pandas import DataFrame
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
+from strategy_utils.bounded_history import BoundedHistoryMixin
+from strategy_utils.memory import MemoryReportMixin
+from strategy_utils.profiler import ProfilerMixin
+
 # --------------------------------
 
-class EmaRsiStrategy(IStrategy):
+class EmaRsiStrategy(ProfilerMixin, MemoryReportMixin, BoundedHistoryMixin, IStrategy):
     """
     Basic EMA Crossover Strategy with RSI Filter
 
@@ -49,6 +53,8 @@ class EmaRsiStrategy(IStrategy):
 
     # Run "populate_indicators()" only for new candle notifications
     process_only_new_candles = True
+    # Longest lookback (slow EMA) - analyzed dataframes keep this plus a margin
+    history_lookback = 21
 
     # These values can be overridden in the config.
     use_exit_signal = True
@@ -3,16 +3,22 @@ from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, Boolea
 from pandas import DataFrame
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
-import logging
 from typing import Optional
 from freqtrade.persistence import Trade
 from datetime import datetime, timedelta
+from strategy_utils.async_logging import get_strategy_logger
+from strategy_utils.bounded_history import BoundedHistoryMixin
+from strategy_utils.lazy_signals import LazySignalsMixin
+from strategy_utils.memory import MemoryReportMixin
+from strategy_utils.profiler import ProfilerMixin
+from strategy_utils.regime import RegimeService, RegimeServiceMixin
+from strategy_utils.risk_parity import RiskParitySizer
 import numpy as np
 
-logger = logging.getLogger(__name__)
+logger = get_strategy_logger(__name__)
 
 
-class EnhancedRiskManagedStrategy(IStrategy):
+class EnhancedRiskManagedStrategy(ProfilerMixin, MemoryReportMixin, BoundedHistoryMixin, LazySignalsMixin, RegimeServiceMixin, IStrategy):
     """
     Enhanced Trading Strategy with Risk Management, DCA, and Auto-Rebalancing
     
@@ -31,6 +37,7 @@ class EnhancedRiskManagedStrategy(IStrategy):
     # Basic strategy configuration
     timeframe = '15m'
     can_short = False
+    max_open_positions = 10  # also stops entry signals from being computed while full
     
     # Advanced ROI with time-based targets
     minimal_roi = {
@@ -56,6 +63,8 @@ class EnhancedRiskManagedStrategy(IStrategy):
     ignore_roi_if_entry_signal = False
     process_only_new_candles = True
     startup_candle_count: int = 50
+    # Risk parity reads 192 candles of analyzed history (4 x 48 halflife), longer than sma_50
+    history_lookback = 192
 
     # === RISK MANAGEMENT PARAMETERS ===
     
@@ -119,7 +128,7 @@ class EnhancedRiskManagedStrategy(IStrategy):
         # === MOMENTUM INDICATORS ===
         dataframe['rsi'] = ta.RSI(dataframe, timeperiod=self.rsi_period.value)
         dataframe['macd'], dataframe['macdsignal'], dataframe['macdhist'] = ta.MACD(dataframe)
-        dataframe['adx'] = ta.ADX(dataframe, timeperiod=14)
+        dataframe = RegimeService.for_strategy(self).apply(dataframe, metadata['pair'], columns=('adx',))
         
         # === VOLATILITY INDICATORS ===
         dataframe['atr'] = ta.ATR(dataframe, timeperiod=self.atr_period.value)
@@ -148,82 +157,10 @@ class EnhancedRiskManagedStrategy(IStrategy):
         
         return dataframe
 
-    def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
-                          proposed_stake: float, min_stake: Optional[float], max_stake: float,
-                          leverage: float, entry_tag: Optional[str], side: str,
-                          **kwargs) -> float:
-        """
-        Dynamic position sizing based on risk management and volatility
-        """
-        try:
-            # Get current dataframe for this pair
-            dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-            if dataframe.empty:
-                return proposed_stake
-            
-            current_candle = dataframe.iloc[-1]
-            
-            # === VOLATILITY-BASED SIZING ===
-            volatility = current_candle.get('price_volatility', 0.02)
-            atr = current_candle.get('atr', current_rate * 0.02)
-            
-            # Adjust position size based on volatility (lower volatility = larger position)
-            volatility_multiplier = max(0.5, min(2.0, 1 / (1 + volatility * 10)))
-            
-            # === PORTFOLIO RISK ASSESSMENT ===
-            total_stake = self.wallets.get_total_stake_amount()
-            if total_stake <= 0:
-                return min_stake or proposed_stake
-            
-            # Calculate current portfolio exposure
-            open_trades_risk = 0
-            for trade in Trade.get_trades_proxy(is_open=True):
-                if trade.pair != pair:  # Don't count current trade
-                    trade_risk = abs(trade.stake_amount * (trade.stop_loss_pct or 0.08))
-                    open_trades_risk += trade_risk
-            
-            # Maximum allowed risk for this trade
-            max_trade_risk = total_stake * self.risk_per_trade.value
-            remaining_risk_budget = (total_stake * self.max_total_risk.value) - open_trades_risk
-            max_trade_risk = min(max_trade_risk, remaining_risk_budget)
-            
-            if max_trade_risk <= 0:
-                logger.warning(f"No remaining risk budget for {pair}")
-                return min_stake or (proposed_stake * 0.1)
-            
-            # === CALCULATE OPTIMAL POSITION SIZE ===
-            # Base position size
-            base_stake = total_stake * self.base_stake_percent.value
-            
-            # Apply volatility adjustment
-            adjusted_stake = base_stake * volatility_multiplier * self.volatility_factor.value
-            
-            # Apply risk-based sizing (position size = risk budget / expected loss per unit)
-            stop_distance = atr * 2  # Dynamic stop based on ATR
-            risk_based_stake = max_trade_risk / (stop_distance / current_rate)
-            
-            # Take the minimum of risk-based and volatility-adjusted sizing
-            optimal_stake = min(adjusted_stake, risk_based_stake)
-            
-            # Apply limits
-            max_allowed_stake = total_stake * self.max_stake_percent.value
-            optimal_stake = max(min_stake or 0, min(optimal_stake, max_allowed_stake, max_stake))
-            
-            # DCA consideration - reduce initial position if DCA is enabled
-            if self.enable_dca.value and entry_tag != "dca":
-                optimal_stake *= 0.7  # Reserve 30% for potential DCA orders
-            
-            logger.info(f"Position sizing for {pair}: "
-                       f"Proposed: {proposed_stake:.2f}, "
-                       f"Optimal: {optimal_stake:.2f}, "
-                       f"Volatility: {volatility:.4f}, "
-                       f"Risk Budget: {max_trade_risk:.2f}")
-            
-            return optimal_stake
-            
-        except Exception as e:
-            logger.error(f"Error in custom_stake_amount for {pair}: {e}")
-            return min_stake or (proposed_stake * 0.5)
+    def risk_parity_multiplier(self, pair: str, current_time: datetime) -> Optional[float]:
+        """Inverse-volatility stake multiplier across the whitelist (0.5-2.0), None while unknown"""
+        multiplier = RiskParitySizer.for_strategy(self).multiplier(pair, current_time)
+        return None if multiplier is None else max(0.5, min(2.0, multiplier))
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -323,6 +260,8 @@ class EnhancedRiskManagedStrategy(IStrategy):
         
         return dataframe
 
+    # Not @cached_stoploss: the stop tightens with the trade's age and moves with atr/current_rate,
+    # so any reused value would be looser than a fresh one
     def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
                        current_rate: float, current_profit: float, **kwargs) -> float:
         """
@@ -362,8 +301,8 @@ class EnhancedRiskManagedStrategy(IStrategy):
             final_stop = max(dynamic_stop, self.stoploss)
             
             if current_profit > 0.02:  # Log only for profitable trades
-                logger.info(f"Dynamic stop for {pair}: Profit: {current_profit:.1%}, "
-                           f"Stop: {final_stop:.1%}, ATR: {atr:.6f}")
+                logger.info("Dynamic stop for %s: Profit: %.1f%%, Stop: %.1f%%, ATR: %.6f",
+                            pair, current_profit * 100, final_stop * 100, atr, key=pair, every=300)
             
             return final_stop
             
@@ -460,7 +399,7 @@ class EnhancedRiskManagedStrategy(IStrategy):
             
             # Check total open positions
             open_trades = Trade.get_trades_proxy(is_open=True)
-            if len(open_trades) >= 10:  # Max 10 open positions
+            if len(open_trades) >= self.max_open_positions:
                 logger.warning(f"Maximum open positions reached, rejecting {pair}")
                 return False
             
@@ -583,9 +522,13 @@ class EnhancedRiskManagedStrategy(IStrategy):
                             
                             return position_size
             
-            # Fallback to proposed stake if universal risk management not available
-            logger.info(f"⚠️ Using proposed stake ${proposed_stake:.2f} for {pair} (Universal RM not configured)")
-            return proposed_stake
+            # Fallback to proposed stake if universal risk management not available,
+            # scaled to the pair's risk-parity share
+            multiplier = self.risk_parity_multiplier(pair, current_time) or 1.0
+            stake = min(max(proposed_stake * multiplier, min_stake or 0), max_stake)
+            logger.info("⚠️ Using proposed stake $%.2f x %.2f for %s (Universal RM not configured)",
+                        proposed_stake, multiplier, pair, key=pair, every=300)
+            return stake
             
         except Exception as e:
             logger.error(f"Error in custom_stake_amount for {pair}: {e}")
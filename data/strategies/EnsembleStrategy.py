@@ -0,0 +1,301 @@
+# --- Strategy Ensemble: several strategies in one bot ---
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from freqtrade.exceptions import OperationalException
+from freqtrade.persistence import Trade
+from freqtrade.strategy import IStrategy, stoploss_from_open
+
+from strategy_utils.bounded_history import BoundedHistoryMixin, bounded
+from strategy_utils.ensemble import (BASE_COLUMNS, MemberDataProvider, base_timeframe, load_members,
+                                     merge_member_columns, split_tag)
+from strategy_utils.informative import InformativeResampler
+from strategy_utils.memory import MemoryReportMixin
+from strategy_utils.profiler import ProfilerMixin
+
+
+class EnsembleStrategy(ProfilerMixin, MemoryReportMixin, BoundedHistoryMixin, IStrategy):
+    """
+    Runs the strategies listed in config.json as one bot:
+
+        "ensemble": {"strategies": ["EmaRsiStrategy", "DCAStrategy"]}
+
+    Candles are fetched once at the smallest member timeframe, every member
+    analyzes them once per candle, and each trade is handled by the member
+    that opened it (routed by enter_tag "<Member>:<tag>").
+    See strategy_utils/ensemble.py.
+    """
+
+    INTERFACE_VERSION = 3
+
+    # Replaced from the members in __init__
+    timeframe = '5m'
+    startup_candle_count: int = 0
+    process_only_new_candles = True
+
+    # ROI, exit signals and stops are applied per member in custom_roi / custom_exit / custom_stoploss
+    minimal_roi = {"0": 10.0}
+    use_custom_roi = True
+    stoploss = -0.99
+    use_custom_stoploss = True
+    trailing_stop = False
+    use_exit_signal = True
+    exit_profit_only = False
+    ignore_roi_if_entry_signal = False
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        names = config.get('ensemble', {}).get('strategies', [])
+        if not names:
+            raise OperationalException(
+                'EnsembleStrategy needs "ensemble": {"strategies": [...]} in config.json')
+        self.members = load_members(config, names)
+        self.members_by_name = {member.name: member for member in self.members}
+
+        self.timeframe = base_timeframe(self.members)
+        base_seconds = self._seconds(self.timeframe)
+        self.startup_candle_count = max(
+            member.strategy.startup_candle_count * self._seconds(member.timeframe) // base_seconds
+            for member in self.members)
+        self.stoploss = min(member.strategy.stoploss for member in self.members)
+        self.can_short = any(member.strategy.can_short for member in self.members)
+        self.position_adjustment_enable = any(member.strategy.position_adjustment_enable
+                                              for member in self.members)
+        # -1 is unlimited; each member's own limit is enforced in adjust_trade_position()
+        limits = [member.strategy.max_entry_position_adjustment for member in self.members
+                  if member.strategy.position_adjustment_enable]
+        self.max_entry_position_adjustment = -1 if not limits or min(limits) < 0 else max(limits)
+
+    @staticmethod
+    def _seconds(timeframe: str) -> int:
+        from freqtrade.exchange import timeframe_to_seconds
+
+        return timeframe_to_seconds(timeframe)
+
+    def bot_start(self, **kwargs) -> None:
+        # Member candles for the whole analyzed range (backtests included), not just the live window
+        self.resampler = InformativeResampler(self.timeframe, dp=self.dp, max_candles=100_000)
+        for member in self.members:
+            member.strategy.dp = MemberDataProvider(self.dp, member, self.timeframe)
+            member.strategy.wallets = self.wallets
+            member.strategy.ft_bot_start()
+
+    def ft_bot_cleanup(self) -> None:
+        # Members' mixins own threads too (snapshot writer, profiler, memory report)
+        for member in self.members:
+            member.strategy.ft_bot_cleanup()
+        super().ft_bot_cleanup()
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        for member in self.members:
+            member.strategy.bot_loop_start(current_time=current_time, **kwargs)
+
+    def informative_pairs(self):
+        pairs = []
+        for member in self.members:
+            for informative in member.strategy.informative_pairs():
+                if informative not in pairs:
+                    pairs.append(informative)
+        return pairs
+
+    # === ANALYSIS ===
+
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """Every member's indicators and signals, merged into one dataframe"""
+        pair = metadata['pair']
+        for member in self.members:
+            if member.timeframe != self.timeframe:
+                self.resampler.track(pair, member.timeframe)
+        self.resampler.update(pair, dataframe)
+        for member in self.members:
+            if member.timeframe == self.timeframe:
+                candles = dataframe[BASE_COLUMNS].copy()
+            else:
+                candles = self.resampler.get_pair_dataframe(pair, member.timeframe).copy()
+            frame = member.analyze(candles, pair)
+            dataframe = merge_member_columns(dataframe, frame, member, self.timeframe)
+            # Merged at full length above; the member's own copy only needs its bound
+            bounded(member.strategy, pair, frame)
+        return dataframe
+
+    def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """A member's entry (not vetoed by its own exit) tagged with the member; first listed member wins"""
+        for side in ('long', 'short') if self.can_short else ('long',):
+            enter = np.zeros(len(dataframe), dtype=bool)
+            tags = np.full(len(dataframe), None, dtype=object)
+            for member in reversed(self.members):
+                wanted = dataframe[f"{member.name}_enter_{side}"].to_numpy() == 1
+                if member.strategy.use_exit_signal:
+                    wanted &= dataframe[f"{member.name}_exit_{side}"].to_numpy() != 1
+                member_tags = dataframe[f"{member.name}_enter_tag"].to_numpy()
+                tags[wanted] = [member.tag(tag if isinstance(tag, str) else None)
+                                for tag in member_tags[wanted]]
+                enter |= wanted
+            dataframe[f"enter_{side}"] = enter.astype(int)
+            dataframe.loc[enter, 'enter_tag'] = tags[enter]
+        return dataframe
+
+    def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """Exit signals only close the member's own trades - see custom_exit()"""
+        dataframe['exit_long'] = 0
+        if self.can_short:
+            dataframe['exit_short'] = 0
+        return dataframe
+
+    # === ROUTING ===
+
+    def _owner(self, enter_tag: Optional[str]):
+        """(member, member's own tag) for an enter_tag, member None for unknown tags"""
+        name, member_tag = split_tag(enter_tag)
+        return self.members_by_name.get(name), member_tag
+
+    def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
+                            proposed_stake: float, min_stake: Optional[float], max_stake: float,
+                            leverage: float, entry_tag: Optional[str], side: str,
+                            **kwargs) -> float:
+        member, member_tag = self._owner(entry_tag)
+        if member is None:
+            return proposed_stake
+        return member.strategy.custom_stake_amount(
+            pair=pair, current_time=current_time, current_rate=current_rate,
+            proposed_stake=proposed_stake, min_stake=min_stake, max_stake=max_stake,
+            leverage=leverage, entry_tag=member_tag, side=side, **kwargs)
+
+    def custom_entry_price(self, pair: str, trade: Optional[Trade], current_time: datetime,
+                           proposed_rate: float, entry_tag: Optional[str], side: str,
+                           **kwargs) -> float:
+        member, member_tag = self._owner(entry_tag)
+        if member is None:
+            return proposed_rate
+        return member.strategy.custom_entry_price(
+            pair=pair, trade=trade, current_time=current_time, proposed_rate=proposed_rate,
+            entry_tag=member_tag, side=side, **kwargs)
+
+    def confirm_trade_entry(self, pair: str, order_type: str, amount: float, rate: float,
+                            time_in_force: str, current_time: datetime, entry_tag: Optional[str],
+                            side: str, **kwargs) -> bool:
+        member, member_tag = self._owner(entry_tag)
+        if member is None:
+            return False
+        return member.strategy.confirm_trade_entry(
+            pair=pair, order_type=order_type, amount=amount, rate=rate,
+            time_in_force=time_in_force, current_time=current_time, entry_tag=member_tag,
+            side=side, **kwargs)
+
+    def leverage(self, pair: str, current_time: datetime, current_rate: float,
+                 proposed_leverage: float, max_leverage: float, entry_tag: Optional[str],
+                 side: str, **kwargs) -> float:
+        member, member_tag = self._owner(entry_tag)
+        if member is None:
+            return 1.0
+        return member.strategy.leverage(
+            pair=pair, current_time=current_time, current_rate=current_rate,
+            proposed_leverage=proposed_leverage, max_leverage=max_leverage,
+            entry_tag=member_tag, side=side, **kwargs)
+
+    def adjust_trade_position(self, trade: Trade, current_time: datetime, current_rate: float,
+                              current_profit: float, min_stake: Optional[float], max_stake: float,
+                              **kwargs):
+        member, _ = self._owner(trade.enter_tag)
+        if member is None or not member.strategy.position_adjustment_enable:
+            return None
+        limit = member.strategy.max_entry_position_adjustment
+        if -1 < limit < trade.nr_of_successful_entries:
+            return None
+        return member.strategy.adjust_trade_position(
+            trade=trade, current_time=current_time, current_rate=current_rate,
+            current_profit=current_profit, min_stake=min_stake, max_stake=max_stake, **kwargs)
+
+    def order_filled(self, pair: str, trade: Trade, order, current_time: datetime, **kwargs) -> None:
+        member, _ = self._owner(trade.enter_tag)
+        if member is not None:
+            member.strategy.order_filled(pair=pair, trade=trade, order=order,
+                                         current_time=current_time, **kwargs)
+
+    def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime, current_rate: float,
+                        current_profit: float, after_fill: bool, **kwargs) -> Optional[float]:
+        """Tightest of the owner's custom stop, static stoploss and trailing stop"""
+        member, _ = self._owner(trade.enter_tag)
+        if member is None:
+            return None
+        strategy = member.strategy
+        # stoploss_from_open() gives 0 once the member's stop is crossed - keep it just below the rate
+        stops = [max(stoploss_from_open(strategy.stoploss, current_profit, trade.is_short, trade.leverage),
+                     0.0001)]
+        if strategy.use_custom_stoploss:
+            custom = strategy.custom_stoploss(pair=pair, trade=trade, current_time=current_time,
+                                              current_rate=current_rate, current_profit=current_profit,
+                                              after_fill=after_fill, **kwargs)
+            if custom is not None and custom == custom and custom != 0:
+                stops.append(abs(custom))
+        if strategy.trailing_stop:
+            offset = strategy.trailing_stop_positive_offset or 0.0
+            if not strategy.trailing_only_offset_is_reached or current_profit > offset:
+                trailing = abs(strategy.stoploss)
+                if strategy.trailing_stop_positive is not None and current_profit > offset:
+                    trailing = strategy.trailing_stop_positive
+                stops.append(trailing)
+        return min(stops)
+
+    def custom_exit(self, pair: str, trade: Trade, current_time: datetime, current_rate: float,
+                    current_profit: float, **kwargs):
+        """Owner's custom_exit, then its exit signal"""
+        member, _ = self._owner(trade.enter_tag)
+        if member is None:
+            return None
+        strategy = member.strategy
+        reason = strategy.custom_exit(pair=pair, trade=trade, current_time=current_time,
+                                      current_rate=current_rate, current_profit=current_profit,
+                                      **kwargs)
+        if reason:
+            return reason if isinstance(reason, str) else 'custom_exit'
+
+        candle = self._last_candle(member, pair)
+        side = 'short' if trade.is_short else 'long'
+        if candle is not None and strategy.use_exit_signal and candle.get(f'exit_{side}') == 1:
+            if not strategy.exit_profit_only or current_profit > strategy.exit_profit_offset:
+                exit_tag = candle.get('exit_tag')
+                return exit_tag if isinstance(exit_tag, str) and exit_tag else 'exit_signal'
+        return None
+
+    def custom_roi(self, pair: str, trade: Trade, current_time: datetime, trade_duration: int,
+                   entry_tag: Optional[str], side: str, **kwargs) -> Optional[float]:
+        """The owner's ROI for the trade's age (its table or its own custom_roi)"""
+        member, _ = self._owner(trade.enter_tag)
+        if member is None:
+            return None
+        strategy = member.strategy
+        if strategy.ignore_roi_if_entry_signal:
+            candle = self._last_candle(member, pair)
+            if candle is not None and candle.get(f'enter_{side}') == 1:
+                return None
+        return strategy.min_roi_reached_entry(trade, trade_duration, current_time)[1]
+
+    @staticmethod
+    def _last_candle(member, pair: str):
+        dataframe, _ = member.strategy.dp.get_analyzed_dataframe(pair, member.timeframe)
+        return dataframe.iloc[-1] if not dataframe.empty else None
+
+    def confirm_trade_exit(self, pair: str, trade: Trade, order_type: str, amount: float,
+                           rate: float, time_in_force: str, exit_reason: str,
+                           current_time: datetime, **kwargs) -> bool:
+        member, _ = self._owner(trade.enter_tag)
+        if member is None:
+            return True
+        return member.strategy.confirm_trade_exit(
+            pair=pair, trade=trade, order_type=order_type, amount=amount, rate=rate,
+            time_in_force=time_in_force, exit_reason=exit_reason, current_time=current_time,
+            **kwargs)
+
+    def custom_exit_price(self, pair: str, trade: Trade, current_time: datetime,
+                          proposed_rate: float, current_profit: float, exit_tag: Optional[str],
+                          **kwargs) -> float:
+        member, _ = self._owner(trade.enter_tag)
+        if member is None:
+            return proposed_rate
+        return member.strategy.custom_exit_price(
+            pair=pair, trade=trade, current_time=current_time, proposed_rate=proposed_rate,
+            current_profit=current_profit, exit_tag=exit_tag, **kwargs)
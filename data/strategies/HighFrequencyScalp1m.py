@@ -9,8 +9,16 @@ from freqtrade.strategy import IStrategy, stoploss_from_open
 from pandas import DataFrame
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
-
-class HighFrequencyScalp1m(IStrategy):
+from strategy_utils.batch_indicators import BatchIndicators
+from strategy_utils.bounded_history import BoundedHistoryMixin
+from strategy_utils.memory import MemoryReportMixin
+from strategy_utils.parallel import ParallelAnalysisMixin
+from strategy_utils.profiler import ProfilerMixin
+from strategy_utils.screener import PairScreenerMixin
+from strategy_utils.stoploss_cache import cached_stoploss
+from strategy_utils.streaming import StreamingEntryMixin, StreamingIndicators
+
+class HighFrequencyScalp1m(ProfilerMixin, MemoryReportMixin, BoundedHistoryMixin, StreamingEntryMixin, PairScreenerMixin, ParallelAnalysisMixin, IStrategy):
     """
     HighFrequencyScalp1m: A high-frequency 1-minute scalping strategy for Freqtrade.
     Focus: Many small wins via quick momentum trades. Aggressive risk settings.
@@ -22,6 +30,30 @@ class HighFrequencyScalp1m(IStrategy):
     timeframe = '1m'
     # We only need to process new candle data (avoid intra-candle duplicates)
     process_only_new_candles = True
+    # populate_* only use the pair's own candles, so large whitelists can be analyzed in a
+    # process pool - enable per bot with "parallel_analysis": {"workers": N} in config.json
+    parallel_analysis_workers = 0
+    # ema_slow (200) is the longest lookback - analyzed dataframes keep this plus a margin
+    history_lookback = 200
+
+    # EMA/Bollinger/RSI/ADX/volume MA for every whitelist pair in one vectorized pass per candle
+    indicators = (BatchIndicators()
+                  .ema('ema_fast', 50)
+                  .ema('ema_slow', 200)
+                  .bbands(('bb_upper', 'bb_middle', 'bb_lower'), 20, 2, min_periods=1)
+                  .rsi('rsi', 14)
+                  .adx('adx', 14)
+                  .sma('vol_ma', 30, 'volume'))
+
+    # Trend, trend strength, volume, RSI and Bollinger part of the entry, checked for all
+    # pairs at once each candle - pairs failing it skip the full analysis
+    screener_indicators = indicators
+
+    # Optional sub-candle mode: entries also evaluated on the forming candle, built from the
+    # trade stream - enable per bot with "streaming": {"enabled": true} in config.json.
+    # Everything populate_entry_trend reads, advanced incrementally from the last closed candle.
+    streaming_indicators = StreamingIndicators.from_batch(indicators).stochf(('fastk', 'fastd'), 5, 3)
+
     # Allow the strategy to open a high number of concurrent trades
     max_open_trades = -1  # No limit on number of open trades (manage risk via stake per trade)
 
@@ -64,21 +96,30 @@ class HighFrequencyScalp1m(IStrategy):
     STOCH_OVERBOUGHT = 80
     ADX_THRESHOLD = 25
 
+    def entry_precondition(self, latest):
+        """
+        The entry conditions that only need the latest candle (everything but the
+        stochastic), evaluated for every pair at once before full analysis.
+        """
+        return ((latest['ema_fast'] > latest['ema_slow'])
+                & (latest['adx'] > self.ADX_THRESHOLD)
+                & (latest['volume'] > 0.5 * latest['vol_ma'])
+                & (latest['rsi'] < self.RSI_OVERSOLD)
+                & (latest['close'] < latest['bb_lower']))
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Calculate all required indicators for the strategy. 
         This method is called for each candle (row in dataframe) and should add indicator columns to the dataframe.
         """
         # Exponential Moving Averages (EMA) for trend direction
-        dataframe['ema_fast'] = ta.EMA(dataframe, timeperiod=50)   # Fast EMA (e.g. 50-period)
-        dataframe['ema_slow'] = ta.EMA(dataframe, timeperiod=200)  # Slow EMA (e.g. 200-period)
+        # Fast EMA 50 / slow EMA 200, Bollinger Bands, RSI, ADX and volume MA come from the batched
+        # indicator engine (all whitelist pairs at once in live/dry-run, per pair otherwise)
+        dataframe = self.indicators.apply(dataframe, metadata['pair'], self.dp, self.timeframe)
         # EMA rationale: EMA reacts faster to price changes than SMA, ideal for short-term trend detection&#8203;:contentReference[oaicite:18]{index=18}.
 
         # Bollinger Bands for volatility and mean reversion context
-        bollinger = qtpylib.bollinger_bands(dataframe['close'], window=20, stds=2)
-        dataframe['bb_upper'] = bollinger['upper']
-        dataframe['bb_middle'] = bollinger['mid']
-        dataframe['bb_lower'] = bollinger['lower']
+        # (window 20, 2 stds - computed by self.indicators above)
         # Bollinger bands usage: Price touching or below the lower band indicates an oversold condition (far from mean)&#8203;:contentReference[oaicite:19]{index=19}.
 
         # Stochastic Oscillator (fast)
@@ -89,11 +130,11 @@ class HighFrequencyScalp1m(IStrategy):
         # Stoch: Values <20 indicate oversold, >80 overbought. We'll look for %K crossing above %D as entry signal from oversold levels.
 
         # Relative Strength Index (RSI)
-        dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
+        # (14-period - computed by self.indicators above)
         # RSI: Classic momentum oscillator, <30 oversold, >70 overbought&#8203;:contentReference[oaicite:20]{index=20}.
 
         # Average Directional Index (ADX) and directional indicators
-        dataframe['adx'] = ta.ADX(dataframe, timeperiod=14)
+        # (ADX 14 - computed by self.indicators above)
         dataframe['di_plus'] = ta.PLUS_DI(dataframe, timeperiod=14)
         dataframe['di_minus'] = ta.MINUS_DI(dataframe, timeperiod=14)
         # ADX indicates trend strength. We use ADX > 25 as a threshold for a strong trend&#8203;:contentReference[oaicite:21]{index=21}.
@@ -101,7 +142,7 @@ class HighFrequencyScalp1m(IStrategy):
 
         # Volume indicators
         # Compute a moving average of volume to gauge relative volume
-        dataframe['vol_ma'] = ta.SMA(dataframe, timeperiod=30, price='volume')
+        # (30-period SMA of volume - computed by self.indicators above)
         # We'll use this to filter out extremely low volume candles.
 
         # Parabolic SAR (Stop and Reverse) for potential stop-loss reference (optional)
@@ -191,6 +232,8 @@ class HighFrequencyScalp1m(IStrategy):
         # The 'exit_long' signals mainly ensure we take profit early if momentum indicators show overbought or if price hit a likely resistance.
         return dataframe
 
+    # Pure function of current_profit and trails upwards - recomputed only on a new profit high
+    @cached_stoploss(candle=False, profit='trailing')
     def custom_stoploss(self, pair: str, trade, current_time, current_rate, current_profit, **kwargs) -> float:
         """
         Custom dynamic stoploss logic. This is called continuously (for open trades) to allow adjusting the stoploss.
@@ -216,14 +259,15 @@ class HighFrequencyScalp1m(IStrategy):
 
         return new_stop  # Return stoploss as positive fraction of current price (Freqtrade interprets this as new stoploss level relative to current price).
 
-    def confirm_trade_entry(self, pair: str, order_type: str, amount: float, rate: float, time, **kwargs) -> bool:
+    def confirm_trade_entry(self, pair: str, order_type: str, amount: float, rate: float, time_in_force: str,
+                            current_time, entry_tag, side: str, **kwargs) -> bool:
         """
         Optional confirmation step before actually issuing a buy order.
         This allows us to check current order book or other conditions right at execution time.
         Return True to proceed with order, False to cancel.
         """
-        # Check order book for the pair (depth 1 = top of book)
-        ob = self.dp.orderbook(pair, 1)
+        # Check order book for the pair (depth 1 = top of book) - only live/dry-run have a current one
+        ob = self.dp.orderbook(pair, 1) if self.dp.runmode.value in ('live', 'dry_run') else None
         if ob:
             best_ask = ob['asks'][0][0]  # lowest sell price
             best_bid = ob['bids'][0][0]  # highest buy price
@@ -0,0 +1,13 @@
+"""
+Shared helpers for the strategies in data/strategies.
+
+This package lives next to the strategy files so it is mounted into every pool
+container together with them (/pool/strategies). Freqtrade puts the strategy
+directory on sys.path while it imports a strategy, so strategies import the
+helpers with a plain top-level import, e.g.:
+
+    from strategy_utils.informative import InformativeResampler
+
+Freqtrade only scans top-level .py files for strategies, so nothing in this
+package shows up in the strategy list.
+"""
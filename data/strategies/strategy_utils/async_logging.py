@@ -0,0 +1,159 @@
+# --- Asynchronous Sampled Strategy Logging ---
+"""
+Logging for strategy callbacks that run per trade / per pair on every loop.
+
+Plain logger.info(f"...") inside custom_stake_amount, custom_stoploss and
+friends formats the message and writes it to freqtrade's log file synchronously
+inside the trading loop, on every call. StrategyLogger keeps the stdlib logger
+interface but:
+- hands records to a background thread through a QueueHandler, so the loop
+  never waits on disk; the thread passes them on to the root handlers freqtrade
+  configured (log file, console, the API's log buffer)
+- formats %-style messages on that thread, and only if they are emitted
+- rate limits by message key: every=<seconds> emits a key at most once per
+  interval, sample=<n> emits one in n; the next emitted line reports how many
+  were suppressed
+- appends structured fields as key=value pairs
+
+    logger = get_strategy_logger(__name__)
+    logger.info("Initial position for %s: %.2f", pair, stake, key=pair, every=300,
+                pair=pair, stake=round(stake, 2))
+
+The key defaults to the message template, so give per-pair messages key=pair.
+Nothing is rate limited unless every or sample is passed.
+"""
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+_queue: 'queue.SimpleQueue[logging.LogRecord]' = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _RootForwarder(logging.Handler):
+    """Runs on the listener thread: renders the record and hands it to the root handlers"""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            message += f" (+{suppressed} suppressed)"
+        fields = getattr(record, 'fields', None)
+        if fields:
+            message += ' | ' + ' '.join(f"{name}={value}" for name, value in fields.items())
+        record.msg, record.args = message, None
+
+        for handler in logging.getLogger().handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:   # handle() does the work
+        pass
+
+
+def _ensure_listener() -> None:
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_queue, _RootForwarder())
+            _listener.start()
+            atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+class StrategyLogger:
+    """stdlib-compatible logger with rate limiting and a background writer"""
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+        self._handler = _DeferredQueueHandler(_queue)
+        self._limits: Dict[object, Tuple[float, int, int]] = {}   # key -> (last emit, calls, suppressed)
+
+    def debug(self, msg, *args, **kwargs) -> None:
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg, *args, **kwargs) -> None:
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg, *args, **kwargs) -> None:
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+    def error(self, msg, *args, **kwargs) -> None:
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+    def exception(self, msg, *args, **kwargs) -> None:
+        kwargs.setdefault('exc_info', True)
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, msg, *args, key=None, every: Optional[float] = None,
+            sample: Optional[int] = None, exc_info=None, **fields) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+
+        suppressed = 0
+        if every or sample:
+            allowed, suppressed = self._allow(msg if key is None else (msg, key), every, sample)
+            if not allowed:
+                return
+
+        record = self.logger.makeRecord(self.logger.name, level, '(strategy)', 0, msg, args,
+                                        self._exc_info(exc_info))
+        record.suppressed = suppressed
+        record.fields = fields
+        _ensure_listener()
+        self._handler.handle(record)
+
+    def _allow(self, key, every: Optional[float], sample: Optional[int]) -> Tuple[bool, int]:
+        """Rate-limit decision for one call; returns (emit, suppressed since last emit)"""
+        now = time.monotonic()
+        last, calls, suppressed = self._limits.get(key, (float('-inf'), 0, 0))
+        calls += 1
+        allowed = (not every or now - last >= every) and (not sample or calls % sample == 1 or sample == 1)
+        if allowed:
+            self._limits[key] = (now, calls, 0)
+            return True, suppressed
+        self._limits[key] = (last, calls, suppressed + 1)
+        return False, 0
+
+    @staticmethod
+    def _exc_info(exc_info):
+        if exc_info is True:
+            return sys.exc_info()
+        return exc_info or None
+
+
+_loggers: Dict[str, StrategyLogger] = {}
+
+
+def get_strategy_logger(name: str) -> StrategyLogger:
+    """Shared StrategyLogger for a strategy module (use like logging.getLogger(__name__))"""
+    if name not in _loggers:
+        _loggers[name] = StrategyLogger(name)
+    return _loggers[name]
@@ -0,0 +1,435 @@
+# --- Content-Addressed Backtest Result Cache ---
+"""
+Runs freqtrade backtests through a result cache keyed by everything that can
+change the outcome:
+
+- code:   the strategy file plus every strategy_utils module it imports
+          (transitively) and, for EnsembleStrategy, the member strategy files
+- params: the resolved strategy parameters (IntParameter/DecimalParameter/...
+          values including a <Strategy>.json parameter file), ROI table,
+          stoploss and trailing settings
+- data:   the candles the backtest loads - every pair and timeframe, startup
+          candles included - hashed by content, not by file path or mtime
+- config: the config minus what cannot affect a backtest (paths, api_server,
+          telegram, logging, ...)
+- freqtrade: the installed freqtrade version, whose backtesting engine
+          produced the result
+
+Re-running an unchanged combination returns the stored result without loading
+the strategy into a backtest. Any change to one of the five gives a new key,
+so results never go stale; old entries stay until the directory is cleaned.
+
+Each entry is one JSON file, entries/<key[:2]>/<key>.json, with the summary
+metrics, an equity curve (at most EQUITY_POINTS points) and the trade list.
+catalogue.json holds the latest summary per strategy with the hash of every
+code file it depends on and the freqtrade version; the orchestrator serves it
+with /api/strategies and flags entries whose code or freqtrade version changed
+since as stale, without running anything.
+
+The cache lives in data/backtest_cache unless BACKTEST_CACHE_DIR or
+--cache-dir says otherwise.
+
+Usage (from data/strategies):
+    python -m strategy_utils.backtest_cache -c config.json --strategy DCAStrategy \
+        --timerange 20240101-20240401
+    python -m strategy_utils.backtest_cache --list
+"""
+import argparse
+import ast
+import hashlib
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = STRATEGIES_DIR.parent / 'backtest_cache'
+CACHE_FORMAT = 1
+EQUITY_POINTS = 500
+
+# Config entries that never change a backtest result
+IGNORED_CONFIG_KEYS = {
+    'api_server', 'telegram', 'webhook', 'discord', 'producer', 'external_message_consumer',
+    'bot_name', 'db_url', 'logfile', 'log_config', 'verbosity', 'print_colorized', 'print_json',
+    'user_data_dir', 'datadir', 'exportfilename', 'exportdirectory', 'export', 'backtest_cache',
+    'backtest_show_pair_list', 'backtest_breakdown', 'backtest_notes', 'config_files',
+    'original_config', 'runmode', 'strategy_path', 'recursive_strategy_search', 'initial_state',
+    'internals', 'cancel_open_orders_on_exit', 'force_entry_enable', 'dataformat_ohlcv',
+    'dataformat_trades', 'userId', 'timerange', 'progress', 'strategy_list',
+}
+# Exchange entries that do (the rest are credentials and connection settings)
+EXCHANGE_KEYS = ('name', 'pair_whitelist', 'pair_blacklist')
+
+SUMMARY_KEYS = (
+    'total_trades', 'profit_total', 'profit_total_abs', 'profit_mean', 'profit_median', 'cagr',
+    'sharpe', 'sortino', 'calmar', 'sqn', 'profit_factor', 'expectancy', 'expectancy_ratio',
+    'max_drawdown_account', 'max_relative_drawdown', 'max_drawdown_abs', 'trades_per_day',
+    'market_change', 'starting_balance', 'final_balance', 'stake_currency', 'timeframe',
+    'backtest_start', 'backtest_end', 'backtest_days', 'wins', 'losses', 'draws',
+)
+TRADE_KEYS = (
+    'pair', 'open_timestamp', 'close_timestamp', 'open_rate', 'close_rate', 'amount',
+    'stake_amount', 'profit_ratio', 'profit_abs', 'fee_open', 'fee_close', 'exit_reason',
+    'enter_tag', 'is_short',
+)
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def canonical_hash(value) -> str:
+    """Hash of a JSON-able value, independent of key order"""
+    return sha256_bytes(json.dumps(value, sort_keys=True, default=str).encode())
+
+
+# === KEY COMPONENTS ===
+
+@dataclass
+class CacheKey:
+    code: str
+    params: str
+    data: str
+    config: str
+    freqtrade: str
+    code_files: Dict[str, str] = field(default_factory=dict)  # path relative to STRATEGIES_DIR -> sha256
+
+    @property
+    def digest(self) -> str:
+        return canonical_hash([CACHE_FORMAT, self.code, self.params, self.data, self.config, self.freqtrade])
+
+    def components(self) -> dict:
+        return {'code': self.code, 'params': self.params, 'data': self.data, 'config': self.config,
+                'freqtrade': self.freqtrade}
+
+
+def code_files(strategy_files: List[Path], root: Path = STRATEGIES_DIR) -> Dict[str, str]:
+    """
+    Content hash of the strategy files and of every module below `root` they
+    import, followed transitively through the imported modules.
+    """
+    hashes: Dict[str, str] = {}
+    pending = [Path(path).resolve() for path in strategy_files]
+    while pending:
+        path = pending.pop()
+        relative = path.relative_to(root).as_posix() if path.is_relative_to(root) else str(path)
+        if relative in hashes:
+            continue
+        source = path.read_bytes()
+        hashes[relative] = sha256_bytes(source)
+        for module in _imported_modules(source):
+            parts = module.split('.')
+            for candidate in (root.joinpath(*parts).with_suffix('.py'),
+                              root.joinpath(*parts, '__init__.py')):
+                if candidate.is_file():
+                    pending.append(candidate)
+                    break
+            if len(parts) > 1 and root.joinpath(parts[0], '__init__.py').is_file():
+                pending.append(root.joinpath(parts[0], '__init__.py'))
+    return dict(sorted(hashes.items()))
+
+
+def _imported_modules(source: bytes) -> List[str]:
+    modules = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+            # `from strategy_utils import screener` imports a module too
+            modules.extend(f'{node.module}.{alias.name}' for alias in node.names)
+    return modules
+
+
+def strategy_files(strategy) -> List[Path]:
+    """Source files of a loaded strategy, with the members of an ensemble"""
+    files = [Path(strategy.__file__)]
+    for member in getattr(strategy, 'members', []):
+        member_file = getattr(member.strategy, '__file__', None)
+        if member_file:
+            files.append(Path(member_file))
+    return files
+
+
+def strategy_params(strategy) -> dict:
+    """Every strategy setting a backtest result depends on, resolved"""
+    params = {name: param.value for name, param in strategy.enumerate_parameters()}
+    for member in getattr(strategy, 'members', []):
+        params.update({f'{member.name}.{name}': param.value
+                       for name, param in member.strategy.enumerate_parameters()})
+    return {
+        'strategy': strategy.get_strategy_name(),
+        'timeframe': strategy.timeframe,
+        'parameters': params,
+        'minimal_roi': {str(key): value for key, value in strategy.minimal_roi.items()},
+        'stoploss': strategy.stoploss,
+        'trailing': [strategy.trailing_stop, strategy.trailing_stop_positive,
+                     strategy.trailing_stop_positive_offset, strategy.trailing_only_offset_is_reached],
+        'use_custom_stoploss': strategy.use_custom_stoploss,
+        'position_adjustment_enable': strategy.position_adjustment_enable,
+        'max_entry_position_adjustment': strategy.max_entry_position_adjustment,
+        'use_exit_signal': strategy.use_exit_signal,
+        'exit_profit_only': strategy.exit_profit_only,
+        'exit_profit_offset': strategy.exit_profit_offset,
+        'ignore_roi_if_entry_signal': strategy.ignore_roi_if_entry_signal,
+        'startup_candle_count': strategy.startup_candle_count,
+        'order_types': _order_types(strategy.order_types),
+    }
+
+
+def config_subset(config: dict) -> dict:
+    subset = {key: value for key, value in config.items() if key not in IGNORED_CONFIG_KEYS}
+    exchange = config.get('exchange', {})
+    subset['exchange'] = {key: exchange.get(key) for key in EXCHANGE_KEYS}
+    if 'order_types' in subset:
+        subset['order_types'] = _order_types(subset['order_types'])
+    return subset
+
+
+def _order_types(order_types: dict) -> dict:
+    # freqtrade adds emergency_exit to the (shared) class attribute once the first bot or
+    # backtest starts; backtests never place it
+    return {key: value for key, value in order_types.items() if key != 'emergency_exit'}
+
+
+def data_hash(config: dict, strategy) -> str:
+    """
+    Hash of the candles the backtest of `strategy` loads: every whitelist pair
+    on the strategy timeframe (and timeframe_detail) plus the informative pairs,
+    limited to the timerange with startup candles.
+    """
+    from pandas.util import hash_pandas_object
+
+    from freqtrade.configuration import TimeRange
+    from freqtrade.data.history import load_data
+
+    timerange = TimeRange.parse_timerange(config.get('timerange'))
+    candle_type = config.get('candle_type_def', 'spot')
+    whitelist = list(config['exchange']['pair_whitelist'])
+    requests = {(strategy.timeframe, candle_type): whitelist}
+    if config.get('timeframe_detail'):
+        requests[(config['timeframe_detail'], candle_type)] = whitelist
+    try:
+        for pair, timeframe, *rest in strategy.gather_informative_pairs():
+            requests.setdefault((timeframe, rest[0] if rest else candle_type), []).append(pair)
+    except Exception as e:
+        logger.debug(f"Informative pairs unavailable for the data hash: {e}")
+
+    digest = hashlib.sha256()
+    for (timeframe, pair_candle_type), pairs in sorted(requests.items(), key=str):
+        data = load_data(
+            datadir=config['datadir'],
+            pairs=sorted(set(pairs)),
+            timeframe=timeframe,
+            timerange=timerange,
+            startup_candles=strategy.startup_candle_count,
+            data_format=config.get('dataformat_ohlcv', 'feather'),
+            candle_type=pair_candle_type,
+        )
+        for pair in sorted(data):
+            candles = data[pair][['date', 'open', 'high', 'low', 'close', 'volume']]
+            digest.update(f'{pair}|{timeframe}|{pair_candle_type}|{len(candles)}'.encode())
+            digest.update(hash_pandas_object(candles, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(config: dict, strategy) -> CacheKey:
+    import freqtrade
+
+    files = code_files(strategy_files(strategy))
+    return CacheKey(
+        code=canonical_hash(files),
+        params=canonical_hash(strategy_params(strategy)),
+        data=data_hash(config, strategy),
+        config=canonical_hash(config_subset(config)),
+        freqtrade=freqtrade.__version__,
+        code_files=files,
+    )
+
+
+# === STORE ===
+
+class BacktestCache:
+    """Directory of cached backtest results"""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or os.environ.get('BACKTEST_CACHE_DIR') or DEFAULT_CACHE_DIR)
+
+    def entry_path(self, digest: str) -> Path:
+        return self.directory / 'entries' / digest[:2] / f'{digest}.json'
+
+    @property
+    def catalogue_path(self) -> Path:
+        return self.directory / 'catalogue.json'
+
+    def get(self, digest: str) -> Optional[dict]:
+        path = self.entry_path(digest)
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def put(self, entry: dict) -> None:
+        _write_json(self.entry_path(entry['key']), entry)
+        catalogue = self.catalogue()
+        catalogue[entry['strategy']] = catalogue_record(entry)
+        _write_json(self.catalogue_path, catalogue)
+
+    def catalogue(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.catalogue_path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding unreadable {self.catalogue_path}: {e}")
+            return {}
+
+
+def catalogue_record(entry: dict) -> dict:
+    return {
+        'key': entry['key'],
+        'created_at': entry['created_at'],
+        'timerange': entry['timerange'],
+        'pairs': entry['pairs'],
+        'summary': entry['summary'],
+        'code_files': entry['code_files'],
+        'freqtrade_version': entry['freqtrade_version'],
+    }
+
+
+def _write_json(path: Path, value) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.tmp{os.getpid()}')
+    tmp.write_text(json.dumps(value, default=str))
+    os.replace(tmp, path)
+
+
+# === RUNNER ===
+
+def summarize(stats: dict) -> Tuple[dict, list, list]:
+    """(summary metrics, equity curve, trade list) of one strategy's backtest stats"""
+    summary = {key: stats.get(key) for key in SUMMARY_KEYS if key in stats}
+    trades = [{key: trade.get(key) for key in TRADE_KEYS} for trade in stats.get('trades', [])]
+    if 'wins' not in summary:
+        summary['wins'] = sum(1 for trade in trades if (trade['profit_abs'] or 0) > 0)
+    summary['winrate'] = summary['wins'] / len(trades) if trades else 0.0
+    return summary, equity_curve(trades, stats.get('starting_balance', 0.0),
+                                 stats.get('backtest_start_ts')), trades
+
+
+def equity_curve(trades: list, starting_balance: float, start_ts: Optional[int] = None,
+                 points: int = EQUITY_POINTS) -> List[list]:
+    """[[close timestamp ms, wallet balance]] after each closed trade, thinned to `points`"""
+    closed = sorted((trade['close_timestamp'], trade['profit_abs'] or 0.0) for trade in trades
+                    if trade['close_timestamp'] is not None)
+    curve = [[start_ts, starting_balance]] if start_ts is not None else []
+    if closed:
+        timestamps = np.array([ts for ts, _ in closed], dtype=np.int64)
+        balances = starting_balance + np.cumsum([profit for _, profit in closed])
+        keep = np.unique(np.linspace(0, len(closed) - 1, min(points, len(closed))).round().astype(int))
+        curve += [[int(timestamps[i]), round(float(balances[i]), 8)] for i in keep]
+    return curve
+
+
+def run_backtest(config: dict) -> dict:
+    """Full freqtrade backtest of config['strategy'], returning its stats"""
+    from freqtrade.optimize.backtesting import Backtesting
+
+    config = {**config, 'export': 'none', 'backtest_cache': 'none'}
+    backtesting = Backtesting(config)
+    backtesting.start()
+    return backtesting.results['strategy'][config['strategy']]
+
+
+def cached_backtest(config: dict, cache: Optional[BacktestCache] = None,
+                    refresh: bool = False) -> Tuple[dict, bool]:
+    """
+    Backtest result for config['strategy'], from the cache when the same code,
+    parameters, candles and config were backtested before.
+    Returns (entry, cache hit).
+    """
+    from freqtrade.data.dataprovider import DataProvider
+    from freqtrade.resolvers import StrategyResolver
+
+    cache = cache or BacktestCache()
+    strategy = StrategyResolver.load_strategy(config)
+    strategy.dp = DataProvider(config, None)
+    key = cache_key(config, strategy)
+
+    entry = None if refresh else cache.get(key.digest)
+    if entry is not None:
+        logger.info(f"Backtest cache hit for {config['strategy']}: {key.digest[:12]}")
+        if cache.catalogue().get(entry['strategy'], {}).get('key') != entry['key']:
+            cache.put(entry)
+        return entry, True
+
+    logger.info(f"Backtest cache miss for {config['strategy']}: {key.digest[:12]}, running backtest")
+    stats = run_backtest(config)
+    summary, equity, trades = summarize(stats)
+    entry = {
+        'format': CACHE_FORMAT,
+        'key': key.digest,
+        'strategy': config['strategy'],
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'timerange': config.get('timerange'),
+        'pairs': list(config['exchange']['pair_whitelist']),
+        'components': key.components(),
+        'code_files': key.code_files,
+        'freqtrade_version': key.freqtrade,
+        'params': strategy_params(strategy),
+        'summary': summary,
+        'equity': equity,
+        'trades': trades,
+    }
+    cache.put(entry)
+    return entry, False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from strategy_utils.market_data import load_config
+
+    parser = argparse.ArgumentParser(description='Backtest through the content-addressed result cache')
+    parser.add_argument('-c', '--config', action='append')
+    parser.add_argument('--strategy')
+    parser.add_argument('--timerange')
+    parser.add_argument('--cache-dir')
+    parser.add_argument('--refresh', action='store_true', help='Backtest again even on a cache hit')
+    parser.add_argument('--list', action='store_true', help='Show the cached summary of every strategy')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    cache = BacktestCache(args.cache_dir)
+    if args.list:
+        for name, record in sorted(cache.catalogue().items()):
+            summary = record['summary']
+            logger.info(f"{name:<32} {record['timerange'] or 'all':<20} "
+                        f"trades={summary.get('total_trades')} "
+                        f"profit={summary.get('profit_total', 0):.2%} "
+                        f"max_dd={summary.get('max_drawdown_account', 0):.2%} "
+                        f"key={record['key'][:12]}")
+        return 0
+    if not args.config or not args.strategy:
+        parser.error('--config and --strategy are required unless --list is given')
+
+    config = load_config(args.config, timerange=args.timerange, strategy=args.strategy)
+    entry, hit = cached_backtest(config, cache, refresh=args.refresh)
+    summary = entry['summary']
+    logger.info(f"{entry['strategy']} ({'cached' if hit else 'new'}, key {entry['key'][:12]}): "
+                f"{summary.get('total_trades')} trades, profit {summary.get('profit_total', 0):.2%}, "
+                f"max drawdown {summary.get('max_drawdown_account', 0):.2%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
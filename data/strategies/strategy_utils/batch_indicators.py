@@ -0,0 +1,333 @@
+# --- Multi-Pair Batched Indicators ---
+"""
+Computes EMA/SMA/RSI/ATR/ADX/Bollinger Bands for every whitelist pair at once.
+
+Strategies normally call TA-Lib once per indicator per pair from
+populate_indicators(), so a bot with 100 pairs makes hundreds of small calls
+per candle, each paying Python and pandas overhead. BatchIndicators stacks the
+close/high/low/volume columns of all pairs into (candles, pairs) matrices,
+computes each declared indicator for every pair in one vectorized call and
+hands each pair its columns when populate_indicators() runs for it.
+
+Pairs are stacked by position, not by date, so every pair gets exactly what
+TA-Lib computes over its own rows. Pairs with a different number of candles
+form their own batch. Values match TA-Lib / qtpylib up to float rounding.
+
+Usage inside a strategy:
+
+    indicators = (BatchIndicators()
+                  .ema('ema_fast', 50)
+                  .rsi('rsi', 14)
+                  .bbands(('bb_upper', 'bb_middle', 'bb_lower'), 20, 2))
+
+    def populate_indicators(self, dataframe, metadata):
+        dataframe = self.indicators.apply(dataframe, metadata['pair'], self.dp, self.timeframe)
+
+Batches are only built in live/dry-run, from dp.ohlcv() of the current
+whitelist. Backtests, hyperopt and pairs the batch does not cover are computed
+on their own with the same code.
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame
+from scipy.signal import lfilter
+
+logger = logging.getLogger(__name__)
+
+
+# === VECTORIZED INDICATORS ON (T, P) ARRAYS ===
+
+def _wilder(values: np.ndarray, period: int, alpha: float, first: int) -> np.ndarray:
+    """
+    Recursive smoothing y[t] = alpha * x[t] + (1 - alpha) * y[t-1] down axis 0,
+    seeded with the mean of values[first:first + period] at row first + period - 1.
+    """
+    out = np.full(values.shape, np.nan)
+    seed_row = first + period - 1
+    if values.shape[0] <= seed_row:
+        return out
+    seed = values[first:seed_row + 1].mean(axis=0)
+    out[seed_row] = seed
+    rest = values[seed_row + 1:]
+    if len(rest):
+        zi = ((1 - alpha) * seed)[np.newaxis, :]
+        out[seed_row + 1:], _ = lfilter([alpha], [1.0, alpha - 1.0], rest, axis=0, zi=zi)
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """TA-Lib EMA: seeded with the SMA of the first period values"""
+    return _wilder(values, period, 2.0 / (period + 1), 0)
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """TA-Lib SMA"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] < period:
+        return out
+    csum = np.cumsum(values, axis=0)
+    out[period - 1] = csum[period - 1]
+    out[period:] = csum[period:] - csum[:-period]
+    out[period - 1:] /= period
+    return out
+
+
+def rsi(values: np.ndarray, period: int = 14) -> np.ndarray:
+    """TA-Lib RSI: Wilder-smoothed gains/losses seeded with their simple average"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] <= period:
+        return out
+    diff = np.diff(values, axis=0)
+    gain = _wilder(np.where(diff > 0, diff, 0.0), period, 1.0 / period, 0)
+    loss = _wilder(np.where(diff < 0, -diff, 0.0), period, 1.0 / period, 0)
+    total = gain + loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[1:] = np.where(total != 0, 100.0 * gain / total, 0.0)
+    out[:period] = np.nan
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """TA-Lib TRANGE (first row NaN)"""
+    prev_close = close[:-1]
+    tr = np.full(high.shape, np.nan)
+    tr[1:] = np.maximum.reduce([high[1:] - low[1:], np.abs(high[1:] - prev_close),
+                                np.abs(low[1:] - prev_close)])
+    return tr
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """TA-Lib ATR: Wilder-smoothed true range seeded with its simple average"""
+    tr = true_range(high, low, close)
+    if period == 1:
+        return tr
+    out = np.full(high.shape, np.nan)
+    out[1:] = _wilder(tr[1:], period, 1.0 / period, 0)
+    return out
+
+
+def directional_sums(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    TA-Lib's ADX internals per candle: Wilder sums of +DM, -DM and true range
+    (seeded with the sum of their first period - 1 values) and the ADX itself
+    (DX averaged over its first period values, then Wilder-smoothed). DX counts
+    as 0 where TA-Lib skips it (no range or no movement yet).
+    """
+    rows = high.shape[0]
+    plus = np.full(high.shape, np.nan)
+    minus, ranges, out = plus.copy(), plus.copy(), plus.copy()
+    if period < 2 or rows < period:
+        return plus, minus, ranges, out
+    up = np.diff(high, axis=0)
+    down = -np.diff(low, axis=0)
+    plus_dm = np.where((up > 0) & (up > down), up, 0.0)
+    minus_dm = np.where((down > 0) & (up < down), down, 0.0)
+    tr = true_range(high, low, close)[1:]
+
+    decay = 1.0 - 1.0 / period
+
+    def wilder_sum(values):
+        # row k of values belongs to candle k + 1; sums start at candle period - 1
+        seed = values[:period - 1].sum(axis=0)
+        summed, _ = lfilter([1.0], [1.0, -decay], values[period - 1:], axis=0,
+                            zi=(decay * seed)[np.newaxis, :])
+        return np.concatenate([seed[np.newaxis, :], summed])
+
+    plus[period - 1:], minus[period - 1:], ranges[period - 1:] = (
+        wilder_sum(plus_dm), wilder_sum(minus_dm), wilder_sum(tr))
+    if rows >= 2 * period:
+        dx = directional_index(plus[period:], minus[period:], ranges[period:])
+        # dx row k belongs to candle period + k; ADX starts at candle 2 * period - 1
+        out[2 * period - 1:] = _wilder(dx, period, 1.0 / period, 0)[period - 1:]
+    return plus, minus, ranges, out
+
+
+def directional_index(plus: np.ndarray, minus: np.ndarray, ranges: np.ndarray) -> np.ndarray:
+    """DX from the Wilder sums of +DM, -DM and true range, 0 where TA-Lib skips it"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = 100.0 * plus / ranges
+        minus_di = 100.0 * minus / ranges
+        di_sum = plus_di + minus_di
+        dx = 100.0 * np.abs(plus_di - minus_di) / di_sum
+    return np.where((np.abs(ranges) < 1e-14) | (np.abs(di_sum) < 1e-14), 0.0, dx)
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """TA-Lib ADX"""
+    return directional_sums(high, low, close, period)[3]
+
+
+def bbands(values: np.ndarray, period: int = 20, stds: float = 2.0,
+           min_periods: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands (upper, middle, lower) from the rolling mean and sample std.
+    min_periods=1 reproduces qtpylib.bollinger_bands().
+    """
+    frame = DataFrame(values).rolling(window=period, min_periods=min_periods or period)
+    mid = frame.mean().to_numpy()
+    std = frame.std().to_numpy()
+    return mid + std * stds, mid, mid - std * stds
+
+
+# === BATCH ENGINE ===
+
+class BatchIndicators:
+    """Declared indicators, computed for all whitelist pairs at once in live/dry-run"""
+
+    def __init__(self):
+        self._specs: List[Tuple[str, Tuple[str, ...], dict]] = []
+        self._cache: Dict[str, Tuple[tuple, Dict[str, np.ndarray]]] = {}
+        self._batch_key: Optional[tuple] = None
+
+    # === DECLARATION ===
+
+    def ema(self, column: str, period: int, source: str = 'close') -> 'BatchIndicators':
+        self._specs.append(('ema', (column,), {'period': period, 'source': source}))
+        return self
+
+    def sma(self, column: str, period: int, source: str = 'close') -> 'BatchIndicators':
+        self._specs.append(('sma', (column,), {'period': period, 'source': source}))
+        return self
+
+    def rsi(self, column: str, period: int = 14, source: str = 'close') -> 'BatchIndicators':
+        self._specs.append(('rsi', (column,), {'period': period, 'source': source}))
+        return self
+
+    def atr(self, column: str, period: int = 14) -> 'BatchIndicators':
+        self._specs.append(('atr', (column,), {'period': period}))
+        return self
+
+    def adx(self, column: str, period: int = 14) -> 'BatchIndicators':
+        self._specs.append(('adx', (column,), {'period': period}))
+        return self
+
+    def bbands(self, columns: Sequence[str] = ('bb_upperband', 'bb_middleband', 'bb_lowerband'),
+               period: int = 20, stds: float = 2.0, source: str = 'close',
+               min_periods: Optional[int] = None) -> 'BatchIndicators':
+        self._specs.append(('bbands', tuple(columns),
+                            {'period': period, 'stds': stds, 'source': source, 'min_periods': min_periods}))
+        return self
+
+    @property
+    def columns(self) -> List[str]:
+        return [column for _, columns, _ in self._specs for column in columns]
+
+    # === APPLICATION ===
+
+    def apply(self, dataframe: DataFrame, pair: str, dp=None, timeframe: Optional[str] = None) -> DataFrame:
+        """Add every declared indicator column to this pair's dataframe"""
+        key = self._frame_key(dataframe)
+        cached = self._cache.get(pair)
+        if (cached is None or cached[0] != key) and self._can_batch(dp):
+            self._compute_batch(dp, timeframe)
+            cached = self._cache.get(pair)
+
+        if cached is not None and cached[0] == key:
+            values = cached[1]
+        else:
+            values = self._compute([dataframe])[0]
+
+        for column in self.columns:
+            dataframe[column] = values[column]
+        return dataframe
+
+    def _compute_batch(self, dp, timeframe: str) -> None:
+        """Compute all indicators for the current whitelist, grouped by candle count"""
+        try:
+            frames = {}
+            for pair in dp.current_whitelist():
+                frame = dp.ohlcv(pair, timeframe, copy=False)
+                if isinstance(frame, DataFrame) and not frame.empty:
+                    frames[pair] = frame
+        except Exception as e:
+            logger.warning(f"Batch indicators unavailable, computing per pair: {e}")
+            return
+
+        batch_key = tuple(sorted((pair, self._frame_key(frame)) for pair, frame in frames.items()))
+        if batch_key == self._batch_key:
+            return
+        self._batch_key = batch_key
+
+        groups: Dict[int, List[str]] = {}
+        for pair, frame in frames.items():
+            groups.setdefault(len(frame), []).append(pair)
+
+        self._cache = {}
+        for pairs in groups.values():
+            results = self._compute([frames[pair] for pair in pairs])
+            for pair, values in zip(pairs, results):
+                self._cache[pair] = (self._frame_key(frames[pair]), values)
+
+    def latest(self, frames: List[DataFrame]) -> Dict[str, np.ndarray]:
+        """Declared indicators on the last candle of each frame, one value per frame"""
+        series = self.series(frames)
+        return {column: np.array([values[column][-1] for values in series], dtype=np.float64)
+                for column in self.columns}
+
+    def series(self, frames: List[DataFrame]) -> List[Dict[str, np.ndarray]]:
+        """Declared indicators of frames of any length, stacked by length; one dict per frame"""
+        groups: Dict[int, List[int]] = {}
+        for idx, frame in enumerate(frames):
+            groups.setdefault(len(frame), []).append(idx)
+        series: List[Dict[str, np.ndarray]] = [{} for _ in frames]
+        for indices in groups.values():
+            for idx, values in zip(indices, self._compute([frames[idx] for idx in indices])):
+                series[idx] = values
+        return series
+
+    def pair_series(self, frames: Dict[str, DataFrame]) -> Dict[str, Dict[str, np.ndarray]]:
+        """series() by pair; apply() reuses the results while a pair's candles are unchanged"""
+        pairs = list(frames)
+        series = dict(zip(pairs, self.series([frames[pair] for pair in pairs])))
+        self._cache = {pair: (self._frame_key(frames[pair]), values) for pair, values in series.items()}
+        self._batch_key = None
+        return series
+
+    def _compute(self, frames: List[DataFrame]) -> List[Dict[str, np.ndarray]]:
+        """Compute the declared indicators for equally long frames; one dict per frame"""
+        results = self._compute_stacked(frames)
+        return [{name: values[:, idx] for name, values in results.items()} for idx in range(len(frames))]
+
+    def _compute_stacked(self, frames: List[DataFrame]) -> Dict[str, np.ndarray]:
+        """Compute the declared indicators for equally long frames as (candles, frames) arrays"""
+        stacked: Dict[str, np.ndarray] = {}
+
+        def column(name: str) -> np.ndarray:
+            if name not in stacked:
+                stacked[name] = np.column_stack([frame[name].to_numpy(dtype=np.float64) for frame in frames])
+            return stacked[name]
+
+        results: Dict[str, np.ndarray] = {}
+        for kind, columns, params in self._specs:
+            if kind == 'ema':
+                results[columns[0]] = ema(column(params['source']), params['period'])
+            elif kind == 'sma':
+                results[columns[0]] = sma(column(params['source']), params['period'])
+            elif kind == 'rsi':
+                results[columns[0]] = rsi(column(params['source']), params['period'])
+            elif kind == 'atr':
+                results[columns[0]] = atr(column('high'), column('low'), column('close'), params['period'])
+            elif kind == 'adx':
+                results[columns[0]] = adx(column('high'), column('low'), column('close'), params['period'])
+            elif kind == 'bbands':
+                bands = bbands(column(params['source']), params['period'], params['stds'], params['min_periods'])
+                for name, values in zip(columns, bands):
+                    results[name] = values
+        return results
+
+    @staticmethod
+    def _frame_key(frame: DataFrame) -> tuple:
+        last = frame.iloc[-1]
+        return len(frame), last['date'], float(last['close'])
+
+    @staticmethod
+    def _can_batch(dp) -> bool:
+        if dp is None:
+            return False
+        try:
+            return dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            return False
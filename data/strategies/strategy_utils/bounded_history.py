@@ -0,0 +1,120 @@
+# --- Bounded Analyzed History ---
+"""
+Keeps each pair's analyzed dataframe to the candles the strategy can use.
+
+Freqtrade analyzes every candle it holds for a pair: the exchange's candle
+limit plus the startup candles, 1000-1500 rows on most exchanges. Our longest
+lookback is 200 candles (sma_200, the 200 EMA), so on 1m bots most of every
+analyzed dataframe is dead weight in the dataprovider cache, and
+populate_entry_trend/populate_exit_trend mask all of it each candle.
+
+Strategies that mix in BoundedHistoryMixin declare their longest lookback
+
+    history_lookback = 200     # sma_200
+
+and keep lookback + margin rows (margin: half the lookback, at least
+history_min_margin). On each new candle the mixin:
+1. runs populate_indicators on the full candle history, so recursive
+   indicators (EMA, RSI, ATR) come out exactly as without a bound
+2. drops the rows before the bound from that dataframe in place
+3. hands the trimmed dataframe to freqtrade's usual analysis, which skips
+   populate_indicators for it and runs entries, exits, validation and the
+   dataprovider cache on the bounded rows only
+
+Indicator values on the kept rows are identical to unbounded analysis, and so
+are signals as long as populate_entry/exit_trend look back less than the
+margin. Strategies with persisted indicator snapshots keep at least the
+snapshot's rows, so restarts resume as before.
+
+history_rows() reports, per pair, the candle history and the rows kept; the
+memory report (strategy_utils/memory.py) includes it. Only live/dry-run bots
+are bounded. Configure with "bounded_history": {"enabled": true, "rows": N}
+in config.json, rows overriding the derived bound.
+"""
+import logging
+from typing import Dict, Optional
+
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+
+def bounded(strategy, pair: str, dataframe: DataFrame) -> DataFrame:
+    """dataframe trimmed to strategy's bound, unchanged for strategies without one"""
+    if not isinstance(strategy, BoundedHistoryMixin) or not strategy._history_enabled():
+        return dataframe
+    return strategy.bound_history(pair, dataframe)
+
+
+class BoundedHistoryMixin:
+    """
+    Mix in before IStrategy (and before IndicatorSnapshotMixin):
+
+        class DCAStrategy(BoundedHistoryMixin, IStrategy):
+            history_lookback = 200
+    """
+
+    history_lookback: Optional[int] = None   # longest indicator lookback in candles, None = startup_candle_count
+    history_margin: float = 0.5              # extra rows, as a fraction of the lookback
+    history_min_margin: int = 50
+
+    def history_bound(self) -> int:
+        """Rows kept per pair"""
+        rows = self.config.get('bounded_history', {}).get('rows')
+        if rows:
+            return int(rows)
+        lookback = self.history_lookback or self.startup_candle_count
+        bound = lookback + max(self.history_min_margin, int(lookback * self.history_margin))
+        if getattr(self, '_snapshot_writer', None) is not None:
+            bound = max(bound, self._snapshot_rows())
+        return bound
+
+    def history_rows(self) -> Dict[str, dict]:
+        """Per pair: candles freqtrade holds and rows the analyzed dataframe keeps"""
+        return dict(self.__dict__.get('_history_rows', {}))
+
+    def bound_history(self, pair: str, dataframe: DataFrame) -> DataFrame:
+        """Drop the rows before the bound, in place; returns dataframe"""
+        bound = self.history_bound()
+        rows = len(dataframe)
+        if rows > bound:
+            dataframe.drop(index=dataframe.index[:rows - bound], inplace=True)
+            dataframe.reset_index(drop=True, inplace=True)
+        self.__dict__.setdefault('_history_rows', {})[pair] = {'rows': rows, 'bounded_rows': len(dataframe)}
+        return dataframe
+
+    def _analyze_ticker_internal(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        pair = metadata['pair']
+        if not self._history_enabled() or not self._history_new_candle(pair, dataframe):
+            return super()._analyze_ticker_internal(dataframe, metadata)
+
+        from freqtrade.strategy.strategy_wrapper import strategy_safe_wrapper
+
+        # Indicators over everything freqtrade holds, then only the bound goes on
+        analyzed = strategy_safe_wrapper(self.advise_indicators, message="")(dataframe, metadata)
+        self._history_prepared = self.bound_history(pair, analyzed)
+        try:
+            return super()._analyze_ticker_internal(self._history_prepared, metadata)
+        finally:
+            self._history_prepared = None
+
+    def advise_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if dataframe is self.__dict__.get('_history_prepared'):
+            return dataframe
+        return super().advise_indicators(dataframe, metadata)
+
+    def _history_new_candle(self, pair: str, dataframe: DataFrame) -> bool:
+        """Whether IStrategy._analyze_ticker_internal() analyzes this call (it skips seen candles)"""
+        if dataframe.empty:
+            return False
+        last_seen = self._IStrategy__last_candle_seen_per_pair
+        return not self.process_only_new_candles or last_seen.get(pair) != dataframe.iloc[-1]['date']
+
+    def _history_enabled(self) -> bool:
+        if not self.config.get('bounded_history', {}).get('enabled', True):
+            return False
+        dp = getattr(self, 'dp', None)
+        try:
+            return dp is not None and dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            return False
@@ -0,0 +1,288 @@
+# --- Rolling Cross-Asset Correlation ---
+"""
+Rolling covariance / correlation of the whitelist pairs' candle returns, kept
+up to date with rank-1 updates instead of a full recompute.
+
+Position limits so far group assets with a fixed map (CORRELATION_GROUPS in
+the orchestrator's universal-features.js), which misses that correlations move
+with the market. RollingCovariance holds the last `window` log-return vectors
+in a ring buffer and, per pair combination, the running sums a pairwise-complete
+covariance needs (joint counts, sums, sums of squares and cross products). A
+new candle adds its return vector as an outer product and subtracts the one
+leaving the window - O(pairs²) per candle. Pairs without a candle (NaN) simply
+do not count for that row, like pandas' DataFrame.cov()/corr(). The sums are
+rebuilt from the buffer once per window to drop accumulated rounding error.
+
+CorrelationEngine feeds it from the strategy's analyzed dataframes and answers
+the queries risk callbacks need:
+
+    engine = CorrelationEngine.for_strategy(self)
+    engine.correlated_exposure(pair, open_stakes(), threshold=0.8)
+    engine.portfolio_volatility({'BTC/USDT': 0.4, 'ETH/USDT': 0.25})
+
+refresh() only does work once per new candle; the matrices are cached until
+the next one, so the queries cost O(pairs) to O(open positions²) and are cheap
+enough for confirm_trade_entry and custom_stake_amount. In backtesting the
+analyzed dataframes end at the candle being simulated, so there is no
+lookahead.
+
+Settings come from the "correlation" block in config.json:
+    window       candles in the rolling window (default 180)
+    min_periods  joint candles needed before a pair combination has a value (default 30)
+"""
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+from pandas import DataFrame, Series, Timedelta, Timestamp
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+class RollingCovariance:
+    """Pairwise-complete rolling covariance over a fixed set of columns"""
+
+    def __init__(self, columns: List[str], window: int, min_periods: int = 2):
+        self.columns = list(columns)
+        self.index = {column: i for i, column in enumerate(self.columns)}
+        self.window = window
+        self.min_periods = max(min_periods, 2)
+        n = len(self.columns)
+        self._buffer = np.full((window, n), np.nan)
+        self._pos = 0
+        self._rows = 0
+        self._pushes = 0
+        self._count = np.zeros((n, n))   # joint valid rows
+        self._sum = np.zeros((n, n))     # [i, j]: sum of x_i over rows where x_j is valid too
+        self._sumsq = np.zeros((n, n))   # [i, j]: sum of x_i² over the same rows
+        self._cross = np.zeros((n, n))   # [i, j]: sum of x_i * x_j
+        self._cov: Optional[np.ndarray] = None
+        self._corr: Optional[np.ndarray] = None
+
+    def push(self, values: np.ndarray) -> None:
+        """Add one observation (NaN = missing) and drop the oldest once the window is full"""
+        values = np.asarray(values, dtype=np.float64)
+        if self._rows == self.window:
+            self._apply(self._buffer[self._pos], -1.0)
+        else:
+            self._rows += 1
+        self._buffer[self._pos] = values
+        self._apply(values, 1.0)
+        self._pos = (self._pos + 1) % self.window
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            self._rebuild()
+        self._cov = self._corr = None
+
+    def _apply(self, values: np.ndarray, sign: float) -> None:
+        valid = np.isfinite(values)
+        x = np.where(valid, values, 0.0)
+        v = valid.astype(np.float64)
+        xs = sign * x
+        self._count += sign * np.multiply.outer(v, v)
+        self._sum += np.multiply.outer(xs, v)
+        self._sumsq += np.multiply.outer(xs * x, v)
+        self._cross += np.multiply.outer(xs, x)
+
+    def _rebuild(self) -> None:
+        """Recompute the sums from the buffered rows"""
+        rows = self._buffer[:self._rows]
+        valid = np.isfinite(rows)
+        x = np.where(valid, rows, 0.0)
+        v = valid.astype(np.float64)
+        self._count = v.T @ v
+        self._sum = x.T @ v
+        self._sumsq = (x * x).T @ v
+        self._cross = x.T @ x
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance matrix, NaN where fewer than min_periods joint rows"""
+        if self._cov is None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                count = self._count
+                cov = (self._cross - self._sum * self._sum.T / count) / (count - 1)
+                cov[count < self.min_periods] = np.nan
+            self._cov = cov
+        return self._cov
+
+    def correlation(self) -> np.ndarray:
+        """Correlation matrix from each pair combination's joint rows"""
+        if self._corr is None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                var = (self._sumsq - self._sum * self._sum / self._count) / (self._count - 1)
+                corr = self.covariance() / np.sqrt(var * var.T)
+            self._corr = np.clip(corr, -1.0, 1.0)
+        return self._corr
+
+
+class CorrelationEngine:
+    """Rolling return covariance of a strategy's whitelist, refreshed once per candle"""
+
+    def __init__(self, dp, timeframe: str, window: int = 180, min_periods: int = 30):
+        from freqtrade.exchange import timeframe_to_seconds
+
+        self.dp = dp
+        self.timeframe = timeframe
+        self.window = window
+        self.min_periods = min_periods
+        self.periods_per_year = SECONDS_PER_YEAR / timeframe_to_seconds(timeframe)
+        self.candle = Timedelta(seconds=timeframe_to_seconds(timeframe))
+        self.cov: Optional[RollingCovariance] = None
+        self.last_date: Optional[Timestamp] = None
+
+    @classmethod
+    def for_strategy(cls, strategy) -> 'CorrelationEngine':
+        """Engine for a strategy's timeframe, created once and cached on the strategy"""
+        engine = strategy.__dict__.get('_correlation_engine')
+        if engine is None:
+            settings = strategy.config.get('correlation', {})
+            engine = strategy._correlation_engine = cls(
+                strategy.dp, strategy.timeframe,
+                window=settings.get('window', 180), min_periods=settings.get('min_periods', 30))
+        return engine
+
+    # === UPDATES ===
+
+    def refresh(self) -> None:
+        """Catch up with the newest analyzed candles; no-op until a new candle arrives"""
+        frames = whitelist_frames(self.dp, self.timeframe)
+        if not frames:
+            return
+        newest = max(dataframe['date'].iloc[-1] for dataframe in frames.values())
+        same_pairs = self.cov is not None and self.cov.columns == sorted(frames)
+        if same_pairs and self.last_date is not None and newest <= self.last_date:
+            return
+
+        if same_pairs and self.last_date is not None:
+            missed = int((newest - self.last_date) / self.candle)
+            if missed <= self.window:
+                returns = aligned_log_returns(frames, missed + 1)
+                for values in returns[returns.index > self.last_date].to_numpy():
+                    self.cov.push(values)
+                self.last_date = newest
+                return
+        self._rebuild(frames, newest)
+
+    def _rebuild(self, frames: Dict[str, DataFrame], newest: Timestamp) -> None:
+        """Start over from the last `window` returns (first run, whitelist change, long gap)"""
+        returns = aligned_log_returns(frames, self.window)
+        self.cov = RollingCovariance(sorted(frames), self.window, self.min_periods)
+        for values in returns.tail(self.window).to_numpy():
+            self.cov.push(values)
+        self.last_date = newest
+        logger.info(f"Correlation engine tracking {len(frames)} pairs over {len(returns)} candles")
+
+    # === QUERIES ===
+
+    def correlation(self, pair_a: str, pair_b: str) -> Optional[float]:
+        """Rolling return correlation of two pairs, None while unknown"""
+        if self.cov is None or pair_a not in self.cov.index or pair_b not in self.cov.index:
+            return None
+        value = self.cov.correlation()[self.cov.index[pair_a], self.cov.index[pair_b]]
+        return None if np.isnan(value) else float(value)
+
+    def volatility(self, pair: str) -> Optional[float]:
+        """Annualized return volatility of one pair, None while unknown"""
+        if self.cov is None or pair not in self.cov.index:
+            return None
+        i = self.cov.index[pair]
+        variance = self.cov.covariance()[i, i]
+        return None if np.isnan(variance) else float(np.sqrt(variance * self.periods_per_year))
+
+    def correlated_exposure(self, pair: str, positions: Dict[str, float],
+                            threshold: float = 0.8) -> float:
+        """
+        Sum of the position values whose returns correlate with pair's at
+        threshold or above. Positions in pair itself always count; pairs the
+        engine has no history for only count when they are pair.
+        """
+        exposure = 0.0
+        for other, value in positions.items():
+            if other == pair:
+                exposure += value
+                continue
+            corr = self.correlation(pair, other)
+            if corr is not None and corr >= threshold:
+                exposure += value
+        return exposure
+
+    def portfolio_volatility(self, weights: Dict[str, float]) -> Optional[float]:
+        """
+        Annualized volatility of a portfolio given as {pair: weight} (weights as
+        fractions of equity, cash is the remainder). Pairs without enough history
+        are left out; None if no pair is known.
+        """
+        if self.cov is None:
+            return None
+        known = [(self.cov.index[pair], weight) for pair, weight in weights.items()
+                 if pair in self.cov.index]
+        if not known:
+            return None
+        idx = np.array([i for i, _ in known])
+        w = np.array([weight for _, weight in known], dtype=np.float64)
+        cov = self.cov.covariance()[np.ix_(idx, idx)]
+        keep = ~np.isnan(np.diag(cov))
+        if not keep.any():
+            return None
+        cov, w = np.nan_to_num(cov[np.ix_(keep, keep)]), w[keep]
+        return float(np.sqrt(max(w @ cov @ w, 0.0) * self.periods_per_year))
+
+    def max_addition(self, pair: str, weights: Dict[str, float], limit: float) -> Optional[float]:
+        """
+        Largest weight that can be added to pair while the portfolio's annualized
+        volatility stays at or below limit; 0 if it is already above, None if
+        pair's volatility is unknown.
+        """
+        if self.cov is None or pair not in self.cov.index:
+            return None
+        i = self.cov.index[pair]
+        cov = np.nan_to_num(self.cov.covariance())
+        c = cov[i, i]
+        if c <= 0:
+            return None
+        w = np.zeros(len(self.cov.columns))
+        for other, weight in weights.items():
+            if other in self.cov.index:
+                w[self.cov.index[other]] += weight
+        # variance(w + s e_i) = a + 2 b s + c s², solved for variance = limit²
+        a, b = w @ cov @ w, (cov @ w)[i]
+        target = limit ** 2 / self.periods_per_year
+        if a > target:
+            return 0.0
+        return float((-b + np.sqrt(b * b + c * (target - a))) / c)
+
+
+def whitelist_frames(dp, timeframe: str) -> Dict[str, DataFrame]:
+    """Analyzed dataframe of every whitelist pair that has one (no copies)"""
+    try:
+        pairs = list(dp.current_whitelist())
+    except Exception:
+        return {}
+    frames = {}
+    for pair in pairs:
+        dataframe, _ = dp.get_analyzed_dataframe(pair, timeframe)
+        if not dataframe.empty:
+            frames[pair] = dataframe
+    return frames
+
+
+def aligned_log_returns(frames: Dict[str, DataFrame], candles: int) -> DataFrame:
+    """Log returns of the last `candles` candles per pair, aligned by date, pairs sorted"""
+    closes = {}
+    for pair, dataframe in frames.items():
+        tail = dataframe.iloc[-(candles + 1):]
+        closes[pair] = Series(tail['close'].to_numpy(dtype=np.float64), index=tail['date'])
+    prices = DataFrame(closes).sort_index()[sorted(frames)]
+    return np.log(prices).diff().iloc[1:]
+
+
+def open_stakes() -> Dict[str, float]:
+    """Stake per pair over the bot's open trades"""
+    from freqtrade.persistence import Trade
+
+    stakes: Dict[str, float] = {}
+    for trade in Trade.get_trades_proxy(is_open=True):
+        stakes[trade.pair] = stakes.get(trade.pair, 0.0) + trade.stake_amount
+    return stakes
@@ -0,0 +1,577 @@
+# --- Vectorized DCA Ladder Simulator ---
+"""
+Replays DCAStrategy entry/exit signals for many DCA ladders at once.
+
+A "ladder" is one combination of the DCA parameters that are optimize=False in
+DCAStrategy because full backtests with adjust_trade_position are too slow:
+dca_level_1..4, dca_size_multiplier_1..4, base_position_size,
+max_total_allocation, min_time_between_entries and max_position_size.
+
+The signals (enter_long/exit_long/enter_tag/atr) do not depend on these
+parameters, so the strategy is analyzed once and every ladder is simulated as
+one lane of NumPy arrays shaped (ladders, pairs). Chunks of ladders are spread
+over worker processes and ranked afterwards.
+
+The simulation follows freqtrade's backtesting loop candle by candle:
+entry orders, limit fills, adjust_trade_position at the candle open, then
+exit signal -> stoploss -> ROI -> trailing stop. It mirrors DCAStrategy as it
+is written, including that:
+- 'dca_initial' entries are sized by calculate_dca_size() with the default 1.5
+  multiplier, priced by custom_entry_price() and skip the checks in
+  confirm_trade_entry()
+- adjustment orders carry no dca_N tag, so a level can fire again once
+  min_time_between_entries has passed, until max_total_allocation is reached
+- custom_stoploss() is not active (use_custom_stoploss is not set), so the
+  static stoploss and freqtrade's trailing stop apply
+
+Usage (from data/strategies):
+    python -m strategy_utils.dca_simulator -c config.json --timerange 20240101-20240601 \
+        --ladders 5000 --workers 8
+    python -m strategy_utils.dca_simulator -c config.json --timerange 20240101-20240601 \
+        --parity user_data/backtest_results/backtest-result.json
+
+strategy_utils/tests/test_dca_simulator.py checks the current ladder against a
+real backtest on fixed synthetic candles.
+"""
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from strategy_utils.market_data import (MarketArrays, roi_exit_rate, roi_lookup, stack_frames,
+                                        stoploss_exit_rate)
+
+logger = logging.getLogger(__name__)
+
+# Ladder parameters that are swept, in DCAStrategy attribute names
+LADDER_PARAMS = [
+    'dca_level_1', 'dca_level_2', 'dca_level_3', 'dca_level_4',
+    'dca_size_multiplier_1', 'dca_size_multiplier_2', 'dca_size_multiplier_3', 'dca_size_multiplier_4',
+    'base_position_size', 'max_position_size', 'max_total_allocation', 'min_time_between_entries',
+]
+
+MAX_ORDER_SHARE = 0.15          # calculate_dca_size / get_dca_level_and_size cap per order
+DEFAULT_ENTRY_MULTIPLIER = 1.5  # calculate_dca_size fallback for tags without dca_N
+
+
+@dataclass
+class SimulationSettings:
+    """Strategy and config values shared by every ladder of a sweep"""
+    starting_balance: float = 1000.0
+    tradable_balance_ratio: float = 0.99
+    max_open_trades: int = 3
+    fee: float = 0.001
+    stoploss: float = -0.12
+    trailing_stop: bool = True
+    trailing_stop_positive: Optional[float] = 0.03
+    trailing_stop_positive_offset: float = 0.05
+    trailing_only_offset_is_reached: bool = True
+    minimal_roi: Dict = field(default_factory=lambda: {0: 0.30})
+    use_exit_signal: bool = True
+    ignore_roi_if_entry_signal: bool = False
+    dca_enabled: bool = True
+    entry_timeout_seconds: Optional[int] = 600  # None: entry orders never time out
+    timeframe_seconds: int = 3600
+
+    @classmethod
+    def from_strategy(cls, strategy, config: dict) -> 'SimulationSettings':
+        from freqtrade.exchange import timeframe_to_seconds
+
+        wallet = config.get('dry_run_wallet', 1000.0)
+        if isinstance(wallet, dict):
+            wallet = wallet.get(config.get('stake_currency'), 1000.0)
+        # Like strategy.ft_check_timed_out(): no 'entry' timeout configured means orders stay open
+        timeout = config.get('unfilledtimeout', {})
+        timeout_seconds = None
+        if timeout.get('entry') is not None:
+            timeout_seconds = timeout['entry'] * (60 if timeout.get('unit', 'minutes') == 'minutes' else 1)
+        max_open = config.get('max_open_trades', strategy.max_open_trades)
+        return cls(
+            starting_balance=float(wallet),
+            tradable_balance_ratio=float(config.get('tradable_balance_ratio', 0.99)),
+            max_open_trades=int(max_open) if max_open not in (None, -1) else 10 ** 6,
+            fee=float(config.get('fee') or 0.001),
+            stoploss=strategy.stoploss,
+            trailing_stop=strategy.trailing_stop,
+            trailing_stop_positive=strategy.trailing_stop_positive,
+            trailing_stop_positive_offset=strategy.trailing_stop_positive_offset or 0.0,
+            trailing_only_offset_is_reached=strategy.trailing_only_offset_is_reached,
+            minimal_roi=dict(strategy.minimal_roi),
+            use_exit_signal=strategy.use_exit_signal,
+            ignore_roi_if_entry_signal=strategy.ignore_roi_if_entry_signal,
+            dca_enabled=bool(strategy.dca_enabled.value and strategy.position_adjustment_enable),
+            entry_timeout_seconds=int(timeout_seconds) if timeout_seconds is not None else None,
+            timeframe_seconds=timeframe_to_seconds(strategy.timeframe),
+        )
+
+
+# === LADDER GENERATION ===
+
+def default_ladder(strategy) -> Dict[str, float]:
+    """The ladder currently configured on the strategy"""
+    return {name: float(getattr(strategy, name).value) for name in LADDER_PARAMS}
+
+
+def sample_ladders(strategy, count: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Draw ladders uniformly from the parameter ranges declared on the strategy.
+    Row 0 is always the strategy's current ladder.
+    """
+    rng = np.random.default_rng(seed)
+    ladders = {}
+    for name in LADDER_PARAMS:
+        param = getattr(strategy, name)
+        if hasattr(param, 'decimals'):
+            values = np.round(rng.uniform(param.low, param.high, count), param.decimals)
+        else:
+            values = rng.integers(param.low, param.high + 1, count).astype(np.float64)
+        values[0] = param.value
+        ladders[name] = values
+    return ladders
+
+
+# === SIMULATION ===
+
+def simulate(market: MarketArrays, ladders: Dict[str, np.ndarray], settings: SimulationSettings,
+             record_trades: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Simulate all ladders over the market arrays.
+
+    Expects market columns open/high/low/close/enter_long/exit_long/atr with the
+    signal columns already shifted (stack_frames(shift_signals=True)), atr
+    shifted as well (atr_prev), and a bool tag column 'dca_tag' telling whether
+    the shifted enter_tag contains 'dca'.
+    Returns per-ladder metrics; with record_trades also a 'trades' list for ladder 0.
+    """
+    L = len(ladders['base_position_size'])
+    T, P = market.shape
+    fee = settings.fee
+    buy_cost = 1.0 + fee
+    sell_gain = 1.0 - fee
+
+    lv = np.stack([ladders[f'dca_level_{i}'] for i in range(1, 5)])            # (4, L)
+    mult = np.stack([ladders[f'dca_size_multiplier_{i}'] for i in range(1, 5)])
+    base = ladders['base_position_size']
+    max_alloc = ladders['max_total_allocation']
+    min_gap = ladders['min_time_between_entries'] * 3600.0
+
+    # === PER LADDER STATE ===
+    closed_profit = np.zeros(L)
+    tied = np.zeros(L)                  # stake bound in open trades and open entry orders
+    open_count = np.zeros(L, dtype=np.int64)
+    peak = np.zeros(L)
+    max_dd = np.zeros(L)
+    n_trades = np.zeros(L, dtype=np.int64)
+    n_wins = np.zeros(L, dtype=np.int64)
+    gross_win = np.zeros(L)
+    gross_loss = np.zeros(L)
+    n_entries_total = np.zeros(L, dtype=np.int64)
+
+    # === PER LADDER AND PAIR STATE ===
+    in_trade = np.zeros((L, P), dtype=bool)
+    amount = np.zeros((L, P))
+    stake = np.zeros((L, P))
+    open_rate = np.zeros((L, P))
+    open_time = np.zeros((L, P), dtype=np.int64)
+    last_order = np.zeros((L, P), dtype=np.int64)
+    stop = np.zeros((L, P))
+    trailing = np.zeros((L, P), dtype=bool)
+    entries = np.zeros((L, P), dtype=np.int64)
+    pending = np.zeros((L, P), dtype=bool)
+    pending_initial = np.zeros((L, P), dtype=bool)
+    pending_price = np.zeros((L, P))
+    pending_stake = np.zeros((L, P))
+    pending_time = np.zeros((L, P), dtype=np.int64)
+
+    trades: List[dict] = []
+    o_all, h_all, l_all = market['open'], market['high'], market['low']
+    enter_all = market['enter_long'] == 1
+    exit_all = market['exit_long'] == 1
+    atr_all = market['atr_prev']
+    dca_tag_all = market['dca_tag'] == 1
+    tsp = settings.trailing_stop_positive
+    offset = settings.trailing_stop_positive_offset
+    tf_min = settings.timeframe_seconds // 60
+
+    def fill(mask, col, now):
+        """Fill pending orders in mask for pair col"""
+        added = pending_stake[mask, col]
+        new_amount = added / pending_price[mask, col]
+        amount[mask, col] += new_amount
+        stake[mask, col] += added
+        open_rate[mask, col] = stake[mask, col] / amount[mask, col]
+        initial = pending_initial[mask, col]
+        tied[mask] += np.where(initial, 0.0, added)
+        new_stop = open_rate[mask, col] * (1 - abs(settings.stoploss))
+        stop[mask, col] = np.where(initial, new_stop, np.maximum(stop[mask, col], new_stop))
+        entries[mask, col] += 1
+        pending[mask, col] = False
+        pending_initial[mask, col] = False
+
+    def close(mask, col, rate, now, reason):
+        """Close trades in mask for pair col at rate (array over mask)"""
+        open_value = amount[mask, col] * open_rate[mask, col] * buy_cost
+        profit = amount[mask, col] * rate * sell_gain - open_value
+        idx = np.flatnonzero(mask)
+        np.add.at(closed_profit, idx, profit)
+        np.add.at(tied, idx, -stake[mask, col])
+        np.add.at(open_count, idx, -1)
+        n_trades[idx] += 1
+        n_wins[idx] += profit > 0
+        gross_win[idx] += np.where(profit > 0, profit, 0.0)
+        gross_loss[idx] += np.where(profit < 0, -profit, 0.0)
+        n_entries_total[idx] += entries[mask, col]
+        if record_trades and mask[0]:
+            trades.append({
+                'pair': market.pairs[col],
+                'open_date': int(open_time[0, col]), 'close_date': int(now),
+                'open_rate': float(open_rate[0, col]), 'close_rate': float(rate[0]),
+                'stake_amount': float(stake[0, col]), 'nr_of_entries': int(entries[0, col]),
+                'profit_abs': float(profit[0]), 'profit_ratio': float(profit[0] / open_value[0]),
+                'exit_reason': reason,
+            })
+        in_trade[mask, col] = False
+        amount[mask, col] = 0.0
+        stake[mask, col] = 0.0
+        entries[mask, col] = 0
+        trailing[mask, col] = False
+        equity = closed_profit
+        np.maximum(peak, equity, out=peak)
+        np.maximum(max_dd, peak - equity, out=max_dd)
+
+    for t in range(T):
+        now = int(market.dates[t])
+        # Like freqtrade, pairs with an open trade go first, so their exits free
+        # capital and trade slots before other pairs enter on the same candle
+        started = in_trade.copy()
+        for with_trade in (True, False):
+            for col in range(P):
+                if not market.valid[t, col]:
+                    continue
+                lanes = started[:, col] if with_trade else ~started[:, col]
+                if not lanes.any() or not (with_trade or enter_all[t, col]):
+                    continue
+                o, h, low = o_all[t, col], h_all[t, col], l_all[t, col]
+                # wallets.get_total_stake_amount(), which the strategy sizes orders from
+                total = (settings.starting_balance + closed_profit) * settings.tradable_balance_ratio
+
+                # 1. Cancel entry orders that ran into unfilledtimeout
+                if settings.entry_timeout_seconds is None:
+                    expired = np.zeros(L, dtype=bool)
+                else:
+                    expired = lanes & pending[:, col] & (pending_time[:, col] + settings.entry_timeout_seconds <= now)
+                if expired.any():
+                    dropped = expired & pending_initial[:, col]
+                    tied[dropped] -= pending_stake[dropped, col]
+                    open_count[dropped] -= 1
+                    in_trade[dropped, col] = False
+                    pending[expired, col] = False
+                    pending_initial[expired, col] = False
+
+                # 2. New entries - 'dca_initial' is sized and priced as a DCA order
+                if enter_all[t, col] and not exit_all[t, col]:
+                    can_enter = lanes & ~in_trade[:, col] & (open_count < settings.max_open_trades)
+                    if can_enter.any():
+                        available = total - tied
+                        entry_stake = np.minimum(np.minimum(total * base * DEFAULT_ENTRY_MULTIPLIER,
+                                                            total * MAX_ORDER_SHARE), available)
+                        can_enter &= entry_stake > 0
+                        price = min(_dca_entry_price(o, atr_all[t, col], dca_tag_all[t, col]), h)
+                        in_trade[can_enter, col] = True
+                        open_count[can_enter] += 1
+                        tied[can_enter] += entry_stake[can_enter]
+                        open_time[can_enter, col] = now
+                        last_order[can_enter, col] = now
+                        pending[can_enter, col] = True
+                        pending_initial[can_enter, col] = True
+                        pending_price[can_enter, col] = price
+                        pending_stake[can_enter, col] = entry_stake[can_enter]
+                        pending_time[can_enter, col] = now
+
+                # 3. Fill open entry orders whose price lies within this candle
+                fillable = lanes & pending[:, col] & (pending_price[:, col] >= low) & (pending_price[:, col] <= h)
+                if fillable.any():
+                    fill(fillable, col, now)
+
+                has_position = lanes & in_trade[:, col] & (amount[:, col] > 0)
+                if not has_position.any():
+                    continue
+
+                # 4a. adjust_trade_position at the candle open
+                if settings.dca_enabled:
+                    ratio = o * sell_gain / (open_rate[:, col] * buy_cost) - 1.0
+                    candidate = (has_position & ~pending[:, col]
+                                 & (now - last_order[:, col] >= min_gap)
+                                 & (stake[:, col] / np.where(total > 0, total, np.inf) < max_alloc))
+                    level = np.full(L, -1)
+                    for i in range(3, -1, -1):
+                        level = np.where((level < 0) & (ratio <= lv[i]), i, level)
+                    candidate &= level >= 0
+                    if candidate.any():
+                        size = total * base * mult[np.clip(level, 0, 3), np.arange(L)]
+                        size = np.minimum(np.minimum(size, total * MAX_ORDER_SHARE), total - tied)
+                        candidate &= size > 0
+                        price = min(_dca_entry_price(o, atr_all[t, col], dca_tag_all[t, col]), h)
+                        last_order[candidate, col] = now
+                        pending[candidate, col] = True
+                        pending_initial[candidate, col] = False
+                        pending_price[candidate, col] = price
+                        pending_stake[candidate, col] = size[candidate]
+                        pending_time[candidate, col] = now
+                        filled = candidate & (price >= low)
+                        if filled.any():
+                            fill(filled, col, now)
+
+                # 4b. Exit checks: exit signal -> stoploss -> ROI -> trailing stop
+                profit_best = h * sell_gain / (open_rate[:, col] * buy_cost) - 1.0
+
+                if settings.trailing_stop:
+                    dir_correct = has_position & (stop[:, col] < low)
+                    active = dir_correct
+                    if settings.trailing_only_offset_is_reached:
+                        active = active & (profit_best >= offset)
+                    use_positive = (tsp is not None) & (profit_best > offset)
+                    trail_pct = np.where(use_positive, abs(tsp or 0.0), abs(settings.stoploss))
+                    new_stop = h * (1 - trail_pct)
+                    raise_stop = active & (new_stop > stop[:, col])
+                    stop[raise_stop, col] = new_stop[raise_stop]
+                    trailing[raise_stop, col] = True
+
+                remaining = has_position.copy()
+                enter_now = enter_all[t, col]
+
+                if settings.use_exit_signal and exit_all[t, col] and not enter_now:
+                    close(remaining, col, np.full(remaining.sum(), o), now, 'exit_signal')
+                    continue
+
+                sl_hit = remaining & (stop[:, col] >= low)
+                trade_dur = (now - open_time[:, col]) // 60
+
+                static_hit = sl_hit & ~trailing[:, col]
+                if static_hit.any():
+                    close(static_hit, col, stoploss_exit_rate(stop[static_hit, col], o, h), now, 'stop_loss')
+                    remaining &= ~static_hit
+
+                if not (enter_now and settings.ignore_roi_if_entry_signal):
+                    roi, roi_entry = roi_lookup(settings.minimal_roi, trade_dur)
+                    roi_hit = remaining & (profit_best > roi)
+                    if roi_hit.any():
+                        rate = roi_exit_rate(open_rate[roi_hit, col], roi[roi_hit], roi_entry[roi_hit],
+                                             trade_dur[roi_hit], o, h, low, fee, tf_min)
+                        close(roi_hit, col, rate, now, 'roi')
+                        remaining &= ~roi_hit
+
+                trail_hit = remaining & sl_hit & trailing[:, col]
+                if trail_hit.any():
+                    rate = stoploss_exit_rate(stop[trail_hit, col], o, h)
+                    same_candle = trade_dur[trail_hit] == 0
+                    if same_candle.any() and settings.trailing_only_offset_is_reached and tsp:
+                        worst = max(low, o * (1 + abs(offset) - abs(tsp)))
+                        rate = np.where(same_candle, worst, rate)
+                    close(trail_hit, col, rate, now, 'trailing_stop_loss')
+
+    # === FORCE EXIT WHATEVER IS STILL OPEN ===
+    for col in range(P):
+        rows = np.flatnonzero(market.valid[:, col])
+        if not len(rows):
+            continue
+        last = rows[-1]
+        still_open = in_trade[:, col] & (amount[:, col] > 0)
+        if still_open.any():
+            close(still_open, col, np.full(still_open.sum(), o_all[last, col]),
+                  int(market.dates[last]), 'force_exit')
+
+    profit_pct = closed_profit / settings.starting_balance
+    max_dd_pct = max_dd / (settings.starting_balance + peak)
+    result = {
+        'profit_abs': closed_profit,
+        'profit_pct': profit_pct,
+        'trades': n_trades,
+        'win_rate': np.divide(n_wins, n_trades, out=np.zeros(L), where=n_trades > 0),
+        'profit_factor': np.divide(gross_win, gross_loss, out=np.full(L, np.inf), where=gross_loss > 0),
+        'max_drawdown_abs': max_dd,
+        'max_drawdown_pct': max_dd_pct,
+        'avg_entries': np.divide(n_entries_total, n_trades, out=np.zeros(L), where=n_trades > 0),
+        'calmar': np.divide(profit_pct, max_dd_pct, out=np.full(L, np.inf), where=max_dd_pct > 0),
+    }
+    if record_trades:
+        result['trade_list'] = trades
+    return result
+
+
+def _dca_entry_price(open_rate: float, atr: float, dca_tag: bool) -> float:
+    """DCAStrategy.custom_entry_price: discount of min(1%, 0.5 * ATR) for dca tagged orders"""
+    if not dca_tag:
+        return open_rate
+    # min() with a NaN second argument returns the first one, like the strategy does
+    discount = min(0.01, (atr * 0.5) / open_rate)
+    return open_rate * (1 - discount)
+
+
+# === MARKET PREPARATION ===
+
+def prepare_market(frames: Dict[str, DataFrame], timeframe: str) -> MarketArrays:
+    """Stack analyzed DCAStrategy dataframes into simulator input"""
+    frames = {pair: frame.assign(atr_prev=frame['atr'].shift(1)) for pair, frame in frames.items()}
+    market = stack_frames(frames, ['open', 'high', 'low', 'close', 'enter_long', 'exit_long', 'atr_prev'],
+                          timeframe=timeframe, tag_columns=['enter_tag'])
+    tags = market.tags['enter_tag']
+    market.columns['dca_tag'] = np.vectorize(lambda tag: 1.0 if tag and 'dca' in str(tag).lower() else 0.0,
+                                             otypes=[np.float64])(tags)
+    for name in ('enter_long', 'exit_long'):
+        market.columns[name] = np.nan_to_num(market.columns[name])
+    return market
+
+
+# === PARALLEL SWEEP ===
+
+_worker_market: Optional[MarketArrays] = None
+_worker_settings: Optional[SimulationSettings] = None
+
+
+def _init_worker(market: MarketArrays, settings: SimulationSettings) -> None:
+    global _worker_market, _worker_settings
+    _worker_market = market
+    _worker_settings = settings
+
+
+def _run_chunk(ladders: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return simulate(_worker_market, ladders, _worker_settings)
+
+
+def sweep(market: MarketArrays, ladders: Dict[str, np.ndarray], settings: SimulationSettings,
+          workers: Optional[int] = None, chunk_size: Optional[int] = None) -> DataFrame:
+    """
+    Simulate all ladders in worker processes and return one row of metrics per ladder.
+    The per-candle cost is mostly interpreter overhead, so by default every worker
+    gets one wide chunk rather than many narrow ones.
+    """
+    count = len(ladders['base_position_size'])
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or -(-count // workers)
+    chunks = [{name: values[start:start + chunk_size] for name, values in ladders.items()}
+              for start in range(0, count, chunk_size)]
+
+    if workers <= 1 or len(chunks) == 1:
+        results = [simulate(market, chunk, settings) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(market, settings)) as executor:
+            results = list(executor.map(_run_chunk, chunks))
+
+    table = DataFrame(ladders)
+    for metric in results[0]:
+        table[metric] = np.concatenate([result[metric] for result in results])
+    return table
+
+
+def rank_ladders(table: DataFrame, objective: str = 'calmar', min_trades: int = 10) -> DataFrame:
+    """Sort sweep results best first, ignoring ladders with too few trades"""
+    ranked = table[table['trades'] >= min_trades]
+    return ranked.sort_values(objective, ascending=False)
+
+
+# === PARITY CHECK ===
+
+def check_parity(simulated: List[dict], backtest: DataFrame, profit_tolerance: float = 0.002) -> dict:
+    """
+    Compare the simulator's trade list (ladder 0) with a freqtrade backtest export.
+    Trades are matched on (pair, open_date); matched trades must agree on close
+    date, exit reason, entry count and profit ratio within profit_tolerance.
+    """
+    sim = DataFrame(simulated)
+    if sim.empty or backtest.empty:
+        return {'matched': 0, 'simulated': len(sim), 'backtest': len(backtest), 'mismatches': [], 'ok': sim.empty and backtest.empty}
+
+    bt = backtest.copy()
+    if 'nr_of_entries' not in bt and 'orders' in bt:
+        bt['nr_of_entries'] = bt['orders'].apply(lambda orders: sum(1 for order in orders if order.get('ft_is_entry')))
+    bt['open_date'] = bt['open_date'].astype('datetime64[s, UTC]').astype(np.int64)
+    bt['close_date'] = bt['close_date'].astype('datetime64[s, UTC]').astype(np.int64)
+    merged = sim.merge(bt, on=['pair', 'open_date'], how='outer', suffixes=('_sim', '_bt'), indicator=True)
+
+    mismatches = []
+    for _, row in merged.iterrows():
+        if row['_merge'] != 'both':
+            mismatches.append({'pair': row['pair'], 'open_date': row['open_date'],
+                               'issue': 'only in simulator' if row['_merge'] == 'left_only' else 'only in backtest'})
+            continue
+        issues = []
+        if row['close_date_sim'] != row['close_date_bt']:
+            issues.append('close_date')
+        if row['exit_reason_sim'] != row['exit_reason_bt']:
+            issues.append('exit_reason')
+        if 'nr_of_entries_bt' in row and row['nr_of_entries_sim'] != row['nr_of_entries_bt']:
+            issues.append('nr_of_entries')
+        if abs(row['profit_ratio_sim'] - row['profit_ratio_bt']) > profit_tolerance:
+            issues.append('profit_ratio')
+        if issues:
+            mismatches.append({'pair': row['pair'], 'open_date': row['open_date'], 'issue': ', '.join(issues)})
+
+    matched = int((merged['_merge'] == 'both').sum())
+    return {'matched': matched, 'simulated': len(sim), 'backtest': len(bt),
+            'mismatches': mismatches, 'ok': not mismatches}
+
+
+# === COMMAND LINE ===
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from strategy_utils.market_data import load_analyzed_data, load_config
+
+    parser = argparse.ArgumentParser(description='Vectorized DCA ladder sweep for DCAStrategy')
+    parser.add_argument('-c', '--config', action='append', required=True)
+    parser.add_argument('--strategy', default='DCAStrategy')
+    parser.add_argument('--timerange')
+    parser.add_argument('--ladders', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--objective', default='calmar',
+                        choices=['calmar', 'profit_pct', 'profit_factor', 'win_rate'])
+    parser.add_argument('--min-trades', type=int, default=10)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help='Write the full result table to this CSV file')
+    parser.add_argument('--parity', help='freqtrade backtest export to compare the current ladder against')
+    parser.add_argument('--enable-dca', action='store_true',
+                        help='Simulate as if position_adjustment_enable were set')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    config = load_config(args.config, timerange=args.timerange, strategy=args.strategy)
+    strategy, frames = load_analyzed_data(config)
+    market = prepare_market(frames, strategy.timeframe)
+    settings = SimulationSettings.from_strategy(strategy, config)
+    if args.enable_dca:
+        settings.dca_enabled = True
+    elif not settings.dca_enabled:
+        logger.warning("position_adjustment_enable is off - DCA orders are not simulated, "
+                       "use --enable-dca to sweep the ladders as if it were on")
+
+    if args.parity:
+        from freqtrade.data.btanalysis import load_backtest_data
+
+        ladder = {name: np.array([value]) for name, value in default_ladder(strategy).items()}
+        result = simulate(market, ladder, settings, record_trades=True)
+        report = check_parity(result['trade_list'], load_backtest_data(args.parity, args.strategy))
+        logger.info(f"Parity: {report['matched']} matched, {report['simulated']} simulated, "
+                    f"{report['backtest']} in backtest, {len(report['mismatches'])} mismatches")
+        for mismatch in report['mismatches'][:50]:
+            logger.info(f"  {mismatch}")
+        return 0 if report['ok'] else 1
+
+    ladders = sample_ladders(strategy, args.ladders, seed=args.seed)
+    table = sweep(market, ladders, settings, workers=args.workers)
+    if args.output:
+        table.to_csv(args.output, index=False)
+    ranked = rank_ladders(table, args.objective, args.min_trades)
+    print(ranked.head(args.top).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
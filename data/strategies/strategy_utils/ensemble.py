@@ -0,0 +1,195 @@
+# --- Strategy Ensembles ---
+"""
+Runs several strategies from data/strategies inside one freqtrade process.
+
+EnsembleStrategy (data/strategies/EnsembleStrategy.py) loads the strategies
+listed in config.json as members:
+
+    "ensemble": {"strategies": ["EmaRsiStrategy", "DCAStrategy"]}
+
+and trades them on one set of candles:
+- the bot runs at the smallest member timeframe; members on larger
+  timeframes get candles resampled from the bot's own (InformativeResampler),
+  so nothing is fetched twice
+- every member analyzes its candles once per candle; indicator columns are
+  merged into the bot's dataframe, identical columns only once, clashing ones
+  suffixed with the member name, larger timeframes suffixed with
+  <member>_<timeframe> the way merge_informative_pair() does
+- entries are tagged "<Member>:<member's enter_tag>", the first listed member
+  wins a candle on which several want to enter
+- trades are routed back to their member by that tag: stake, entry/exit
+  price, confirmations, position adjustment, stoploss (custom, static and
+  trailing) and exits (custom_exit, the member's exit signal and ROI table)
+
+Member callbacks read their own analyzed dataframe through a dataprovider
+wrapper, cut to the candles the bot has seen, so they behave as they do in a
+bot of their own - including in backtesting.
+
+Limits: members share the bot's wallet and max_open_trades (a member's own
+trade counting sees the whole ensemble's trades); members that mix in
+lazy signals or indicator snapshots run without those optimisations; stop
+adjustments apply at loop rate rather than at candle highs.
+"""
+import copy
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, Timedelta, concat
+
+from freqtrade.exchange import timeframe_to_seconds
+from freqtrade.strategy import merge_informative_pair
+
+logger = logging.getLogger(__name__)
+
+BASE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+SIGNAL_COLUMNS = ['enter_long', 'exit_long', 'enter_short', 'exit_short', 'enter_tag', 'exit_tag']
+TAG_SEPARATOR = ':'
+
+# Settings freqtrade copies between config and strategy - members keep their own
+MEMBER_ATTRIBUTES = (
+    'minimal_roi', 'timeframe', 'stoploss', 'trailing_stop', 'trailing_stop_positive',
+    'trailing_stop_positive_offset', 'trailing_only_offset_is_reached', 'use_custom_stoploss',
+    'process_only_new_candles', 'startup_candle_count', 'use_exit_signal', 'exit_profit_only',
+    'ignore_roi_if_entry_signal', 'exit_profit_offset', 'disable_dataframe_checks',
+    'ignore_buying_expired_candle_after', 'position_adjustment_enable',
+    'max_entry_position_adjustment',
+)
+
+
+class MemberDataProvider:
+    """
+    Dataprovider handed to a member: its own timeframe's analyzed dataframe is
+    the member's frame, cut to the candles the bot's own analyzed dataframe
+    reaches; everything else goes to the bot's dataprovider.
+    """
+
+    def __init__(self, dp, member: 'EnsembleMember', base_timeframe: str):
+        self._dp = dp
+        self._member = member
+        self._base_timeframe = base_timeframe
+        # a member candle is complete once the base candle ending with it is
+        self._lag = Timedelta(seconds=timeframe_to_seconds(member.timeframe)
+                              - timeframe_to_seconds(base_timeframe))
+
+    def get_analyzed_dataframe(self, pair: str, timeframe: str) -> Tuple[DataFrame, object]:
+        if timeframe != self._member.timeframe:
+            return self._dp.get_analyzed_dataframe(pair, timeframe)
+        base, refreshed = self._dp.get_analyzed_dataframe(pair, self._base_timeframe)
+        frame = self._member.frames.get(pair)
+        if frame is None or base.empty:
+            return DataFrame(), refreshed
+        cutoff = (base['date'].iloc[-1] - self._lag).to_datetime64()
+        end = np.searchsorted(frame['date'].to_numpy(dtype='datetime64[ns]'), cutoff, side='right')
+        return (frame if end == len(frame) else frame.iloc[:end]), refreshed
+
+    def __getattr__(self, name):
+        return getattr(self._dp, name)
+
+
+class EnsembleMember:
+    """One member strategy with its analyzed frames"""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.name = type(strategy).__name__
+        self.timeframe = strategy.timeframe
+        self.frames: Dict[str, DataFrame] = {}
+
+    def analyze(self, candles: DataFrame, pair: str) -> DataFrame:
+        """Indicators and signals of the member for one pair"""
+        metadata = {'pair': pair}
+        frame = self.strategy.advise_indicators(candles, metadata)
+        frame = self.strategy.advise_entry(frame, metadata)
+        frame = self.strategy.advise_exit(frame, metadata)
+        for column in ('enter_long', 'exit_long', 'enter_short', 'exit_short'):
+            if column not in frame:
+                frame[column] = 0
+        for column in ('enter_tag', 'exit_tag'):
+            if column not in frame:
+                frame[column] = None
+        self.frames[pair] = frame
+        return frame
+
+    def tag(self, member_tag: Optional[str]) -> str:
+        return f"{self.name}{TAG_SEPARATOR}{member_tag}" if member_tag else self.name
+
+
+def member_config(config: dict, name: str) -> dict:
+    """Bot config for loading one member, without the ensemble's strategy settings"""
+    config = copy.deepcopy(config)
+    for attribute in MEMBER_ATTRIBUTES:
+        config.pop(attribute, None)
+    config.pop('ensemble', None)
+    config['strategy'] = name
+    config.setdefault('strategy_path', str(Path(__file__).resolve().parent.parent))
+    return config
+
+
+def load_members(config: dict, names: List[str]) -> List[EnsembleMember]:
+    from freqtrade.resolvers import StrategyResolver
+
+    members = []
+    for name in names:
+        if name == 'EnsembleStrategy':
+            raise ValueError("EnsembleStrategy cannot be a member of itself")
+        members.append(EnsembleMember(StrategyResolver.load_strategy(member_config(config, name))))
+    return members
+
+
+def split_tag(enter_tag: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(member name, member's own tag) from an ensemble enter_tag"""
+    if not enter_tag:
+        return None, None
+    name, _, member_tag = enter_tag.partition(TAG_SEPARATOR)
+    return name, (member_tag or None)
+
+
+def base_timeframe(members: List[EnsembleMember]) -> str:
+    """Smallest member timeframe; the others must be whole multiples of it"""
+    timeframe = min((member.timeframe for member in members), key=timeframe_to_seconds)
+    base = timeframe_to_seconds(timeframe)
+    for member in members:
+        if timeframe_to_seconds(member.timeframe) % base:
+            raise ValueError(f"{member.name} timeframe {member.timeframe} is not a multiple of {timeframe}")
+    return timeframe
+
+
+def merge_member_columns(dataframe: DataFrame, frame: DataFrame, member: EnsembleMember,
+                         timeframe: str) -> DataFrame:
+    """
+    Add a member's indicators and signals to the bot's dataframe: indicators
+    by name (identical ones once), signals as <Member>_<column>. Members on a
+    larger timeframe are merged like informative pairs, and their signals only
+    fire on the first base candle after the member candle closed.
+    """
+    signals = {}
+    if member.timeframe == timeframe:
+        columns = {}
+        for column in frame.columns:
+            if column in BASE_COLUMNS:
+                continue
+            if column in SIGNAL_COLUMNS:
+                signals[column] = frame[column].to_numpy()
+            elif column not in dataframe:
+                columns[column] = frame[column].to_numpy()
+            elif not dataframe[column].reset_index(drop=True).equals(frame[column].reset_index(drop=True)):
+                columns[f"{column}_{member.name}"] = frame[column].to_numpy()
+        added = DataFrame(columns, index=dataframe.index)
+    else:
+        suffix = f"{member.name}_{member.timeframe}"
+        merged = merge_informative_pair(dataframe[['date']], frame, timeframe, member.timeframe,
+                                        ffill=True, append_timeframe=False, suffix=suffix)
+        candle_dates = merged[f"date_{suffix}"]
+        first = (candle_dates != candle_dates.shift()).to_numpy() & candle_dates.notna().to_numpy()
+        for column in SIGNAL_COLUMNS:
+            values = merged.pop(f"{column}_{suffix}").to_numpy()
+            if column.endswith('_tag'):
+                signals[column] = np.where(first, values, None)
+            else:
+                signals[column] = np.where(first, np.nan_to_num(values.astype(np.float64)), 0)
+        added = merged.drop(columns=['date']).set_index(dataframe.index)
+    for column, values in signals.items():
+        added[f"{member.name}_{column}"] = values
+    return concat([dataframe, added], axis=1)
@@ -0,0 +1,910 @@
+# --- Golden-Output Regression Corpus ---
+"""
+Records what every strategy in data/strategies produces for a fixed set of
+candle inputs, so optimized code paths (incremental indicators, float32,
+tail-only evaluation, fused kernels) can be checked against it candle by
+candle.
+
+Inputs are either synthetic or recorded:
+
+- synthetic: seeded 1m random walks with regime switches (trend, range,
+  volatile, selloffs within an uptrend), price jumps, short V-shaped dips and
+  flat zero-volume stretches, aggregated to every timeframe a strategy or its informative
+  pairs need. They are regenerated on demand; the manifest keeps their hash
+  so a changed generator is caught.
+- recorded:  exchange candles copied into the corpus with `record`.
+
+For every strategy and input the corpus stores, for the last --candles
+candles of the strategy's timeframe:
+
+- signals:   enter_long/exit_long/enter_short/exit_short/enter_tag/exit_tag
+             of every pair, as freqtrade's backtesting computes them
+- callbacks: every call freqtrade's backtest loop makes to a callback the
+             strategy overrides (custom_stoploss, custom_stake_amount,
+             adjust_trade_position, confirm_trade_entry, ...), with the
+             candle time, pair and returned value
+- trades:    the resulting trade list
+
+Strategies that trade less than LIGHT_TRADES times on every input carry a
+`note` in the manifest (and the report): their outputs check the signals but
+little of the trade and callback code, e.g. DCAStrategy's DCA orders and
+custom_stoploss are never reached on the synthetic markets.
+
+`check` re-runs the current code and reports, per column, callback and
+trade field, the first candle that differs beyond the column's tolerance.
+With --tail N it also replays the last N candles one at a time the way a
+live bot analyzes them (growing dataframe, informative pairs cut at the
+candle's close), which catches lookahead and tail-only evaluation that does
+not match the full-frame result. Other execution paths can be checked from
+Python with load_output() and diff_signals().
+
+Tolerances are relative to max(1, |value|); signals and tags are compared
+exactly by default. Trades and callback values also depend on the exchange's
+market precision and limits, so the manifest records the exchange the corpus
+was generated with; generate and check with the same bot config. The corpus
+lives in data/golden_corpus; regenerate a strategy's outputs with
+`generate --strategy X` when a change is meant to alter its behaviour.
+
+The committed corpus was generated against scripts/replay-exchange.py, whose
+markets every checkout can serve:
+
+    python ../../scripts/replay-exchange.py serve --pairs BTC/USD,ETH/USD,SOL/USD &
+    python ../../scripts/replay-exchange.py config --bot golden \
+        --pairs BTC/USD,ETH/USD,SOL/USD --user-data-dir /tmp/golden-user-data > golden.json
+    python -m strategy_utils.golden check -c golden.json
+
+Usage (from data/strategies):
+    python -m strategy_utils.golden generate -c config.json
+    python -m strategy_utils.golden record -c config.json --name kraken-2024q1 \
+        --datadir user_data/data/kraken --timerange 20231001-20240401 --timeframes 1m 5m 15m 1h 4h
+    python -m strategy_utils.golden check -c config.json --tail 50
+    python -m strategy_utils.golden check -c config.json --strategy DCAStrategy --tolerance custom_stake_amount=1e-6
+"""
+import argparse
+import copy
+import json
+import logging
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from strategy_utils.backtest_cache import canonical_hash, code_files, strategy_files, strategy_params
+from strategy_utils.market_data import SIGNAL_COLUMNS
+from strategy_utils.walk_forward import DAY, OHLCV_COLUMNS, STRATEGIES_DIR, strategy_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CORPUS_DIR = STRATEGIES_DIR.parent / 'golden_corpus'
+CORPUS_FORMAT = 1
+
+# Strategies loaded from data/strategies; EnsembleStrategy needs its members configured
+GOLDEN_STRATEGIES = [
+    'AggressiveSophisticated1m', 'DCAStrategy', 'EmaRsiStrategy', 'EnhancedRiskManagedStrategy',
+    'EnsembleStrategy', 'HighFrequencyScalp1m', 'PortfolioRebalancingStrategy', 'SafeDefaultStrategy',
+]
+STRATEGY_CONFIG = {
+    'EnsembleStrategy': {'ensemble': {'strategies': ['EmaRsiStrategy', 'DCAStrategy']}},
+}
+
+# Backtest settings of the corpus, applied over the exchange config passed with -c
+BACKTEST_SETTINGS = {
+    'stake_currency': 'USD',
+    'stake_amount': 100,
+    'dry_run_wallet': 1000,
+    'max_open_trades': 3,
+    'fee': 0.001,
+    'entry_pricing': {'price_side': 'same'},
+    'exit_pricing': {'price_side': 'same'},
+    'pairlists': [{'method': 'StaticPairList'}],
+    'enable_protections': False,
+    'export': 'none',
+    'dataformat_ohlcv': 'feather',
+}
+
+DEFAULT_CANDLES = 500
+LIGHT_TRADES = 5  # a strategy with fewer trades than this on every input is noted as lightly exercised
+TAG_COLUMNS = ['enter_tag', 'exit_tag']
+VALUE_COLUMNS = [column for column in SIGNAL_COLUMNS if column not in TAG_COLUMNS]
+TRADE_FIELDS = ['pair', 'open_date', 'close_date', 'open_rate', 'close_rate', 'amount', 'stake_amount',
+                'profit_abs', 'enter_tag', 'exit_reason']
+
+# Callbacks freqtrade's backtest loop calls; only the ones a strategy overrides are recorded
+CALLBACKS = [
+    'custom_stake_amount', 'custom_entry_price', 'confirm_trade_entry', 'leverage',
+    'custom_stoploss', 'custom_roi', 'custom_exit', 'custom_exit_price', 'confirm_trade_exit',
+    'adjust_trade_position', 'adjust_entry_price', 'adjust_exit_price', 'order_filled',
+    'check_entry_timeout', 'check_exit_timeout',
+]
+
+# Allowed difference relative to max(1, |value|); signals and tags default to exact.
+# 'callbacks' and 'trades' apply to every callback / trade field without its own entry
+# (custom_stoploss, trades.profit_abs, ...).
+DEFAULT_TOLERANCES = {
+    **{column: 0.0 for column in VALUE_COLUMNS},
+    'callbacks': 1e-9,
+    'trades': 1e-9,
+}
+
+
+# === SYNTHETIC CANDLES ===
+
+MINUTES_PER_DAY = 1440
+BLOCKS_PER_DAY = 4  # regime changes every 6 hours
+
+# Corpus pairs: price at the end of the input and volatility scale
+SYNTHETIC_PAIRS = {
+    'BTC/USD': (60000.0, 1.0),
+    'ETH/USD': (3000.0, 1.3),
+    'SOL/USD': (150.0, 1.8),
+}
+SYNTHETIC_END = int(datetime(2024, 3, 1, tzinfo=timezone.utc).timestamp())
+
+
+@dataclass
+class SyntheticMarket:
+    """
+    Regime-switching 1m log-return generator. Every day is drawn from its own
+    seed, counted back from the end of the input, so making an input longer
+    adds older days without changing any existing candle.
+    """
+    seed: int
+    regimes: List[Tuple[float, float]]   # (drift, volatility) of 1m log returns
+    weights: List[float]
+    jump_rate: float = 0.0               # chance per day of a 3-12% one-candle jump
+    dip_rate: float = 0.0                # expected 0.5-1.5% dips per day, down over 5-15 candles and back
+    flat_rate: float = 0.0               # chance per day of an hour without trades
+
+    def day(self, pair_index: int, day: int, scale: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns, wicks (2, 1440) and volume of day `day` before the end"""
+        rng = np.random.default_rng([self.seed, pair_index, day])
+        block = MINUTES_PER_DAY // BLOCKS_PER_DAY
+        regimes = rng.choice(len(self.regimes), size=BLOCKS_PER_DAY, p=self.weights)
+        drift = np.repeat([self.regimes[regime][0] for regime in regimes], block)
+        volatility = np.repeat([self.regimes[regime][1] for regime in regimes], block) * scale
+
+        returns = drift + volatility * rng.standard_normal(MINUTES_PER_DAY)
+        wicks = np.abs(volatility * rng.standard_normal((2, MINUTES_PER_DAY)))
+        volume = rng.lognormal(0.0, 0.5, MINUTES_PER_DAY) * (1.0 + 200.0 * np.abs(returns))
+        if rng.random() < self.jump_rate:
+            returns[rng.integers(MINUTES_PER_DAY)] += rng.choice([-1.0, 1.0]) * rng.uniform(0.03, 0.12)
+        # Oversold dips within the prevailing trend, recovered over twice their length
+        for _ in range(rng.poisson(self.dip_rate) if self.dip_rate else 0):
+            length = int(rng.integers(5, 16))
+            start = int(rng.integers(MINUTES_PER_DAY - 3 * length))
+            depth = rng.uniform(0.005, 0.015)
+            returns[start:start + length] -= depth / length
+            returns[start + length:start + 3 * length] += depth / (2 * length)
+        if rng.random() < self.flat_rate:
+            start = int(rng.integers(MINUTES_PER_DAY - 60))
+            returns[start:start + 60] = 0.0
+            wicks[:, start:start + 60] = 0.0
+            volume[start:start + 60] = 0.0
+        return returns, wicks, volume
+
+    def minute_candles(self, pair_index: int, end_price: float, scale: float, days: int) -> np.ndarray:
+        """(days * 1440, 5) OHLCV array of 1m candles ending at end_price"""
+        blocks = [self.day(pair_index, day, scale) for day in range(days - 1, -1, -1)]
+        returns = np.concatenate([block[0] for block in blocks])
+        wicks = np.concatenate([block[1] for block in blocks], axis=1)
+        volume = np.concatenate([block[2] for block in blocks])
+
+        # Summed from the end so a longer input leaves the existing candles bit-identical
+        remaining = np.cumsum(returns[::-1])[::-1]
+        log_open = np.log(end_price) - remaining
+        log_close = np.r_[log_open[1:], np.log(end_price)]
+        candles = np.empty((len(returns), 5))
+        candles[:, 0] = np.exp(log_open)
+        candles[:, 3] = np.exp(log_close)
+        candles[:, 1] = np.maximum(candles[:, 0], candles[:, 3]) * np.exp(wicks[0])
+        candles[:, 2] = np.minimum(candles[:, 0], candles[:, 3]) * np.exp(-wicks[1])
+        candles[:, 4] = volume
+        return candles
+
+
+SYNTHETIC_MARKETS = {
+    'mixed': SyntheticMarket(
+        seed=47,
+        regimes=[(2e-5, 7e-4), (-2e-5, 7e-4), (0.0, 5e-4), (0.0, 1.5e-3)],
+        weights=[0.3, 0.3, 0.25, 0.15],
+        dip_rate=12.0,
+    ),
+    'pullbacks': SyntheticMarket(
+        seed=7,
+        regimes=[(4e-5, 8e-4), (-1.2e-4, 1.2e-3), (0.0, 6e-4), (1e-5, 2.5e-3)],
+        weights=[0.55, 0.15, 0.2, 0.1],
+        jump_rate=0.4,
+        dip_rate=24.0,
+    ),
+    'stress': SyntheticMarket(
+        seed=4747,
+        regimes=[(6e-5, 1.2e-3), (-8e-5, 1.6e-3), (0.0, 2e-4), (0.0, 3e-3)],
+        weights=[0.25, 0.25, 0.25, 0.25],
+        jump_rate=0.3,
+        dip_rate=24.0,
+        flat_rate=0.3,
+    ),
+}
+
+
+def aggregate(candles: np.ndarray, minutes: int) -> np.ndarray:
+    """1m OHLCV rows to `minutes` candles; the row count must be a multiple of minutes"""
+    grouped = candles.reshape(-1, minutes, 5)
+    return np.column_stack([
+        grouped[:, 0, 0], grouped[:, :, 1].max(axis=1), grouped[:, :, 2].min(axis=1),
+        grouped[:, -1, 3], grouped[:, :, 4].sum(axis=1),
+    ])
+
+
+def write_synthetic(directory: Path, market: SyntheticMarket, days: int, timeframes: List[str]) -> str:
+    """Write the input's candles of every timeframe as feather files; returns their content hash"""
+    from freqtrade.data.history import get_datahandler
+    from freqtrade.exchange import timeframe_to_minutes
+
+    handler = get_datahandler(directory, 'feather')
+    start = SYNTHETIC_END - days * DAY
+    digest = []
+    for pair_index, (pair, (end_price, scale)) in enumerate(SYNTHETIC_PAIRS.items()):
+        candles = market.minute_candles(pair_index, end_price, scale, days)
+        digest.append(canonical_hash(candles[-MINUTES_PER_DAY:].tolist()))
+        for timeframe in timeframes:
+            minutes = timeframe_to_minutes(timeframe)
+            if MINUTES_PER_DAY % minutes:
+                raise ValueError(f"Synthetic inputs only support timeframes that divide a day, not {timeframe}")
+            rows = aggregate(candles, minutes)
+            frame = DataFrame(rows, columns=OHLCV_COLUMNS)
+            frame.insert(0, 'date', pd.to_datetime(start + np.arange(len(rows)) * minutes * 60, unit='s', utc=True))
+            handler.ohlcv_store(pair, timeframe, frame, candle_type='spot')
+    return canonical_hash(digest)
+
+
+# === INPUTS ===
+
+def required_timeframes(strategy) -> List[str]:
+    """The strategy's timeframe and those of its informative pairs"""
+    timeframes = {strategy.timeframe}
+    timeframes.update(timeframe for _, timeframe, _ in strategy.gather_informative_pairs())
+    return sorted(timeframes)
+
+
+def required_days(strategy, candles: int) -> int:
+    """Whole days of data the strategy needs for `candles` analyzed candles plus its startup"""
+    from freqtrade.exchange import timeframe_to_seconds
+
+    longest = max(timeframe_to_seconds(timeframe) for timeframe in required_timeframes(strategy))
+    return int(np.ceil((strategy.startup_candle_count + candles) * longest / DAY)) + 1
+
+
+def input_end(spec: dict, timeframe: str) -> int:
+    """Epoch seconds just after the input's last full candle of timeframe"""
+    from freqtrade.exchange import timeframe_to_prev_date
+
+    end = datetime.fromtimestamp(spec['end'], tz=timezone.utc)
+    return int(timeframe_to_prev_date(timeframe, end).timestamp())
+
+
+def golden_timerange(spec: dict, timeframe: str, candles: int) -> str:
+    """Timerange of the last `candles` full candles of the input (freqtrade's end is inclusive)"""
+    from freqtrade.exchange import timeframe_to_seconds
+
+    seconds = timeframe_to_seconds(timeframe)
+    end = input_end(spec, timeframe)
+    return f'{end - candles * seconds}-{end - seconds}'
+
+
+# === CALLBACK RECORDING ===
+
+def _plain(value):
+    """A callback result as a JSON value"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if isinstance(value, (tuple, list)):
+        return [_plain(item) for item in value]
+    return repr(value)
+
+
+class CallbackRecorder:
+    """Wraps the strategy's overridden callbacks and records every call's time, pair and result"""
+
+    def __init__(self, strategy):
+        from freqtrade.strategy import IStrategy
+
+        self.calls: Dict[str, List[list]] = {}
+        for name in CALLBACKS:
+            if getattr(type(strategy), name, None) is getattr(IStrategy, name, None):
+                continue
+            self.calls[name] = []
+            setattr(strategy, name, self._wrap(name, getattr(strategy, name)))
+
+    def _wrap(self, name: str, method):
+        calls = self.calls[name]
+
+        def recorded(*args, **kwargs):
+            when = kwargs.get('current_time', kwargs.get('time'))
+            trade = kwargs.get('trade')
+            pair = kwargs.get('pair', getattr(trade, 'pair', None))
+            if pair is None and args and isinstance(args[0], str):
+                pair = args[0]
+            timestamp = int(when.timestamp()) if isinstance(when, datetime) else None
+            try:
+                result = method(*args, **kwargs)
+            except Exception as exc:
+                calls.append([timestamp, pair, {'error': type(exc).__name__}])
+                raise
+            calls.append([timestamp, pair, _plain(result)])
+            return result
+
+        return recorded
+
+
+# === RUNNING STRATEGIES ===
+
+@dataclass
+class GoldenOutput:
+    """What one strategy produced for one input"""
+    timerange: str
+    signals: Dict[str, Dict[str, np.ndarray]]             # pair -> column -> values ('date' in epoch seconds)
+    callbacks: Dict[str, List[list]] = field(default_factory=dict)
+    trades: List[dict] = field(default_factory=list)
+
+
+def golden_config(config: dict, strategy_name: str, datadir: Path, pairs: List[str], timerange: str) -> dict:
+    config = strategy_config(config, strategy_name)
+    config.update(copy.deepcopy(BACKTEST_SETTINGS))
+    config.update(copy.deepcopy(STRATEGY_CONFIG.get(strategy_name, {})))
+    config['datadir'] = Path(datadir)
+    config['timerange'] = timerange
+    config['exchange']['pair_whitelist'] = list(pairs)
+    config['exchange']['pair_blacklist'] = []
+    return config
+
+
+def load_golden_strategy(config: dict, strategy_name: str):
+    """The strategy as configured for the corpus, without a backtest (for startup and timeframes)"""
+    from freqtrade.resolvers import StrategyResolver
+
+    config = strategy_config(config, strategy_name)
+    config.update(copy.deepcopy(STRATEGY_CONFIG.get(strategy_name, {})))
+    strategy = StrategyResolver.load_strategy(config)
+    strategy.ft_load_hyper_params()
+    return strategy
+
+
+def signal_arrays(frame: DataFrame) -> Dict[str, np.ndarray]:
+    """The corpus columns of one analyzed dataframe"""
+    arrays = {'date': frame['date'].to_numpy(dtype='datetime64[s]').astype(np.int64)}
+    for column in VALUE_COLUMNS:
+        arrays[column] = (frame[column].to_numpy(dtype=np.float64, na_value=np.nan) if column in frame.columns
+                          else np.full(len(frame), np.nan))
+    for column in TAG_COLUMNS:
+        values = frame[column].to_numpy(dtype=object) if column in frame.columns else np.full(len(frame), None)
+        arrays[column] = np.array([value if isinstance(value, str) else '' for value in values], dtype=str)
+    return arrays
+
+
+class GoldenRunner:
+    """One strategy in a freqtrade Backtesting instance over one corpus input"""
+
+    def __init__(self, config: dict):
+        from freqtrade.optimize.backtesting import Backtesting
+
+        self.backtesting = Backtesting(config)
+        self.backtesting._set_strategy(self.backtesting.strategylist[0])
+        self.strategy = self.backtesting.strategy
+        self.timerange = config['timerange']
+        self.data, _ = self.backtesting.load_bt_data()
+
+    def _trim(self, frame: DataFrame) -> DataFrame:
+        from freqtrade.data.converter import trim_dataframe
+
+        return trim_dataframe(frame, self.backtesting.timerange, startup_candles=self.backtesting.required_startup)
+
+    def run(self) -> GoldenOutput:
+        """Signals of the full-frame analysis, then the backtest with callbacks recorded"""
+        from freqtrade.data.converter import trim_dataframes
+        from freqtrade.data.history import get_timerange
+
+        recorder = CallbackRecorder(self.strategy)
+        processed = self.strategy.advise_all_indicators({pair: frame.copy() for pair, frame in self.data.items()})
+        signals = {}
+        for pair, frame in processed.items():
+            analyzed = self.strategy.ft_advise_signals(frame.copy(), {'pair': pair})
+            signals[pair] = signal_arrays(self._trim(analyzed))
+
+        trades = []
+        trimmed = trim_dataframes(processed, self.backtesting.timerange, self.backtesting.required_startup)
+        if trimmed:
+            min_date, max_date = get_timerange(trimmed)
+            results = self.backtesting.backtest(processed=processed, start_date=min_date,
+                                                end_date=max_date)['results']
+            for row in results.to_dict('records'):
+                trade = {key: _plain(row.get(key)) for key in TRADE_FIELDS}
+                trade['open_date'] = int(row['open_date'].timestamp())
+                trade['close_date'] = int(row['close_date'].timestamp())
+                trades.append(trade)
+        return GoldenOutput(timerange=self.timerange, signals=signals, callbacks=recorder.calls, trades=trades)
+
+    def replay_tail(self, candles: int) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Signals of the last `candles` candles, each from analyzing the dataframe
+        up to that candle only, with informative pairs cut at the candle's close
+        """
+        from freqtrade.exchange import timeframe_to_seconds
+
+        dataprovider = self.backtesting.dataprovider
+        step = pd.Timedelta(seconds=timeframe_to_seconds(self.strategy.timeframe))
+        signals = {}
+        for pair, frame in self.data.items():
+            last = len(self._trim(frame))
+            rows = []
+            for end in range(len(frame) - min(candles, last), len(frame)):
+                window = frame.iloc[:end + 1].copy()
+                dataprovider._set_dataframe_max_date(window['date'].iloc[-1] + step)
+                rows.append(self.strategy.analyze_ticker(window, {'pair': pair}).iloc[[-1]])
+            dataprovider._set_dataframe_max_date(None)
+            if rows:
+                signals[pair] = signal_arrays(pd.concat(rows, ignore_index=True))
+        return signals
+
+
+# === CORPUS FILES ===
+
+class Corpus:
+    """
+    manifest.json          inputs, strategies, tolerances and library versions
+    inputs/<name>/         recorded candles (feather, freqtrade datadir layout)
+    outputs/<strategy>/<input>.npz    signals per pair
+    outputs/<strategy>/<input>.json   timerange, callback calls and trades
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or DEFAULT_CORPUS_DIR)
+        path = self.directory / 'manifest.json'
+        self.manifest = json.loads(path.read_text()) if path.is_file() else {
+            'format': CORPUS_FORMAT, 'tolerances': dict(DEFAULT_TOLERANCES), 'inputs': {}, 'strategies': {},
+        }
+        if self.manifest.get('format') != CORPUS_FORMAT:
+            raise ValueError(f"{path} has corpus format {self.manifest.get('format')}, expected {CORPUS_FORMAT}")
+
+    def save_manifest(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest['versions'] = library_versions()
+        (self.directory / 'manifest.json').write_text(json.dumps(self.manifest, indent=2, sort_keys=True) + '\n')
+
+    def input_dir(self, name: str) -> Path:
+        return self.directory / 'inputs' / name
+
+    def output_path(self, strategy_name: str, input_name: str) -> Path:
+        return self.directory / 'outputs' / strategy_name / input_name
+
+    def save_output(self, strategy_name: str, input_name: str, output: GoldenOutput) -> None:
+        path = self.output_path(strategy_name, input_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pairs = list(output.signals)
+        arrays = {f'{index}.{column}': values for index, pair in enumerate(pairs)
+                  for column, values in output.signals[pair].items()}
+        np.savez_compressed(path.with_suffix('.npz'), **arrays)
+        path.with_suffix('.json').write_text(json.dumps({
+            'timerange': output.timerange,
+            'pairs': pairs,
+            'callbacks': output.callbacks,
+            'trades': output.trades,
+        }, separators=(',', ':')) + '\n')
+
+    def load_output(self, strategy_name: str, input_name: str) -> GoldenOutput:
+        path = self.output_path(strategy_name, input_name)
+        meta = json.loads(path.with_suffix('.json').read_text())
+        signals: Dict[str, Dict[str, np.ndarray]] = {pair: {} for pair in meta['pairs']}
+        with np.load(path.with_suffix('.npz')) as arrays:
+            for key in arrays.files:
+                index, column = key.split('.', 1)
+                signals[meta['pairs'][int(index)]][column] = arrays[key]
+        return GoldenOutput(timerange=meta['timerange'], signals=signals,
+                            callbacks=meta['callbacks'], trades=meta['trades'])
+
+
+def load_output(strategy_name: str, input_name: str, corpus_dir=None) -> GoldenOutput:
+    return Corpus(corpus_dir).load_output(strategy_name, input_name)
+
+
+def library_versions() -> Dict[str, str]:
+    import freqtrade
+    import talib
+
+    return {'freqtrade': freqtrade.__version__, 'numpy': np.__version__, 'pandas': pd.__version__,
+            'talib': talib.__version__}
+
+
+# === COMPARISON ===
+
+@dataclass
+class Divergence:
+    strategy: str
+    input: str
+    where: str        # pair, callback name or 'trades'
+    column: str
+    first: str        # first divergent candle (or call) and what differs there
+    count: int        # number of divergent candles / calls
+
+    def __str__(self) -> str:
+        return f"{self.strategy} / {self.input} / {self.where} / {self.column}: {self.count} differ, first {self.first}"
+
+
+def _format_time(timestamp) -> str:
+    if timestamp is None:
+        return '-'
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+def values_match(expected, actual, tolerance: float) -> bool:
+    """Whether two JSON callback values agree, numbers within tolerance relative to max(1, |value|)"""
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)) \
+            and not isinstance(expected, bool) and not isinstance(actual, bool):
+        if np.isnan(expected) or np.isnan(actual):
+            return bool(np.isnan(expected) and np.isnan(actual))
+        return abs(expected - actual) <= tolerance * max(1.0, abs(expected), abs(actual))
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(expected) == len(actual) and all(
+            values_match(left, right, tolerance) for left, right in zip(expected, actual))
+    return expected == actual
+
+
+def diff_signals(expected: Dict[str, Dict[str, np.ndarray]], actual: Dict[str, Dict[str, np.ndarray]],
+                 tolerances: Dict[str, float], strategy_name: str = '', input_name: str = '') -> List[Divergence]:
+    """
+    Column by column differences of two signal sets on the candles both have.
+    `actual` may cover only part of the candles (e.g. a tail replay).
+    """
+    divergences = []
+    for pair, columns in expected.items():
+        if pair not in actual:
+            divergences.append(Divergence(strategy_name, input_name, pair, 'date', 'pair missing', len(columns['date'])))
+            continue
+        dates, other = columns['date'], actual[pair]
+        common, rows, other_rows = np.intersect1d(dates, other['date'], return_indices=True)
+        missing = len(other['date']) - len(common)
+        if missing:
+            extra = np.setdiff1d(other['date'], dates)
+            divergences.append(Divergence(strategy_name, input_name, pair, 'date',
+                                          f"{_format_time(extra[0])} not in the corpus", missing))
+        for column in VALUE_COLUMNS + TAG_COLUMNS:
+            left, right = columns[column][rows], other[column][other_rows]
+            if column in TAG_COLUMNS:
+                differs = left != right
+            else:
+                tolerance = tolerances.get(column, 0.0)
+                both_nan = np.isnan(left) & np.isnan(right)
+                scale = np.maximum(1.0, np.maximum(np.abs(left), np.abs(right)))
+                with np.errstate(invalid='ignore'):
+                    differs = ~(both_nan | (np.abs(left - right) <= tolerance * scale))
+            if differs.any():
+                first = int(np.argmax(differs))
+                divergences.append(Divergence(
+                    strategy_name, input_name, pair, column,
+                    f"{_format_time(common[first])}: expected {left[first].item()!r}, got {right[first].item()!r}",
+                    int(differs.sum())))
+    return divergences
+
+
+def diff_calls(expected: Dict[str, List[list]], actual: Dict[str, List[list]], tolerances: Dict[str, float],
+               strategy_name: str = '', input_name: str = '') -> List[Divergence]:
+    """Call by call differences of two recordings of the same callbacks"""
+    divergences = []
+    for name in sorted(set(expected) | set(actual)):
+        left, right = expected.get(name, []), actual.get(name, [])
+        tolerance = tolerances.get(name, tolerances['callbacks'])
+        differs = [index for index, (call, other) in enumerate(zip(left, right))
+                   if call[:2] != other[:2] or not values_match(call[2], other[2], tolerance)]
+        count = len(differs) + abs(len(left) - len(right))
+        if not count:
+            continue
+        if differs:
+            index = differs[0]
+            call, other = left[index], right[index]
+            first = (f"call {index} at {_format_time(call[0])} {call[1]}: expected {call[2]!r}, "
+                     f"got {other[2]!r} at {_format_time(other[0])} {other[1]}")
+        else:
+            index = min(len(left), len(right))
+            call = (left if len(left) > len(right) else right)[index]
+            first = (f"call {index} at {_format_time(call[0])} {call[1]}: "
+                     f"{'missing' if len(left) > len(right) else 'unexpected'}")
+        divergences.append(Divergence(strategy_name, input_name, 'callbacks', name, first, count))
+    return divergences
+
+
+def diff_trades(expected: List[dict], actual: List[dict], tolerances: Dict[str, float],
+                strategy_name: str = '', input_name: str = '') -> List[Divergence]:
+    """Field by field differences of two trade lists, in trade order"""
+    divergences = []
+    if len(expected) != len(actual):
+        index = min(len(expected), len(actual))
+        trade = (expected if len(expected) > len(actual) else actual)[index]
+        divergences.append(Divergence(
+            strategy_name, input_name, 'trades', 'count',
+            f"trade {index} ({trade['pair']} opened {_format_time(trade['open_date'])}): "
+            f"{'missing' if len(expected) > len(actual) else 'unexpected'}", abs(len(expected) - len(actual))))
+    for key in TRADE_FIELDS:
+        tolerance = tolerances.get(f'trades.{key}', tolerances['trades'])
+        differs = [index for index, (trade, other) in enumerate(zip(expected, actual))
+                   if not values_match(trade[key], other[key], tolerance)]
+        if differs:
+            trade = expected[differs[0]]
+            divergences.append(Divergence(
+                strategy_name, input_name, 'trades', key,
+                f"trade {differs[0]} ({trade['pair']} opened {_format_time(trade['open_date'])}): "
+                f"expected {trade[key]!r}, got {actual[differs[0]][key]!r}", len(differs)))
+    return divergences
+
+
+# === DRIVER ===
+
+def _input_datadirs(corpus: Corpus, input_names: List[str], timeframes: List[str],
+                    scratch: Path) -> Dict[str, Path]:
+    """Where the candles of every input are, writing synthetic inputs into scratch"""
+    datadirs = {}
+    for name in input_names:
+        spec = corpus.manifest['inputs'].get(name)
+        if spec is None:
+            raise ValueError(f"Unknown corpus input {name}; known: {', '.join(sorted(corpus.manifest['inputs']))}")
+        if spec['kind'] == 'recorded':
+            datadirs[name] = corpus.input_dir(name)
+            continue
+        datadirs[name] = scratch / name
+        digest = write_synthetic(datadirs[name], SYNTHETIC_MARKETS[spec['market']], spec['days'], timeframes)
+        if spec.get('digest') and spec['digest'] != digest:
+            raise ValueError(f"Synthetic input {name} no longer generates the candles the corpus was "
+                             f"made from (numpy {np.__version__}); regenerate the corpus")
+        spec['digest'] = digest
+    return datadirs
+
+
+def _strategy_input_names(corpus: Corpus, strategy, input_names: List[str]) -> List[str]:
+    """Inputs that hold every timeframe the strategy needs"""
+    usable = []
+    for name in input_names:
+        spec = corpus.manifest['inputs'][name]
+        missing = set(required_timeframes(strategy)) - set(spec.get('timeframes', required_timeframes(strategy)))
+        if missing:
+            logger.warning(f"Skipping input {name} for {strategy.get_strategy_name()}: "
+                           f"no {', '.join(sorted(missing))} candles")
+            continue
+        usable.append(name)
+    return usable
+
+
+def generate(config: dict, strategy_names: List[str], input_names: Optional[List[str]] = None,
+             candles: int = DEFAULT_CANDLES, corpus_dir=None) -> Corpus:
+    """Run the strategies over the inputs and store their outputs as the new reference"""
+    corpus = Corpus(corpus_dir)
+    corpus.manifest['exchange'] = config['exchange']['name']
+    inputs = corpus.manifest['inputs']
+    for market in SYNTHETIC_MARKETS:
+        name = f'synthetic-{market}'
+        if input_names is None or name in input_names:
+            inputs.setdefault(name, {'kind': 'synthetic', 'market': market, 'days': 0,
+                                     'end': SYNTHETIC_END, 'pairs': list(SYNTHETIC_PAIRS)})
+    input_names = input_names or list(inputs)
+    for name in input_names:
+        if name not in inputs:
+            raise ValueError(f"Unknown corpus input {name}; known: {', '.join(sorted(inputs))}")
+    strategies = {name: load_golden_strategy(config, name) for name in strategy_names}
+    timeframes = sorted({timeframe for strategy in strategies.values() for timeframe in required_timeframes(strategy)})
+    for name in input_names:
+        if inputs[name]['kind'] == 'synthetic':
+            days = max(required_days(strategy, candles) for strategy in strategies.values())
+            if days > inputs[name]['days']:
+                inputs[name]['days'] = days
+                inputs[name].pop('digest', None)
+
+    with tempfile.TemporaryDirectory(prefix='golden-') as scratch:
+        datadirs = _input_datadirs(corpus, input_names, timeframes, Path(scratch))
+        for strategy_name, strategy in strategies.items():
+            record = corpus.manifest['strategies'].setdefault(strategy_name, {'outputs': {}})
+            record.update({
+                'timeframe': strategy.timeframe,
+                'params': canonical_hash(strategy_params(strategy)),
+                'code_files': code_files(strategy_files(strategy)),
+                'config': STRATEGY_CONFIG.get(strategy_name, {}),
+            })
+            for input_name in _strategy_input_names(corpus, strategy, input_names):
+                spec = inputs[input_name]
+                started = time.time()
+                output = GoldenRunner(golden_config(
+                    config, strategy_name, datadirs[input_name], spec['pairs'],
+                    golden_timerange(spec, strategy.timeframe, candles))).run()
+                corpus.save_output(strategy_name, input_name, output)
+                record['outputs'][input_name] = {
+                    'timerange': output.timerange,
+                    'candles': {pair: len(columns['date']) for pair, columns in output.signals.items()},
+                    'calls': {name: len(calls) for name, calls in output.callbacks.items()},
+                    'trades': len(output.trades),
+                }
+                logger.info(f"{strategy_name} / {input_name}: {len(output.trades)} trades, "
+                            f"{sum(map(len, output.callbacks.values()))} callback calls "
+                            f"in {time.time() - started:.1f}s")
+            record['note'] = coverage_note(record['outputs'])
+    corpus.save_manifest()
+    return corpus
+
+
+def coverage_note(outputs: Dict[str, dict]) -> Optional[str]:
+    """Why a strategy's outputs check little of its code, from the trade and call counts of its inputs"""
+    trades = [output['trades'] for output in outputs.values()]
+    if not trades or max(trades) >= LIGHT_TRADES:
+        return None
+    callbacks = sorted({name for output in outputs.values() for name in output['calls']})
+    uncalled = [name for name in callbacks if not any(output['calls'].get(name) for output in outputs.values())]
+    counts = f"{min(trades)}-{max(trades)}" if min(trades) < max(trades) else str(max(trades))
+    note = f"lightly exercised: {counts} trades per input"
+    if uncalled:
+        note += f", no {', '.join(uncalled)} calls"
+    return note
+
+
+def record(config: dict, name: str, datadir: str, timerange: str, timeframes: List[str],
+           pairs: List[str], corpus_dir=None) -> Corpus:
+    """Copy exchange candles into the corpus as a recorded input"""
+    from freqtrade.configuration import TimeRange
+    from freqtrade.data.history import get_datahandler, load_pair_history
+    from freqtrade.exchange import timeframe_to_seconds
+
+    corpus = Corpus(corpus_dir)
+    directory = corpus.input_dir(name)
+    directory.mkdir(parents=True, exist_ok=True)
+    handler = get_datahandler(directory, 'feather')
+    ends = []
+    for pair in pairs:
+        for timeframe in timeframes:
+            frame = load_pair_history(pair=pair, timeframe=timeframe, datadir=Path(datadir),
+                                      timerange=TimeRange.parse_timerange(timerange),
+                                      data_format=config.get('dataformat_ohlcv', 'feather'))
+            if frame.empty:
+                raise ValueError(f"No {timeframe} candles for {pair} in {datadir} ({timerange})")
+            handler.ohlcv_store(pair, timeframe, frame, candle_type='spot')
+            # Close of the last candle
+            ends.append(int(frame['date'].iloc[-1].timestamp()) + timeframe_to_seconds(timeframe))
+    corpus.manifest['inputs'][name] = {'kind': 'recorded', 'pairs': list(pairs), 'timeframes': sorted(timeframes),
+                                       'end': min(ends), 'source': str(datadir)}
+    corpus.save_manifest()
+    return corpus
+
+
+def check(config: dict, strategy_names: Optional[List[str]] = None, input_names: Optional[List[str]] = None,
+          tail: int = 0, tolerances: Optional[Dict[str, float]] = None, corpus_dir=None) -> List[Divergence]:
+    """Re-run the strategies over the corpus inputs and diff every output against it"""
+    corpus = Corpus(corpus_dir)
+    manifest = corpus.manifest
+    tolerances = {**manifest.get('tolerances', DEFAULT_TOLERANCES), **(tolerances or {})}
+    strategy_names = strategy_names or sorted(manifest['strategies'])
+    input_names = input_names or sorted(manifest['inputs'])
+
+    if manifest.get('exchange') != config['exchange']['name']:
+        logger.warning(f"Corpus generated with exchange {manifest.get('exchange')}, checking with "
+                       f"{config['exchange']['name']}; trades and callbacks may differ by market precision")
+    versions = library_versions()
+    for library, version in manifest.get('versions', {}).items():
+        if versions.get(library) != version:
+            logger.warning(f"Corpus made with {library} {version}, running {versions.get(library)}")
+
+    strategies = {name: load_golden_strategy(config, name) for name in strategy_names}
+    timeframes = sorted({timeframe for strategy in strategies.values() for timeframe in required_timeframes(strategy)})
+    divergences = []
+    with tempfile.TemporaryDirectory(prefix='golden-') as scratch:
+        datadirs = _input_datadirs(corpus, input_names, timeframes, Path(scratch))
+        for strategy_name, strategy in strategies.items():
+            stored = manifest['strategies'].get(strategy_name)
+            if stored is None:
+                logger.warning(f"{strategy_name} is not in the corpus; run generate first")
+                continue
+            if stored['params'] != canonical_hash(strategy_params(strategy)):
+                logger.warning(f"{strategy_name} parameters changed since the corpus was generated")
+            changed = sorted(path for path, sha in code_files(strategy_files(strategy)).items()
+                             if stored['code_files'].get(path) != sha)
+            if changed:
+                logger.info(f"{strategy_name} code changed since the corpus: {', '.join(changed)}")
+
+            for input_name in input_names:
+                if input_name not in stored['outputs']:
+                    continue
+                expected = corpus.load_output(strategy_name, input_name)
+                runner = GoldenRunner(golden_config(config, strategy_name, datadirs[input_name],
+                                                    list(expected.signals), expected.timerange))
+                actual = runner.run()
+                divergences += diff_signals(expected.signals, actual.signals, tolerances, strategy_name, input_name)
+                divergences += diff_calls(expected.callbacks, actual.callbacks, tolerances,
+                                          strategy_name, input_name)
+                divergences += diff_trades(expected.trades, actual.trades, tolerances,
+                                           strategy_name, input_name)
+                if tail:
+                    divergences += diff_signals(expected.signals, runner.replay_tail(tail), tolerances,
+                                                strategy_name, f'{input_name} (tail)')
+                logger.info(f"{strategy_name} / {input_name}: checked")
+    return divergences
+
+
+def report(divergences: List[Divergence], corpus: Corpus, strategy_names: List[str]) -> str:
+    lines = []
+    diverged = {divergence.strategy for divergence in divergences}
+    for strategy_name in strategy_names:
+        stored = corpus.manifest['strategies'].get(strategy_name, {})
+        status = 'DIVERGES' if strategy_name in diverged else 'ok'
+        note = f"  ({stored['note']})" if stored.get('note') else ''
+        lines.append(f"{strategy_name:<32} {len(stored.get('outputs', {}))} inputs  {status}{note}")
+    if divergences:
+        lines.append('')
+        lines.extend(str(divergence) for divergence in divergences)
+    return '\n'.join(lines)
+
+
+# === COMMAND LINE ===
+
+def _tolerance(value: str) -> Tuple[str, float]:
+    name, _, tolerance = value.partition('=')
+    try:
+        return name, float(tolerance)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected column=tolerance, got {value!r}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['generate', 'record', 'check'])
+    parser.add_argument('-c', '--config', action='append', required=True,
+                        help='freqtrade config with the exchange settings (repeatable)')
+    parser.add_argument('--strategy', action='append', help='Strategy to include (repeatable, default all)')
+    parser.add_argument('--input', action='append', help='Corpus input to include (repeatable, default all)')
+    parser.add_argument('--corpus-dir', default=None, help='Corpus directory (default data/golden_corpus)')
+    parser.add_argument('--candles', type=int, default=DEFAULT_CANDLES,
+                        help='generate: analyzed candles per strategy and input')
+    parser.add_argument('--name', help='record: name of the recorded input')
+    parser.add_argument('--datadir', help='record: freqtrade datadir to copy candles from')
+    parser.add_argument('--timerange', help='record: candles to copy, startup included')
+    parser.add_argument('--timeframes', nargs='+', help='record: timeframes to copy')
+    parser.add_argument('--pairs', nargs='+', default=list(SYNTHETIC_PAIRS), help='record: pairs to copy')
+    parser.add_argument('--tail', type=int, default=0,
+                        help='check: also replay the last N candles one at a time like a live bot')
+    parser.add_argument('--tolerance', type=_tolerance, action='append', default=[],
+                        help='check: column=tolerance, e.g. enter_long=0.5, custom_stoploss=1e-6, '
+                             'callbacks=1e-6 or trades.profit_abs=1e-6')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    from strategy_utils.market_data import load_config
+    config = load_config(args.config)
+    # freqtrade logs every backtest's setup at INFO level
+    logging.getLogger('freqtrade').setLevel(logging.WARNING)
+
+    if args.command == 'record':
+        if not (args.name and args.datadir and args.timerange and args.timeframes):
+            parser.error('record needs --name, --datadir, --timerange and --timeframes')
+        corpus = record(config, args.name, args.datadir, args.timerange, args.timeframes, args.pairs,
+                        args.corpus_dir)
+        print(f"Recorded input {args.name} into {corpus.input_dir(args.name)}; run generate to add its outputs")
+        return 0
+
+    strategy_names = args.strategy or GOLDEN_STRATEGIES
+    if args.command == 'generate':
+        corpus = generate(config, strategy_names, args.input, args.candles, args.corpus_dir)
+        print(report([], corpus, strategy_names))
+        return 0
+
+    divergences = check(config, args.strategy, args.input, args.tail, dict(args.tolerance), args.corpus_dir)
+    corpus = Corpus(args.corpus_dir)
+    print(report(divergences, corpus, args.strategy or sorted(corpus.manifest['strategies'])))
+    return 1 if divergences else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
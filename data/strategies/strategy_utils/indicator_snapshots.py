@@ -0,0 +1,306 @@
+# --- Persisted Indicator Snapshots ---
+"""
+Keeps each pair's recent analyzed candles on disk so a restarted bot resumes
+with warmed-up indicators.
+
+After a restart, strategy switch or pool migration freqtrade only holds the
+candles it fetched again, and long indicators (sma_200 on 1h, 200 startup
+candles on 4h) stay NaN or unsettled until enough history is back. Strategies
+that mix in IndicatorSnapshotMixin:
+- write the last analyzed rows of every pair to
+  user_data/indicator_snapshots/<Strategy>/<pair>-<timeframe>.feather after each
+  new candle, on a background thread
+- on startup, validate a pair's snapshot against the fresh candles (strategy
+  file, parameters and timeframe unchanged, overlapping candles identical)
+- resume the first analysis of each pair from the snapshot whenever it
+  overlaps the tail of the fresh candles: candles the snapshot already holds
+  take its stored indicator values, and populate_indicators only runs over
+  the candles that closed while the bot was down, seeded with the preceding
+  max(history_lookback, startup_candle_count) candles. Fresh candles older
+  than the snapshot keep their candle values only (indicator columns NaN);
+  bounded history drops them as soon as the strategy bounds its frames
+- on later candles, prepend the older snapshot candles to the fresh ones while
+  the fresh history is shorter than the snapshot, so indicators and signals
+  continue where the previous run stopped
+- compare the recomputed indicators with the snapshot on the last candle
+  both hold, once per pair, and log pairs that diverge
+
+Recursive indicators (EMA, RSI, ATR) depend on all earlier candles, so the
+snapshot keeps several times the startup period by default; what remains of
+the seed difference is far below what the comparison reports. The candles
+computed on resume are seeded with the longest lookback only, so windowed
+indicators (sma_200) are exact and recursive ones settle like a freshly
+started bot's first candles; all candles are recomputed on the full history
+from the next candle on.
+
+Snapshots that fail validation are ignored and left to be overwritten. Only
+live/dry-run bots read or write snapshots.
+"""
+import hashlib
+import inspect
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from pandas import DataFrame, concat
+
+from strategy_utils.market_data import SIGNAL_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+BASE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+FINGERPRINT_KEY = b'strategy_fingerprint'
+
+
+class _SnapshotWriter:
+    """Background thread writing the newest pending frame per file"""
+
+    def __init__(self):
+        self._pending: Dict[Path, tuple] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='indicator-snapshots', daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path, frame: DataFrame, fingerprint: str) -> None:
+        with self._lock:
+            self._pending[path] = (frame, fingerprint)
+        self._wake.set()
+
+    def close(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=30)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for path, (frame, fingerprint) in pending.items():
+                try:
+                    write_snapshot(path, frame, fingerprint)
+                except Exception as e:
+                    logger.warning(f"Could not write indicator snapshot {path.name}: {e}")
+            if self._stopped and not self._pending:
+                return
+
+
+def write_snapshot(path: Path, frame: DataFrame, fingerprint: str) -> None:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = pa.Table.from_pandas(frame.reset_index(drop=True), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[FINGERPRINT_KEY] = fingerprint.encode()
+    tmp = path.with_suffix('.tmp')
+    feather.write_feather(table.replace_schema_metadata(metadata), tmp, compression='zstd')
+    tmp.replace(path)
+
+
+def read_snapshot(path: Path, fingerprint: str) -> Optional[DataFrame]:
+    """Snapshot frame, or None if missing, unreadable or written by a different strategy version"""
+    import pyarrow.feather as feather
+
+    if not path.is_file():
+        return None
+    try:
+        table = feather.read_table(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable indicator snapshot {path.name}: {e}")
+        return None
+    stored = (table.schema.metadata or {}).get(FINGERPRINT_KEY, b'').decode()
+    if stored != fingerprint:
+        logger.info(f"Ignoring indicator snapshot {path.name}: strategy or parameters changed")
+        return None
+    return table.to_pandas()
+
+
+class IndicatorSnapshotMixin:
+    """
+    Mix in before IStrategy:
+
+        class DCAStrategy(IndicatorSnapshotMixin, IStrategy):
+    """
+
+    indicator_snapshot_rows: int = 0   # rows kept per pair, 0 = 5 x startup_candle_count (min 500)
+
+    _snapshot_writer: Optional[_SnapshotWriter] = None
+
+    def ft_bot_start(self, **kwargs) -> None:
+        super().ft_bot_start(**kwargs)
+        self._snapshots: Dict[str, Optional[DataFrame]] = {}
+        self._snapshot_checked: set = set()
+        self._snapshot_resumed: set = set()
+        self._snapshot_written: Dict[str, object] = {}
+        self._snapshot_dir = None
+        if self._snapshots_enabled():
+            self._snapshot_dir = (Path(self.config['user_data_dir']) / 'indicator_snapshots'
+                                  / type(self).__name__)
+            self._snapshot_dir.mkdir(parents=True, exist_ok=True)
+            self._snapshot_fingerprint = self._fingerprint()
+            self._snapshot_writer = _SnapshotWriter()
+
+    def analyze(self, pairs) -> None:
+        super().analyze(pairs)
+        if self._snapshot_writer is None:
+            return
+        keep = self._snapshot_rows()
+        for pair in pairs:
+            dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
+            if dataframe.empty:
+                continue
+            last_date = dataframe['date'].iloc[-1]
+            if self._snapshot_written.get(pair) == last_date:
+                continue
+            self._snapshot_written[pair] = last_date
+            self._snapshot_writer.submit(self._snapshot_path(pair), dataframe.tail(keep).copy(),
+                                         self._snapshot_fingerprint)
+
+    def advise_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self._snapshot_writer is None or dataframe.empty:
+            return super().advise_indicators(dataframe, metadata)
+
+        pair = metadata['pair']
+        snapshot = self._load_snapshot(pair, dataframe)
+        if snapshot is not None and pair not in self._snapshot_resumed:
+            self._snapshot_resumed.add(pair)
+            resumed = self._resume(pair, snapshot, dataframe, metadata)
+            if resumed is not None:
+                return resumed
+        if snapshot is None or len(dataframe) >= len(snapshot):
+            return super().advise_indicators(dataframe, metadata)
+
+        older = snapshot.loc[snapshot['date'] < dataframe['date'].iloc[0], BASE_COLUMNS]
+        if older.empty:
+            return super().advise_indicators(dataframe, metadata)
+        if pair not in self._snapshot_checked:
+            logger.info(f"Resuming {pair} from indicator snapshot ({len(older)} earlier candles)")
+        extended = concat([older, dataframe], ignore_index=True)
+        analyzed = super().advise_indicators(extended, metadata)
+        analyzed = analyzed.iloc[len(older):].reset_index(drop=True)
+        self._check_continuity(pair, snapshot, analyzed)
+        return analyzed
+
+    def ft_bot_cleanup(self) -> None:
+        if self._snapshot_writer is not None:
+            self._snapshot_writer.close()
+            self._snapshot_writer = None
+        super().ft_bot_cleanup()
+
+    # === SNAPSHOTS ===
+
+    def _resume(self, pair: str, snapshot: DataFrame, dataframe: DataFrame, metadata: dict) -> Optional[DataFrame]:
+        """
+        Analyzed dataframe built from the snapshot's indicator rows plus the
+        candles that are new since it was written, or None if the snapshot does
+        not overlap the tail of the fresh history
+        """
+        # The snapshot's last candle may have been written before the exchange finalized it
+        stored = snapshot.iloc[:-1]
+        if stored.empty:
+            return None
+        first, last = dataframe['date'].iloc[0], stored['date'].iloc[-1]
+        seed_rows = self._resume_seed_rows()
+        new = dataframe.loc[dataframe['date'] > last, BASE_COLUMNS]
+        if new.empty or len(new) > seed_rows:
+            return None
+
+        candles = concat([stored.loc[stored['date'] < first, BASE_COLUMNS],
+                          dataframe.loc[dataframe['date'] <= last, BASE_COLUMNS]], ignore_index=True)
+        seed = candles.tail(seed_rows)
+        computed = super().advise_indicators(concat([seed, new], ignore_index=True), metadata)
+        older = dataframe.loc[dataframe['date'] < stored['date'].iloc[0], BASE_COLUMNS]
+        reused = stored.loc[stored['date'] >= first]
+        reused = reused.drop(columns=[column for column in SIGNAL_COLUMNS if column in reused])
+        resumed = concat([frame for frame in (older, reused, computed.iloc[len(seed):]) if not frame.empty],
+                         ignore_index=True)
+        if not np.array_equal(resumed['date'].to_numpy(dtype='datetime64[s]'),
+                              dataframe['date'].to_numpy(dtype='datetime64[s]')):
+            return None
+        logger.info(f"Resumed {pair} from indicator snapshot ({len(reused)} stored candles, "
+                    f"{len(new)} new)")
+        return resumed
+
+    def _load_snapshot(self, pair: str, dataframe: DataFrame) -> Optional[DataFrame]:
+        """Validated snapshot for pair (read once per run), None if unusable"""
+        if pair not in self._snapshots:
+            snapshot = read_snapshot(self._snapshot_path(pair), self._snapshot_fingerprint)
+            if snapshot is not None and not self._matches_candles(snapshot, dataframe):
+                logger.info(f"Ignoring indicator snapshot for {pair}: candles differ from the exchange's")
+                snapshot = None
+            self._snapshots[pair] = snapshot
+        return self._snapshots[pair]
+
+    @staticmethod
+    def _matches_candles(snapshot: DataFrame, dataframe: DataFrame) -> bool:
+        """Snapshot must reach the fresh candles and agree with them where both exist"""
+        if snapshot.empty or snapshot['date'].iloc[-1] < dataframe['date'].iloc[0]:
+            return False
+        overlap = snapshot[BASE_COLUMNS].merge(dataframe[BASE_COLUMNS], on='date', suffixes=('', '_fresh'))
+        if overlap.empty:
+            return False
+        # The snapshot's last candle may have been written before the exchange finalized it
+        overlap = overlap.iloc[:-1] if len(overlap) > 1 else overlap
+        for column in BASE_COLUMNS[1:]:
+            if not np.allclose(overlap[column], overlap[f'{column}_fresh'], rtol=1e-9, equal_nan=True):
+                return False
+        return True
+
+    def _check_continuity(self, pair: str, snapshot: DataFrame, analyzed: DataFrame) -> None:
+        """Once per pair: recomputed indicators should match the snapshot's on the last shared candle"""
+        if pair in self._snapshot_checked:
+            return
+        self._snapshot_checked.add(pair)
+        overlap = snapshot.merge(analyzed, on='date', suffixes=('', '_new'))
+        if len(overlap) < 2:
+            return
+        # The snapshot's last candle may have been written before the exchange finalized it
+        row = overlap.iloc[-2]
+        diverged = []
+        for column in snapshot.columns:
+            if column in BASE_COLUMNS or f'{column}_new' not in overlap:
+                continue
+            old, new = row[column], row[f'{column}_new']
+            if isinstance(old, (int, float, np.number)) and isinstance(new, (int, float, np.number)):
+                if not np.isclose(old, new, rtol=1e-3, equal_nan=True):
+                    diverged.append(column)
+        if diverged:
+            logger.info(f"{pair}: indicators differ from the snapshot after resume: {', '.join(diverged)}")
+
+    def _snapshot_path(self, pair: str) -> Path:
+        name = re.sub(r'[^A-Za-z0-9_-]', '_', pair)
+        return self._snapshot_dir / f"{name}-{self.timeframe}.feather"
+
+    def _resume_seed_rows(self) -> int:
+        """Candles populate_indicators needs before the first new candle on resume"""
+        return max(getattr(self, 'history_lookback', None) or 0, self.startup_candle_count)
+
+    def _snapshot_rows(self) -> int:
+        return self.indicator_snapshot_rows or max(5 * self.startup_candle_count, 500)
+
+    def _fingerprint(self) -> str:
+        """Strategy source, parameter values and timeframe - snapshots from other versions are ignored"""
+        digest = hashlib.sha256()
+        try:
+            digest.update(Path(inspect.getfile(type(self))).read_bytes())
+        except (OSError, TypeError):
+            digest.update(type(self).__name__.encode())
+        params = {name: repr(param.value) for name, param in self.enumerate_parameters()}
+        digest.update(json.dumps([self.timeframe, params], sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _snapshots_enabled(self) -> bool:
+        if not self.config.get('indicator_snapshots', {}).get('enabled', True):
+            return False
+        dp = getattr(self, 'dp', None)
+        try:
+            return dp is not None and dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            return False
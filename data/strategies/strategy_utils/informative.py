@@ -0,0 +1,224 @@
+# --- Incremental Informative Timeframe Resampling ---
+"""
+Builds higher-timeframe candles (5m/15m/1h/4h ...) from the base candles a bot
+already holds, instead of requesting every informative timeframe from the
+exchange and resampling the full history on every candle.
+
+Only the base rows that arrived since the previous update are folded in. The
+bucket that is still forming is kept as partial-candle state and is never
+handed out as a finished candle, so merging stays free of lookahead bias.
+
+The frames returned by get_pair_dataframe() have the same date/open/high/low/
+close/volume layout as dp.get_pair_dataframe(), so they can be passed straight
+to merge_informative_pair().
+
+Buckets are multiples of the timeframe since the epoch, which matches the
+exchange's candles up to 1d. Weekly and monthly candles open on calendar
+boundaries (Mondays, the 1st) and are rejected.
+"""
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+from freqtrade.exchange import timeframe_to_seconds
+from freqtrade.strategy import merge_informative_pair
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+CALENDAR_UNITS = ('w', 'M', 'y')    # weeks open on Mondays and months vary in length, not epoch multiples
+
+
+class _ResampleState:
+    """Completed candles and partial-candle state for one (pair, timeframe)"""
+
+    def __init__(self):
+        self.dates = np.empty(0, dtype=np.int64)      # bucket open time, epoch seconds
+        self.ohlcv = np.empty((0, 5), dtype=np.float64)
+        self.partial: Optional[np.ndarray] = None      # [bucket, open, high, low, close, volume]
+        self.last_base_ts: Optional[int] = None        # last base candle folded in
+        self.first_base_ts: Optional[int] = None
+        self.frame: Optional[DataFrame] = None         # cached output, rebuilt on change
+
+
+class InformativeResampler:
+    """
+    Incrementally resamples base-timeframe candles into informative timeframes.
+
+    Usage inside a strategy:
+
+        def bot_start(self, **kwargs) -> None:
+            self.informative = InformativeResampler(self.timeframe, dp=self.dp)
+
+        def populate_indicators(self, dataframe, metadata):
+            self.informative.update(metadata['pair'], dataframe)
+            dataframe = self.informative.merge(dataframe, metadata['pair'], '1h')
+
+    Pairs that were never passed to update() are pulled from the dataprovider
+    at the base timeframe, which is served from the bot's own candle cache for
+    whitelisted pairs and does not need an extra exchange request.
+    """
+
+    def __init__(self, base_timeframe: str, dp=None, max_candles: int = 1000):
+        self.base_timeframe = base_timeframe
+        self.base_seconds = timeframe_to_seconds(base_timeframe)
+        self.dp = dp
+        self.max_candles = max_candles
+        self._states: Dict[Tuple[str, str], _ResampleState] = {}
+        self._seen_pairs: set = set()
+
+    # === PUBLIC INTERFACE ===
+
+    def update(self, pair: str, dataframe: DataFrame) -> None:
+        """Fold the not yet seen base candles of this pair into every tracked timeframe"""
+        self._seen_pairs.add(pair)
+        for (state_pair, timeframe), state in self._states.items():
+            if state_pair == pair:
+                self._fold(state, dataframe, timeframe_to_seconds(timeframe))
+
+    def track(self, pair: str, timeframe: str) -> None:
+        """Start tracking a timeframe from the next update() instead of replaying dataprovider history"""
+        self._check_timeframe(timeframe)
+        self._states.setdefault((pair, timeframe), _ResampleState())
+
+    def get_pair_dataframe(self, pair: str, timeframe: str) -> DataFrame:
+        """
+        Completed candles of the given informative timeframe, oldest first.
+        The forming candle is not included - see get_partial_candle().
+        """
+        tf_seconds = self._check_timeframe(timeframe)
+        if tf_seconds == self.base_seconds:
+            return self._base_dataframe(pair)[['date'] + OHLCV_COLUMNS]
+
+        key = (pair, timeframe)
+        state = self._states.get(key)
+        if state is None:
+            # First request for this timeframe: start tracking and replay history once
+            state = self._states[key] = _ResampleState()
+            self._fold(state, self._base_dataframe(pair), tf_seconds)
+        elif pair not in self._seen_pairs:
+            # Pair is not analyzed by this bot - pull fresh base candles on demand
+            self._fold(state, self._base_dataframe(pair), tf_seconds)
+
+        if state.frame is None:
+            state.frame = self._build_frame(state)
+        return state.frame
+
+    def get_partial_candle(self, pair: str, timeframe: str) -> Optional[dict]:
+        """The candle that is still forming for this timeframe, if any"""
+        state = self._states.get((pair, timeframe))
+        if state is None or state.partial is None:
+            return None
+        bucket, open_, high, low, close, volume = state.partial
+        return {
+            'date': to_datetime(int(bucket), unit='s', utc=True),
+            'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+        }
+
+    def merge(self, dataframe: DataFrame, pair: str, timeframe: str, ffill: bool = True,
+              append_timeframe: bool = True, suffix: Optional[str] = None) -> DataFrame:
+        """Shortcut for merge_informative_pair() with resampled candles"""
+        informative = self.get_pair_dataframe(pair, timeframe)
+        return merge_informative_pair(dataframe, informative, self.base_timeframe, timeframe,
+                                      ffill=ffill, append_timeframe=append_timeframe,
+                                      suffix=suffix)
+
+    def reset(self, pair: Optional[str] = None) -> None:
+        """Drop resampling state for one pair, or for all pairs"""
+        if pair is None:
+            self._states.clear()
+            self._seen_pairs.clear()
+            return
+        self._seen_pairs.discard(pair)
+        for key in [key for key in self._states if key[0] == pair]:
+            del self._states[key]
+
+    # === INTERNALS ===
+
+    def _check_timeframe(self, timeframe: str) -> int:
+        """Buckets are epoch multiples of the timeframe, which only fixed-length timeframes are"""
+        if timeframe.endswith(CALENDAR_UNITS):
+            raise ValueError(f"Cannot resample into calendar timeframe {timeframe}, "
+                             "request it from the exchange instead")
+        tf_seconds = timeframe_to_seconds(timeframe)
+        if tf_seconds < self.base_seconds or tf_seconds % self.base_seconds:
+            raise ValueError(f"Cannot resample {self.base_timeframe} candles into {timeframe}")
+        return tf_seconds
+
+    def _base_dataframe(self, pair: str) -> DataFrame:
+        if self.dp is None:
+            return DataFrame(columns=['date'] + OHLCV_COLUMNS)
+        return self.dp.get_pair_dataframe(pair, self.base_timeframe)
+
+    def _fold(self, state: _ResampleState, dataframe: DataFrame, tf_seconds: int) -> None:
+        """Aggregate base rows newer than state.last_base_ts into the state"""
+        if dataframe is None or dataframe.empty:
+            return
+
+        base_ts = dataframe['date'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+        # History was replaced (restart, pair re-added, gap bigger than our window)
+        if state.last_base_ts is not None and (
+                base_ts[-1] < state.last_base_ts or base_ts[0] > state.last_base_ts + self.base_seconds):
+            state.__init__()
+
+        if state.last_base_ts is None:
+            start = 0
+        else:
+            start = int(np.searchsorted(base_ts, state.last_base_ts, side='right'))
+        if start >= len(base_ts):
+            return
+
+        ts = base_ts[start:]
+        values = dataframe[OHLCV_COLUMNS].to_numpy(dtype=np.float64)[start:]
+        if state.first_base_ts is None:
+            state.first_base_ts = int(ts[0])
+
+        # === GROUP NEW ROWS BY TARGET BUCKET ===
+        buckets = ts - ts % tf_seconds
+        group_starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        group_ends = np.r_[group_starts[1:], len(ts)]
+
+        grouped = np.column_stack([
+            buckets[group_starts],
+            values[group_starts, 0],
+            np.maximum.reduceat(values[:, 1], group_starts),
+            np.minimum.reduceat(values[:, 2], group_starts),
+            values[group_ends - 1, 3],
+            np.add.reduceat(values[:, 4], group_starts),
+        ])
+
+        # Continue the candle that was still forming on the previous update
+        if state.partial is not None:
+            if grouped[0, 0] == state.partial[0]:
+                grouped[0, 1] = state.partial[1]
+                grouped[0, 2] = max(grouped[0, 2], state.partial[2])
+                grouped[0, 3] = min(grouped[0, 3], state.partial[3])
+                grouped[0, 5] += state.partial[5]
+            else:
+                # Base candles are missing at the end of the old bucket - close it as is
+                grouped = np.vstack([state.partial, grouped])
+            state.partial = None
+
+        # The newest bucket is complete once its last base candle has been seen
+        last_complete = ts[-1] + self.base_seconds >= grouped[-1, 0] + tf_seconds
+        if not last_complete:
+            state.partial = grouped[-1].copy()
+            grouped = grouped[:-1]
+
+        # A bucket is only usable if history covers it from its first base candle
+        if len(state.dates) == 0 and len(grouped) and grouped[0, 0] < state.first_base_ts:
+            grouped = grouped[1:]
+
+        state.last_base_ts = int(ts[-1])
+        if len(grouped):
+            state.dates = np.concatenate([state.dates, grouped[:, 0].astype(np.int64)])[-self.max_candles:]
+            state.ohlcv = np.concatenate([state.ohlcv, grouped[:, 1:]])[-self.max_candles:]
+            state.frame = None
+
+    @staticmethod
+    def _build_frame(state: _ResampleState) -> DataFrame:
+        frame = DataFrame(state.ohlcv, columns=OHLCV_COLUMNS)
+        frame.insert(0, 'date', to_datetime(state.dates, unit='s', utc=True))
+        return frame
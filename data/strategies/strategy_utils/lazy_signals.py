@@ -0,0 +1,166 @@
+# --- Capacity-Aware Lazy Signals ---
+"""
+Skips entry/exit signal computation that the bot cannot act on.
+
+Every candle freqtrade runs populate_entry_trend/populate_exit_trend for every
+whitelist pair, even when no new trade can be opened. Strategies that mix in
+LazySignalsMixin take a snapshot of the open trades before each analysis cycle
+and, per pair:
+- pair has an open trade -> exits only (freqtrade never opens a second trade
+  on the same pair)
+- no open trade, a slot is free -> entries and exits (an exit signal on the
+  same candle vetoes the entry, so exits are still needed)
+- no open trade, all slots taken -> neither
+
+A slot is taken when the open trades reach the config's max_open_trades or
+the strategy's own max_open_positions cap. Declare the cap only if every entry
+is really refused beyond it - DCAStrategy's entries are all tagged dca_* and
+bypass its confirm_trade_entry limit, so it declares none.
+
+Skipped columns are not left empty: the values from the pair's last full
+computation are carried over for the candles they cover and only the candles
+analyzed while skipping read 0, which is what the bot did on them. When a
+slot frees up, the skipped pairs are re-analyzed on the next loop iteration
+instead of waiting for the next candle.
+
+Only live/dry-run bots are affected. Backtesting, hyperopt, plotting and the
+API's pair history run populate_* in full.
+"""
+import logging
+from typing import Dict, Optional, Set
+
+import numpy as np
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+ENTRY_COLUMNS = ('enter_long', 'enter_short', 'enter_tag')
+EXIT_COLUMNS = ('exit_long', 'exit_short', 'exit_tag')
+
+
+class LazySignalsMixin:
+    """
+    Mix in before IStrategy:
+
+        class EnhancedRiskManagedStrategy(LazySignalsMixin, IStrategy):
+            max_open_positions = 10
+    """
+
+    lazy_signals: bool = True
+    max_open_positions: Optional[int] = None   # strategy's own cap on open trades, None = no cap
+
+    _lazy_open_pairs: Optional[Set[str]] = None  # set during analyze() in live/dry-run only
+    _lazy_can_enter: bool = True
+
+    def analyze(self, pairs) -> None:
+        snapshot = self._lazy_snapshot()
+        if snapshot is None:
+            return super().analyze(pairs)
+
+        open_pairs, can_enter = snapshot
+        skipped = self._lazy_skipped_pairs()
+        eligible = {pair for pair in skipped if pair not in open_pairs} if can_enter else set()
+        if eligible:
+            # These pairs could enter now but were analyzed without entry signals this
+            # candle - redo them instead of waiting for the next candle
+            last_seen = self._IStrategy__last_candle_seen_per_pair
+            for pair in eligible:
+                last_seen.pop(pair, None)
+            logger.info(f"Trade slot available, re-analyzing {len(eligible)} pairs with entry signals")
+            skipped -= eligible
+
+        self._lazy_open_pairs, self._lazy_can_enter = open_pairs, can_enter
+        try:
+            super().analyze(pairs)
+        finally:
+            self._lazy_open_pairs = None
+
+    # IStrategy.analyze_ticker() calls advise_entry/advise_exit directly, so the
+    # decision is made there rather than in ft_advise_signals()
+
+    def advise_entry(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self._lazy_open_pairs is None:
+            return super().advise_entry(dataframe, metadata)
+
+        pair = metadata['pair']
+        skipped = self._lazy_skipped_pairs()
+        if self._lazy_wants_entries(pair):
+            skipped.discard(pair)
+            return self._lazy_remember(super().advise_entry(dataframe, metadata), pair, ENTRY_COLUMNS)
+        skipped.add(pair)
+        return self._lazy_carry_over(dataframe, pair, ENTRY_COLUMNS)
+
+    def advise_exit(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self._lazy_open_pairs is None:
+            return super().advise_exit(dataframe, metadata)
+
+        pair = metadata['pair']
+        if pair in self._lazy_open_pairs or self._lazy_wants_entries(pair):
+            return self._lazy_remember(super().advise_exit(dataframe, metadata), pair, EXIT_COLUMNS)
+        return self._lazy_carry_over(dataframe, pair, EXIT_COLUMNS)
+
+    def _lazy_wants_entries(self, pair: str) -> bool:
+        return self._lazy_can_enter and pair not in self._lazy_open_pairs
+
+    # === CAPACITY ===
+
+    def _lazy_snapshot(self):
+        """(pairs with an open trade, whether a new trade can be opened), or None to analyze in full"""
+        if not self.lazy_signals or getattr(self, 'dp', None) is None:
+            return None
+        try:
+            if self.dp.runmode.value not in ('live', 'dry_run'):
+                return None
+            from freqtrade.persistence import Trade
+
+            open_trades = Trade.get_trades_proxy(is_open=True)
+        except Exception as e:
+            logger.debug(f"Open trades unavailable, computing all signals: {e}")
+            return None
+
+        open_pairs = {trade.pair for trade in open_trades}
+        limits = [self.config.get('max_open_trades'), self.max_open_positions]
+        limits = [limit for limit in limits if limit is not None and 0 <= limit < float('inf')]
+        can_enter = not limits or len(open_trades) < min(limits)
+        return open_pairs, can_enter
+
+    # === SKIPPED COLUMNS ===
+
+    def _lazy_remember(self, dataframe: DataFrame, pair: str, columns) -> DataFrame:
+        """Keep the freshly computed signal columns for carrying over later"""
+        present = [column for column in columns if column in dataframe.columns]
+        if present:
+            signals = self._lazy_signal_history().setdefault(pair, {})
+            dates = dataframe['date'].to_numpy(dtype='datetime64[ns]')
+            for column in present:
+                signals[column] = (dates, dataframe[column].to_numpy())
+        return dataframe
+
+    def _lazy_carry_over(self, dataframe: DataFrame, pair: str, columns) -> DataFrame:
+        """Fill skipped columns from the last full computation, 0 / '' for newer candles"""
+        signals = self._lazy_signal_history().get(pair, {})
+        dates = dataframe['date'].to_numpy(dtype='datetime64[ns]')
+        for column in columns:
+            default = '' if column.endswith('_tag') else 0
+            if column not in signals:
+                if not column.endswith('_short'):
+                    dataframe[column] = default
+                continue
+            known_dates, known_values = signals[column]
+            rows = np.searchsorted(known_dates, dates)
+            found = rows < len(known_dates)
+            found[found] = known_dates[rows[found]] == dates[found]
+            values = np.full(len(dates), default, dtype=known_values.dtype)
+            values[found] = known_values[rows[found]]
+            dataframe[column] = values
+        return dataframe
+
+    def _lazy_signal_history(self) -> Dict[str, dict]:
+        if '_lazy_signals' not in self.__dict__:
+            self._lazy_signals = {}
+        return self._lazy_signals
+
+    def _lazy_skipped_pairs(self) -> Set[str]:
+        if '_lazy_skipped' not in self.__dict__:
+            self._lazy_skipped = set()
+        return self._lazy_skipped
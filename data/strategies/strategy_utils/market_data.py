@@ -0,0 +1,169 @@
+# --- Backtest Market Data Helpers ---
+"""
+Loads historic candles, runs a strategy over them the way freqtrade's
+backtesting does, and stacks the per-pair results into aligned 2D arrays
+(time x pair) for the vectorized research tools in this package.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+# Columns freqtrade shifts by one candle before simulating, so a signal raised on
+# candle N is acted upon at the open of candle N + 1.
+SIGNAL_COLUMNS = ['enter_long', 'exit_long', 'enter_short', 'exit_short', 'enter_tag', 'exit_tag']
+
+
+@dataclass
+class MarketArrays:
+    """Candles and strategy output for many pairs, aligned on one date index"""
+    dates: np.ndarray                          # (T,) int64 epoch seconds
+    pairs: List[str]
+    columns: Dict[str, np.ndarray]             # name -> (T, P) array
+    valid: np.ndarray                          # (T, P) bool, pair has a candle at this date
+    timeframe: str = ''
+    tags: Dict[str, np.ndarray] = field(default_factory=dict)  # name -> (T, P) object array
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.valid.shape
+
+
+def load_config(config_files: List[str], timerange: Optional[str] = None,
+                strategy: Optional[str] = None, pairs: Optional[List[str]] = None) -> dict:
+    """Load a freqtrade config file the same way `freqtrade backtesting` does"""
+    from freqtrade.configuration import Configuration
+    from freqtrade.enums import RunMode
+
+    args = {'config': config_files, 'user_data_dir': None}
+    if strategy:
+        args['strategy'] = strategy
+    if timerange:
+        args['timerange'] = timerange
+    if pairs:
+        args['pairs'] = pairs
+    config = Configuration(args, RunMode.BACKTEST).get_config()
+    return config
+
+
+def load_analyzed_data(config: dict, strategy=None) -> Tuple[object, Dict[str, DataFrame]]:
+    """
+    Load candles for the configured pairs and run populate_indicators/entry/exit.
+    Returns (strategy, {pair: analyzed dataframe}) with the startup period trimmed,
+    which is what freqtrade hands to its backtesting loop.
+    """
+    from freqtrade.configuration import TimeRange
+    from freqtrade.data.dataprovider import DataProvider
+    from freqtrade.data.history import load_data
+    from freqtrade.data.converter import trim_dataframe
+    from freqtrade.resolvers import StrategyResolver
+
+    if strategy is None:
+        strategy = StrategyResolver.load_strategy(config)
+    strategy.dp = DataProvider(config, None)
+    strategy.ft_bot_start()
+
+    timerange = TimeRange.parse_timerange(config.get('timerange'))
+    startup = strategy.startup_candle_count
+    data = load_data(
+        datadir=config['datadir'],
+        pairs=config['exchange']['pair_whitelist'],
+        timeframe=strategy.timeframe,
+        timerange=timerange,
+        startup_candles=startup,
+        data_format=config.get('dataformat_ohlcv', 'feather'),
+        candle_type=config.get('candle_type_def', 'spot'),
+    )
+
+    analyzed = {}
+    for pair, dataframe in strategy.advise_all_indicators(data).items():
+        dataframe = strategy.ft_advise_signals(dataframe, {'pair': pair})
+        analyzed[pair] = trim_dataframe(dataframe, timerange, startup_candles=startup)
+    return strategy, analyzed
+
+
+def stack_frames(frames: Dict[str, DataFrame], columns: Iterable[str], timeframe: str = '',
+                 shift_signals: bool = True, tag_columns: Iterable[str] = ()) -> MarketArrays:
+    """
+    Align per-pair dataframes on the union of their dates.
+
+    With shift_signals the signal columns are moved one candle forward, matching
+    freqtrade's backtesting which acts on the previous candle's signal. Missing
+    float values become NaN, missing signals 0.
+    """
+    pairs = [pair for pair, frame in frames.items() if not frame.empty]
+    per_pair_dates = {pair: frames[pair]['date'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+                      for pair in pairs}
+    dates = np.unique(np.concatenate(list(per_pair_dates.values()))) if pairs else np.empty(0, np.int64)
+
+    T, P = len(dates), len(pairs)
+    valid = np.zeros((T, P), dtype=bool)
+    stacked = {name: np.full((T, P), np.nan) for name in columns}
+    tags = {name: np.full((T, P), None, dtype=object) for name in tag_columns}
+
+    for col, pair in enumerate(pairs):
+        frame = frames[pair]
+        rows = np.searchsorted(dates, per_pair_dates[pair])
+        valid[rows, col] = True
+        for name in columns:
+            if name not in frame.columns:
+                continue
+            values = frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            if shift_signals and name in SIGNAL_COLUMNS:
+                values = np.r_[0.0, np.nan_to_num(values[:-1])]
+            stacked[name][rows, col] = values
+        for name in tag_columns:
+            if name not in frame.columns:
+                continue
+            values = frame[name].to_numpy(dtype=object)
+            if shift_signals and name in SIGNAL_COLUMNS:
+                values = np.r_[[None], values[:-1]]
+            tags[name][rows, col] = values
+
+    if shift_signals and T:
+        # freqtrade drops the first candle of every pair after shifting
+        first_rows = valid.argmax(axis=0)
+        valid[first_rows, np.arange(P)] = False
+
+    return MarketArrays(dates=dates, pairs=pairs, columns=stacked, valid=valid,
+                        timeframe=timeframe, tags=tags)
+
+
+def roi_lookup(minimal_roi: Dict, durations_min: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized minimal_roi lookup.
+    Returns (roi threshold, roi table key in minutes) for each trade duration,
+    using the highest key <= duration like IStrategy.min_roi_reached_entry().
+    Durations before the first key get +inf (no ROI exit).
+    """
+    keys = np.array(sorted(int(k) for k in minimal_roi), dtype=np.int64)
+    values = np.array([minimal_roi[k] if k in minimal_roi else minimal_roi[str(k)]
+                       for k in keys], dtype=np.float64)
+    idx = np.searchsorted(keys, durations_min, side='right') - 1
+    roi = np.where(idx >= 0, values[np.clip(idx, 0, None)], np.inf)
+    entry = np.where(idx >= 0, keys[np.clip(idx, 0, None)], -1)
+    return roi, entry
+
+
+def roi_exit_rate(open_rate: np.ndarray, roi: np.ndarray, roi_entry: np.ndarray, trade_dur: np.ndarray,
+                  o, h, low, fee: float, timeframe_min: int) -> np.ndarray:
+    """
+    Exit rate for a ROI exit, as Backtesting._get_close_rate_for_roi() computes it:
+    the rate that yields exactly the ROI after fees, kept inside the candle, or the
+    candle open when a new ROI step starts on this candle and the open is better.
+    """
+    close_rate = (1 + roi) * open_rate * (1 + fee) / (1 - fee)
+    new_step = (trade_dur > 0) & (trade_dur == roi_entry) & (roi_entry % timeframe_min == 0) & (o > close_rate)
+    return np.where(new_step, o, np.minimum(np.maximum(close_rate, low), h))
+
+
+def stoploss_exit_rate(stop_price: np.ndarray, o, h) -> np.ndarray:
+    """Exit rate of a stoploss: the stop price, or the open if the candle gapped below it"""
+    return np.where(stop_price > h, o, stop_price)
@@ -0,0 +1,350 @@
+# --- Per-Bot Memory Report ---
+"""
+Reports what a running bot keeps in memory, so the orchestrator can place
+bots by their real footprint instead of counting them as equal.
+
+A 1m bot analyzing 100 pairs holds far more than a 4h bot with a handful, and
+most of it is dataframes. Strategies that mix in MemoryReportMixin start one
+reporter thread per process which rewrites
+
+    <user_data_dir>/memory_report.json
+
+every interval_seconds (60 by default) with:
+- process: resident and peak resident set size
+- analyzed: rows and bytes of every analyzed dataframe the dataprovider
+  caches, per pair and timeframe
+- columns: bytes per column name, summed over the analyzed dataframes
+- candle_history: rows and bytes of the raw candles the exchange keeps
+- caches: bytes held by each strategy attribute of at least CACHE_MIN_BYTES
+  (BatchIndicators results, ensemble member frames, snapshots, ...), counted
+  down into strategy_utils objects and containers
+- totals: the sums of the above, next to rss_bytes
+- bounded_history: per strategy with BoundedHistoryMixin its row bound and,
+  per pair, the candles held vs the rows its analyzed dataframe keeps
+
+Bytes come from pandas' memory_usage(deep=True) and numpy's nbytes, so
+arrays shared between frames are counted once per frame.
+
+Allocation tracing is on demand: writing
+
+    <user_data_dir>/memory_request.json   {"seconds": 60, "top": 25}
+
+(POST /api/bots/:instanceId/memory/trace in the orchestrator) runs tracemalloc
+for that long and adds the top allocation sites of the window to the report
+under "tracemalloc". tracemalloc slows allocations down noticeably, so it
+never runs unrequested and only sees what is allocated while it runs.
+
+Only live/dry-run bots report. Configure with
+"memory_report": {"enabled": true, "interval_seconds": 60} in config.json.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from pandas import DataFrame, Series
+
+from strategy_utils.profiler import instance_id
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = 'memory_report.json'
+REQUEST_FILE = 'memory_request.json'
+
+POLL_SECONDS = 2.0
+DEFAULT_INTERVAL_SECONDS = 60
+CACHE_MIN_BYTES = 16 * 1024
+MAX_DEPTH = 8
+
+DEFAULT_TRACE_SECONDS = 60
+MAX_TRACE_SECONDS = 900
+DEFAULT_TRACE_TOP = 25
+TRACE_FRAMES = 1
+
+# Strategy attributes that are freqtrade's, not the strategy's own state
+NOT_CACHES = {'config', 'dp', 'wallets'}
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+# === SIZES ===
+
+def frame_bytes(frame: DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def column_bytes(frame: DataFrame) -> Dict[str, int]:
+    usage = frame.memory_usage(index=False, deep=True)
+    return {str(column): int(size) for column, size in usage.items()}
+
+
+def deep_size(obj, seen: set, depth: int = 0) -> int:
+    """
+    Bytes held by obj: dataframes and arrays by their buffers, containers and
+    strategy_utils objects with their contents, everything else shallow.
+    Objects whose id is in seen count 0.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, DataFrame):
+        return frame_bytes(obj)
+    if isinstance(obj, Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj, 0)
+    if depth >= MAX_DEPTH:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_size(key, seen, depth + 1) + deep_size(value, seen, depth + 1)
+                          for key, value in list(obj.items()))
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(deep_size(item, seen, depth + 1) for item in list(obj))
+    if type(obj).__module__.startswith('strategy_utils') and hasattr(obj, '__dict__'):
+        return size + deep_size(vars(obj), seen, depth + 1)
+    return size
+
+
+def _items(mapping) -> list:
+    """Snapshot of a dict the bot's main thread may be changing"""
+    for _ in range(3):
+        try:
+            return list(mapping.items())
+        except RuntimeError:
+            continue
+    return []
+
+
+def process_memory() -> Dict[str, int]:
+    """Resident and peak resident set size of this process (Linux /proc, else getrusage)"""
+    memory = {}
+    try:
+        for line in Path('/proc/self/status').read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                memory['rss_bytes'] = int(line.split()[1]) * 1024
+            elif line.startswith('VmHWM:'):
+                memory['peak_rss_bytes'] = int(line.split()[1]) * 1024
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        memory['peak_rss_bytes'] = peak if sys.platform == 'darwin' else peak * 1024
+    return memory
+
+
+def memory_report(strategies) -> dict:
+    """Memory figures of the bot running strategies (first one is the bot's own)"""
+    analyzed, columns, history, caches, bounded_history = {}, {}, {}, {}, {}
+    dp = getattr(strategies[0], 'dp', None) if strategies else None
+    cached_pairs = getattr(dp, '_DataProvider__cached_pairs', {}) or {}
+    for (pair, timeframe, _), (frame, _) in _items(cached_pairs):
+        analyzed[f"{pair} {timeframe}"] = {'rows': len(frame), 'bytes': frame_bytes(frame)}
+        for column, size in column_bytes(frame).items():
+            columns[column] = columns.get(column, 0) + size
+
+    klines = getattr(getattr(dp, '_exchange', None), '_klines', {}) or {}
+    for (pair, timeframe, candle_type), frame in _items(klines):
+        history[f"{pair} {timeframe} {candle_type}"] = {'rows': len(frame), 'bytes': frame_bytes(frame)}
+
+    # Strategies reached through another (ensemble members) are reported on their own
+    seen = {id(strategy) for strategy in strategies}
+    for strategy in strategies:
+        name = type(strategy).__name__
+        for attribute, value in _items(vars(strategy)):
+            if attribute in NOT_CACHES:
+                continue
+            size = deep_size(value, seen)
+            if size >= CACHE_MIN_BYTES:
+                caches[f"{name}.{attribute}"] = size
+        if hasattr(strategy, 'history_rows'):
+            bounded_history[name] = {'bound': strategy.history_bound(), 'pairs': strategy.history_rows()}
+
+    totals = {
+        'analyzed_bytes': sum(entry['bytes'] for entry in analyzed.values()),
+        'candle_history_bytes': sum(entry['bytes'] for entry in history.values()),
+        'cache_bytes': sum(caches.values()),
+    }
+    totals['accounted_bytes'] = sum(totals.values())
+    return {
+        'process': process_memory(),
+        'totals': totals,
+        'analyzed': analyzed,
+        'columns': dict(sorted(columns.items(), key=lambda item: -item[1])),
+        'candle_history': history,
+        'caches': dict(sorted(caches.items(), key=lambda item: -item[1])),
+        'bounded_history': bounded_history,
+    }
+
+
+# === ALLOCATION TRACING ===
+
+def read_trace_request(path: Path):
+    """(seconds, top) of a trace request, defaults for missing or bad values"""
+    try:
+        request = json.loads(path.read_text() or '{}')
+    except (OSError, ValueError):
+        request = {}
+    if not isinstance(request, dict):
+        request = {}
+    try:
+        seconds = float(request.get('seconds', DEFAULT_TRACE_SECONDS))
+    except (TypeError, ValueError):
+        seconds = DEFAULT_TRACE_SECONDS
+    try:
+        top = int(request.get('top', DEFAULT_TRACE_TOP))
+    except (TypeError, ValueError):
+        top = DEFAULT_TRACE_TOP
+    return min(max(seconds, 1.0), MAX_TRACE_SECONDS), min(max(top, 1), 500)
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, top: int) -> list:
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+    return [{'file': stat.traceback[0].filename, 'line': stat.traceback[0].lineno,
+             'bytes': stat.size, 'blocks': stat.count}
+            for stat in snapshot.statistics('lineno')[:top]]
+
+
+# === REPORTER ===
+
+class _MemoryReporter:
+    """Process-wide thread writing the memory report and running requested traces"""
+
+    def __init__(self, user_data_dir: Path, interval: float):
+        self.report_path = user_data_dir / REPORT_FILE
+        self.request_path = user_data_dir / REQUEST_FILE
+        self.instance = instance_id(user_data_dir)
+        self.interval = interval
+        self.strategies: list = []
+        self.trace: Optional[dict] = None
+        self._trace_until: Optional[float] = None
+        self._trace_top = DEFAULT_TRACE_TOP
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='memory-report', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=10)
+        if self._trace_until is not None and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _run(self) -> None:
+        next_report = time.monotonic() + POLL_SECONDS
+        while not self._stop.wait(POLL_SECONDS):
+            try:
+                self._check_trace()
+                if time.monotonic() >= next_report:
+                    self.write()
+                    next_report = time.monotonic() + self.interval
+            except Exception as e:
+                logger.warning(f"Memory report failed: {e}")
+
+    def _check_trace(self) -> None:
+        if self._trace_until is None:
+            if not os.path.exists(self.request_path):
+                return
+            seconds, self._trace_top = read_trace_request(self.request_path)
+            self.request_path.unlink(missing_ok=True)
+            if tracemalloc.is_tracing():
+                logger.warning("tracemalloc is already running, ignoring memory trace request")
+                return
+            tracemalloc.start(TRACE_FRAMES)
+            self._trace_until = time.monotonic() + seconds
+            self.trace = {'state': 'running', 'started_at': datetime.now(timezone.utc).isoformat(),
+                          'seconds': seconds}
+            logger.info(f"Tracing allocations for {seconds:.0f}s")
+            self.write()
+        elif time.monotonic() >= self._trace_until:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._trace_until = None
+            self.trace.update(state='done', finished_at=datetime.now(timezone.utc).isoformat(),
+                              traced_bytes=current, traced_peak_bytes=peak,
+                              top=top_allocations(snapshot, self._trace_top))
+            logger.info("Allocation trace added to the memory report")
+            self.write()
+
+    def write(self) -> None:
+        report = {
+            'instance': self.instance,
+            'strategy': type(self.strategies[0]).__name__ if self.strategies else None,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'interval_seconds': self.interval,
+            **memory_report(list(self.strategies)),
+            'tracemalloc': self.trace,
+        }
+        _write_json(self.report_path, report)
+
+
+_reporter: Optional[_MemoryReporter] = None
+_reporter_lock = threading.Lock()
+
+
+def register(strategy) -> None:
+    """Start the process' reporter (once) and account strategy's state in it"""
+    global _reporter
+    with _reporter_lock:
+        if _reporter is None:
+            settings = strategy.config.get('memory_report', {})
+            _reporter = _MemoryReporter(Path(strategy.config['user_data_dir']),
+                                        float(settings.get('interval_seconds', DEFAULT_INTERVAL_SECONDS)))
+        if strategy not in _reporter.strategies:
+            _reporter.strategies.append(strategy)
+
+
+def unregister(strategy) -> None:
+    """Stop the reporter once its last strategy is cleaned up"""
+    global _reporter
+    with _reporter_lock:
+        if _reporter is None:
+            return
+        if strategy in _reporter.strategies:
+            _reporter.strategies.remove(strategy)
+        if not _reporter.strategies:
+            _reporter.close()
+            _reporter = None
+
+
+class MemoryReportMixin:
+    """
+    Mix in before IStrategy:
+
+        class DCAStrategy(MemoryReportMixin, IStrategy):
+    """
+
+    def ft_bot_start(self, **kwargs) -> None:
+        # Before super(): an ensemble starts its members there, the bot's own strategy goes first
+        if self._memory_report_enabled():
+            register(self)
+        super().ft_bot_start(**kwargs)
+
+    def ft_bot_cleanup(self) -> None:
+        unregister(self)
+        super().ft_bot_cleanup()
+
+    def _memory_report_enabled(self) -> bool:
+        if not self.config.get('memory_report', {}).get('enabled', True):
+            return False
+        dp = getattr(self, 'dp', None)
+        try:
+            return dp is not None and dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            return False
@@ -0,0 +1,281 @@
+# --- Monte Carlo Robustness Runner ---
+"""
+Turns one backtest's trade list into distributions: tens of thousands of
+resampled equity paths, each a perturbed replay of the same trades.
+
+Per path, all optional and combinable:
+- shuffle:   the trades close in a random order (the close times stay where
+             they were, the trades are dealt onto them)
+- skip:      every trade is left out with probability --skip, like missed
+             entries from a full wallet, an outage or a rejected order
+- slippage:  every trade loses |N(0, --slippage)| on entry and on exit
+- fees:      every trade's fee rate is scaled by U(1 - --fee-jitter, 1 + --fee-jitter)
+
+Trades keep their stake (freqtrade's fixed stake_amount); with --compound
+the stake grows and shrinks with the wallet instead.
+
+Reported as percentile bands over all paths:
+- max drawdown (relative to the running peak)
+- CAGR over the backtest's length
+- longest time under water (days from a peak until the wallet is back at it,
+  or until the last trade)
+- share of the backtest spent under water
+- final profit
+plus the probability of ruin: the wallet falling below (1 - --ruin) of the
+starting balance at any point.
+
+Paths are simulated as (paths, trades) arrays in chunks spread over a
+process pool; 20,000 paths of a few hundred trades take a few seconds.
+
+Trades come from the backtest result cache (strategy_utils.backtest_cache):
+the latest cached result of --strategy, or the entry --cache-key. A
+freqtrade backtest export (--backtest-file, .json or .zip) works as well.
+
+Usage (from data/strategies):
+    python -m strategy_utils.monte_carlo --strategy DCAStrategy --paths 20000 \
+        --shuffle --skip 0.1 --slippage 0.001 --fee-jitter 0.5
+    python -m strategy_utils.monte_carlo --backtest-file ../../user_data/backtest_results/result.zip \
+        --strategy EnhancedRiskManagedStrategy --shuffle --compound
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = [5, 25, 50, 75, 95]
+YEAR_DAYS = 365.0
+CHUNK_CELLS = 4_000_000     # paths x trades simulated per array chunk
+
+
+@dataclass
+class TradeList:
+    """What the simulation needs from a backtest, trades ordered by close time"""
+    profit_ratio: np.ndarray    # (N,)
+    stake_amount: np.ndarray    # (N,)
+    fee_rate: np.ndarray        # (N,) fee_open + fee_close
+    close_days: np.ndarray      # (N,) days since the backtest start
+    starting_balance: float
+    days: float                 # backtest length
+
+    @classmethod
+    def from_trades(cls, trades: List[dict], starting_balance: float,
+                    start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> 'TradeList':
+        trades = sorted((trade for trade in trades if trade.get('close_timestamp') is not None),
+                        key=lambda trade: trade['close_timestamp'])
+        if not trades:
+            raise ValueError('The backtest has no closed trades')
+        close_ms = np.array([trade['close_timestamp'] for trade in trades], dtype=np.float64)
+        start_ms = start_ms if start_ms is not None else min(trade['open_timestamp'] for trade in trades)
+        end_ms = end_ms if end_ms is not None else close_ms[-1]
+        return cls(
+            profit_ratio=np.array([trade['profit_ratio'] or 0.0 for trade in trades], dtype=np.float64),
+            stake_amount=np.array([trade['stake_amount'] or 0.0 for trade in trades], dtype=np.float64),
+            fee_rate=np.array([(trade.get('fee_open') or 0.0) + (trade.get('fee_close') or 0.0)
+                               for trade in trades], dtype=np.float64),
+            close_days=(close_ms - start_ms) / 86_400_000,
+            starting_balance=float(starting_balance),
+            days=max((end_ms - start_ms) / 86_400_000, float(close_ms[-1] - start_ms) / 86_400_000, 1.0),
+        )
+
+
+@dataclass
+class Perturbation:
+    shuffle: bool = False
+    skip: float = 0.0
+    slippage: float = 0.0
+    fee_jitter: float = 0.0
+    compound: bool = False
+    ruin: float = 0.5
+
+
+# === SIMULATION ===
+
+def simulate(trades: TradeList, settings: Perturbation, paths: int, seed) -> Dict[str, np.ndarray]:
+    """Metrics of `paths` resampled equity paths, one value per path"""
+    rng = np.random.default_rng(seed)
+    count = len(trades.profit_ratio)
+    if settings.shuffle:
+        order = rng.permuted(np.broadcast_to(np.arange(count), (paths, count)), axis=1)
+    else:
+        order = np.broadcast_to(np.arange(count), (paths, count))
+
+    ratio = trades.profit_ratio[order]
+    if settings.slippage:
+        ratio = ratio - np.abs(rng.normal(0.0, settings.slippage, (paths, count))) \
+            - np.abs(rng.normal(0.0, settings.slippage, (paths, count)))
+    if settings.fee_jitter:
+        scale = rng.uniform(1 - settings.fee_jitter, 1 + settings.fee_jitter, (paths, count))
+        ratio = ratio - trades.fee_rate[order] * (scale - 1)
+    if settings.skip:
+        ratio = np.where(rng.random((paths, count)) < settings.skip, 0.0, ratio)
+
+    start = trades.starting_balance
+    if settings.compound:
+        equity = start * np.cumprod(1 + trades.stake_amount[order] / start * ratio, axis=1)
+    else:
+        equity = start + np.cumsum(trades.stake_amount[order] * ratio, axis=1)
+
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), start)
+    drawdown = (peak - equity) / peak
+    final = equity[:, -1]
+
+    # time under water, on the original close times
+    times = trades.close_days
+    at_peak = equity >= peak
+    last_peak = np.maximum.accumulate(np.where(at_peak, times, 0.0), axis=1)
+    was_at_peak = np.c_[np.ones((paths, 1), dtype=bool), at_peak[:, :-1]]
+    previous_peak = np.c_[np.zeros((paths, 1)), last_peak[:, :-1]]
+    recovered = np.where(at_peak & ~was_at_peak, times - previous_peak, 0.0)
+    still_under = np.where(at_peak[:, -1], 0.0, trades.days - last_peak[:, -1])
+    longest = np.maximum(recovered.max(axis=1), still_under)
+    spans = np.diff(np.r_[times, trades.days])
+    under_share = ((~at_peak) * spans).sum(axis=1) / trades.days
+
+    years = trades.days / YEAR_DAYS
+    growth = np.clip(final / start, 0.0, None)
+    return {
+        'max_drawdown': drawdown.max(axis=1),
+        'cagr': growth ** (1 / years) - 1,
+        'longest_underwater_days': longest,
+        'underwater_share': under_share,
+        'profit_ratio': final / start - 1,
+        'ruined': (equity <= start * (1 - settings.ruin)).any(axis=1),
+    }
+
+
+def _simulate_chunk(args) -> Dict[str, np.ndarray]:
+    return simulate(*args)
+
+
+def run_monte_carlo(trades: TradeList, settings: Perturbation, paths: int = 20000, seed: int = 0,
+                    workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """All paths, split in chunks of at most CHUNK_CELLS cells over a process pool"""
+    count = len(trades.profit_ratio)
+    size = max(1, min(paths, CHUNK_CELLS // max(count, 1)))
+    workers = workers or os.cpu_count() or 1
+    size = min(size, -(-paths // workers))
+    sizes = [min(size, paths - start) for start in range(0, paths, size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = [(trades, settings, chunk_paths, chunk_seed) for chunk_paths, chunk_seed in zip(sizes, seeds)]
+
+    if len(chunks) == 1 or workers == 1:
+        results = [_simulate_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results = list(executor.map(_simulate_chunk, chunks))
+    return {name: np.concatenate([result[name] for result in results]) for name in results[0]}
+
+
+def summarize(metrics: Dict[str, np.ndarray], baseline: Dict[str, np.ndarray]) -> dict:
+    """Percentile bands per metric, the unperturbed backtest's value and the ruin probability"""
+    bands = {}
+    for name, values in metrics.items():
+        if name == 'ruined':
+            continue
+        bands[name] = {
+            'backtest': float(baseline[name][0]),
+            **{f'p{q}': float(value) for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        }
+    return {'paths': len(metrics['ruined']), 'ruin_probability': float(metrics['ruined'].mean()), 'bands': bands}
+
+
+# === TRADE SOURCES ===
+
+def trades_from_cache(strategy: Optional[str] = None, key: Optional[str] = None,
+                      cache_dir: Optional[str] = None) -> TradeList:
+    """Trades of a backtest_cache entry, by key or the latest of a strategy"""
+    from strategy_utils.backtest_cache import BacktestCache
+
+    cache = BacktestCache(cache_dir)
+    if key is None:
+        record = cache.catalogue().get(strategy)
+        if record is None:
+            raise ValueError(f"No cached backtest of {strategy} in {cache.directory}")
+        key = record['key']
+    entry = cache.get(key)
+    if entry is None:
+        raise ValueError(f"No cached backtest {key} in {cache.directory}")
+    logger.info(f"Using cached backtest {entry['key'][:12]} of {entry['strategy']} ({entry['timerange']})")
+    summary = entry['summary']
+    start = entry['equity'][0][0] if entry.get('equity') else None
+    end = start + summary['backtest_days'] * 86_400_000 if start is not None and summary.get('backtest_days') else None
+    return TradeList.from_trades(entry['trades'], summary['starting_balance'], start_ms=start, end_ms=end)
+
+
+def trades_from_file(path: str, strategy: Optional[str] = None) -> TradeList:
+    """Trades of one strategy in a freqtrade backtest export"""
+    from freqtrade.data.btanalysis import load_backtest_stats
+
+    stats = load_backtest_stats(Path(path))['strategy']
+    if strategy is None:
+        if len(stats) != 1:
+            raise ValueError(f"{path} holds {', '.join(stats)} - pick one with --strategy")
+        strategy = next(iter(stats))
+    result = stats[strategy]
+    return TradeList.from_trades(result['trades'], result['starting_balance'],
+                                 start_ms=result.get('backtest_start_ts'), end_ms=result.get('backtest_end_ts'))
+
+
+def report(summary: dict, settings: Perturbation) -> str:
+    table = DataFrame({name: band for name, band in summary['bands'].items()}).T
+    lines = [f"{summary['paths']} paths, {asdict(settings)}",
+             table.to_string(float_format=lambda value: f'{value:.4f}'),
+             f"Probability of ruin (wallet below {1 - settings.ruin:.0%} of start): "
+             f"{summary['ruin_probability']:.2%}"]
+    return '\n'.join(lines)
+
+
+# === COMMAND LINE ===
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Monte Carlo resampling of a backtest trade list')
+    parser.add_argument('--strategy', help='Latest cached backtest of this strategy (or the one in --backtest-file)')
+    parser.add_argument('--cache-key', help='A specific backtest cache entry')
+    parser.add_argument('--cache-dir')
+    parser.add_argument('--backtest-file', help='freqtrade backtest export instead of the cache')
+    parser.add_argument('--paths', type=int, default=20000)
+    parser.add_argument('--shuffle', action='store_true', help='Shuffle the trade order')
+    parser.add_argument('--skip', type=float, default=0.0, help='Probability of skipping each trade')
+    parser.add_argument('--slippage', type=float, default=0.0, help='Std of the slippage per side, as a ratio')
+    parser.add_argument('--fee-jitter', type=float, default=0.0, help='Relative fee rate perturbation')
+    parser.add_argument('--compound', action='store_true', help='Scale stakes with the wallet')
+    parser.add_argument('--ruin', type=float, default=0.5, help='Loss of the starting balance counted as ruin')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the bands and settings as JSON to this file')
+    args = parser.parse_args(argv)
+
+    if not (args.strategy or args.cache_key or args.backtest_file):
+        parser.error('Give --strategy, --cache-key or --backtest-file')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    if args.backtest_file:
+        trades = trades_from_file(args.backtest_file, args.strategy)
+    else:
+        trades = trades_from_cache(args.strategy, args.cache_key, args.cache_dir)
+    settings = Perturbation(shuffle=args.shuffle, skip=args.skip, slippage=args.slippage,
+                            fee_jitter=args.fee_jitter, compound=args.compound, ruin=args.ruin)
+    logger.info(f"{len(trades.profit_ratio)} trades over {trades.days:.1f} days")
+
+    metrics = run_monte_carlo(trades, settings, args.paths, args.seed, args.workers)
+    baseline = simulate(trades, Perturbation(compound=args.compound, ruin=args.ruin), 1, args.seed)
+    summary = summarize(metrics, baseline)
+    print(report(summary, settings))
+    if args.output:
+        Path(args.output).write_text(json.dumps({'settings': asdict(settings), **summary}, indent=2))
+        logger.info(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# --- Parallel Pair Analysis ---
+"""
+Runs populate_indicators/entry/exit for many pairs in parallel inside one bot.
+
+Freqtrade analyzes the whitelist pair by pair in the main loop. Strategies that
+mix in ParallelAnalysisMixin instead hand the pairs that have a new candle to a
+persistent pool of worker processes:
+- the parent copies every pair's OHLCV into one shared-memory buffer
+- workers attach to it, run the strategy's own populate_* methods on their
+  copy of the strategy and send back only the columns they added
+- the parent reassembles the frames in whitelist order and caches them exactly
+  like IStrategy._analyze_ticker_internal() does (validation, dp cache, emit)
+
+Only strategies whose populate_* methods work without self.dp/self.wallets can
+use it. Workers load the strategy through freqtrade's resolver with the bot's
+config, so hyperopt parameter files apply to them too.
+
+Enable per bot in config.json (off by default, bots in a pool share cores):
+
+    "parallel_analysis": {"workers": 4, "min_pairs": 8}
+
+Any pool failure falls back to the serial analysis for the affected pairs.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, concat, to_datetime
+
+from strategy_utils.bounded_history import bounded
+
+logger = logging.getLogger(__name__)
+
+BASE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+class _OhlcvBuffer:
+    """Growable shared-memory block holding int64 dates followed by (rows, 5) float64 OHLCV"""
+
+    def __init__(self):
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.capacity = 0
+
+    def write(self, frames: List[DataFrame]) -> Tuple[str, int, List[Tuple[int, int]]]:
+        """Copy frames into the buffer; returns (name, total rows, [(start, length)])"""
+        total = sum(len(frame) for frame in frames)
+        if total > self.capacity:
+            self.close()
+            self.capacity = int(total * 1.5) + 1024
+            self.shm = shared_memory.SharedMemory(create=True, size=self.capacity * 48)
+
+        dates, ohlcv = _views(self.shm, self.capacity)
+        slices = []
+        start = 0
+        for frame in frames:
+            length = len(frame)
+            dates[start:start + length] = frame['date'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+            ohlcv[start:start + length] = frame[BASE_COLUMNS[1:]].to_numpy(dtype=np.float64)
+            slices.append((start, length))
+            start += length
+        return self.shm.name, self.capacity, slices
+
+    def close(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+            self.capacity = 0
+
+
+def _views(shm: shared_memory.SharedMemory, capacity: int) -> Tuple[np.ndarray, np.ndarray]:
+    dates = np.ndarray((capacity,), dtype=np.int64, buffer=shm.buf)
+    ohlcv = np.ndarray((capacity, 5), dtype=np.float64, buffer=shm.buf, offset=capacity * 8)
+    return dates, ohlcv
+
+
+# === WORKER SIDE ===
+
+_worker_strategy = None
+_worker_buffers: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _init_worker(config: dict) -> None:
+    """Load the bot's strategy once per worker process"""
+    global _worker_strategy
+    from freqtrade.resolvers import StrategyResolver
+
+    logging.basicConfig(level=logging.WARNING)
+    _worker_strategy = StrategyResolver.load_strategy(config)
+    _worker_strategy.dp = None
+    _worker_strategy.ft_bot_start()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    shm = _worker_buffers.get(name)
+    if shm is None:
+        # The buffer is re-created when it grows - drop stale attachments
+        for old in _worker_buffers.values():
+            old.close()
+        _worker_buffers.clear()
+        # Spawned workers share the parent's resource tracker, so attaching here does not
+        # make the block outlive or predecease the parent's unlink()
+        shm = _worker_buffers[name] = shared_memory.SharedMemory(name=name)
+    return shm
+
+
+def _analyze_in_worker(args) -> DataFrame:
+    name, capacity, pair, start, length = args
+    dates, ohlcv = _views(_attach(name), capacity)
+    dataframe = DataFrame(ohlcv[start:start + length].copy(), columns=BASE_COLUMNS[1:])
+    dataframe.insert(0, 'date', to_datetime(dates[start:start + length], unit='ns', utc=True))
+    analyzed = _worker_strategy.analyze_ticker(dataframe, {'pair': pair})
+    return analyzed.drop(columns=BASE_COLUMNS)
+
+
+# === STRATEGY SIDE ===
+
+class ParallelAnalysisMixin:
+    """
+    Mix in before IStrategy to analyze pairs in a process pool:
+
+        class HighFrequencyScalp1m(ParallelAnalysisMixin, IStrategy):
+    """
+
+    parallel_analysis_workers: int = 0      # 0 = serial, overridden by config
+    parallel_analysis_min_pairs: int = 8    # below this the pool is not worth the round trip
+
+    _parallel_pool: Optional[ProcessPoolExecutor] = None
+    _parallel_buffer: Optional[_OhlcvBuffer] = None
+    _parallel_disabled: bool = False
+
+    def analyze(self, pairs: List[str]) -> None:
+        workers = self._parallel_workers()
+        if workers <= 1 or len(pairs) < self._parallel_min_pairs() or self._parallel_disabled:
+            return super().analyze(pairs)
+
+        if self._ft_informative_cache is not None:
+            self._ft_informative_cache.expire()
+
+        from freqtrade.enums import CandleType
+
+        candle_type = self.config.get('candle_type_def', CandleType.SPOT)
+        # IStrategy keeps the last analyzed candle per pair in a private dict; share it so
+        # serial and parallel cycles agree on what is new
+        last_seen = self._IStrategy__last_candle_seen_per_pair
+
+        jobs = []
+        for pair in pairs:
+            dataframe = self.dp.ohlcv(pair, self.timeframe, candle_type=candle_type)
+            if not isinstance(dataframe, DataFrame) or dataframe.empty:
+                logger.warning(f"Empty candle (OHLCV) data for pair {pair}")
+                continue
+            if self.process_only_new_candles and last_seen.get(pair) == dataframe.iloc[-1]['date']:
+                continue
+            jobs.append((pair, dataframe))
+        if not jobs:
+            return
+
+        results = self._run_parallel(jobs, workers)
+        for (pair, dataframe), added in zip(jobs, results):
+            if added is None:
+                self.analyze_pair(pair)
+                continue
+            self._store_analyzed(pair, dataframe, added, candle_type, last_seen)
+
+    def _run_parallel(self, jobs: List[Tuple[str, DataFrame]], workers: int) -> List[Optional[DataFrame]]:
+        """Analyze jobs in the pool; None marks pairs that must be analyzed serially"""
+        try:
+            if self._parallel_pool is None:
+                context = multiprocessing.get_context('spawn')   # the bot process is multithreaded
+                self._parallel_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                          initializer=_init_worker, initargs=(self.config,))
+                self._parallel_buffer = _OhlcvBuffer()
+                logger.info(f"Started parallel analysis pool with {workers} workers")
+
+            name, capacity, slices = self._parallel_buffer.write([frame for _, frame in jobs])
+            futures = [self._parallel_pool.submit(_analyze_in_worker, (name, capacity, pair, start, length))
+                       for (pair, _), (start, length) in zip(jobs, slices)]
+        except Exception as e:
+            logger.error(f"Parallel analysis unavailable, falling back to serial: {e}")
+            self._shutdown_parallel()
+            self._parallel_disabled = True
+            return [None] * len(jobs)
+
+        results = []
+        for (pair, _), future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool as e:
+                logger.error(f"Parallel analysis pool died, analyzing serially this candle: {e}")
+                self._shutdown_parallel()
+                return results + [None] * (len(jobs) - len(results))
+            except Exception as e:
+                logger.warning(f"Parallel analysis failed for {pair}, analyzing serially: {e}")
+                results.append(None)
+        return results
+
+    def _store_analyzed(self, pair: str, dataframe: DataFrame, added: DataFrame, candle_type,
+                        last_seen: dict) -> None:
+        """Cache a worker result the way IStrategy._analyze_ticker_internal() does"""
+        from freqtrade.strategy.strategy_validation import StrategyResultValidator
+
+        validator = StrategyResultValidator(dataframe, warn_only=self.disable_dataframe_checks)
+        added.index = dataframe.index
+        analyzed = concat([dataframe, added], axis=1)
+        validator.assert_df(analyzed)
+        analyzed = bounded(self, pair, analyzed)
+
+        last_seen[pair] = dataframe.iloc[-1]['date']
+        self.dp._set_cached_df(pair, self.timeframe, analyzed, candle_type=candle_type)
+        self.dp._emit_df((pair, self.timeframe, candle_type), analyzed, True)
+
+    def _parallel_workers(self) -> int:
+        settings = self.config.get('parallel_analysis', {})
+        workers = int(settings.get('workers', self.parallel_analysis_workers) or 0)
+        if workers < 0:
+            workers = os.cpu_count() or 1
+        return workers
+
+    def _parallel_min_pairs(self) -> int:
+        return int(self.config.get('parallel_analysis', {}).get('min_pairs', self.parallel_analysis_min_pairs))
+
+    def _shutdown_parallel(self) -> None:
+        if self._parallel_pool is not None:
+            self._parallel_pool.shutdown(wait=False, cancel_futures=True)
+            self._parallel_pool = None
+        if self._parallel_buffer is not None:
+            self._parallel_buffer.close()
+            self._parallel_buffer = None
+
+    def ft_bot_cleanup(self) -> None:
+        self._shutdown_parallel()
+        super().ft_bot_cleanup()
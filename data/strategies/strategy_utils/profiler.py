@@ -0,0 +1,276 @@
+# --- On-Demand Sampling Profiler ---
+"""
+Samples the stacks of a running bot for a few seconds when the orchestrator
+asks for it, to find which bot, strategy method and pair a CPU spike in a
+pool container comes from.
+
+Strategies that mix in ProfilerMixin start one watcher thread per process. It
+only stats the control file every few seconds, so the bot runs at full speed
+while nothing is requested. To profile, write
+
+    <user_data_dir>/profile_request.json   {"seconds": 30, "interval_ms": 10}
+
+(POST /api/bots/:instanceId/profile in the orchestrator does this). The
+watcher removes the request and samples every thread's Python stack via
+sys._current_frames() at the given interval until the time is up. Nothing is
+traced in between samples, so the cost while profiling is one stack walk per
+thread and interval.
+
+Each sample is written in collapsed-stack format, ready for flamegraph.pl or
+speedscope:
+
+    <instance>;<Strategy>;<pair>;<thread>;worker.py:_process;...;DCAStrategy.py:populate_indicators 42
+
+The strategy is the innermost `self` on the stack that is a running strategy
+(so ensemble members show up under their own name), the pair the innermost
+`pair` / `metadata['pair']` local; '-' where there is none. Samples are wall
+clock: a thread waiting for the next loop counts as well, under its waiting
+frame.
+
+Results go to <user_data_dir>/profiles/<UTC time>-<instance>.collapsed (the
+newest PROFILES_KEPT are kept), progress and the last result to
+profiles/status.json. Only live/dry-run bots watch for requests; set
+"profiler": {"enabled": false} in config.json to turn the watcher off.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REQUEST_FILE = 'profile_request.json'
+PROFILES_DIR = 'profiles'
+STATUS_FILE = 'status.json'
+PROFILES_KEPT = 20
+
+POLL_SECONDS = 2.0
+DEFAULT_SECONDS = 30
+MAX_SECONDS = 600
+DEFAULT_INTERVAL_MS = 10
+MIN_INTERVAL_MS = 1
+MAX_DEPTH = 128
+
+
+def instance_id(user_data_dir: Path) -> str:
+    """Pool bots use the bot dir as user data dir, legacy bots its user_data subdir"""
+    return user_data_dir.parent.name if user_data_dir.name == 'user_data' else user_data_dir.name
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def read_request(path: Path) -> Tuple[float, float]:
+    """(seconds, interval in seconds) of a profile request, defaults for missing or bad values"""
+    try:
+        request = json.loads(path.read_text() or '{}')
+    except (OSError, ValueError):
+        request = {}
+    if not isinstance(request, dict):
+        request = {}
+    try:
+        seconds = float(request.get('seconds', DEFAULT_SECONDS))
+    except (TypeError, ValueError):
+        seconds = DEFAULT_SECONDS
+    try:
+        interval_ms = float(request.get('interval_ms', DEFAULT_INTERVAL_MS))
+    except (TypeError, ValueError):
+        interval_ms = DEFAULT_INTERVAL_MS
+    seconds = min(max(seconds, 1.0), MAX_SECONDS)
+    interval_ms = max(interval_ms, MIN_INTERVAL_MS)
+    return seconds, interval_ms / 1000.0
+
+
+# === SAMPLING ===
+
+class StackSampler:
+    """Collapsed stacks of all other threads, tagged with strategy and pair"""
+
+    def __init__(self, instance: str, strategies):
+        self.instance = instance
+        self.strategies = strategies
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[object, str] = {}
+        self._strategy_names: Dict[int, str] = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+            self._labels[code] = label
+        return label
+
+    def _tags(self, frame, strategy: Optional[str], pair: Optional[str]):
+        """Strategy and pair named by one frame's locals, if not already found further in"""
+        varnames = frame.f_code.co_varnames
+        if strategy is None and 'self' in varnames:
+            # By id: `self` may be anything, DataFrames are not even hashable
+            strategy = self._strategy_names.get(id(frame.f_locals.get('self')))
+        if pair is None:
+            if 'pair' in varnames:
+                value = frame.f_locals.get('pair')
+                if isinstance(value, str):
+                    pair = value
+            elif 'metadata' in varnames:
+                value = frame.f_locals.get('metadata')
+                if isinstance(value, dict) and isinstance(value.get('pair'), str):
+                    pair = value['pair']
+        return strategy, pair
+
+    def sample(self, skip: set) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self._strategy_names = {id(strategy): type(strategy).__name__ for strategy in list(self.strategies)}
+        for ident, frame in sys._current_frames().items():
+            if ident in skip:
+                continue
+            stack = []
+            strategy = pair = None
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(self._label(frame.f_code))
+                if strategy is None or pair is None:
+                    strategy, pair = self._tags(frame, strategy, pair)
+                frame = frame.f_back
+            stack.reverse()
+            thread = names.get(ident, str(ident)).replace(';', '_').replace(' ', '_')
+            prefix = [self.instance, strategy or '-', (pair or '-').replace(' ', '_'), thread]
+            self.counts[';'.join(prefix + stack)] += 1
+        self.samples += 1
+
+    def write(self, path: Path) -> None:
+        tmp = path.with_suffix('.tmp')
+        with tmp.open('w') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp, path)
+
+
+# === CONTROL ===
+
+class _ProfilerWatcher:
+    """Process-wide thread waiting for profile requests in one user data dir"""
+
+    def __init__(self, user_data_dir: Path):
+        self.user_data_dir = user_data_dir
+        self.request_path = user_data_dir / REQUEST_FILE
+        self.profiles_dir = user_data_dir / PROFILES_DIR
+        self.instance = instance_id(user_data_dir)
+        self.strategies: weakref.WeakSet = weakref.WeakSet()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-watch', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(POLL_SECONDS):
+            try:
+                if not os.path.exists(self.request_path):
+                    continue
+                seconds, interval = read_request(self.request_path)
+                self.request_path.unlink(missing_ok=True)
+                self._profile(seconds, interval)
+            except Exception as e:
+                logger.warning(f"Profiler failed: {e}")
+
+    def _status(self, **status) -> None:
+        status.update(instance=self.instance, strategies=sorted({type(s).__name__ for s in self.strategies}))
+        _write_json(self.profiles_dir / STATUS_FILE, status)
+
+    def _profile(self, seconds: float, interval: float) -> None:
+        self.profiles_dir.mkdir(parents=True, exist_ok=True)
+        started = datetime.now(timezone.utc)
+        name = f"{started.strftime('%Y%m%dT%H%M%SZ')}-{self.instance}.collapsed"
+        common = dict(file=name, started_at=started.isoformat(), seconds=seconds,
+                      interval_ms=round(interval * 1000, 3))
+        self._status(state='running', **common)
+        logger.info(f"Profiling for {seconds:.0f}s every {interval * 1000:.0f}ms")
+
+        sampler = StackSampler(self.instance, self.strategies)
+        skip = {threading.get_ident()}
+        deadline = time.monotonic() + seconds
+        next_sample = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                time.sleep(next_sample - now)
+            sampler.sample(skip)
+            next_sample += interval
+            # Behind schedule (GIL held by a long C call): skip rather than burst
+            next_sample = max(next_sample, time.monotonic())
+
+        sampler.write(self.profiles_dir / name)
+        self._prune()
+        self._status(state='done', finished_at=datetime.now(timezone.utc).isoformat(),
+                     samples=sampler.samples, stacks=len(sampler.counts), **common)
+        logger.info(f"Profile written to {PROFILES_DIR}/{name} ({sampler.samples} samples)")
+
+    def _prune(self) -> None:
+        profiles = sorted(self.profiles_dir.glob('*.collapsed'))
+        for old in profiles[:-PROFILES_KEPT]:
+            old.unlink(missing_ok=True)
+
+
+_watcher: Optional[_ProfilerWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def register(strategy) -> None:
+    """Start the process' watcher (once) and tag samples under strategy"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = _ProfilerWatcher(Path(strategy.config['user_data_dir']))
+        _watcher.strategies.add(strategy)
+
+
+def unregister(strategy) -> None:
+    """Stop the watcher once its last strategy is cleaned up"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            return
+        _watcher.strategies.discard(strategy)
+        if not len(_watcher.strategies):
+            _watcher.close()
+            _watcher = None
+
+
+class ProfilerMixin:
+    """
+    Mix in before IStrategy:
+
+        class DCAStrategy(ProfilerMixin, IStrategy):
+    """
+
+    def ft_bot_start(self, **kwargs) -> None:
+        super().ft_bot_start(**kwargs)
+        if self._profiler_enabled():
+            register(self)
+
+    def ft_bot_cleanup(self) -> None:
+        unregister(self)
+        super().ft_bot_cleanup()
+
+    def _profiler_enabled(self) -> bool:
+        if not self.config.get('profiler', {}).get('enabled', True):
+            return False
+        dp = getattr(self, 'dp', None)
+        try:
+            return dp is not None and dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            return False
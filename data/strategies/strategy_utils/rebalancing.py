@@ -0,0 +1,130 @@
+# --- Portfolio Rebalancing Solver ---
+"""
+Turns category targets and the open positions into one rebalancing plan for
+the whole portfolio.
+
+Deciding pair by pair (is this pair's category off target? then buy / sell
+it) re-derives the same category drift for every pair and signals every pair
+of an off-target category at once: a category 20% over target exits all of
+its trades, lands under target and is bought back on the next candle.
+solve_rebalance() looks at the portfolio once:
+
+- category values and drift from one bincount over all pairs; free balance
+  counts as 'stable'
+- categories drifting more than `threshold` from target get orders worth the
+  gap:
+  buys   go to whitelisted pairs of the category with the most room under
+         max_position first, each capped at that room; new positions must
+         reach min_position
+  sells  close the category's largest positions first (strategy exits close
+         whole trades), skipping any that would push the category below
+         target by more than the threshold
+- orders smaller than min_amount are dropped
+
+The strategy keeps a plan until it is `frequency` old, timed by candles:
+created_at is the open time of the newest closed candle, whether the plan was
+solved in populate_*_trend() or a callback, so live bots and backtests age it
+the same way. Callbacks only look up their pair's order and mark it done once
+confirmed, so an order is placed at most once per plan.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class RebalanceOrder:
+    """Stake to buy (amount > 0) or position to close (amount < 0) for one pair"""
+    pair: str
+    category: str
+    amount: float
+    reason: str
+
+
+@dataclass
+class RebalancePlan:
+    """Orders for one rebalancing period"""
+    created_at: datetime             # open time of the candle it was solved on
+    total_value: float
+    allocations: Dict[str, float]
+    targets: Dict[str, float]
+    orders: Dict[str, RebalanceOrder] = field(default_factory=dict)
+
+    def order_for(self, pair: str) -> Optional[RebalanceOrder]:
+        return self.orders.get(pair)
+
+    def done(self, pair: str) -> None:
+        """Order was placed - do not signal it again during this plan"""
+        self.orders.pop(pair, None)
+
+
+def solve_rebalance(positions: Dict[str, float], candidates: Iterable[str],
+                    category_of: Callable[[str], str], targets: Dict[str, float],
+                    total_value: float, threshold: float, min_amount: float,
+                    max_position: float, min_position: float,
+                    created_at: datetime) -> RebalancePlan:
+    """
+    positions    stake currently held per pair
+    candidates   pairs that may be bought (the whitelist)
+    targets      category -> target share of total_value
+    max_position / min_position are shares of total_value
+    """
+    categories = list(targets)
+    candidates = set(candidates)
+    pairs: List[str] = list(dict.fromkeys([*positions, *sorted(candidates)]))
+    cat_index = {category: i for i, category in enumerate(categories)}
+    cats = np.array([cat_index.get(category_of(pair), cat_index.get('other', 0)) for pair in pairs],
+                    dtype=np.int64)
+    values = np.array([positions.get(pair, 0.0) for pair in pairs], dtype=np.float64)
+    buyable = np.array([pair in candidates for pair in pairs], dtype=bool)
+
+    category_values = np.bincount(cats, weights=values, minlength=len(categories))
+    if 'stable' in cat_index:
+        category_values[cat_index['stable']] += max(total_value - values.sum(), 0.0)
+    target = np.array([targets[category] for category in categories], dtype=np.float64)
+    allocation = category_values / total_value if total_value > 0 else np.zeros(len(categories))
+    drift = allocation - target
+    gap = -drift * total_value
+    active = (np.abs(drift) > threshold) & (target > 0) & (np.abs(gap) >= min_amount)
+
+    plan = RebalancePlan(created_at=created_at, total_value=total_value,
+                         allocations=dict(zip(categories, allocation.tolist())),
+                         targets=dict(zip(categories, target.tolist())))
+    if total_value <= 0 or not active.any():
+        return plan
+
+    # Buys: fill the pairs with the most room first, vectorized per category via cumulative room
+    room = np.clip(max_position * total_value - values, 0.0, None) * buyable
+    order = np.lexsort((-room, cats))
+    sorted_cats, sorted_room = cats[order], room[order]
+    room_before = np.cumsum(sorted_room) - sorted_room
+    starts = np.searchsorted(sorted_cats, sorted_cats)
+    room_before -= room_before[starts]
+    wanted = np.where(active & (gap > 0), gap, 0.0)[sorted_cats]
+    buy = np.clip(wanted - room_before, 0.0, sorted_room)
+    floor = np.where(values[order] > 0, min_amount, max(min_amount, min_position * total_value))
+    for i in np.flatnonzero(buy >= floor):
+        pair, category = pairs[order[i]], categories[sorted_cats[i]]
+        c = cat_index[category]
+        plan.orders[pair] = RebalanceOrder(
+            pair, category, float(buy[i]),
+            f"{category} {allocation[c]:.1%} vs target {target[c]:.1%}, buy {buy[i]:.2f}")
+
+    # Sells: whole positions, largest first, without overshooting below target - threshold
+    for c in np.flatnonzero(active & (gap < 0)):
+        excess = -gap[c]
+        slack = threshold * total_value
+        held = np.flatnonzero((cats == c) & (values > 0))
+        for i in held[np.argsort(-values[held], kind='stable')]:
+            if excess < min_amount:
+                break
+            if values[i] < min_amount or values[i] > excess + slack:
+                continue
+            excess -= values[i]
+            plan.orders[pairs[i]] = RebalanceOrder(
+                pairs[i], categories[c], -float(values[i]),
+                f"{categories[c]} {allocation[c]:.1%} vs target {target[c]:.1%}, "
+                f"close {values[i]:.2f}")
+    return plan
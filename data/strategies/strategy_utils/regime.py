@@ -0,0 +1,405 @@
+# --- Shared Market Regime Service ---
+"""
+Per-pair and market-wide regime labels, computed once per candle and shared by
+every bot in a container pool.
+
+Several strategies derive the same trend/regime columns from ADX/DI and a
+trend EMA for every pair in every bot. RegimeService computes them in one
+place:
+
+    regime      0 uncertain, 1 uptrend, 2 downtrend, 3 range
+                (ADX above trend_threshold with +DI/-DI deciding the side,
+                ADX below range_threshold = range)
+    adx, plus_di, minus_di
+    trend_direction / trend_strength   close vs the ema_period EMA
+
+and publishes each pair's series to a shared-memory board per exchange,
+candle type and timeframe, one slot per pair. Pool bots run as separate
+freqtrade processes in the same container; a bot that finds a pair's current
+candle on the board copies the labels instead of computing them. ADX and the
+EMA are recursive, so the values depend on where the history starts: each
+series is stored with the first candle and a hash of the high/low/close
+columns and the parameters it was computed from, and a bot only copies it
+when its own dataframe starts on the same candle and hashes the same - the
+columns are then exactly the ones the bot would have computed itself.
+Otherwise it computes locally (and publishes over the slot). The board keeps
+the newest `rows` candles per pair.
+
+Backtesting and hyperopt compute everything locally. Boards live in /dev/shm
+(about 11 MB each with the defaults); every board records the pids of the
+bots attached to it, and strategies that mix in RegimeServiceMixin detach in
+ft_bot_cleanup(), unlinking the board when the last attached bot is gone.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+import talib.abstract as ta
+
+logger = logging.getLogger(__name__)
+
+UNCERTAIN, UPTREND, DOWNTREND, RANGE = 0, 1, 2, 3
+FIELDS = ('regime', 'adx', 'plus_di', 'minus_di', 'trend_direction', 'trend_strength')
+
+_MAGIC = 0x52474D32   # "RGM2"
+_HEADER = 4           # int64: magic, slots, rows, fields
+_USERS = 64           # int64 pids of the attached bots
+
+# Boards this process has attached to: name -> [board, services using it]
+_open_boards: Dict[str, list] = {}
+
+
+def compute_regime(dataframe: DataFrame, adx_period: int = 14, trend_threshold: float = 25,
+                   range_threshold: float = 20, ema_period: int = 75) -> Dict[str, np.ndarray]:
+    """Regime columns for one pair's candles"""
+    adx = ta.ADX(dataframe, timeperiod=adx_period).to_numpy(dtype=np.float64)
+    plus_di = ta.PLUS_DI(dataframe, timeperiod=adx_period).to_numpy(dtype=np.float64)
+    minus_di = ta.MINUS_DI(dataframe, timeperiod=adx_period).to_numpy(dtype=np.float64)
+    ema = ta.EMA(dataframe, timeperiod=ema_period).to_numpy(dtype=np.float64)
+    close = dataframe['close'].to_numpy(dtype=np.float64)
+
+    trending = adx > trend_threshold
+    regime = np.full(len(close), UNCERTAIN, dtype=np.float64)
+    regime[trending & (plus_di > minus_di)] = UPTREND
+    regime[trending & (minus_di > plus_di)] = DOWNTREND
+    regime[adx < range_threshold] = RANGE
+
+    return {
+        'regime': regime,
+        'adx': adx,
+        'plus_di': plus_di,
+        'minus_di': minus_di,
+        'trend_direction': np.where(close > ema, 1.0, -1.0),
+        'trend_strength': np.abs(close - ema) / close,
+    }
+
+
+class RegimeBoard:
+    """
+    Shared-memory table of label series, one slot per pair.
+    Slots are claimed under a file lock; each slot has a sequence counter that
+    is odd while a writer is updating it, so readers can detect torn reads.
+    """
+
+    def __init__(self, name: str, slots: int = 128, rows: int = 1500):
+        self.name = name
+        size = 8 * (_HEADER + _USERS + 5 * slots + slots * rows * (1 + len(FIELDS)))
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        with self._locked():
+            try:
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                created = True
+            except FileExistsError:
+                self.shm = shared_memory.SharedMemory(name=name)
+                created = False
+            # The board outlives the bot that created it - other pool bots still use it
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+
+            header = np.ndarray((_HEADER,), dtype=np.int64, buffer=self.shm.buf)
+            if created:
+                header[:] = (_MAGIC, slots, rows, len(FIELDS))
+            elif header[0] != _MAGIC or header[3] != len(FIELDS):
+                raise ValueError(f"Shared memory block {name} is not a regime board")
+            self.slots, self.rows = int(header[1]), int(header[2])
+            self.users = np.ndarray((_USERS,), dtype=np.int64, buffer=self.shm.buf, offset=_HEADER * 8)
+            self._attach()
+
+        offset = (_HEADER + _USERS) * 8
+        self.keys = np.ndarray((self.slots,), dtype=np.uint64, buffer=self.shm.buf, offset=offset)
+        offset += self.slots * 8
+        self.seq = np.ndarray((self.slots,), dtype=np.int64, buffer=self.shm.buf, offset=offset)
+        offset += self.slots * 8
+        self.length = np.ndarray((self.slots,), dtype=np.int64, buffer=self.shm.buf, offset=offset)
+        offset += self.slots * 8
+        self.origin = np.ndarray((self.slots,), dtype=np.int64, buffer=self.shm.buf, offset=offset)
+        offset += self.slots * 8
+        self.digest = np.ndarray((self.slots,), dtype=np.uint64, buffer=self.shm.buf, offset=offset)
+        offset += self.slots * 8
+        self.dates = np.ndarray((self.slots, self.rows), dtype=np.int64, buffer=self.shm.buf, offset=offset)
+        offset += self.slots * self.rows * 8
+        self.values = np.ndarray((self.slots, self.rows, len(FIELDS)), dtype=np.float64,
+                                 buffer=self.shm.buf, offset=offset)
+        self._slot_cache: Dict[str, int] = {}
+
+    def read(self, pair: str) -> Optional[Tuple[np.ndarray, np.ndarray, int, int]]:
+        """
+        (dates, values, origin, digest) of a pair's series, None if absent or being
+        written. origin and digest identify the candle history the series came from.
+        """
+        slot = self._find(pair)
+        if slot is None:
+            return None
+        for _ in range(3):
+            before = int(self.seq[slot])
+            if before % 2:
+                time.sleep(0)
+                continue
+            length = int(self.length[slot])
+            dates = self.dates[slot, :length].copy()
+            values = self.values[slot, :length].copy()
+            origin, digest = int(self.origin[slot]), int(self.digest[slot])
+            if int(self.seq[slot]) == before:
+                return dates, values, origin, digest
+        return None
+
+    def last_date(self, pair: str) -> Optional[int]:
+        slot = self._find(pair)
+        if slot is None or self.length[slot] == 0:
+            return None
+        return int(self.dates[slot, self.length[slot] - 1])
+
+    def write(self, pair: str, dates: np.ndarray, values: np.ndarray, origin: int, digest: int) -> None:
+        slot = self._find(pair, claim=True)
+        if slot is None:
+            return
+        dates, values = dates[-self.rows:], values[-self.rows:]
+        with self._locked():   # two bots may publish the same pair on the same candle
+            self.seq[slot] += 1
+            self.dates[slot, :len(dates)] = dates
+            self.values[slot, :len(dates)] = values
+            self.length[slot] = len(dates)
+            self.origin[slot] = origin
+            self.digest[slot] = digest
+            self.seq[slot] += 1
+
+    def close(self) -> None:
+        """Detach this process; the last attached bot unlinks the board"""
+        with self._locked():
+            self.users[self.users == os.getpid()] = 0
+            self._prune_users()
+            unlink = not self.users.any()
+            if unlink:
+                try:
+                    # unlink() unregisters from the resource tracker, which __init__ already did
+                    resource_tracker.register(self.shm._name, 'shared_memory')
+                    self.shm.unlink()
+                except FileNotFoundError:
+                    pass
+        del self.keys, self.seq, self.length, self.origin, self.digest, self.dates, self.values, self.users
+        self.shm.close()
+        if unlink:
+            logger.info(f"Unlinked regime board {self.name}")
+
+    @classmethod
+    def open(cls, name: str, slots: int = 128, rows: int = 1500) -> 'RegimeBoard':
+        """Attach to a board, shared by all services of this process"""
+        entry = _open_boards.get(name)
+        if entry is None:
+            entry = _open_boards[name] = [cls(name, slots, rows), 0]
+        entry[1] += 1
+        return entry[0]
+
+    def release(self) -> None:
+        """Counterpart of open(); the board is closed when no service of this process uses it"""
+        entry = _open_boards.get(self.name)
+        if entry is None or entry[0] is not self:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _open_boards[self.name]
+            self.close()
+
+    def _attach(self) -> None:
+        """Record this process as a user (caller holds the lock)"""
+        self._prune_users()
+        if (self.users == os.getpid()).any():
+            return
+        free = np.flatnonzero(self.users == 0)
+        if len(free):
+            self.users[free[0]] = os.getpid()
+        else:
+            logger.warning(f"Regime board {self.name} tracks {_USERS} bots already, it may be unlinked early")
+
+    def _prune_users(self) -> None:
+        """Forget pids of bots that exited without detaching"""
+        for index in np.flatnonzero(self.users):
+            try:
+                os.kill(int(self.users[index]), 0)
+            except ProcessLookupError:
+                self.users[index] = 0
+            except PermissionError:
+                pass
+
+    def _find(self, pair: str, claim: bool = False) -> Optional[int]:
+        slot = self._slot_cache.get(pair)
+        if slot is not None:
+            return slot
+        key = pair_key(pair)
+        found = np.flatnonzero(self.keys == key)
+        if not len(found) and claim:
+            with self._locked():
+                found = np.flatnonzero(self.keys == key)
+                if not len(found):
+                    free = np.flatnonzero(self.keys == 0)
+                    if not len(free):
+                        logger.warning(f"Regime board {self.name} is full, not sharing {pair}")
+                        return None
+                    self.length[free[0]] = 0
+                    self.keys[free[0]] = key
+                    found = free[:1]
+        if not len(found):
+            return None
+        self._slot_cache[pair] = int(found[0])
+        return self._slot_cache[pair]
+
+    def _locked(self):
+        return _FileLock(self._lock_path)
+
+
+class _FileLock:
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+
+
+def pair_key(pair: str) -> np.uint64:
+    key = int.from_bytes(hashlib.blake2b(pair.encode(), digest_size=8).digest(), 'little')
+    return np.uint64(key or 1)
+
+
+class RegimeService:
+    """Regime columns for a strategy's pairs, shared through a RegimeBoard in live/dry-run"""
+
+    def __init__(self, timeframe: str, adx_period: int = 14, trend_threshold: float = 25,
+                 range_threshold: float = 20, ema_period: int = 75, board: Optional[RegimeBoard] = None,
+                 exchange: str = '', candle_type: str = 'spot'):
+        self.timeframe = timeframe
+        self.exchange = exchange
+        self.candle_type = candle_type
+        self.params = dict(adx_period=adx_period, trend_threshold=trend_threshold,
+                           range_threshold=range_threshold, ema_period=ema_period)
+        self.board = board
+        self.hits = 0
+        self.computed = 0
+
+    @classmethod
+    def for_strategy(cls, strategy, **params) -> 'RegimeService':
+        """
+        Service for a strategy and parameter set, shared through the pool's board for the
+        strategy's timeframe when running live/dry-run. Cached on the strategy, so it can be called from
+        populate_indicators() with the current (hyperoptable) parameter values.
+        """
+        services = strategy.__dict__.setdefault('_regime_services', {})
+        cache_key = tuple(sorted(params.items()))
+        if cache_key not in services:
+            services[cache_key] = cls._create(strategy, **params)
+        return services[cache_key]
+
+    @classmethod
+    def _create(cls, strategy, **params) -> 'RegimeService':
+        config = strategy.config
+        settings = config.get('regime_service', {})
+        service = cls(strategy.timeframe, exchange=config.get('exchange', {}).get('name', ''),
+                      candle_type=str(config.get('candle_type_def', 'spot')), **params)
+        dp = getattr(strategy, 'dp', None)
+        try:
+            live = dp is not None and dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            live = False
+        if live and settings.get('enabled', True):
+            try:
+                service.board = RegimeBoard.open(service.board_name(), settings.get('slots', 128),
+                                                 settings.get('rows', 1500))
+            except Exception as e:
+                logger.warning(f"Regime board unavailable, computing regimes locally: {e}")
+        return service
+
+    @staticmethod
+    def release(strategy) -> None:
+        """Detach the boards of every service for_strategy() created on this strategy"""
+        for service in strategy.__dict__.pop('_regime_services', {}).values():
+            if service.board is not None:
+                service.board.release()
+                service.board = None
+
+    def board_name(self) -> str:
+        scope = [self.exchange.lower(), self.candle_type]
+        digest = hashlib.blake2b(repr(scope).encode(), digest_size=6).hexdigest()
+        return f"ft_regime_{self.timeframe}_{digest}"
+
+    def apply(self, dataframe: DataFrame, pair: str, columns=FIELDS) -> DataFrame:
+        """Add the regime columns (all of FIELDS by default) to a pair's dataframe"""
+        values = self._from_board(pair, dataframe)
+        if values is None:
+            values = compute_regime(dataframe, **self.params)
+            self.computed += 1
+            self._publish(pair, dataframe, values)
+        for column in columns:
+            if column in ('regime', 'trend_direction'):
+                dataframe[column] = values[column].astype(np.int64)
+            else:
+                dataframe[column] = values[column]
+        return dataframe
+
+    def stats(self) -> dict:
+        return {'board_hits': self.hits, 'computed': self.computed}
+
+    def _from_board(self, pair: str, dataframe: DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        if self.board is None or dataframe.empty:
+            return None
+        dates = _epoch_seconds(dataframe)
+        if self.board.last_date(pair) != dates[-1]:
+            return None
+        series = self.board.read(pair)
+        if series is None:
+            return None
+        board_dates, board_values, origin, digest = series
+        # Recursive indicators only match when computed from the same candles and parameters
+        if origin != dates[0] or digest != candles_digest(dataframe, self.params):
+            return None
+        rows = np.searchsorted(board_dates, dates)
+        if rows[0] >= len(board_dates) or rows[-1] >= len(board_dates) \
+                or not np.array_equal(board_dates[rows], dates):
+            return None
+        self.hits += 1
+        return {name: board_values[rows, idx] for idx, name in enumerate(FIELDS)}
+
+    def _publish(self, pair: str, dataframe: DataFrame, values: Dict[str, np.ndarray]) -> None:
+        if self.board is None or dataframe.empty:
+            return
+        dates = _epoch_seconds(dataframe)
+        last = self.board.last_date(pair)
+        if last is not None and last > dates[-1]:
+            return
+        self.board.write(pair, dates, np.column_stack([values[name] for name in FIELDS]),
+                         int(dates[0]), candles_digest(dataframe, self.params))
+
+
+class RegimeServiceMixin:
+    """
+    Mix in before IStrategy in strategies that use RegimeService, so the bot
+    detaches from the pool's regime boards when it stops:
+
+        class PortfolioRebalancingStrategy(RegimeServiceMixin, IStrategy):
+    """
+
+    def ft_bot_cleanup(self) -> None:
+        RegimeService.release(self)
+        super().ft_bot_cleanup()
+
+
+def candles_digest(dataframe: DataFrame, params: dict) -> int:
+    """Hash of the high/low/close columns and the parameters regimes are computed from"""
+    digest = hashlib.blake2b(repr(sorted(params.items())).encode(), digest_size=8)
+    for column in ('high', 'low', 'close'):
+        digest.update(np.ascontiguousarray(dataframe[column].to_numpy(dtype=np.float64)).tobytes())
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def _epoch_seconds(dataframe: DataFrame) -> np.ndarray:
+    return dataframe['date'].to_numpy(dtype='datetime64[s]').astype(np.int64)
@@ -0,0 +1,128 @@
+# --- Risk-Parity Stake Sizing ---
+"""
+Inverse-volatility (risk-parity) stake weights for the whole whitelist,
+recomputed once per candle and read in O(1) from custom_stake_amount.
+
+Sizing so far looked at one pair at a time (EnhancedRiskManagedStrategy
+scales by that pair's rolling price_volatility, the orchestrator's
+UniversalRiskManager.calculateVolatility fetches candles per pair over the
+API), so a stake was never relative to what the bot's other pairs risk.
+RiskParitySizer takes the analyzed candles the bot already holds, aligns the
+last `candles` log returns of all pairs into one matrix and computes every
+pair's EWMA volatility (RiskMetrics style, zero mean, `halflife` candles) in
+a single weighted matrix product. From those:
+
+    weight(pair)      (1 / vol) / sum(1 / vol) over the pairs with a volatility
+    multiplier(pair)  weight * number of pairs: 1.0 for a pair of average
+                      risk, below 1 for riskier ones - scale a base stake by it
+    volatility(pair)  annualized EWMA volatility
+
+so equal base stakes carry roughly equal risk. Lookups recompute first only
+when current_time has moved to a new candle, so they work the same in live
+and in backtesting (where the analyzed dataframes end at the simulated
+candle). Pairs without enough history get None.
+
+    sizer = RiskParitySizer.for_strategy(self)
+    stake = base_stake * clip(sizer.multiplier(pair, current_time) or 1.0, 0.5, 2.0)
+
+Settings come from the "risk_parity" block in config.json:
+    halflife     EWMA half-life in candles (default 48)
+    candles      returns looked at (default 4 x halflife)
+    min_periods  returns a pair needs before it gets a weight (default 20)
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import numpy as np
+
+from strategy_utils.correlation import SECONDS_PER_YEAR, aligned_log_returns, whitelist_frames
+
+logger = logging.getLogger(__name__)
+
+
+def ewma_volatility(returns: np.ndarray, halflife: float, min_periods: int = 20) -> np.ndarray:
+    """
+    Per-column EWMA volatility of a (candles, pairs) return matrix, newest row
+    last; NaN returns are skipped and columns with fewer than min_periods
+    valid returns give NaN.
+    """
+    decay = 0.5 ** (1.0 / halflife)
+    weights = decay ** np.arange(len(returns) - 1, -1, -1, dtype=np.float64)
+    valid = np.isfinite(returns)
+    squared = np.where(valid, returns, 0.0) ** 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (weights @ squared) / (weights @ valid)
+    variance[valid.sum(axis=0) < min_periods] = np.nan
+    return np.sqrt(variance)
+
+
+class RiskParitySizer:
+    """Inverse-volatility weights of a strategy's whitelist, refreshed once per candle"""
+
+    def __init__(self, dp, timeframe: str, halflife: float = 48, candles: Optional[int] = None,
+                 min_periods: int = 20):
+        from freqtrade.exchange import timeframe_to_seconds
+
+        self.dp = dp
+        self.timeframe = timeframe
+        self.halflife = halflife
+        self.candles = candles or int(4 * halflife)
+        self.min_periods = min_periods
+        self.periods_per_year = SECONDS_PER_YEAR / timeframe_to_seconds(timeframe)
+        self._candle: Optional[datetime] = None
+        self._volatility: Dict[str, float] = {}
+        self._weight: Dict[str, float] = {}
+
+    @classmethod
+    def for_strategy(cls, strategy) -> 'RiskParitySizer':
+        """Sizer for a strategy's timeframe, created once and cached on the strategy"""
+        sizer = strategy.__dict__.get('_risk_parity_sizer')
+        if sizer is None:
+            settings = strategy.config.get('risk_parity', {})
+            sizer = strategy._risk_parity_sizer = cls(
+                strategy.dp, strategy.timeframe,
+                halflife=settings.get('halflife', 48), candles=settings.get('candles'),
+                min_periods=settings.get('min_periods', 20))
+        return sizer
+
+    def refresh(self) -> None:
+        """Recompute every pair's volatility and weight from the analyzed candles"""
+        frames = whitelist_frames(self.dp, self.timeframe)
+        if not frames:
+            return
+        returns = aligned_log_returns(frames, self.candles).tail(self.candles)
+        volatility = ewma_volatility(returns.to_numpy(), self.halflife, self.min_periods)
+        known = np.isfinite(volatility) & (volatility > 0)
+        inverse = np.where(known, 1.0 / np.where(known, volatility, 1.0), 0.0)
+        weights = inverse / inverse.sum() if known.any() else inverse
+        pairs = returns.columns
+        self._volatility = {pairs[i]: float(volatility[i]) for i in np.flatnonzero(known)}
+        self._weight = {pairs[i]: float(weights[i]) for i in np.flatnonzero(known)}
+
+    def _maybe_refresh(self, current_time: Optional[datetime]) -> None:
+        from freqtrade.exchange import timeframe_to_prev_date
+
+        candle = timeframe_to_prev_date(self.timeframe, current_time or datetime.now(timezone.utc))
+        if candle != self._candle:
+            self.refresh()
+            self._candle = candle
+
+    # === LOOKUPS ===
+
+    def weight(self, pair: str, current_time: Optional[datetime] = None) -> Optional[float]:
+        """Risk-parity share of the pair, weights of all known pairs sum to 1"""
+        self._maybe_refresh(current_time)
+        return self._weight.get(pair)
+
+    def multiplier(self, pair: str, current_time: Optional[datetime] = None) -> Optional[float]:
+        """Stake multiplier relative to an average-risk pair (weight x number of pairs)"""
+        self._maybe_refresh(current_time)
+        weight = self._weight.get(pair)
+        return None if weight is None else weight * len(self._weight)
+
+    def volatility(self, pair: str, current_time: Optional[datetime] = None) -> Optional[float]:
+        """Annualized EWMA volatility of the pair's candle returns"""
+        self._maybe_refresh(current_time)
+        volatility = self._volatility.get(pair)
+        return None if volatility is None else float(volatility * np.sqrt(self.periods_per_year))
@@ -0,0 +1,238 @@
+# --- Vectorized Pair Pre-Screener ---
+"""
+Skips full analysis of pairs that cannot enter on the current candle.
+
+Every candle freqtrade runs populate_indicators/entry/exit for every whitelist
+pair, including pairs without volume and pairs that fail the strategy's basic
+filter - DCAStrategy never enters below sma_200, HighFrequencyScalp1m never
+without ema_fast > ema_slow and ADX > 25. Strategies that mix in
+PairScreenerMixin declare such a necessary precondition:
+
+    screener_indicators = BatchIndicators().sma('sma_200', 200)
+
+    def entry_precondition(self, latest):
+        return (latest['volume'] > 0) & (latest['close'] > latest['sma_200'])
+
+Once per candle the mixin stacks the candles of all whitelist pairs, computes
+the declared indicators for all of them in one vectorized pass
+(BatchIndicators) and calls entry_precondition() once with the latest candle
+of every pair: `latest` maps open/high/low/close/volume and each indicator
+column to an array with one value per pair. Only pairs that pass, and pairs
+with an open trade, are analyzed in full; a strategy that applies the same
+BatchIndicators in populate_indicators reuses the screener's values for them.
+The others get a placeholder as
+analyzed dataframe: their candles with empty signals, the indicator columns of
+the pair's last full analysis on the candles it covered, and the screener
+indicators. Its `screened_out` column is 1 on the candles that were not
+analyzed in full, so charts and callbacks (e.g. on a forced entry) can tell
+placeholder rows from analyzed ones; the strategy's other indicators are NaN
+there.
+
+The precondition must be necessary, not sufficient: whatever it screens out
+could not have entered on that candle. Pairs whose screener indicators are
+still NaN (too little history) are analyzed in full.
+
+The active set is written to user_data/pair_screener.json on every new candle;
+the orchestrator serves it at GET /api/bots/:instanceId/screener.
+
+Only live/dry-run bots are screened. Backtesting, hyperopt and plotting
+analyze every pair.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from pandas import DataFrame
+
+from strategy_utils.batch_indicators import BatchIndicators
+from strategy_utils.bounded_history import bounded
+
+logger = logging.getLogger(__name__)
+
+CANDLE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+STATE_FILE = 'pair_screener.json'
+SCREENED_OUT_COLUMN = 'screened_out'
+
+
+class PairScreenerMixin:
+    """
+    Mix in before IStrategy:
+
+        class HighFrequencyScalp1m(PairScreenerMixin, IStrategy):
+            screener_indicators = BatchIndicators().ema('ema_fast', 50).ema('ema_slow', 200)
+
+            def entry_precondition(self, latest):
+                return latest['ema_fast'] > latest['ema_slow']
+    """
+
+    pair_screening: bool = True
+    screener_indicators: Optional[BatchIndicators] = None
+
+    _screener_key: Optional[tuple] = None
+    _screener_passed: Set[str] = set()
+    _screener_series: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def entry_precondition(self, latest: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Per pair: can the latest candle carry an entry signal? Must hold whenever
+        populate_entry_trend() would enter; the default screens nothing out.
+        """
+        return np.ones(len(latest['close']), dtype=bool)
+
+    def analyze(self, pairs) -> None:
+        if not self._screening_enabled():
+            return super().analyze(pairs)
+        active = self.screen_pairs(pairs)
+        super().analyze([pair for pair in pairs if pair in active])
+
+    def screen_pairs(self, pairs: List[str]) -> Set[str]:
+        """Pairs that need full analysis now; publishes empty signals for the rest"""
+        from freqtrade.enums import CandleType
+
+        candle_type = self.config.get('candle_type_def', CandleType.SPOT)
+        frames: Dict[str, DataFrame] = {}
+        for pair in pairs:
+            dataframe = self.dp.ohlcv(pair, self.timeframe, candle_type=candle_type, copy=False)
+            if isinstance(dataframe, DataFrame) and not dataframe.empty:
+                frames[pair] = dataframe
+
+        key = tuple((pair, len(frame), frame['date'].iloc[-1]) for pair, frame in frames.items())
+        new_candle = key != self._screener_key
+        if new_candle:
+            self._screener_key = key
+            self._screener_passed = self._evaluate(frames)
+
+        open_pairs = self._screener_open_pairs()
+        if open_pairs is None:
+            return set(pairs)
+        # pairs without candles go through so freqtrade reports them as usual
+        active = {pair for pair in pairs
+                  if pair not in frames or pair in self._screener_passed or pair in open_pairs}
+
+        if new_candle:
+            last_seen = self._IStrategy__last_candle_seen_per_pair
+            for pair in frames:
+                if pair not in active:
+                    self.dp._set_cached_df(pair, self.timeframe,
+                                           bounded(self, pair, self._placeholder(pair, frames[pair])),
+                                           candle_type=candle_type)
+                    # analyze in full as soon as the pair gets a trade (e.g. a forced entry)
+                    last_seen.pop(pair, None)
+            logger.info(f"Pair screener: {len(self._screener_passed)}/{len(frames)} pairs pass the "
+                        f"entry precondition, analyzing {len(active)} "
+                        f"({len(open_pairs & set(pairs))} with open trades)")
+            self._write_screener_state(pairs, frames, active, open_pairs)
+        return active
+
+    def _evaluate(self, frames: Dict[str, DataFrame]) -> Set[str]:
+        """Pairs whose latest candle passes entry_precondition(), all evaluated at once"""
+        pairs = list(frames)
+        self._screener_series = {}
+        if not pairs:
+            return set()
+        candles = [frames[pair] for pair in pairs]
+        latest = {column: np.array([frame[column].iat[-1] for frame in candles], dtype=np.float64)
+                  for column in CANDLE_COLUMNS}
+        unknown = np.zeros(len(pairs), dtype=bool)
+        if self.screener_indicators is not None:
+            # filling the indicators' cache too, so a strategy applying the same
+            # BatchIndicators in populate_indicators does not compute them again
+            self._screener_series = self.screener_indicators.pair_series(frames)
+            indicators = {column: np.array([self._screener_series[pair][column][-1] for pair in pairs],
+                                           dtype=np.float64)
+                          for column in self.screener_indicators.columns}
+            for values in indicators.values():
+                unknown |= np.isnan(values)
+            latest.update(indicators)
+        try:
+            with np.errstate(invalid='ignore'):
+                passed = np.asarray(self.entry_precondition(latest), dtype=bool) | unknown
+        except Exception as e:
+            logger.warning(f"Pair screener precondition failed, analyzing all pairs: {e}")
+            return set(pairs)
+        return {pair for pair, ok in zip(pairs, passed) if ok}
+
+    def _placeholder(self, pair: str, candles: DataFrame) -> DataFrame:
+        """Analyzed dataframe of a screened-out pair, see the module docstring"""
+        frame = _without_signals(candles)
+        screened_out = np.ones(len(frame), dtype=np.int64)
+        previous, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
+        if not previous.empty:
+            carried = [column for column in previous.columns if column not in frame.columns]
+            merged = frame[['date']].merge(previous[['date'] + carried], on='date', how='left', indicator=True)
+            covered = (merged['_merge'] == 'both').to_numpy()
+            if SCREENED_OUT_COLUMN in carried:
+                screened_out[covered] = merged.loc[covered, SCREENED_OUT_COLUMN].to_numpy(dtype=np.int64)
+            else:
+                screened_out[covered] = 0
+            for column in carried:
+                if column != SCREENED_OUT_COLUMN:
+                    frame[column] = merged[column].to_numpy()
+        for column, values in self._screener_series.get(pair, {}).items():
+            if len(values) == len(frame):
+                frame[column] = frame[column].where(frame[column].notna(), values) if column in frame else values
+        frame[SCREENED_OUT_COLUMN] = screened_out
+        return frame
+
+    # === STATE ===
+
+    def screener_state(self, pairs: List[str], frames: Dict[str, DataFrame], active: Set[str],
+                       open_pairs: Set[str]) -> dict:
+        """What the screener decided on the latest candle"""
+        last = max((frame['date'].iloc[-1] for frame in frames.values()), default=None)
+        return {
+            'strategy': type(self).__name__,
+            'timeframe': self.timeframe,
+            'candle': last.isoformat() if last is not None else None,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'pairs': len(pairs),
+            'active': [pair for pair in pairs if pair in active],
+            'passed': [pair for pair in pairs if pair in self._screener_passed],
+            'open_trades': [pair for pair in pairs if pair in open_pairs],
+            'screened_out': [pair for pair in pairs if pair not in active],
+        }
+
+    def _write_screener_state(self, pairs, frames, active, open_pairs) -> None:
+        user_data_dir = self.config.get('user_data_dir')
+        if not user_data_dir:
+            return
+        path = Path(user_data_dir) / STATE_FILE
+        tmp = path.with_suffix('.tmp')
+        try:
+            tmp.write_text(json.dumps(self.screener_state(pairs, frames, active, open_pairs), indent=2))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Could not write {path}: {e}")
+
+    # === HELPERS ===
+
+    def _screener_open_pairs(self) -> Optional[Set[str]]:
+        try:
+            from freqtrade.persistence import Trade
+
+            return {trade.pair for trade in Trade.get_trades_proxy(is_open=True)}
+        except Exception as e:
+            logger.debug(f"Open trades unavailable, analyzing all pairs: {e}")
+            return None
+
+    def _screening_enabled(self) -> bool:
+        if not self.pair_screening or getattr(self, 'dp', None) is None:
+            return False
+        try:
+            return self.dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            return False
+
+
+def _without_signals(dataframe: DataFrame) -> DataFrame:
+    """Candles as analyzed dataframe of a screened-out pair: no entries, no exits"""
+    dataframe = dataframe.copy()
+    for column in ('enter_long', 'exit_long', 'enter_short', 'exit_short'):
+        dataframe[column] = 0
+    for column in ('enter_tag', 'exit_tag'):
+        dataframe[column] = None
+    return dataframe
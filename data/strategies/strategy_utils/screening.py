@@ -0,0 +1,486 @@
+# --- Signal-Level Screening Backtester ---
+"""
+Scores ROI tables, stoplosses and custom stop functions against precomputed
+entry/exit signals, for thousands of parameter combinations at once.
+
+Strategies are analyzed once. Every combination then runs as one row of NumPy
+state arrays shaped (combinations, pairs), stepping through the candles the
+way freqtrade's backtesting does: entry at the open of the candle after the
+signal, stop adjustment (custom stop function, then trailing stop), then
+exit signal -> stoploss -> ROI -> trailing stop, with freqtrade's exit rates.
+
+This is a screening tool, not a replacement for `freqtrade backtesting`:
+every pair holds at most one trade and trades are scored by profit ratio, so
+max_open_trades, wallet limits, position adjustment and custom entry pricing
+are not modelled. Send the best combinations to a full backtest.
+
+Callbacks other than custom_stoploss() (confirm_trade_exit, custom_exit, ...)
+are not called either.
+
+Custom stop functions mirror a strategy's custom_stoploss() and return the
+same value it would (a stop distance relative to the candle high, NaN or 0 for
+"keep the current stop"). They receive a StopContext and the combination's
+parameters shaped (combinations, 1). Built-in ones:
+- half_profit_trail: HighFrequencyScalp1m
+- atr_time: EnhancedRiskManagedStrategy (its custom_stoploss() is not enabled
+  there, pass --stop atr_time to see what enabling it would do)
+
+Usage (from data/strategies):
+    python -m strategy_utils.screening -c config.json --strategy HighFrequencyScalp1m \
+        --timerange 20240101-20240201 --combos 5000 --workers 8
+"""
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from strategy_utils.market_data import (MarketArrays, roi_exit_rate, stack_frames,
+                                        stoploss_exit_rate)
+
+logger = logging.getLogger(__name__)
+
+EXIT_REASONS = ['exit_signal', 'stop_loss', 'roi', 'trailing_stop_loss', 'force_exit']
+
+
+@dataclass
+class ScreeningSettings:
+    """Values shared by every combination of a screening run"""
+    fee: float = 0.001
+    timeframe_seconds: int = 60
+    use_exit_signal: bool = True
+    ignore_roi_if_entry_signal: bool = False
+
+    @classmethod
+    def from_strategy(cls, strategy, config: dict) -> 'ScreeningSettings':
+        from freqtrade.exchange import timeframe_to_seconds
+
+        return cls(
+            fee=float(config.get('fee') or 0.001),
+            timeframe_seconds=timeframe_to_seconds(strategy.timeframe),
+            use_exit_signal=strategy.use_exit_signal,
+            ignore_roi_if_entry_signal=strategy.ignore_roi_if_entry_signal,
+        )
+
+
+@dataclass
+class StopContext:
+    """What custom_stoploss() would see for every open trade on the current candle"""
+    current_rate: np.ndarray      # (P,) candle high, the rate freqtrade passes in backtesting
+    current_profit: np.ndarray    # (C, P) profit ratio at current_rate
+    open_rate: np.ndarray         # (C, P)
+    trade_hours: np.ndarray       # (C, P) time since the trade opened
+    stoploss: np.ndarray          # (C, 1) static stoploss of each combination
+    candle: Dict[str, np.ndarray]  # column -> (P,) values of the last analyzed candle
+
+
+# === BUILT-IN STOP FUNCTIONS ===
+
+def half_profit_trail(ctx: StopContext, params: Dict[str, np.ndarray]) -> np.ndarray:
+    """HighFrequencyScalp1m: trail at half the profit once +1%, clamped to 0.25%-5%"""
+    profit = ctx.current_profit
+    stop = np.clip(profit * params['trail_factor'], params['trail_min'], params['trail_max'])
+    return np.where(profit < params['trail_activation'], np.nan, stop)
+
+
+def atr_time_stop(ctx: StopContext, params: Dict[str, np.ndarray]) -> np.ndarray:
+    """EnhancedRiskManagedStrategy: ATR distance tightened over time, trailing above +5% profit"""
+    profit = ctx.current_profit
+    time_factor = np.maximum(0.5, 1 - ctx.trade_hours / params['tighten_hours'])
+    atr_distance = ctx.candle['atr'] * params['atr_multiplier'] / ctx.current_rate
+    volatility_stop = -np.minimum(atr_distance, params['max_distance'])
+    trailing_factor = np.maximum(0.5, 1 - profit * 2)
+    dynamic_stop = np.where(profit > params['trail_profit'],
+                            np.maximum(volatility_stop * trailing_factor, -params['trail_floor']),
+                            volatility_stop * time_factor)
+    return np.maximum(dynamic_stop, ctx.stoploss)
+
+
+# name -> (function, candle columns it reads, {param: (low, high, strategy default)})
+STOP_FUNCTIONS: Dict[str, Tuple[Callable, List[str], Dict[str, Tuple[float, float, float]]]] = {
+    'half_profit_trail': (half_profit_trail, [], {
+        'trail_activation': (0.005, 0.02, 0.01),
+        'trail_factor': (0.3, 0.8, 0.5),
+        'trail_min': (0.001, 0.005, 0.0025),
+        'trail_max': (0.02, 0.08, 0.05),
+    }),
+    'atr_time': (atr_time_stop, ['atr'], {
+        'atr_multiplier': (1.5, 4.0, 2.5),
+        'max_distance': (0.08, 0.20, 0.15),
+        'tighten_hours': (12.0, 96.0, 48.0),
+        'trail_profit': (0.02, 0.08, 0.05),
+        'trail_floor': (0.01, 0.05, 0.03),
+    }),
+}
+
+# Strategies whose custom_stoploss() has a built-in vectorized twin
+STRATEGY_STOPS = {
+    'HighFrequencyScalp1m': 'half_profit_trail',
+    'EnhancedRiskManagedStrategy': 'atr_time',
+}
+
+
+# === ROI TABLES ===
+
+def roi_grid(tables: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Put differently shaped minimal_roi tables on one grid of minute keys.
+    Returns (keys (K,), thresholds (C, K), table keys (C, K)) where row c at key k
+    holds what table c applies from minute k on (+inf before its first step).
+    """
+    keys = np.array(sorted({int(key) for table in tables for key in table}), dtype=np.int64)
+    thresholds = np.full((len(tables), len(keys)), np.inf)
+    entries = np.full((len(tables), len(keys)), -1, dtype=np.int64)
+    for row, table in enumerate(tables):
+        own = sorted((int(key), float(value)) for key, value in table.items())
+        own_keys = np.array([key for key, _ in own])
+        idx = np.searchsorted(own_keys, keys, side='right') - 1
+        has = idx >= 0
+        thresholds[row, has] = np.array([value for _, value in own])[idx[has]]
+        entries[row, has] = own_keys[idx[has]]
+    return keys, thresholds, entries
+
+
+# === SIMULATION ===
+
+def screen(market: MarketArrays, combos: Dict[str, np.ndarray], roi_tables: List[Dict],
+           settings: ScreeningSettings, stop_function: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Simulate every combination over the market arrays.
+
+    combos holds one array per parameter, all of length C: 'stoploss', optional
+    'trailing_stop_positive'/'trailing_stop_positive_offset' (freqtrade trailing
+    with trailing_only_offset_is_reached) and the stop function's parameters.
+    roi_tables has one minimal_roi dict per combination, or a single shared one.
+    Expects shifted enter_long/exit_long columns (stack_frames) and the stop
+    function's candle columns shifted as well, like prepare_market() builds them.
+    """
+    C = len(combos['stoploss'])
+    T, P = market.shape
+    fee = settings.fee
+    buy_cost = 1.0 + fee
+    sell_gain = 1.0 - fee
+    tf_min = settings.timeframe_seconds // 60
+
+    if len(roi_tables) == 1:
+        roi_tables = roi_tables * C
+    roi_keys, roi_values, roi_entries = roi_grid(roi_tables)
+
+    stoploss = np.abs(combos['stoploss'])[:, None]
+    trailing_enabled = 'trailing_stop_positive' in combos
+    if trailing_enabled:
+        tsp = combos['trailing_stop_positive'][:, None]
+        tsp_offset = combos['trailing_stop_positive_offset'][:, None]
+
+    stop_fn, stop_columns = None, []
+    if stop_function:
+        stop_fn, stop_columns, _ = STOP_FUNCTIONS[stop_function]
+        params = {name: values[:, None] for name, values in combos.items()}
+
+    # === STATE ===
+    in_trade = np.zeros((C, P), dtype=bool)
+    open_rate = np.ones((C, P))
+    open_time = np.zeros((C, P), dtype=np.int64)
+    stop = np.zeros((C, P))
+    stop_pct = np.zeros((C, P))
+    trailing = np.zeros((C, P), dtype=bool)
+
+    trades = np.zeros(C, dtype=np.int64)
+    wins = np.zeros(C, dtype=np.int64)
+    profit_sum = np.zeros(C)
+    gross_win = np.zeros(C)
+    gross_loss = np.zeros(C)
+    duration_sum = np.zeros(C)
+    cum = np.zeros(C)
+    peak = np.zeros(C)
+    max_dd = np.zeros(C)
+    reasons = np.zeros((C, len(EXIT_REASONS)), dtype=np.int64)
+
+    o_all, h_all, l_all = market['open'], market['high'], market['low']
+    enter_all = market['enter_long'] == 1
+    exit_all = market['exit_long'] == 1
+
+    def book(closing, rate, now, reason_idx):
+        """Close the trades in closing at rate (C, P)"""
+        profit = np.where(closing, rate * sell_gain / (open_rate * buy_cost) - 1.0, 0.0)
+        per_combo = profit.sum(axis=1)
+        count = closing.sum(axis=1)
+        trades[:] += count
+        wins[:] += (closing & (profit > 0)).sum(axis=1)
+        profit_sum[:] += per_combo
+        gross_win[:] += np.where(profit > 0, profit, 0.0).sum(axis=1)
+        gross_loss[:] -= np.where(profit < 0, profit, 0.0).sum(axis=1)
+        duration_sum[:] += np.where(closing, now - open_time, 0).sum(axis=1) / 60.0
+        reasons[:, reason_idx] += count
+        cum[:] += per_combo
+        in_trade[closing] = False
+        trailing[closing] = False
+
+    for t in range(T):
+        valid = market.valid[t]
+        entering = enter_all[t] & ~exit_all[t] & valid
+        if not entering.any() and not in_trade.any():
+            continue
+        now = int(market.dates[t])
+        o, h, low = o_all[t], h_all[t], l_all[t]
+
+        # 1. Entries at the open
+        new = ~in_trade & entering
+        if new.any():
+            in_trade |= new
+            open_rate = np.where(new, o, open_rate)
+            open_time = np.where(new, now, open_time)
+            stop = np.where(new, o * (1 - stoploss), stop)
+            stop_pct = np.where(new, stoploss, stop_pct)
+
+        active = in_trade & valid
+        if not active.any():
+            continue
+
+        # 2. Stop adjustment: custom stop, then trailing stop
+        profit_best = h * sell_gain / (open_rate * buy_cost) - 1.0
+        dir_correct = active & (stop < low)
+        if stop_fn is not None:
+            ctx = StopContext(current_rate=h, current_profit=profit_best, open_rate=open_rate,
+                              trade_hours=(now - open_time) / 3600.0, stoploss=-stoploss,
+                              candle={name: market[name][t] for name in stop_columns})
+            with np.errstate(invalid='ignore', divide='ignore'):
+                value = np.abs(np.broadcast_to(stop_fn(ctx, params), (C, P)))
+            usable = dir_correct & np.isfinite(value) & (value != 0)
+            new_stop = h * (1 - value)
+            raised = usable & (new_stop > stop)
+            stop = np.where(raised, new_stop, stop)
+            stop_pct = np.where(raised, value, stop_pct)
+            trailing |= raised
+        if trailing_enabled:
+            armed = dir_correct & (profit_best >= tsp_offset)
+            distance = np.where(profit_best > tsp_offset, np.abs(tsp), stoploss)
+            new_stop = h * (1 - distance)
+            raised = armed & (new_stop > stop)
+            stop = np.where(raised, new_stop, stop)
+            stop_pct = np.where(raised, distance, stop_pct)
+            trailing |= raised
+
+        # 3. Exits in freqtrade's priority order
+        if settings.use_exit_signal:
+            signal = active & (exit_all[t] & ~enter_all[t])
+            if signal.any():
+                book(signal, np.broadcast_to(o, (C, P)), now, 0)
+                active &= ~signal
+
+        stop_hit = active & (stop >= low)
+        static_hit = stop_hit & ~trailing
+        if static_hit.any():
+            book(static_hit, stoploss_exit_rate(stop, o, h), now, 1)
+            active &= ~static_hit
+
+        trade_dur = (now - open_time) // 60
+        roi_hit = active
+        if settings.ignore_roi_if_entry_signal:
+            roi_hit = roi_hit & ~enter_all[t]
+        if roi_hit.any():
+            idx = np.searchsorted(roi_keys, trade_dur, side='right') - 1
+            safe_idx = np.clip(idx, 0, None)
+            roi = np.where(idx >= 0, np.take_along_axis(roi_values, safe_idx, axis=1), np.inf)
+            roi_entry = np.where(idx >= 0, np.take_along_axis(roi_entries, safe_idx, axis=1), -1)
+            roi_hit = roi_hit & (profit_best > roi)
+            if roi_hit.any():
+                book(roi_hit, roi_exit_rate(open_rate, roi, roi_entry, trade_dur, o, h, low, fee, tf_min),
+                     now, 2)
+                active &= ~roi_hit
+
+        trail_hit = active & stop_hit & trailing
+        if trail_hit.any():
+            rate = stoploss_exit_rate(stop, o, h)
+            # Same candle as the entry: assume the worst realistic path, like freqtrade
+            if stop_fn is None and trailing_enabled:
+                worst = o * (1 + np.abs(tsp_offset) - np.abs(tsp))
+            else:
+                worst = o * (1 - stop_pct)
+            rate = np.where(trade_dur == 0, np.maximum(low, worst), rate)
+            book(trail_hit, rate, now, 3)
+
+        np.maximum(peak, cum, out=peak)
+        np.maximum(max_dd, peak - cum, out=max_dd)
+
+    # === FORCE EXIT WHATEVER IS STILL OPEN ===
+    if in_trade.any():
+        last_rows = T - 1 - np.argmax(market.valid[::-1], axis=0)
+        last_open = o_all[last_rows, np.arange(P)]
+        book(in_trade.copy(), np.broadcast_to(last_open, (C, P)), int(market.dates[-1]), 4)
+        np.maximum(peak, cum, out=peak)
+        np.maximum(max_dd, peak - cum, out=max_dd)
+
+    result = {
+        'trades': trades,
+        'profit_sum': profit_sum,
+        'profit_mean': np.divide(profit_sum, trades, out=np.zeros(C), where=trades > 0),
+        'win_rate': np.divide(wins, trades, out=np.zeros(C), where=trades > 0),
+        'profit_factor': np.divide(gross_win, gross_loss, out=np.full(C, np.inf), where=gross_loss > 0),
+        'max_drawdown': max_dd,
+        'avg_duration_min': np.divide(duration_sum, trades, out=np.zeros(C), where=trades > 0),
+    }
+    for idx, reason in enumerate(EXIT_REASONS):
+        result[f'exits_{reason}'] = reasons[:, idx]
+    return result
+
+
+# === MARKET PREPARATION ===
+
+def prepare_market(frames: Dict[str, DataFrame], timeframe: str,
+                   stop_columns: List[str] = ()) -> MarketArrays:
+    """
+    Stack analyzed dataframes into screening input. The stop function's columns
+    are shifted by one candle like the signals, since custom_stoploss() reads the
+    last analyzed candle while the current one is still forming.
+    """
+    shifted = [f'{name}_prev' for name in stop_columns]
+    frames = {pair: frame.assign(**{f'{name}_prev': frame[name].shift(1) for name in stop_columns})
+              for pair, frame in frames.items()}
+    market = stack_frames(frames, ['open', 'high', 'low', 'close', 'enter_long', 'exit_long'] + shifted,
+                          timeframe=timeframe)
+    for name in stop_columns:
+        market.columns[name] = market.columns.pop(f'{name}_prev')
+    for name in ('enter_long', 'exit_long'):
+        market.columns[name] = np.nan_to_num(market.columns[name])
+    return market
+
+
+# === COMBINATION GENERATION ===
+
+def sample_combos(strategy, count: int, stop_function: Optional[str] = None,
+                  roi_scale: Tuple[float, float] = (0.5, 1.5), seed: int = 0) -> Tuple[Dict[str, np.ndarray], List[Dict]]:
+    """
+    Draw combinations around the strategy's own settings: its ROI table with every
+    step scaled independently (kept non-increasing), a stoploss between half and
+    double its own, and the stop function's parameter ranges. Row 0 is the
+    strategy as configured.
+    """
+    rng = np.random.default_rng(seed)
+    base_roi = sorted((int(key), float(value)) for key, value in strategy.minimal_roi.items())
+    roi_tables = []
+    for row in range(count):
+        if row == 0:
+            roi_tables.append(dict(base_roi))
+            continue
+        values = [value * rng.uniform(*roi_scale) for _, value in base_roi]
+        values = np.minimum.accumulate(values)
+        roi_tables.append({key: round(float(value), 4) for (key, _), value in zip(base_roi, values)})
+
+    base_stop = abs(strategy.stoploss)
+    combos = {'stoploss': -np.round(rng.uniform(base_stop * 0.5, base_stop * 2, count), 4)}
+    combos['stoploss'][0] = strategy.stoploss
+
+    if strategy.trailing_stop:
+        tsp = strategy.trailing_stop_positive or 0.01
+        offset = strategy.trailing_stop_positive_offset or 0.0
+        combos['trailing_stop_positive'] = np.round(rng.uniform(tsp * 0.5, tsp * 1.5, count), 4)
+        combos['trailing_stop_positive_offset'] = np.round(rng.uniform(offset * 0.5, offset * 1.5, count), 4)
+        combos['trailing_stop_positive'][0] = tsp
+        combos['trailing_stop_positive_offset'][0] = offset
+
+    if stop_function:
+        for name, (low, high, default) in STOP_FUNCTIONS[stop_function][2].items():
+            combos[name] = np.round(rng.uniform(low, high, count), 4)
+            combos[name][0] = default
+    return combos, roi_tables
+
+
+# === PARALLEL RUN ===
+
+_worker_market: Optional[MarketArrays] = None
+_worker_settings: Optional[ScreeningSettings] = None
+
+
+def _init_worker(market: MarketArrays, settings: ScreeningSettings) -> None:
+    global _worker_market, _worker_settings
+    _worker_market = market
+    _worker_settings = settings
+
+
+def _run_chunk(args) -> Dict[str, np.ndarray]:
+    combos, roi_tables, stop_function = args
+    return screen(_worker_market, combos, roi_tables, _worker_settings, stop_function)
+
+
+def run_screen(market: MarketArrays, combos: Dict[str, np.ndarray], roi_tables: List[Dict],
+               settings: ScreeningSettings, stop_function: Optional[str] = None,
+               workers: Optional[int] = None) -> DataFrame:
+    """Screen all combinations in worker processes, one wide chunk per worker"""
+    count = len(combos['stoploss'])
+    if len(roi_tables) == 1:
+        roi_tables = roi_tables * count
+    workers = min(workers or os.cpu_count() or 1, count)
+    size = -(-count // workers)
+    chunks = [({name: values[start:start + size] for name, values in combos.items()},
+               roi_tables[start:start + size], stop_function)
+              for start in range(0, count, size)]
+
+    if len(chunks) == 1:
+        results = [screen(market, chunks[0][0], chunks[0][1], settings, stop_function)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(market, settings)) as executor:
+            results = list(executor.map(_run_chunk, chunks))
+
+    table = DataFrame(combos)
+    table['minimal_roi'] = [str(table_) for table_ in roi_tables]
+    for metric in results[0]:
+        table[metric] = np.concatenate([result[metric] for result in results])
+    return table
+
+
+# === COMMAND LINE ===
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from strategy_utils.market_data import load_analyzed_data, load_config
+
+    parser = argparse.ArgumentParser(description='Screen ROI/stoploss/custom stop combinations on fixed signals')
+    parser.add_argument('-c', '--config', action='append', required=True)
+    parser.add_argument('--strategy', required=True)
+    parser.add_argument('--timerange')
+    parser.add_argument('--combos', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stop', choices=['auto', 'none'] + list(STOP_FUNCTIONS), default='auto',
+                        help='Custom stop function (auto: the one matching the strategy, if any)')
+    parser.add_argument('--objective', default='profit_sum',
+                        choices=['profit_sum', 'profit_mean', 'profit_factor', 'win_rate'])
+    parser.add_argument('--min-trades', type=int, default=10)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help='Write the full result table to this CSV file')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    config = load_config(args.config, timerange=args.timerange, strategy=args.strategy)
+    strategy, frames = load_analyzed_data(config)
+
+    stop_function = args.stop
+    if stop_function == 'auto':
+        stop_function = STRATEGY_STOPS.get(args.strategy) if strategy.use_custom_stoploss else None
+        if strategy.use_custom_stoploss and not stop_function:
+            logger.warning(f"{args.strategy} uses custom_stoploss() without a vectorized twin - "
+                           f"screening with static/trailing stops only")
+    if stop_function == 'none':
+        stop_function = None
+    stop_columns = STOP_FUNCTIONS[stop_function][1] if stop_function else []
+
+    market = prepare_market(frames, strategy.timeframe, stop_columns)
+    settings = ScreeningSettings.from_strategy(strategy, config)
+    combos, roi_tables = sample_combos(strategy, args.combos, stop_function, seed=args.seed)
+    table = run_screen(market, combos, roi_tables, settings, stop_function, workers=args.workers)
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+    ranked = table[table['trades'] >= args.min_trades].sort_values(args.objective, ascending=False)
+    print(ranked.head(args.top).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# --- Memoized custom_stoploss ---
+"""
+Caches custom_stoploss results between loop iterations.
+
+Freqtrade calls custom_stoploss for every open trade on every loop iteration
+(about every 5 seconds), while most stop functions only change when a new
+candle is analyzed or the trade makes a new high. The @cached_stoploss
+decorator recomputes only when one of the declared inputs changes:
+
+    @cached_stoploss(candle=True, profit='none')
+    def custom_stoploss(self, pair, trade, current_time, current_rate, current_profit, **kwargs):
+
+candle     the stop reads the analyzed dataframe - recompute after each analysis
+profit     how the stop depends on current_rate / current_profit:
+           'none'      not at all
+           'trailing'  the stop *price* never falls when profit rises (a trailing
+                       stop) - recompute only on a new profit high for the key;
+                       below that high freqtrade keeps the higher stop it already
+                       has, so the uncached result would be ignored as well
+           'exact'     anything else - the exact rate is part of the key
+
+There is no declaration for stops that change with the trade's age or within
+a range of rates: reusing such a stop returns a looser one than the function
+would, so leave those functions undecorated.
+
+Every key also holds the trade id, open rate (changes with DCA fills) and
+side, and calls made right after an order fill are never cached.
+
+Only live/dry-run bots use the cache. With "stoploss_cache": {"verify": true}
+in config.json every hit is also recomputed, counted as a violation and
+replaced if the cached stop would be looser - for checking a declaration in
+dry-run before trusting it.
+"""
+import functools
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+PROFIT_MODES = ('none', 'trailing', 'exact')
+STATS_LOG_INTERVAL = 600    # seconds between hit-rate log lines
+MAX_TRADES = 1024           # cached trades per strategy; closed trades age out
+
+
+class StoplossCache:
+    """Per-strategy cache for one custom_stoploss function"""
+
+    def __init__(self, name: str, candle: bool, profit: str):
+        self.name = name
+        self.candle = candle
+        self.profit = profit
+        self.entries: 'OrderedDict[int, tuple]' = OrderedDict()   # trade id -> (key, profit, rate, value)
+        self.hits = 0
+        self.misses = 0
+        self.violations = 0
+        self._last_log = time.monotonic()
+
+    def call(self, func, strategy, pair, trade, current_time, current_rate, current_profit, verify, **kwargs):
+        if kwargs.get('after_fill') or trade.id is None:
+            self.misses += 1
+            return func(strategy, pair, trade, current_time, current_rate, current_profit, **kwargs)
+
+        key = [trade.open_rate, trade.is_short]
+        if self.candle:
+            key.append(strategy.dp.get_analyzed_dataframe(pair, strategy.timeframe)[1])
+        if self.profit == 'exact':
+            key.append(current_rate)
+        key = tuple(key)
+
+        entry = self.entries.get(trade.id)
+        if entry is not None and entry[0] == key and (self.profit != 'trailing' or current_profit <= entry[1]):
+            self.hits += 1
+            value = entry[3]
+            if verify:
+                value = self._verify(entry, func, strategy, pair, trade, current_time, current_rate,
+                                     current_profit, kwargs)
+            self._maybe_log()
+            return value
+
+        self.misses += 1
+        value = func(strategy, pair, trade, current_time, current_rate, current_profit, **kwargs)
+        self.entries[trade.id] = (key, current_profit, current_rate, value)
+        self.entries.move_to_end(trade.id)
+        if len(self.entries) > MAX_TRADES:
+            self.entries.popitem(last=False)
+        self._maybe_log()
+        return value
+
+    def _verify(self, entry, func, strategy, pair, trade, current_time, current_rate, current_profit, kwargs):
+        """Recompute a hit and compare stop prices; the looser cached value is replaced"""
+        value = entry[3]
+        fresh = func(strategy, pair, trade, current_time, current_rate, current_profit, **kwargs)
+        cached_price = stop_price(value, current_rate, trade.is_short)
+        if self.profit == 'trailing':
+            # freqtrade still holds the stop set when the value was computed
+            computed_price = stop_price(value, entry[2], trade.is_short)
+            cached_price = min(cached_price, computed_price) if trade.is_short else max(cached_price, computed_price)
+        fresh_price = stop_price(fresh, current_rate, trade.is_short)
+        looser = cached_price > fresh_price if trade.is_short else cached_price < fresh_price
+        if looser:
+            self.violations += 1
+            logger.warning(f"{self.name}: cached stop {value} for {pair} is looser than {fresh}, "
+                           f"check the @cached_stoploss declaration")
+            return fresh
+        return value
+
+    def _maybe_log(self) -> None:
+        now = time.monotonic()
+        if now - self._last_log >= STATS_LOG_INTERVAL:
+            self._last_log = now
+            logger.info(f"{self.name} cache: {self.stats()}")
+
+    def stats(self) -> dict:
+        calls = self.hits + self.misses
+        return {
+            'calls': calls,
+            'hits': self.hits,
+            'hit_rate': round(self.hits / calls, 4) if calls else 0.0,
+            'violations': self.violations,
+            'trades': len(self.entries),
+        }
+
+
+def stop_price(value, current_rate: float, is_short: bool) -> float:
+    """Stop price freqtrade derives from a custom_stoploss return value (None/NaN/0 = no stop)"""
+    if value is None or value != value or value == 0:
+        return float('inf') if is_short else float('-inf')
+    return current_rate * (1 + abs(value)) if is_short else current_rate * (1 - abs(value))
+
+
+def cached_stoploss(candle: bool = True, profit: str = 'exact'):
+    """Decorator for IStrategy.custom_stoploss, see the module docstring for the declarations"""
+    if profit not in PROFIT_MODES:
+        raise ValueError(f"profit must be one of {PROFIT_MODES}, got {profit!r}")
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, pair, trade, current_time, current_rate, current_profit, **kwargs):
+            cache = self.__dict__.get('_stoploss_cache')
+            if cache is None:
+                cache = self._stoploss_cache = (
+                    StoplossCache(f"{type(self).__name__}.{func.__name__}", candle, profit)
+                    if _cache_enabled(self) else False)
+            if cache is False:
+                return func(self, pair, trade, current_time, current_rate, current_profit, **kwargs)
+            verify = bool(self.config.get('stoploss_cache', {}).get('verify', False))
+            return cache.call(func, self, pair, trade, current_time, current_rate, current_profit,
+                              verify, **kwargs)
+
+        wrapper.stoploss_cache_declaration = {'candle': candle, 'profit': profit}
+        return wrapper
+
+    return decorator
+
+
+def _cache_enabled(strategy) -> bool:
+    if not strategy.config.get('stoploss_cache', {}).get('enabled', True):
+        return False
+    dp = getattr(strategy, 'dp', None)
+    try:
+        return dp is not None and dp.runmode.value in ('live', 'dry_run')
+    except Exception:
+        return False
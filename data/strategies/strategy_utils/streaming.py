@@ -0,0 +1,497 @@
+# --- Sub-Candle Streaming Entries ---
+"""
+Evaluates entry conditions on the forming candle, built from a trade stream.
+
+With process_only_new_candles a strategy decides once per closed candle, so a
+1m scalper acts on data up to a minute old. Strategies that mix in
+StreamingEntryMixin keep, per pair:
+- the forming candle (open/high/low/close/volume since the candle started),
+  built from the trades a TradeFeed delivers each bot loop
+- the state of the declared StreamingIndicators at the last closed candle
+  (previous EMA, Wilder averages, the last period - 1 values of rolling
+  windows), prepared once per closed candle from the pair's candles
+
+Each loop the indicators are advanced to the forming candle in O(1) per
+indicator and the strategy's own populate_entry_trend() runs on the last few
+closed candles plus the forming one, so the entry logic is not duplicated. A
+forming-candle entry must hold for `debounce_seconds` of consecutive loops
+before it is published: the bot's analyzed dataframe gets the forming candle
+appended with enter_long set, and freqtrade enters on that loop. Exit signals
+of the closed candle are carried onto the appended row; exits are still
+decided on closed candles only.
+
+Enable per bot in config.json:
+
+    "streaming": {"enabled": true, "source": "trades", "debounce_seconds": 10}
+
+source "trades" reads the exchange's public trades through dp.trades() (needs
+"use_public_trades" in the exchange config), "ticker" polls dp.ticker() every
+`ticker_interval` seconds per pair (last price, volume from the 24h volume
+change). The stream is read once per bot loop, so lower
+internals.process_throttle_secs to evaluate more often. ReplayTradeFeed
+replays recorded trades (freqtrade's <pair>-trades.feather files) against a
+simulated clock for testing.
+
+A candle the stream joined after it started misses the earlier trades: its
+open is the first trade seen and its volume is too low until the next candle.
+Only live/dry-run bots stream; backtesting and hyperopt are unaffected.
+"""
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame, Timestamp, concat, read_feather
+
+from strategy_utils.batch_indicators import _wilder, directional_index, directional_sums, ema, rsi, sma
+
+logger = logging.getLogger(__name__)
+
+CANDLE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+SIGNAL_COLUMNS = ('enter_long', 'exit_long', 'enter_short', 'exit_short', 'enter_tag', 'exit_tag')
+
+
+# === TRADE FEEDS ===
+
+class TradeFeed(ABC):
+    """New trades per pair as (timestamp ms, price, amount) rows"""
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    @abstractmethod
+    def poll(self, pair: str) -> np.ndarray:
+        """Trades of the pair since the last poll"""
+
+
+class DataProviderTradeFeed(TradeFeed):
+    """Public trades the bot refreshes with its candles (dp.trades())"""
+
+    def __init__(self, dp):
+        self.dp = dp
+        self._last: Dict[str, int] = {}
+
+    def poll(self, pair: str) -> np.ndarray:
+        trades = self.dp.trades(pair, copy=False)
+        if trades is None or trades.empty:
+            return np.empty((0, 3))
+        timestamps = trades['timestamp'].to_numpy(dtype=np.int64)
+        start = np.searchsorted(timestamps, self._last.get(pair, -1), side='right')
+        self._last[pair] = int(timestamps[-1])
+        return np.column_stack([timestamps[start:], trades['price'].to_numpy(dtype=np.float64)[start:],
+                                trades['amount'].to_numpy(dtype=np.float64)[start:]])
+
+
+class TickerFeed(TradeFeed):
+    """Last price from dp.ticker() as one trade per poll, sized by the 24h volume change"""
+
+    def __init__(self, dp, interval: float = 5.0):
+        self.dp = dp
+        self.interval = interval
+        self._polled: Dict[str, datetime] = {}
+        self._volume: Dict[str, float] = {}
+
+    def poll(self, pair: str) -> np.ndarray:
+        now = self.now()
+        polled = self._polled.get(pair)
+        if polled is not None and (now - polled).total_seconds() < self.interval:
+            return np.empty((0, 3))
+        self._polled[pair] = now
+        ticker = self.dp.ticker(pair) or {}
+        price, volume = ticker.get('last'), ticker.get('baseVolume')
+        if not price:
+            return np.empty((0, 3))
+        previous = self._volume.get(pair)
+        if volume is not None:
+            self._volume[pair] = volume
+        amount = max(volume - previous, 0.0) if volume is not None and previous is not None else 0.0
+        timestamp = ticker.get('timestamp') or int(now.timestamp() * 1000)
+        return np.array([[timestamp, price, amount]], dtype=np.float64)
+
+
+class ReplayTradeFeed(TradeFeed):
+    """
+    Recorded trades replayed against a simulated clock: poll() returns the
+    trades up to the time set with advance().
+    """
+
+    def __init__(self, trades: Dict[str, DataFrame], start: Optional[datetime] = None):
+        self._trades = {}
+        for pair, frame in trades.items():
+            frame = frame.sort_values('timestamp', kind='stable')
+            self._trades[pair] = np.column_stack([frame['timestamp'].to_numpy(dtype=np.int64),
+                                                  frame['price'].to_numpy(dtype=np.float64),
+                                                  frame['amount'].to_numpy(dtype=np.float64)])
+        self._pos: Dict[str, int] = {}
+        self.clock = start or datetime.fromtimestamp(0, tz=timezone.utc)
+
+    @classmethod
+    def from_directory(cls, directory, pairs: Sequence[str], **kwargs) -> 'ReplayTradeFeed':
+        """Trades downloaded with `freqtrade download-data --dl-trades` (feather format)"""
+        directory = Path(directory)
+        trades = {}
+        for pair in pairs:
+            path = directory / f"{pair.replace('/', '_').replace(':', '_')}-trades.feather"
+            if path.exists():
+                trades[pair] = read_feather(path)
+        return cls(trades, **kwargs)
+
+    def advance(self, clock: datetime) -> None:
+        self.clock = clock
+
+    def now(self) -> datetime:
+        return self.clock
+
+    def poll(self, pair: str) -> np.ndarray:
+        trades = self._trades.get(pair)
+        if trades is None:
+            return np.empty((0, 3))
+        start = self._pos.get(pair, 0)
+        end = int(np.searchsorted(trades[:, 0], self.clock.timestamp() * 1000, side='right'))
+        self._pos[pair] = max(end, start)
+        return trades[start:end]
+
+
+# === FORMING CANDLE ===
+
+class FormingCandle:
+    """OHLCV of the candle starting at `date`, from the trades seen so far"""
+
+    def __init__(self, date: Timestamp):
+        self.date = date
+        self.open = self.high = self.low = self.close = np.nan
+        self.volume = 0.0
+        self.trades = 0
+
+    def add(self, prices: np.ndarray, amounts: np.ndarray) -> None:
+        if not len(prices):
+            return
+        if not self.trades:
+            self.open = self.high = self.low = float(prices[0])
+        self.high = max(self.high, float(prices.max()))
+        self.low = min(self.low, float(prices.min()))
+        self.close = float(prices[-1])
+        self.volume += float(amounts.sum())
+        self.trades += len(prices)
+
+    def row(self) -> dict:
+        return {'date': self.date, 'open': self.open, 'high': self.high, 'low': self.low,
+                'close': self.close, 'volume': self.volume}
+
+
+# === INCREMENTAL INDICATORS ===
+
+class StreamingIndicators:
+    """
+    Indicators that can be advanced to a forming candle from the closed
+    candles' state. Values match TA-Lib / qtpylib on the completed candle up to
+    float rounding.
+    """
+
+    def __init__(self):
+        self._specs: List[Tuple[str, Tuple[str, ...], dict]] = []
+
+    @classmethod
+    def from_batch(cls, batch) -> 'StreamingIndicators':
+        """
+        The indicators a BatchIndicators declares, so a strategy declares them
+        once and only adds the ones it computes elsewhere.
+        """
+        indicators = cls()
+        for kind, columns, params in batch._specs:
+            params = dict(params)
+            # min_periods only changes the warmup rows, never the state at the last closed candle
+            params.pop('min_periods', None)
+            if not hasattr(cls, f'_update_{kind}') or (kind in ('rsi', 'bbands')
+                                                       and params.pop('source') != 'close'):
+                raise ValueError(f"Cannot stream {kind} {', '.join(columns)}")
+            indicators._specs.append((kind, columns, params))
+        return indicators
+
+    # === DECLARATION ===
+
+    def ema(self, column: str, period: int, source: str = 'close') -> 'StreamingIndicators':
+        self._specs.append(('ema', (column,), {'period': period, 'source': source}))
+        return self
+
+    def sma(self, column: str, period: int, source: str = 'close') -> 'StreamingIndicators':
+        self._specs.append(('sma', (column,), {'period': period, 'source': source}))
+        return self
+
+    def rsi(self, column: str, period: int = 14) -> 'StreamingIndicators':
+        self._specs.append(('rsi', (column,), {'period': period}))
+        return self
+
+    def bbands(self, columns: Sequence[str] = ('bb_upperband', 'bb_middleband', 'bb_lowerband'),
+               period: int = 20, stds: float = 2.0) -> 'StreamingIndicators':
+        self._specs.append(('bbands', tuple(columns), {'period': period, 'stds': stds}))
+        return self
+
+    def stochf(self, columns: Sequence[str] = ('fastk', 'fastd'), fastk_period: int = 5,
+               fastd_period: int = 3) -> 'StreamingIndicators':
+        self._specs.append(('stochf', tuple(columns),
+                            {'fastk_period': fastk_period, 'fastd_period': fastd_period}))
+        return self
+
+    def adx(self, column: str, period: int = 14) -> 'StreamingIndicators':
+        self._specs.append(('adx', (column,), {'period': period}))
+        return self
+
+    # === STATE ===
+
+    def prepare(self, candles: DataFrame, rows: int) -> Tuple[DataFrame, list]:
+        """
+        From closed candles: their last `rows` rows with every declared column,
+        and the state update() advances from.
+        """
+        values = {name: candles[name].to_numpy(dtype=np.float64)[:, np.newaxis]
+                  for name in ('open', 'high', 'low', 'close', 'volume')}
+        context = candles[CANDLE_COLUMNS].iloc[-rows:].reset_index(drop=True)
+        states = []
+        for kind, columns, params in self._specs:
+            computed, state = getattr(self, f'_prepare_{kind}')(values, **params)
+            for column, series in zip(columns, computed):
+                context[column] = series[-rows:, 0]
+            states.append(state)
+        return context, states
+
+    def update(self, states: list, candle: dict) -> dict:
+        """Declared columns for a forming candle"""
+        row = {}
+        for (kind, columns, params), state in zip(self._specs, states):
+            row.update(zip(columns, getattr(self, f'_update_{kind}')(state, candle, **params)))
+        return row
+
+    @staticmethod
+    def _prepare_ema(values, period, source):
+        series = ema(values[source], period)
+        return (series,), (float(series[-1, 0]), 2.0 / (period + 1))
+
+    @staticmethod
+    def _update_ema(state, candle, period, source):
+        previous, alpha = state
+        return (alpha * candle[source] + (1 - alpha) * previous,)
+
+    @staticmethod
+    def _prepare_sma(values, period, source):
+        return (sma(values[source], period),), _tail(values[source][:, 0], period - 1)
+
+    @staticmethod
+    def _update_sma(window, candle, period, source):
+        if len(window) < period - 1:
+            return (np.nan,)
+        return ((window.sum() + candle[source]) / period,)
+
+    @staticmethod
+    def _prepare_rsi(values, period):
+        close = values['close']
+        diff = np.diff(close, axis=0)
+        gain = _wilder(np.where(diff > 0, diff, 0.0), period, 1.0 / period, 0)
+        loss = _wilder(np.where(diff < 0, -diff, 0.0), period, 1.0 / period, 0)
+        last = (float(gain[-1, 0]), float(loss[-1, 0])) if len(diff) else (np.nan, np.nan)
+        return (rsi(close, period),), (*last, float(close[-1, 0]))
+
+    @staticmethod
+    def _update_rsi(state, candle, period):
+        gain, loss, previous = state
+        change = candle['close'] - previous
+        gain = (gain * (period - 1) + max(change, 0.0)) / period
+        loss = (loss * (period - 1) + max(-change, 0.0)) / period
+        total = gain + loss
+        return (100.0 * gain / total if total != 0 else 0.0,)
+
+    @staticmethod
+    def _prepare_bbands(values, period, stds):
+        frame = DataFrame(values['close'][:, 0]).rolling(window=period, min_periods=1)
+        mid, std = frame.mean().to_numpy(), frame.std().to_numpy()
+        return (mid + std * stds, mid, mid - std * stds), _tail(values['close'][:, 0], period - 1)
+
+    @staticmethod
+    def _update_bbands(window, candle, period, stds):
+        closes = np.append(window, candle['close'])
+        mid = closes.mean()
+        std = closes.std(ddof=1) if len(closes) > 1 else np.nan
+        return mid + std * stds, mid, mid - std * stds
+
+    @staticmethod
+    def _prepare_stochf(values, fastk_period, fastd_period):
+        high, low, close = values['high'][:, 0], values['low'][:, 0], values['close'][:, 0]
+        fastk = np.full(len(close), np.nan)
+        if len(close) >= fastk_period:
+            windows = np.lib.stride_tricks.sliding_window_view
+            highest = windows(high, fastk_period).max(axis=1)
+            lowest = windows(low, fastk_period).min(axis=1)
+            spread = highest - lowest
+            with np.errstate(invalid='ignore', divide='ignore'):
+                fastk[fastk_period - 1:] = np.where(
+                    spread != 0, 100.0 * (close[fastk_period - 1:] - lowest) / spread, 0.0)
+        fastd = np.full(len(close), np.nan)
+        if len(close) >= fastk_period:
+            fastd[fastk_period - 1:] = sma(fastk[fastk_period - 1:, np.newaxis], fastd_period)[:, 0]
+        state = (_tail(high, fastk_period - 1), _tail(low, fastk_period - 1), _tail(fastk, fastd_period - 1))
+        # TA-Lib starts both lines where fastd starts
+        fastk[:fastk_period + fastd_period - 2] = np.nan
+        fastd[:fastk_period + fastd_period - 2] = np.nan
+        return (fastk[:, np.newaxis], fastd[:, np.newaxis]), state
+
+    @staticmethod
+    def _update_stochf(state, candle, fastk_period, fastd_period):
+        highs, lows, fastks = state
+        if len(highs) < fastk_period - 1:
+            return np.nan, np.nan
+        highest = max(highs.max(), candle['high']) if len(highs) else candle['high']
+        lowest = min(lows.min(), candle['low']) if len(lows) else candle['low']
+        spread = highest - lowest
+        fastk = 100.0 * (candle['close'] - lowest) / spread if spread != 0 else 0.0
+        fastd = (fastks.sum() + fastk) / fastd_period
+        return fastk, fastd
+
+    @staticmethod
+    def _prepare_adx(values, period):
+        high, low, close = values['high'], values['low'], values['close']
+        plus, minus, ranges, series = directional_sums(high, low, close, period)
+        state = (float(plus[-1, 0]), float(minus[-1, 0]), float(ranges[-1, 0]), float(series[-1, 0]),
+                 float(high[-1, 0]), float(low[-1, 0]), float(close[-1, 0]))
+        return (series,), state
+
+    @staticmethod
+    def _update_adx(state, candle, period):
+        plus, minus, ranges, previous, last_high, last_low, last_close = state
+        up, down = candle['high'] - last_high, last_low - candle['low']
+        decay = 1.0 - 1.0 / period
+        plus = plus * decay + (up if up > 0 and up > down else 0.0)
+        minus = minus * decay + (down if down > 0 and up < down else 0.0)
+        ranges = ranges * decay + max(candle['high'] - candle['low'], abs(candle['high'] - last_close),
+                                      abs(candle['low'] - last_close))
+        dx = float(directional_index(np.array(plus), np.array(minus), np.array(ranges)))
+        return ((previous * (period - 1) + dx) / period,)
+
+
+def _tail(values: np.ndarray, rows: int) -> np.ndarray:
+    return values[max(len(values) - rows, 0):]
+
+
+# === STRATEGY MIXIN ===
+
+class StreamingEntryMixin:
+    """
+    Mix in before IStrategy:
+
+        class HighFrequencyScalp1m(StreamingEntryMixin, IStrategy):
+            streaming_indicators = StreamingIndicators().ema('ema_fast', 50).rsi('rsi', 14)
+
+    The declared columns must be all populate_entry_trend() reads, apart from
+    the candle itself.
+    """
+
+    streaming_indicators: Optional[StreamingIndicators] = None
+    streaming_context_rows: int = 2   # closed candles populate_entry_trend() needs before the forming one
+    streaming_tag: str = 'stream'     # enter_tag of forming-candle entries without a tag of their own
+
+    stream_feed: Optional[TradeFeed] = None
+
+    def ft_bot_start(self, **kwargs) -> None:
+        super().ft_bot_start(**kwargs)
+        settings = self.config.get('streaming', {})
+        self._stream_debounce = timedelta(seconds=settings.get('debounce_seconds', 10))
+        self._stream_candles: Dict[str, FormingCandle] = {}
+        self._stream_states: Dict[str, tuple] = {}
+        self._stream_since: Dict[str, datetime] = {}
+        self._stream_published: Dict[str, Tuple[DataFrame, DataFrame]] = {}
+        if self.stream_feed is None and settings.get('enabled') and self._streaming_runmode():
+            if settings.get('source', 'trades') == 'ticker':
+                self.stream_feed = TickerFeed(self.dp, settings.get('ticker_interval', 5))
+            else:
+                self.stream_feed = DataProviderTradeFeed(self.dp)
+            logger.info(f"Streaming entries from {type(self.stream_feed).__name__}, "
+                        f"debounce {self._stream_debounce.total_seconds():.0f}s")
+
+    def analyze(self, pairs) -> None:
+        super().analyze(pairs)
+        if self.stream_feed is None or self.streaming_indicators is None:
+            return
+        now = self.stream_feed.now()
+        for pair in pairs:
+            try:
+                self._stream_pair(pair, now)
+            except Exception as e:
+                logger.warning(f"Streaming evaluation failed for {pair}: {e}")
+
+    def _stream_pair(self, pair: str, now: datetime) -> None:
+        from freqtrade.enums import CandleType
+        from freqtrade.exchange import timeframe_to_prev_date, timeframe_to_seconds
+
+        candle_type = self.config.get('candle_type_def', CandleType.SPOT)
+        candles = self.dp.ohlcv(pair, self.timeframe, candle_type=candle_type, copy=False)
+        if not isinstance(candles, DataFrame) or candles.empty:
+            return
+        closed = candles['date'].iloc[-1]
+        forming_date = closed + timedelta(seconds=timeframe_to_seconds(self.timeframe))
+
+        state = self._stream_states.get(pair)
+        if state is None or state[0] != closed:
+            state = (closed, *self.streaming_indicators.prepare(candles, self.streaming_context_rows))
+            self._stream_states[pair] = state
+        candle = self._stream_candles.get(pair)
+        if candle is None or candle.date != forming_date:
+            candle = self._stream_candles[pair] = FormingCandle(forming_date)
+            self._stream_since.pop(pair, None)
+
+        trades = self.stream_feed.poll(pair)
+        if len(trades):
+            dates = trades[:, 0]
+            start = forming_date.timestamp() * 1000
+            in_candle = (dates >= start) & (dates < start + timeframe_to_seconds(self.timeframe) * 1000)
+            candle.add(trades[in_candle, 1], trades[in_candle, 2])
+        # past the forming candle's end the closed candle is overdue - wait for the refresh
+        if not candle.trades or timeframe_to_prev_date(self.timeframe, now) > forming_date:
+            return self._stream_signal(pair, None)
+
+        row = candle.row()
+        row.update(self.streaming_indicators.update(state[2], row))
+        frame = concat([state[1], DataFrame([row])], ignore_index=True)
+        frame = self.populate_entry_trend(frame, {'pair': pair})
+        entry = frame['enter_long'].iat[-1] == 1 if 'enter_long' in frame else False
+        if not entry:
+            self._stream_since.pop(pair, None)
+            return self._stream_signal(pair, None)
+        since = self._stream_since.setdefault(pair, now)
+        if now - since < self._stream_debounce:
+            return self._stream_signal(pair, None)
+        tag = frame['enter_tag'].iat[-1] if 'enter_tag' in frame else None
+        self._stream_signal(pair, {**candle.row(), 'enter_tag': tag if isinstance(tag, str) and tag
+                                   else self.streaming_tag})
+
+    def _stream_signal(self, pair: str, row: Optional[dict]) -> None:
+        """Append (row) or withdraw (None) a forming-candle entry on the bot's analyzed dataframe"""
+        from freqtrade.enums import CandleType
+
+        candle_type = self.config.get('candle_type_def', CandleType.SPOT)
+        analyzed, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
+        published = self._stream_published.get(pair)
+        base = published[0] if published is not None and analyzed is published[1] else analyzed
+        if row is None:
+            if published is not None:
+                del self._stream_published[pair]
+                if base is not analyzed:
+                    self.dp._set_cached_df(pair, self.timeframe, base, candle_type=candle_type)
+            return
+        if base.empty or base['date'].iat[-1] >= row['date']:
+            return
+        last = base.iloc[-1]
+        forming = {**{column: last[column] for column in SIGNAL_COLUMNS if column in base}, **row}
+        forming['enter_long'] = 1
+        appended = concat([base, DataFrame([forming])], ignore_index=True)
+        if published is None:
+            logger.info(f"Streaming entry signal for {pair} at {row['close']} "
+                        f"({row['date']:%H:%M} candle, tag {row['enter_tag']})")
+        self._stream_published[pair] = (base, appended)
+        self.dp._set_cached_df(pair, self.timeframe, appended, candle_type=candle_type)
+
+    def _streaming_runmode(self) -> bool:
+        try:
+            return self.dp.runmode.value in ('live', 'dry_run')
+        except Exception:
+            return False
@@ -0,0 +1,354 @@
+# --- Successive-Halving (ASHA) Parameter Search ---
+"""
+Multi-fidelity search over a strategy's IntParameter/DecimalParameter
+spaces: every candidate is first backtested on a short slice at the start
+of the timerange, and only the best 1/eta of each rung is promoted to a
+slice eta times longer, up to the full timerange.
+
+    rung 0:  all candidates     min_days
+    rung 1:  top 1/eta          min_days * eta
+    rung 2:  top 1/eta^2        min_days * eta^2
+    ...      ...                full timerange
+
+Promotion is asynchronous (ASHA): whenever a worker is free it takes the
+best not yet promoted candidate that ranks in the top 1/eta of the results
+its rung has so far, checking the highest rung first, and otherwise starts
+the next new candidate on rung 0. Workers never wait for a rung to fill, and
+losers stop at the rung they failed on. When rung 0 is done and nothing
+qualifies any more, the best candidate of the highest rung reached is
+promoted until one candidate has run on the full timerange.
+
+Backtests run the same way as strategy_utils.walk_forward: freqtrade's
+backtest loop in worker processes, populate_indicators re-run per
+candidate, candles memory-mapped from one shared copy. Candidates are scored
+by --objective; a candidate needs --min-trades trades on the full
+timerange, scaled down to the slice length on shorter rungs.
+
+Every finished backtest is appended to a JSONL results file right away. The
+file name is derived from the search settings, the strategy code (its file
+and the strategy_utils modules it imports) and the candles, so running the
+same command again after an interruption picks up the stored results and
+only runs what is missing. Changing any of them starts a new file.
+
+Usage (from data/strategies):
+    python -m strategy_utils.successive_halving -c config.json --strategy AggressiveSophisticated1m \
+        --timerange 20240101-20240701 --candidates 243 --eta 3 --min-days 7 --workers 8
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from strategy_utils.walk_forward import (DAY, OBJECTIVES, CandleStore, init_worker,
+                                         load_candles, run_task, sample_candidates, search_space,
+                                         strategy_config)
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_RESULTS_DIR = STRATEGIES_DIR.parent / 'search_results'
+
+RESULTS_FORMAT = 1
+
+
+def rung_days(total_days: float, min_days: float, eta: int) -> List[float]:
+    """Slice length of every rung: min_days * eta^k below the full range, then the full range"""
+    days = []
+    length = min_days
+    while length < total_days:
+        days.append(length)
+        length *= eta
+    days.append(total_days)
+    return days
+
+
+def store_digest(store: CandleStore) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps(store.index, sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(store.dates).data)
+    digest.update(np.ascontiguousarray(store.ohlcv).data)
+    return digest.hexdigest()
+
+
+class ResultsFile:
+    """
+    Append-only JSONL log of one search: a header line with the search
+    settings, then one line per finished backtest.
+    """
+
+    def __init__(self, path: Path, header: dict):
+        self.path = Path(path)
+        self.header = header
+        self.records: List[dict] = []
+        if self.path.is_file():
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._append(header)
+
+    def _load(self) -> None:
+        text = self.path.read_text()
+        if not text.endswith('\n'):
+            # drop the partial line of an interrupted write before appending to it
+            text = text[:text.rfind('\n') + 1]
+            self.path.write_text(text)
+        lines = text.splitlines()
+        if not lines or json.loads(lines[0]).get('key') != self.header['key']:
+            raise ValueError(f"{self.path} belongs to a different search")
+        for line in lines[1:]:
+            try:
+                self.records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping unreadable line in {self.path}")
+        logger.info(f"Resuming from {self.path}: {len(self.records)} stored results")
+
+    def _append(self, record: dict) -> None:
+        with self.path.open('a') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def add(self, record: dict) -> None:
+        self.records.append(record)
+        self._append(record)
+
+
+class Scheduler:
+    """ASHA bookkeeping: results per rung and which candidates were promoted"""
+
+    def __init__(self, candidate_count: int, rung_count: int, eta: int,
+                 scores: List[Callable[[dict], float]]):
+        self.candidate_count = candidate_count
+        self.rung_count = rung_count
+        self.eta = eta
+        self.scores = scores                        # rung -> metrics -> score
+        self.results: List[Dict[int, dict]] = [{} for _ in range(rung_count)]
+        self.running: Set[Tuple[int, int]] = set()  # (candidate, rung)
+        self.next_candidate = 0
+
+    def record(self, candidate: int, rung: int, metrics: dict) -> None:
+        self.results[rung][candidate] = metrics
+        self.running.discard((candidate, rung))
+
+    def _taken(self, candidate: int, rung: int) -> bool:
+        return candidate in self.results[rung] or (candidate, rung) in self.running
+
+    def _ranked(self, rung: int) -> List[int]:
+        score = self.scores[rung]
+        return sorted(self.results[rung], key=lambda candidate: -score(self.results[rung][candidate]))
+
+    def _qualified(self, candidate: int, rung: int) -> bool:
+        return np.isfinite(self.scores[rung](self.results[rung][candidate]))
+
+    def next_job(self) -> Optional[Tuple[int, int]]:
+        """(candidate, rung) to run next, or None when nothing can start right now"""
+        for rung in range(self.rung_count - 2, -1, -1):
+            ranked = self._ranked(rung)
+            for candidate in ranked[:len(ranked) // self.eta]:
+                if self._qualified(candidate, rung) and not self._taken(candidate, rung + 1):
+                    return self._start(candidate, rung + 1)
+        while self.next_candidate < self.candidate_count:
+            candidate = self.next_candidate
+            self.next_candidate += 1
+            if not self._taken(candidate, 0):
+                return self._start(candidate, 0)
+        if not self.running and not self.results[-1]:
+            # nothing qualifies any more: push the best of the highest rung reached
+            for rung in range(self.rung_count - 2, -1, -1):
+                for candidate in self._ranked(rung):
+                    if self._qualified(candidate, rung) and not self._taken(candidate, rung + 1):
+                        return self._start(candidate, rung + 1)
+        return None
+
+    def _start(self, candidate: int, rung: int) -> Tuple[int, int]:
+        self.running.add((candidate, rung))
+        return candidate, rung
+
+    def best(self) -> List[Tuple[int, int]]:
+        """(candidate, rung) of every candidate at the highest rung it reached, best first"""
+        ranked, seen = [], set()
+        for rung in range(self.rung_count - 1, -1, -1):
+            for candidate in self._ranked(rung):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    ranked.append((candidate, rung))
+        return ranked
+
+
+def make_score(objective: str, min_trades: float):
+    def score(metrics: dict) -> float:
+        value = metrics[objective]
+        if metrics['total_trades'] < min_trades or not np.isfinite(value):
+            return -np.inf
+        return value
+    return score
+
+
+def successive_halving(config: dict, strategy_name: str, start: int, end: int, candidates: int,
+                       eta: int = 3, min_days: float = 7, objective: str = 'sharpe', min_trades: int = 5,
+                       spaces: Optional[List[str]] = None, include_fixed: bool = False, seed: int = 0,
+                       workers: Optional[int] = None, results_dir: Optional[str] = None) -> dict:
+    """Run (or resume) one search; returns the rung layout, the ranking and the candidates"""
+    from freqtrade.resolvers import StrategyResolver
+
+    from strategy_utils.backtest_cache import canonical_hash, code_files, strategy_files
+
+    work_dir = Path(tempfile.mkdtemp(prefix='successive_halving_'))
+    try:
+        strategy = StrategyResolver.load_strategy(strategy_config(config, strategy_name))
+        strategy.ft_load_hyper_params()
+        store = CandleStore.write(work_dir / 'candles', load_candles(config, strategy))
+        parameters = search_space(strategy, spaces, include_fixed)
+        if not parameters:
+            raise ValueError(f"{strategy_name} has no IntParameter/DecimalParameter to search")
+        pool = sample_candidates(parameters, candidates, seed)
+
+        total_days = (end - start) / DAY
+        days = rung_days(total_days, min_days, eta)
+        settings = {
+            'format': RESULTS_FORMAT, 'strategy': strategy_name, 'start': start, 'end': end,
+            'pairs': sorted(store.index), 'candidates': candidates, 'eta': eta, 'min_days': min_days,
+            'objective': objective, 'min_trades': min_trades, 'seed': seed,
+            'parameters': [asdict(parameter) for parameter in parameters],
+        }
+        key = canonical_hash([settings, code_files(strategy_files(strategy)), store_digest(store)])
+        path = Path(results_dir or DEFAULT_RESULTS_DIR) / f'{strategy_name}-{key[:16]}.jsonl'
+        results = ResultsFile(path, {'key': key, 'settings': settings})
+
+        scores = [make_score(objective, max(1, math.ceil(min_trades * length / total_days))) for length in days]
+        scheduler = Scheduler(len(pool), len(days), eta, scores)
+        for record in results.records:
+            scheduler.record(record['candidate'], record['rung'], record['metrics'])
+        logger.info(f"{strategy_name}: {len(parameters)} parameters, {len(pool)} candidates, "
+                    f"rungs of {', '.join(f'{length:g}' for length in days)} days -> {path}")
+
+        workers = workers or os.cpu_count() or 1
+        started = time.time()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(config, {strategy_name: str(store.directory)})) as executor:
+            pending = {}
+
+            def fill():
+                while len(pending) < workers:
+                    job = scheduler.next_job()
+                    if job is None:
+                        return
+                    candidate, rung = job
+                    task = (job, strategy_name, [pool[candidate]], start, start + int(days[rung] * DAY), False)
+                    pending[executor.submit(run_task, task)] = job
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    (candidate, rung), (metrics,) = future.result()
+                    del pending[future]
+                    scheduler.record(candidate, rung, metrics)
+                    results.add({'candidate': candidate, 'rung': rung, 'params': pool[candidate],
+                                 'metrics': metrics})
+                    if rung == len(days) - 1:
+                        logger.info(f"Candidate {candidate} finished the full range: "
+                                    f"{objective} {metrics[objective]:.3f}, {int(metrics['total_trades'])} trades")
+                fill()
+        logger.info(f"Search done in {time.time() - started:.0f}s")
+
+        return {
+            'strategy': strategy_name,
+            'results_path': str(path),
+            'rung_days': days,
+            'rung_counts': [len(rung) for rung in scheduler.results],
+            'parameters': parameters,
+            'ranking': [{'candidate': candidate, 'rung': rung, 'days': days[rung],
+                         'score': scores[rung](scheduler.results[rung][candidate]),
+                         'params': pool[candidate], 'metrics': scheduler.results[rung][candidate]}
+                        for candidate, rung in scheduler.best()],
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def report(search: dict, top: int = 10) -> str:
+    days, counts = search['rung_days'], search['rung_counts']
+    lines = [f"== {search['strategy']} ==",
+             'Rungs: ' + ', '.join(f'{length:g}d x {count}' for length, count in zip(days, counts))]
+    full_cost = counts[0] * days[-1]
+    spent = sum(length * count for length, count in zip(days, counts))
+    if full_cost:
+        lines.append(f"Backtested {spent:.0f} candle-days instead of {full_cost:.0f} "
+                     f"({spent / full_cost:.0%} of running every candidate on the full range)")
+    table = DataFrame([{
+        'candidate': row['candidate'],
+        'days': row['days'],
+        'score': row['score'],
+        'trades': int(row['metrics']['total_trades']),
+        'profit': row['metrics']['profit_total'],
+        'max_dd': row['metrics']['max_drawdown_account'],
+    } for row in search['ranking'][:top]])
+    if not table.empty:
+        lines.append(table.to_string(index=False, float_format=lambda value: f'{value:.4f}'))
+        best = search['ranking'][0]
+        by_space: Dict[str, dict] = {}
+        for parameter in search['parameters']:
+            by_space.setdefault(f'{parameter.space}_params', {})[parameter.name] = best['params'][parameter.name]
+        lines.append(f"Best candidate {best['candidate']} ({best['days']:g} days):")
+        lines.append(json.dumps(by_space, indent=4))
+    return '\n'.join(lines)
+
+
+# === COMMAND LINE ===
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from freqtrade.configuration import TimeRange
+
+    from strategy_utils.market_data import load_config
+
+    parser = argparse.ArgumentParser(description='Successive-halving (ASHA) search of strategy parameters')
+    parser.add_argument('-c', '--config', action='append', required=True)
+    parser.add_argument('--strategy', required=True)
+    parser.add_argument('--timerange', required=True)
+    parser.add_argument('--candidates', type=int, default=243, help='Parameter sets started on rung 0')
+    parser.add_argument('--eta', type=int, default=3, help='Promote the top 1/eta; slices grow eta times per rung')
+    parser.add_argument('--min-days', type=float, default=7, help='Slice length of rung 0')
+    parser.add_argument('--objective', default='sharpe', choices=OBJECTIVES)
+    parser.add_argument('--min-trades', type=int, default=20, help='Trades needed on the full timerange')
+    parser.add_argument('--spaces', nargs='+', default=None, help='Parameter spaces to search (default: all)')
+    parser.add_argument('--all-params', action='store_true', help='Also search optimize=False parameters')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--results-dir', default=None, help=f'Default: {DEFAULT_RESULTS_DIR}')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.eta < 2:
+        parser.error('--eta must be at least 2')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    config = load_config(args.config, timerange=args.timerange, strategy=args.strategy)
+    config['export'] = 'none'
+
+    timerange = TimeRange.parse_timerange(args.timerange)
+    if not timerange.startts or not timerange.stopts:
+        parser.error('--timerange needs a start and an end date')
+
+    search = successive_halving(config, args.strategy, timerange.startts, timerange.stopts, args.candidates,
+                                eta=args.eta, min_days=args.min_days, objective=args.objective,
+                                min_trades=args.min_trades, spaces=args.spaces, include_fixed=args.all_params,
+                                seed=args.seed, workers=args.workers, results_dir=args.results_dir)
+    print(report(search, args.top))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Fixtures for tests that run real freqtrade backtests.
+
+Freqtrade loads the exchange's markets even for backtests, so these tests
+point a binance config at scripts/replay-exchange.py running on a free local
+port instead of the real exchange. Run from data/strategies:
+
+    python -m pytest strategy_utils/tests
+"""
+import json
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('freqtrade')
+
+REPO_DIR = Path(__file__).resolve().parents[4]
+STRATEGIES_DIR = Path(__file__).resolve().parents[2]
+REPLAY_EXCHANGE = REPO_DIR / 'scripts' / 'replay-exchange.py'
+TEST_PAIRS = ['BTC/USD', 'ETH/USD', 'SOL/USD']
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='session')
+def replay_exchange():
+    """URL of a replay exchange serving TEST_PAIRS"""
+    port = _free_port()
+    url = f'http://127.0.0.1:{port}'
+    process = subprocess.Popen(
+        [sys.executable, str(REPLAY_EXCHANGE), 'serve', '--host', '127.0.0.1', '--port', str(port),
+         '--pairs', ','.join(TEST_PAIRS), '--report-interval', '3600'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 15
+        while True:
+            try:
+                urllib.request.urlopen(f'{url}/metrics', timeout=1).close()
+                break
+            except OSError:
+                if time.time() > deadline or process.poll() is not None:
+                    pytest.fail('Replay exchange did not start')
+                time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+@pytest.fixture
+def backtest_config(replay_exchange, tmp_path):
+    """Backtest config against the replay exchange, with an empty datadir under tmp_path"""
+    output = subprocess.run(
+        [sys.executable, str(REPLAY_EXCHANGE), 'config', '--bot', 'pytest', '--url', replay_exchange,
+         '--pairs', ','.join(TEST_PAIRS)],
+        check=True, capture_output=True, text=True).stdout
+    config = json.loads(output)
+    config.update({
+        'max_open_trades': 3,
+        'stake_amount': 'unlimited',
+        'dry_run_wallet': 1000,
+        'fee': 0.001,
+        'entry_pricing': {'price_side': 'same'},
+        'exit_pricing': {'price_side': 'same'},
+        'pairlists': [{'method': 'StaticPairList'}],
+        'user_data_dir': str(tmp_path),
+        'datadir': str(tmp_path / 'data'),
+        'dataformat_ohlcv': 'feather',
+        'export': 'none',
+    })
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(config))
+    return path
+
+
+@pytest.fixture
+def load_strategy(backtest_config):
+    """Loads a strategy from data/strategies with the backtest config"""
+    from freqtrade.resolvers import StrategyResolver
+
+    from strategy_utils.market_data import load_config
+
+    def load(name: str):
+        config = load_config([str(backtest_config)], strategy=name)
+        config['strategy_path'] = str(STRATEGIES_DIR)
+        return StrategyResolver.load_strategy(config)
+
+    return load
@@ -0,0 +1,83 @@
+"""Backtest cache keys, hits and the code hashes the orchestrator's staleness check compares"""
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from strategy_utils import backtest_cache
+from strategy_utils.backtest_cache import STRATEGIES_DIR, BacktestCache, cache_key, cached_backtest, code_files
+from strategy_utils.golden import SYNTHETIC_END, SYNTHETIC_MARKETS, write_synthetic
+from strategy_utils.market_data import load_config
+
+STRATEGY = 'EmaRsiStrategy'
+
+
+def sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_code_files_follow_imports_transitively(tmp_path):
+    package = tmp_path / 'strategy_utils'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'direct.py').write_text('from strategy_utils.nested import helper\n')
+    (package / 'nested.py').write_text('import numpy as np\nhelper = 1\n')
+    (package / 'module.py').write_text('')
+    (package / 'unused.py').write_text('')
+    strategy = tmp_path / 'Strategy.py'
+    strategy.write_text('from strategy_utils.direct import helper\nfrom strategy_utils import module\n')
+
+    files = code_files([strategy], root=tmp_path)
+    assert set(files) == {'Strategy.py', 'strategy_utils/__init__.py', 'strategy_utils/direct.py',
+                          'strategy_utils/nested.py', 'strategy_utils/module.py'}
+    assert files['strategy_utils/nested.py'] == sha256(package / 'nested.py')
+
+    (package / 'nested.py').write_text('helper = 2\n')
+    assert code_files([strategy], root=tmp_path)['strategy_utils/nested.py'] != files['strategy_utils/nested.py']
+
+
+@pytest.fixture
+def cache_config(backtest_config, tmp_path):
+    from freqtrade.exchange import timeframe_to_seconds
+
+    config = load_config([str(backtest_config)], strategy=STRATEGY)
+    config['strategy_path'] = str(STRATEGIES_DIR)
+    write_synthetic(Path(config['datadir']), SYNTHETIC_MARKETS['mixed'], 4, ['15m'])
+    end = SYNTHETIC_END - timeframe_to_seconds('15m')
+    config['timerange'] = f'{end - 2 * 86400}-{end}'
+    return config
+
+
+def test_cached_backtest_hits_until_an_input_changes(cache_config, tmp_path, monkeypatch):
+    cache = BacktestCache(tmp_path / 'cache')
+    entry, hit = cached_backtest(cache_config, cache)
+    assert not hit and cache.get(entry['key']) == entry
+
+    # the catalogue holds what the orchestrator compares: the file hashes on disk and the version
+    import freqtrade
+
+    record = cache.catalogue()[STRATEGY]
+    assert record['key'] == entry['key'] and record['freqtrade_version'] == freqtrade.__version__
+    assert f'{STRATEGY}.py' in record['code_files']
+    for relative, digest in record['code_files'].items():
+        assert sha256(STRATEGIES_DIR / relative) == digest
+
+    def no_backtest(config):
+        raise AssertionError('backtest ran on a cache hit')
+
+    monkeypatch.setattr(backtest_cache, 'run_backtest', no_backtest)
+    again, hit = cached_backtest(cache_config, cache)
+    assert hit and again == entry
+
+    # anything that can change the result gives another key; paths and credentials do not
+    from freqtrade.resolvers import StrategyResolver
+
+    strategy = StrategyResolver.load_strategy(cache_config)
+    key = cache_key(cache_config, strategy)
+    assert key.digest == entry['key']
+    assert cache_key({**cache_config, 'fee': 0.002}, strategy).digest != key.digest
+    assert cache_key({**cache_config, 'user_data_dir': str(tmp_path / 'other'),
+                      'exchange': {**cache_config['exchange'], 'key': 'other', 'secret': 'other'}},
+                     strategy).digest == key.digest
+    monkeypatch.setattr(freqtrade, '__version__', 'other')
+    assert cache_key(cache_config, strategy).digest != key.digest
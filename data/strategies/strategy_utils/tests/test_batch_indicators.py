@@ -0,0 +1,93 @@
+"""Batched indicators against TA-Lib / qtpylib, and cache reuse between the pair screener and populate_indicators"""
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils import batch_indicators
+from strategy_utils.batch_indicators import BatchIndicators
+from strategy_utils.golden import SYNTHETIC_END, SYNTHETIC_MARKETS, aggregate
+from strategy_utils.indicator_snapshots import BASE_COLUMNS
+
+PAIRS = ['BTC/USD', 'ETH/USD', 'SOL/USD']
+
+
+def minute_frames(market: str = 'mixed', candles: int = 600) -> dict:
+    frames = {}
+    for index, pair in enumerate(PAIRS):
+        rows = aggregate(SYNTHETIC_MARKETS[market].minute_candles(index, 100.0 * (index + 1), 1.0, 1), 1)
+        rows = rows[-candles:]
+        frame = pd.DataFrame(rows, columns=BASE_COLUMNS[1:])
+        frame.insert(0, 'date', pd.to_datetime(SYNTHETIC_END - (len(rows) - np.arange(len(rows))) * 60,
+                                               unit='s', utc=True))
+        frames[pair] = frame
+    return frames
+
+
+def stacked(frames: dict, column: str) -> np.ndarray:
+    return np.column_stack([frame[column].to_numpy(dtype=np.float64) for frame in frames.values()])
+
+
+@pytest.mark.parametrize('market', list(SYNTHETIC_MARKETS))
+@pytest.mark.parametrize('name, period', [('ema', 50), ('sma', 30), ('rsi', 14), ('atr', 14), ('adx', 14)])
+def test_matches_talib(market, name, period):
+    import talib
+
+    frames = minute_frames(market)
+    close, high, low = (stacked(frames, column) for column in ('close', 'high', 'low'))
+    if name in ('atr', 'adx'):
+        batched = getattr(batch_indicators, name)(high, low, close, period)
+        expected = [getattr(talib, name.upper())(high[:, idx], low[:, idx], close[:, idx], timeperiod=period)
+                    for idx in range(len(frames))]
+    else:
+        batched = getattr(batch_indicators, name)(close, period)
+        expected = [getattr(talib, name.upper())(close[:, idx], timeperiod=period) for idx in range(len(frames))]
+    for idx, values in enumerate(expected):
+        np.testing.assert_allclose(batched[:, idx], values, rtol=1e-9, atol=1e-9, equal_nan=True,
+                                   err_msg=f'{name} {PAIRS[idx]}')
+
+
+@pytest.mark.parametrize('min_periods', [None, 1])
+def test_bbands_match_qtpylib(min_periods):
+    from freqtrade.vendor.qtpylib.indicators import bollinger_bands
+
+    frames = minute_frames('stress')
+    close = stacked(frames, 'close')
+    upper, middle, lower = batch_indicators.bbands(close, 20, 2, min_periods)
+    for idx, frame in enumerate(frames.values()):
+        if min_periods == 1:
+            expected = bollinger_bands(frame['close'], window=20, stds=2)
+            expected = expected['upper'], expected['mid'], expected['lower']
+        else:
+            rolling = frame['close'].rolling(20)
+            expected = (rolling.mean() + 2 * rolling.std(), rolling.mean(), rolling.mean() - 2 * rolling.std())
+        for batched, values in zip((upper, middle, lower), expected):
+            np.testing.assert_allclose(batched[:, idx], values, rtol=1e-9, equal_nan=True)
+
+
+def live_dp(frames: dict):
+    return SimpleNamespace(runmode=SimpleNamespace(value='dry_run'), current_whitelist=lambda: list(frames),
+                           ohlcv=lambda pair, timeframe, copy=True: frames[pair])
+
+
+def test_apply_reuses_screener_series():
+    frames = minute_frames()
+    indicators = BatchIndicators().ema('ema_fast', 50).ema('ema_slow', 200).rsi('rsi')
+    series = indicators.pair_series(frames)
+
+    computed = []
+    compute = indicators._compute
+    indicators._compute = lambda batch: computed.append(len(batch)) or compute(batch)
+    dp = live_dp(frames)
+    for pair in PAIRS[:2]:
+        analyzed = indicators.apply(frames[pair].copy(), pair, dp, '1m')
+        for column in indicators.columns:
+            np.testing.assert_array_equal(analyzed[column].to_numpy(), series[pair][column])
+    assert computed == []
+
+    # a new candle invalidates the screener's values and falls back to one whitelist batch
+    frames['BTC/USD'] = pd.concat([frames['BTC/USD'].iloc[1:], frames['BTC/USD'].tail(1).assign(
+        date=frames['BTC/USD']['date'].iloc[-1] + pd.Timedelta(minutes=1))], ignore_index=True)
+    indicators.apply(frames['BTC/USD'].copy(), 'BTC/USD', dp, '1m')
+    assert computed == [len(PAIRS)]
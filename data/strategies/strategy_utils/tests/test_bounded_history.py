@@ -0,0 +1,87 @@
+"""Bounded analysis against the full analysis of the same candles"""
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from strategy_utils.golden import SYNTHETIC_END, SYNTHETIC_MARKETS, aggregate
+from strategy_utils.indicator_snapshots import BASE_COLUMNS
+
+PAIR = 'BTC/USD'
+CANDLES = 700
+
+
+class DataProvider:
+    """Takes the analyzed dataframes freqtrade caches, in a dry-run bot or (live=False) a backtest"""
+
+    def __init__(self, live: bool = True):
+        from freqtrade.enums import RunMode
+
+        self.runmode = RunMode.DRY_RUN if live else RunMode.BACKTEST
+        self.cached = {}
+
+    def _set_cached_df(self, pair, timeframe, dataframe, candle_type):
+        self.cached[pair] = dataframe
+
+    def _emit_df(self, pair_key, dataframe, new_candle):
+        pass
+
+
+def candles(strategy) -> pd.DataFrame:
+    from freqtrade.exchange import timeframe_to_minutes
+
+    minutes = timeframe_to_minutes(strategy.timeframe)
+    days = CANDLES * minutes // 1440 + 1
+    rows = aggregate(SYNTHETIC_MARKETS['mixed'].minute_candles(0, 60000.0, 1.0, days), minutes)[-CANDLES:]
+    frame = pd.DataFrame(rows, columns=BASE_COLUMNS[1:])
+    frame.insert(0, 'date', pd.to_datetime(SYNTHETIC_END - (len(rows) - np.arange(len(rows))) * minutes * 60,
+                                           unit='s', utc=True))
+    return frame
+
+
+def analyze(strategy, frame: pd.DataFrame) -> pd.DataFrame:
+    return strategy._analyze_ticker_internal(frame.copy(), {'pair': PAIR})
+
+
+@pytest.mark.parametrize('strategy_name', ['EmaRsiStrategy', 'DCAStrategy'])
+def test_bounded_rows_match_the_full_analysis(load_strategy, strategy_name):
+    strategy = load_strategy(strategy_name)
+    frame = candles(strategy)
+    strategy.dp = DataProvider(live=False)
+    full = analyze(strategy, frame)
+    assert len(full) == CANDLES
+
+    strategy = load_strategy(strategy_name)
+    strategy.dp = DataProvider()
+    bound = strategy.history_bound()
+    lookback = strategy.history_lookback or strategy.startup_candle_count
+    assert bound == lookback + max(strategy.history_min_margin, int(lookback * strategy.history_margin))
+    assert bound < CANDLES
+
+    assert len(analyze(strategy, frame.iloc[:-1])) == bound
+    assert strategy.history_rows() == {PAIR: {'rows': CANDLES - 1, 'bounded_rows': bound}}
+
+    # every new candle is trimmed again, to the rows the full analysis ends with
+    bounded = analyze(strategy, frame)
+    assert len(bounded) == bound
+    expected = full.iloc[-bound:].reset_index(drop=True)
+    assert_frame_equal(bounded, expected[bounded.columns])
+    assert strategy.history_rows() == {PAIR: {'rows': CANDLES, 'bounded_rows': bound}}
+    assert strategy.dp.cached[PAIR] is bounded
+
+    # a candle already analyzed is left to freqtrade's own skip
+    assert len(analyze(strategy, frame)) == CANDLES
+
+
+def test_config_overrides_the_bound(load_strategy):
+    strategy = load_strategy('EmaRsiStrategy')
+    strategy.dp = DataProvider()
+    frame = candles(strategy)
+    strategy.config['bounded_history'] = {'rows': 300}
+    assert len(analyze(strategy, frame)) == 300
+
+    strategy = load_strategy('EmaRsiStrategy')
+    strategy.dp = DataProvider()
+    strategy.config['bounded_history'] = {'enabled': False}
+    assert len(analyze(strategy, frame)) == CANDLES
+    assert strategy.history_rows() == {}
@@ -0,0 +1,42 @@
+"""RollingCovariance against a full recomputation of each window"""
+import numpy as np
+import pandas as pd
+
+from strategy_utils.correlation import RollingCovariance
+
+COLUMNS = ['BTC/USD', 'ETH/USD', 'SOL/USD', 'XRP/USD']
+WINDOW = 30
+
+
+def returns(rows: int, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    mixing = rng.normal(size=(len(COLUMNS), len(COLUMNS)))
+    return rng.normal(0.0005, 0.01, size=(rows, len(COLUMNS))) @ mixing
+
+
+def test_matches_np_cov_over_the_window():
+    values = returns(4 * WINDOW + 7)
+    rolling = RollingCovariance(COLUMNS, WINDOW)
+    for row in range(len(values)):
+        rolling.push(values[row])
+        window = values[max(row + 1 - WINDOW, 0):row + 1]
+        if len(window) < 2:
+            assert np.isnan(rolling.covariance()).all()
+            continue
+        np.testing.assert_allclose(rolling.covariance(), np.cov(window, rowvar=False), rtol=1e-9, atol=1e-15)
+        np.testing.assert_allclose(rolling.correlation(), np.corrcoef(window, rowvar=False), rtol=1e-9, atol=1e-12)
+
+
+def test_missing_values_use_pairwise_complete_rows():
+    values = returns(3 * WINDOW + 11, seed=5)
+    rng = np.random.default_rng(9)
+    values[rng.random(values.shape) < 0.15] = np.nan
+    values[:40, 3] = np.nan   # a pair listed later than the others
+    rolling = RollingCovariance(COLUMNS, WINDOW, min_periods=10)
+    for row in range(len(values)):
+        rolling.push(values[row])
+        window = pd.DataFrame(values[max(row + 1 - WINDOW, 0):row + 1])
+        np.testing.assert_allclose(rolling.covariance(), window.cov(min_periods=10).to_numpy(),
+                                   rtol=1e-9, atol=1e-15, equal_nan=True)
+        np.testing.assert_allclose(rolling.correlation(), window.corr(min_periods=10).to_numpy(),
+                                   rtol=1e-9, atol=1e-12, equal_nan=True)
@@ -0,0 +1,49 @@
+"""Parity of the vectorized DCA simulator with freqtrade's backtesting loop"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from strategy_utils.dca_simulator import SimulationSettings, check_parity, default_ladder, prepare_market, simulate
+from strategy_utils.golden import SYNTHETIC_END, SYNTHETIC_MARKETS, write_synthetic
+from strategy_utils.market_data import load_analyzed_data, load_config
+from strategy_utils.walk_forward import DAY
+
+DAYS = 120
+TIMERANGE = f'{SYNTHETIC_END - (DAYS - 10) * DAY}-{SYNTHETIC_END - DAY}'
+
+
+def backtest_trades(config: dict):
+    """Trade list of a real freqtrade backtest over the configured timerange"""
+    from freqtrade.data.history import get_timerange
+    from freqtrade.optimize.backtesting import Backtesting
+
+    backtesting = Backtesting(config)
+    backtesting._set_strategy(backtesting.strategylist[0])
+    data, timerange = backtesting.load_bt_data()
+    processed = backtesting.strategy.advise_all_indicators(data)
+    min_date, max_date = get_timerange(processed)
+    return backtesting.backtest(processed=processed, start_date=timerange.startdt or min_date,
+                                end_date=max_date)['results']
+
+
+@pytest.mark.parametrize('market_name', ['mixed', 'pullbacks'])
+@pytest.mark.parametrize('dca_enabled', [False, True])
+def test_simulator_matches_backtest(backtest_config: Path, market_name: str, dca_enabled: bool):
+    config = load_config([str(backtest_config)], timerange=TIMERANGE, strategy='DCAStrategy')
+    config['strategy_path'] = str(Path(__file__).resolve().parents[2])
+    config['position_adjustment_enable'] = dca_enabled
+    write_synthetic(Path(config['datadir']), SYNTHETIC_MARKETS[market_name], DAYS, ['1h'])
+
+    backtest = backtest_trades(config)
+    assert len(backtest) > 0, 'fixed dataset produced no trades'
+
+    strategy, frames = load_analyzed_data(config)
+    settings = SimulationSettings.from_strategy(strategy, config)
+    assert settings.dca_enabled == dca_enabled
+    ladder = {name: np.array([value]) for name, value in default_ladder(strategy).items()}
+    result = simulate(prepare_market(frames, strategy.timeframe), ladder, settings, record_trades=True)
+
+    report = check_parity(result['trade_list'], backtest)
+    assert report['ok'], report['mismatches'][:10]
+    assert report['matched'] == len(backtest)
@@ -0,0 +1,48 @@
+"""Golden corpus: a perturbed output is reported at its first divergence"""
+import numpy as np
+
+from strategy_utils.golden import DEFAULT_TOLERANCES, Corpus, _format_time, check, diff_signals, generate
+from strategy_utils.market_data import load_config
+
+STRATEGY = 'AggressiveSophisticated1m'
+INPUT = 'synthetic-mixed'
+
+
+def test_check_reports_first_divergence(backtest_config, tmp_path):
+    config = load_config([str(backtest_config)])
+    corpus_dir = tmp_path / 'corpus'
+    generate(config, [STRATEGY], [INPUT], corpus_dir=corpus_dir)
+    assert check(config, corpus_dir=corpus_dir) == []
+
+    corpus = Corpus(corpus_dir)
+    original = corpus.load_output(STRATEGY, INPUT)
+    perturbed = corpus.load_output(STRATEGY, INPUT)
+
+    # an entry signal that went missing
+    pair = next(pair for pair, columns in perturbed.signals.items() if (columns['enter_long'] == 1).sum() >= 2)
+    entries = np.flatnonzero(perturbed.signals[pair]['enter_long'] == 1)
+    perturbed.signals[pair]['enter_long'][entries[1]] = 0
+    signal_time = _format_time(perturbed.signals[pair]['date'][entries[1]])
+
+    # a callback value and a trade's close rate
+    calls = perturbed.callbacks['custom_stoploss']
+    call = next(index for index, call in enumerate(calls) if index >= 2 and isinstance(call[2], float))
+    calls[call][2] += 0.01
+    assert len(perturbed.trades) >= 2
+    perturbed.trades[1]['close_rate'] *= 1.01
+    corpus.save_output(STRATEGY, INPUT, perturbed)
+
+    divergences = {(divergence.where, divergence.column): divergence
+                   for divergence in check(config, corpus_dir=corpus_dir)}
+    assert set(divergences) == {(pair, 'enter_long'), ('callbacks', 'custom_stoploss'), ('trades', 'close_rate')}
+    assert divergences[pair, 'enter_long'].first.startswith(f"{signal_time}: expected 0.0, got 1.0")
+    assert divergences[pair, 'enter_long'].count == 1
+    assert divergences['callbacks', 'custom_stoploss'].first.startswith(f"call {call} ")
+    assert divergences['callbacks', 'custom_stoploss'].count == 1
+    assert divergences['trades', 'close_rate'].first.startswith('trade 1 ')
+    assert divergences['trades', 'close_rate'].count == 1
+
+    # the same signal difference through the Python API, e.g. for another execution path
+    [divergence] = diff_signals(perturbed.signals, original.signals, DEFAULT_TOLERANCES)
+    assert (divergence.where, divergence.column, divergence.count) == (pair, 'enter_long', 1)
+    assert divergence.first.startswith(signal_time)
@@ -0,0 +1,58 @@
+"""Warm restart of DCAStrategy from an indicator snapshot against a cold analysis"""
+import numpy as np
+import pandas as pd
+
+from strategy_utils.golden import SYNTHETIC_END, SYNTHETIC_MARKETS, aggregate
+from strategy_utils.indicator_snapshots import BASE_COLUMNS, _SnapshotWriter
+
+PAIR = 'BTC/USD'
+
+
+def hourly_candles(days: int) -> pd.DataFrame:
+    rows = aggregate(SYNTHETIC_MARKETS['mixed'].minute_candles(0, 60000.0, 1.0, days), 60)
+    frame = pd.DataFrame(rows, columns=BASE_COLUMNS[1:])
+    frame.insert(0, 'date', pd.to_datetime(SYNTHETIC_END - len(rows) * 3600 + np.arange(len(rows)) * 3600,
+                                           unit='s', utc=True))
+    return frame
+
+
+def test_resume_matches_cold_analysis(load_strategy):
+    strategy = load_strategy('DCAStrategy')
+    history = hourly_candles(60)
+    metadata = {'pair': PAIR}
+
+    # previous run: analyzed up to candle 1200, snapshot keeps the last 500 rows
+    previous = strategy.advise_indicators(history.iloc[:1200].copy(), metadata)
+    snapshot = previous.tail(strategy._snapshot_rows()).reset_index(drop=True)
+
+    # restart: the exchange returns 910 candles, more than the snapshot holds, 11 of them new
+    fresh = history.iloc[300:1210].reset_index(drop=True)
+    cold = strategy.advise_indicators(fresh.copy(), metadata)
+
+    computed_rows = []
+    populate = strategy.populate_indicators
+
+    def recording(dataframe, metadata):
+        computed_rows.append(len(dataframe))
+        return populate(dataframe, metadata)
+
+    strategy.populate_indicators = recording
+    strategy._snapshots = {PAIR: snapshot}
+    strategy._snapshot_resumed, strategy._snapshot_checked = set(), set()
+    strategy._snapshot_writer = _SnapshotWriter()
+    try:
+        resumed = strategy.advise_indicators(fresh.copy(), metadata)
+    finally:
+        strategy._snapshot_writer.close()
+        strategy._snapshot_writer = None
+
+    assert computed_rows == [strategy._resume_seed_rows() + 11]
+    assert strategy._resume_seed_rows() >= 200
+    assert resumed['date'].equals(cold['date'])
+    covered = resumed['date'] >= snapshot['date'].iloc[0]
+    assert not resumed.loc[resumed.index[-11:], 'sma_200'].isna().any()
+    for column in cold.columns:
+        if column in BASE_COLUMNS or not pd.api.types.is_numeric_dtype(cold[column]):
+            continue
+        np.testing.assert_allclose(resumed.loc[covered, column], cold.loc[covered, column],
+                                   rtol=1e-3, atol=1e-5, err_msg=column)
@@ -0,0 +1,40 @@
+"""InformativeResampler candles against resampling the whole history at once"""
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from strategy_utils.informative import OHLCV_COLUMNS, InformativeResampler
+
+PAIR = 'BTC/USD'
+
+
+def hourly_frame(candles: int) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, candles)))
+    return pd.DataFrame({'date': pd.date_range('2024-01-01 05:00', periods=candles, freq='1h', tz='UTC'),
+                         'open': close * 0.999, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+                         'volume': rng.random(candles)})
+
+
+@pytest.mark.parametrize('timeframe', ['4h', '1d'])
+def test_incremental_candles_match_a_full_resample(timeframe):
+    frame = hourly_frame(24 * 10)
+    resampler = InformativeResampler('1h')
+    resampler.track(PAIR, timeframe)
+    for end in range(50, len(frame) + 1, 7):
+        resampler.update(PAIR, frame.iloc[:end])
+    resampler.update(PAIR, frame)
+
+    expected = frame.resample(pd.Timedelta(timeframe), on='date').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}).reset_index()
+    # the first bucket started before the history, the last one is still forming
+    expected = expected.iloc[1:-1].reset_index(drop=True)
+    assert_frame_equal(resampler.get_pair_dataframe(PAIR, timeframe), expected[['date', *OHLCV_COLUMNS]],
+                       check_dtype=False, check_freq=False)
+
+
+@pytest.mark.parametrize('timeframe', ['1w', '1M', '30m'])
+def test_rejects_timeframes_it_cannot_bucket(timeframe):
+    with pytest.raises(ValueError):
+        InformativeResampler('1h').track(PAIR, timeframe)
@@ -0,0 +1,87 @@
+"""Monte Carlo paths of a small trade list with hand-computed metrics"""
+import numpy as np
+import pytest
+
+from strategy_utils import monte_carlo
+from strategy_utils.monte_carlo import Perturbation, TradeList, run_monte_carlo, simulate
+
+DAY_MS = 86_400_000
+
+
+def trade(profit_ratio: float, close_day: int, stake: float = 100.0) -> dict:
+    return {'profit_ratio': profit_ratio, 'stake_amount': stake, 'fee_open': 0.001, 'fee_close': 0.001,
+            'open_timestamp': (close_day - 1) * DAY_MS, 'close_timestamp': close_day * DAY_MS}
+
+
+def known_trades() -> TradeList:
+    # wallet 1000 -> 1010, 990, 980, 1010 on days 1 to 4, the backtest ends on day 5
+    trades = [trade(0.3, 4), trade(-0.2, 2), trade(0.1, 1), trade(-0.1, 3),
+              {**trade(0.5, 5), 'close_timestamp': None}]   # still open
+    return TradeList.from_trades(trades, 1000, start_ms=0, end_ms=5 * DAY_MS)
+
+
+def test_trade_list_keeps_closed_trades_in_close_order():
+    trades = known_trades()
+    np.testing.assert_array_equal(trades.profit_ratio, [0.1, -0.2, -0.1, 0.3])
+    np.testing.assert_array_equal(trades.close_days, [1, 2, 3, 4])
+    np.testing.assert_allclose(trades.fee_rate, 0.002)
+    assert trades.days == 5.0
+    with pytest.raises(ValueError):
+        TradeList.from_trades([{**trade(0.1, 1), 'close_timestamp': None}], 1000)
+
+
+def test_unperturbed_path_matches_the_backtest():
+    metrics = simulate(known_trades(), Perturbation(), paths=3, seed=0)
+    for values in metrics.values():
+        assert len(values) == 3 and (values == values[0]).all()
+    assert metrics['profit_ratio'][0] == pytest.approx(0.01)
+    assert metrics['max_drawdown'][0] == pytest.approx(30 / 1010)
+    assert metrics['longest_underwater_days'][0] == pytest.approx(3.0)    # peak on day 1, back on day 4
+    assert metrics['underwater_share'][0] == pytest.approx(2 / 5)        # days 2 to 4 of 5
+    assert metrics['cagr'][0] == pytest.approx(1.01 ** (365 / 5) - 1)
+    assert not metrics['ruined'].any()
+    assert simulate(known_trades(), Perturbation(ruin=0.015), paths=1, seed=0)['ruined'].all()   # 980 <= 985
+
+
+@pytest.mark.parametrize('compound', [False, True])
+def test_shuffling_moves_drawdowns_but_not_the_final_profit(compound):
+    trades = known_trades()
+    baseline = simulate(trades, Perturbation(compound=compound), paths=1, seed=0)
+    metrics = simulate(trades, Perturbation(shuffle=True, compound=compound), paths=500, seed=1)
+    np.testing.assert_allclose(metrics['profit_ratio'], baseline['profit_ratio'][0])
+    drawdowns = np.unique(metrics['max_drawdown'].round(12))
+    assert len(drawdowns) > 1
+    # the worst orders take both losses in a row; from the starting balance when not compounding
+    worst = 30 / 1000 if not compound else 1 - 0.98 * 0.99
+    assert drawdowns.max() == pytest.approx(worst)
+
+
+def test_perturbations_only_cost():
+    trades = known_trades()
+    baseline = simulate(trades, Perturbation(), paths=1, seed=0)['profit_ratio'][0]
+    slipped = simulate(trades, Perturbation(slippage=0.002), paths=2000, seed=2)['profit_ratio']
+    assert (slipped < baseline).all()
+    # two |N(0, s)| per trade, four trades of 10% of the wallet
+    assert baseline - slipped.mean() == pytest.approx(4 * 0.1 * 2 * 0.002 * np.sqrt(2 / np.pi), rel=0.05)
+
+    jittered = simulate(trades, Perturbation(fee_jitter=0.5), paths=2000, seed=3)['profit_ratio']
+    assert np.abs(jittered - baseline).max() <= 4 * 0.1 * 0.002 * 0.5 + 1e-12
+    assert jittered.mean() == pytest.approx(baseline, abs=1e-5)
+
+    skipped = simulate(trades, Perturbation(skip=1.0), paths=10, seed=4)
+    np.testing.assert_array_equal(skipped['profit_ratio'], 0.0)
+    np.testing.assert_array_equal(skipped['max_drawdown'], 0.0)
+
+
+def test_chunks_cover_every_path_reproducibly(monkeypatch):
+    monkeypatch.setattr(monte_carlo, 'CHUNK_CELLS', 40)    # ten paths of four trades per chunk
+    settings = Perturbation(shuffle=True, slippage=0.001)
+    first = run_monte_carlo(known_trades(), settings, paths=95, seed=7, workers=1)
+    again = run_monte_carlo(known_trades(), settings, paths=95, seed=7, workers=1)
+    other = run_monte_carlo(known_trades(), settings, paths=95, seed=8, workers=1)
+    for name, values in first.items():
+        assert len(values) == 95
+        np.testing.assert_array_equal(values, again[name])
+    assert not np.array_equal(first['profit_ratio'], other['profit_ratio'])
+    # chunks draw from independent streams, not ten copies of one
+    assert len(np.unique(first['profit_ratio'])) == 95
@@ -0,0 +1,42 @@
+"""PortfolioRebalancingStrategy ages its plan by candle time in signals and callbacks alike"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+SIGNAL = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def strategy(load_strategy):
+    from freqtrade.persistence import init_db
+
+    init_db('sqlite://')    # no open trades
+    strategy = load_strategy('PortfolioRebalancingStrategy')
+    strategy.dp = None
+    strategy.wallets = None
+    strategy.bot_start()
+    return strategy
+
+
+def candle(strategy) -> timedelta:
+    from freqtrade.exchange import timeframe_to_seconds
+
+    return timedelta(seconds=timeframe_to_seconds(strategy.timeframe))
+
+
+def test_callbacks_use_the_candle_the_signal_came_from(strategy):
+    assert strategy.signal_candle(SIGNAL + candle(strategy)) == SIGNAL                          # backtest
+    assert strategy.signal_candle(SIGNAL + candle(strategy) + timedelta(seconds=7)) == SIGNAL   # live
+
+
+def test_plan_is_shared_until_it_is_frequency_old(strategy):
+    plan = strategy.rebalance_plan(SIGNAL)
+    assert plan.created_at == SIGNAL
+    # the entry callbacks for that signal, some seconds into the next candle on a live bot
+    callback_time = SIGNAL + candle(strategy) + timedelta(seconds=7)
+    assert strategy.rebalance_plan(strategy.signal_candle(callback_time)) is plan
+
+    frequency = timedelta(hours=strategy.rebalance_frequency_hours.value)
+    assert strategy.rebalance_plan(SIGNAL + frequency - candle(strategy)) is plan
+    renewed = strategy.rebalance_plan(SIGNAL + frequency)
+    assert renewed is not plan and renewed.created_at == SIGNAL + frequency
@@ -0,0 +1,64 @@
+"""solve_rebalance on small portfolios with known answers"""
+from datetime import datetime, timezone
+
+import pytest
+
+from strategy_utils.rebalancing import solve_rebalance
+
+CATEGORIES = {'BTC/USD': 'major', 'ETH/USD': 'major', 'BNB/USD': 'major',
+              'ADA/USD': 'alt', 'DOT/USD': 'alt', 'USDC/USD': 'stable'}
+TARGETS = {'major': 0.5, 'alt': 0.3, 'stable': 0.2}
+CREATED_AT = datetime(2024, 3, 1, tzinfo=timezone.utc)
+TRADED = [pair for pair, category in CATEGORIES.items() if category != 'stable']
+
+
+def solve(positions, candidates=tuple(CATEGORIES), **overrides):
+    settings = {'total_value': 1000.0, 'threshold': 0.05, 'min_amount': 10.0,
+                'max_position': 0.2, 'min_position': 0.05, **overrides}
+    return solve_rebalance(positions, candidates, CATEGORIES.get, TARGETS, created_at=CREATED_AT, **settings)
+
+
+def amounts(plan):
+    return {pair: round(order.amount, 6) for pair, order in plan.orders.items()}
+
+
+def test_on_target_portfolio_has_no_orders():
+    plan = solve({'BTC/USD': 200, 'ETH/USD': 180, 'BNB/USD': 120, 'ADA/USD': 160, 'DOT/USD': 140})
+    assert plan.orders == {}
+    assert plan.allocations == pytest.approx({'major': 0.5, 'alt': 0.3, 'stable': 0.2})
+    assert plan.created_at == CREATED_AT
+
+
+def test_buys_fill_the_most_room_first_up_to_max_position():
+    # major 15% (gap 350), alt 0% (gap 300); free balance counts as stable (85%, nothing to sell)
+    plan = solve({'BTC/USD': 100, 'ETH/USD': 50})
+    assert amounts(plan) == {'BNB/USD': 200, 'ETH/USD': 150, 'ADA/USD': 200, 'DOT/USD': 100}
+    assert plan.allocations['stable'] == pytest.approx(0.85)
+
+
+def test_buys_only_go_to_candidates_and_new_positions_reach_min_position():
+    # alt 24% is 60 short: ADA is above max_position and 60 is too little for a new 10% position
+    plan = solve({'BTC/USD': 200, 'ETH/USD': 200, 'BNB/USD': 100, 'ADA/USD': 240},
+                 candidates=['BTC/USD', 'ADA/USD', 'DOT/USD'], min_position=0.1)
+    assert amounts(plan) == {}
+    # the same gap tops up a held pair with room; DOT is not a candidate
+    plan = solve({'BTC/USD': 200, 'ETH/USD': 200, 'BNB/USD': 100, 'ADA/USD': 150, 'DOT/USD': 90},
+                 candidates=['BTC/USD', 'ADA/USD'], min_position=0.1)
+    assert amounts(plan) == {'ADA/USD': 50}
+
+
+def test_sells_close_whole_positions_largest_first_without_overshooting():
+    # major 60% is 100 over target: closing BTC (300) or ETH (160) would leave it more than the
+    # 5% threshold under target, BNB (140) is the largest that does not
+    plan = solve({'BTC/USD': 300, 'ETH/USD': 160, 'BNB/USD': 140, 'ADA/USD': 300}, TRADED)
+    assert amounts(plan) == {'BNB/USD': -140}
+    # 150 over: ETH first, then BNB no longer fits
+    plan = solve({'BTC/USD': 300, 'ETH/USD': 200, 'BNB/USD': 150, 'ADA/USD': 300}, TRADED)
+    assert amounts(plan) == {'ETH/USD': -200}
+    assert all(order.category == 'major' for order in plan.orders.values())
+
+
+def test_small_drift_and_small_orders_are_ignored():
+    assert solve({'BTC/USD': 200, 'ETH/USD': 200, 'BNB/USD': 140, 'ADA/USD': 260}).orders == {}
+    assert solve({'BTC/USD': 100, 'ETH/USD': 50}, min_amount=400).orders == {}
+    assert solve({}, total_value=0.0).orders == {}
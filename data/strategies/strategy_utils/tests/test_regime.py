@@ -0,0 +1,65 @@
+"""RegimeService boards: shared per timeframe, copied only for the same candles and parameters"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.regime import RegimeBoard, RegimeService, compute_regime
+
+
+def candles(count: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    return pd.DataFrame({'date': pd.date_range('2024-01-01', periods=count, freq='5min', tz='UTC'),
+                         'open': close, 'high': close * 1.005, 'low': close * 0.995, 'close': close,
+                         'volume': 1.0})
+
+
+@pytest.fixture
+def board():
+    # a board of its own, not one a running bot may be attached to
+    name = f"ft_regime_test_{os.getpid()}"
+    opened = RegimeBoard.open(name, slots=4, rows=600)
+    yield opened
+    opened.release()
+
+
+def service(board, **params) -> RegimeService:
+    return RegimeService('5m', board=board, exchange='binance', **params)
+
+
+def test_services_share_a_board_whatever_their_parameters():
+    assert service(None).board_name() == service(None, adx_period=20, ema_period=50).board_name()
+    assert service(None).board_name() != RegimeService('1h', exchange='binance').board_name()
+
+
+def test_labels_are_copied_only_for_the_same_candles_and_parameters(board):
+    frame = candles(500)
+    first = service(board)
+    first.apply(frame.copy(), 'BTC/USD')
+    assert first.computed == 1
+
+    same = service(board)
+    copied = same.apply(frame.copy(), 'BTC/USD')
+    assert same.hits == 1 and same.computed == 0
+    expected = compute_regime(frame)
+    for column, values in expected.items():
+        np.testing.assert_array_equal(copied[column].to_numpy(dtype=np.float64), values)
+
+    # other parameters, or a history starting elsewhere, compute their own labels
+    other = service(board, adx_period=20)
+    labels = other.apply(frame.copy(), 'BTC/USD')
+    assert other.hits == 0 and other.computed == 1
+    np.testing.assert_array_equal(labels['adx'].to_numpy(), compute_regime(frame, adx_period=20)['adx'])
+    shorter = service(board, adx_period=20)
+    shorter.apply(frame.iloc[10:].reset_index(drop=True), 'BTC/USD')
+    assert shorter.hits == 0
+
+    # one slot per pair: it holds the series the last bot computed
+    follower = service(board, adx_period=20)
+    follower.apply(frame.iloc[10:].reset_index(drop=True), 'BTC/USD')
+    assert follower.hits == 1
+    again = service(board)
+    again.apply(frame.copy(), 'BTC/USD')
+    assert again.hits == 0
@@ -0,0 +1,69 @@
+"""EWMA volatility and RiskParitySizer weights on returns with known scales"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.risk_parity import RiskParitySizer, ewma_volatility
+
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+SCALES = {'BTC/USD': 0.01, 'ETH/USD': 0.02, 'SOL/USD': 0.04}
+
+
+class AnalyzedDataProvider:
+    def __init__(self, frames: dict):
+        self.frames = frames
+        self.reads = 0
+
+    def current_whitelist(self):
+        return list(self.frames)
+
+    def get_analyzed_dataframe(self, pair, timeframe):
+        self.reads += 1
+        frame = self.frames[pair]
+        return frame, frame['date'].iloc[-1]
+
+
+def candles(returns: np.ndarray, end: datetime = START) -> pd.DataFrame:
+    close = 100.0 * np.exp(np.concatenate([[0.0], np.cumsum(returns)]))
+    dates = pd.date_range(end=end, periods=len(close), freq='1h')
+    return pd.DataFrame({'date': dates, 'close': close})
+
+
+def test_ewma_volatility_matches_pandas_ewm():
+    rng = np.random.default_rng(11)
+    returns = rng.normal(0.0, 0.01, size=(200, 3))
+    returns[rng.random(returns.shape) < 0.1] = np.nan
+    returns[:190, 2] = np.nan   # too short a history
+    volatility = ewma_volatility(returns, halflife=24, min_periods=20)
+    expected = np.sqrt((pd.DataFrame(returns) ** 2).ewm(halflife=24, min_periods=20).mean().iloc[-1].to_numpy())
+    np.testing.assert_allclose(volatility, expected, rtol=1e-12, equal_nan=True)
+    assert np.isnan(volatility[2])
+
+
+def test_weights_are_inverse_volatility():
+    rng = np.random.default_rng(13)
+    frames = {pair: candles(scale * rng.standard_normal(400)) for pair, scale in SCALES.items()}
+    frames['NEW/USD'] = candles(0.01 * rng.standard_normal(10))
+    dp = AnalyzedDataProvider(frames)
+    sizer = RiskParitySizer(dp, '1h', halflife=48)
+
+    weights = {pair: sizer.weight(pair, START) for pair in frames}
+    assert weights['NEW/USD'] is None and sizer.multiplier('NEW/USD', START) is None
+    known = {pair: weight for pair, weight in weights.items() if weight is not None}
+    assert sum(known.values()) == pytest.approx(1.0)
+    volatility = {pair: sizer.volatility(pair, START) for pair in known}
+    for pair, weight in known.items():
+        # equal risk: weight x volatility is the same for every pair
+        assert weight * volatility[pair] == pytest.approx(known['BTC/USD'] * volatility['BTC/USD'])
+        assert sizer.multiplier(pair, START) == pytest.approx(weight * len(known))
+    assert volatility['ETH/USD'] / volatility['BTC/USD'] == pytest.approx(2.0, rel=0.25)
+    assert volatility['BTC/USD'] == pytest.approx(0.01 * np.sqrt(24 * 365), rel=0.25)
+
+    # lookups within the same candle do not recompute
+    reads = dp.reads
+    sizer.weight('BTC/USD', START + timedelta(minutes=30))
+    assert dp.reads == reads
+    sizer.weight('BTC/USD', START + timedelta(hours=1))
+    assert dp.reads > reads
@@ -0,0 +1,85 @@
+"""@cached_stoploss against the undecorated custom_stoploss over a sweep of rates and trade ages"""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_utils.golden import SYNTHETIC_END, SYNTHETIC_MARKETS, aggregate
+from strategy_utils.indicator_snapshots import BASE_COLUMNS
+from strategy_utils.stoploss_cache import stop_price
+
+PAIR = 'BTC/USD'
+CANDLES = 400
+SWEPT_CANDLES = 60
+CALLS_PER_CANDLE = 12
+
+
+class LiveDataProvider:
+    """Serves a growing analyzed dataframe to custom_stoploss as a dry-run bot would"""
+
+    def __init__(self, frame: pd.DataFrame):
+        from freqtrade.enums import RunMode
+
+        self.runmode = RunMode.DRY_RUN
+        self.frame = frame
+        self.rows = 0
+
+    def get_analyzed_dataframe(self, pair, timeframe):
+        analyzed = self.frame.iloc[:self.rows]
+        return analyzed, analyzed['date'].iloc[-1]
+
+
+def analyzed_candles(strategy) -> pd.DataFrame:
+    from freqtrade.exchange import timeframe_to_minutes
+
+    minutes = timeframe_to_minutes(strategy.timeframe)
+    days = CANDLES * minutes // 1440 + 1
+    rows = aggregate(SYNTHETIC_MARKETS['stress'].minute_candles(0, 60000.0, 1.0, days), minutes)[-CANDLES:]
+    frame = pd.DataFrame(rows, columns=BASE_COLUMNS[1:])
+    frame.insert(0, 'date', pd.to_datetime(SYNTHETIC_END - (len(rows) - np.arange(len(rows))) * minutes * 60,
+                                           unit='s', utc=True))
+    return strategy.populate_indicators(frame, {'pair': PAIR})
+
+
+def ratchet(held: float, value, rate: float) -> float:
+    """freqtrade only ever raises a long stop"""
+    return max(held, stop_price(value, rate, False))
+
+
+@pytest.mark.parametrize('strategy_name', [
+    'AggressiveSophisticated1m', 'EnhancedRiskManagedStrategy', 'HighFrequencyScalp1m'])
+def test_cached_stop_never_looser(load_strategy, strategy_name):
+    strategy = load_strategy(strategy_name)
+    strategy.dp = None
+    frame = analyzed_candles(strategy)
+    strategy.dp = LiveDataProvider(frame)
+    uncached = getattr(type(strategy).custom_stoploss, '__wrapped__', type(strategy).custom_stoploss)
+
+    start = CANDLES - SWEPT_CANDLES
+    candle_seconds = (frame['date'].iloc[1] - frame['date'].iloc[0]).total_seconds()
+    open_rate = frame['close'].iloc[start - 1]
+    open_date = frame['date'].iloc[start - 1].to_pydatetime()
+    trade = SimpleNamespace(id=1, pair=PAIR, open_rate=open_rate, is_short=False, open_date_utc=open_date)
+    rng = np.random.default_rng(7)
+
+    held_cached = held_uncached = open_rate * (1 + strategy.stoploss)
+    rate = open_rate
+    for row in range(start, CANDLES):
+        strategy.dp.rows = row
+        for step in range(CALLS_PER_CANDLE):
+            # small, mostly rising ticks: each new high must raise the stop as far as a fresh call would
+            rate *= np.exp(rng.normal(0.0004, 0.001))
+            current_time = (frame['date'].iloc[row - 1].to_pydatetime()
+                            + timedelta(seconds=candle_seconds * (step + 1) / CALLS_PER_CANDLE))
+            profit = rate / open_rate - 1
+            args = (PAIR, trade, current_time, rate, profit)
+
+            held_cached = ratchet(held_cached, strategy.custom_stoploss(*args, after_fill=False), rate)
+            held_uncached = ratchet(held_uncached, uncached(strategy, *args, after_fill=False), rate)
+            assert held_cached >= held_uncached * (1 - 1e-12), (row, step, rate)
+
+    cache = strategy.__dict__.get('_stoploss_cache')
+    if cache:
+        assert cache.stats()['hits'] > 0
@@ -0,0 +1,94 @@
+"""Forming-candle entries of HighFrequencyScalp1m replayed from trades against the closed-candle analysis"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from strategy_utils.golden import SYNTHETIC_END, SYNTHETIC_MARKETS, aggregate
+from strategy_utils.indicator_snapshots import BASE_COLUMNS
+from strategy_utils.streaming import ReplayTradeFeed
+
+PAIR = 'BTC/USD'
+DAYS = 3
+
+
+class StreamingDataProvider:
+    """The closed candles and analyzed dataframe a dry-run bot holds while candle `closed` + 1 forms"""
+
+    def __init__(self, candles: pd.DataFrame, analyzed: pd.DataFrame):
+        from freqtrade.enums import RunMode
+
+        self.runmode = RunMode.DRY_RUN
+        self.candles = candles
+        self.analyzed = analyzed
+
+    def ohlcv(self, pair, timeframe, candle_type='', copy=True):
+        return self.candles
+
+    def get_analyzed_dataframe(self, pair, timeframe):
+        return self.analyzed, self.analyzed['date'].iloc[-1]
+
+    def _set_cached_df(self, pair, timeframe, dataframe, candle_type=''):
+        self.analyzed = dataframe
+
+
+def minute_candles(market: str) -> pd.DataFrame:
+    rows = aggregate(SYNTHETIC_MARKETS[market].minute_candles(0, 60000.0, 1.0, DAYS), 1)
+    frame = pd.DataFrame(rows, columns=BASE_COLUMNS[1:])
+    frame.insert(0, 'date', pd.to_datetime(SYNTHETIC_END - (len(rows) - np.arange(len(rows))) * 60,
+                                           unit='s', utc=True))
+    return frame
+
+
+def closed_analysis(strategy, candles: pd.DataFrame) -> pd.DataFrame:
+    analyzed = strategy.populate_indicators(candles.copy(), {'pair': PAIR})
+    return strategy.populate_entry_trend(analyzed, {'pair': PAIR})
+
+
+def candle_trades(candle: pd.Series) -> pd.DataFrame:
+    """Trades over the candle's first 45 seconds that add up to its OHLCV"""
+    start = int(candle['date'].timestamp() * 1000)
+    prices = [candle['open'], candle['high'], candle['low'], candle['close'], candle['close'], candle['close']]
+    offsets = [1, 5, 10, 15, 30, 45]
+    return pd.DataFrame({'timestamp': [start + offset * 1000 for offset in offsets], 'price': prices,
+                         'amount': np.full(len(prices), candle['volume'] / len(prices))})
+
+
+def test_streamed_entry_matches_closed_candle(load_strategy):
+    strategy = load_strategy('HighFrequencyScalp1m')
+    strategy.dp = None
+    candles = next(frame for frame in map(minute_candles, SYNTHETIC_MARKETS)
+                   if (closed_analysis(strategy, frame)['enter_long'].iloc[300:] == 1).any())
+    full = closed_analysis(strategy, candles)
+    entry = int(np.flatnonzero(full['enter_long'].to_numpy() == 1)[-1])
+
+    # the bot's state just before candle `entry` closes: candles up to the previous one
+    closed = closed_analysis(strategy, candles.iloc[:entry + 1])
+    history = candles.iloc[:entry].reset_index(drop=True)
+    forming = candles.iloc[entry]
+    feed = ReplayTradeFeed({PAIR: candle_trades(forming)}, start=forming['date'].to_pydatetime())
+    strategy.dp = StreamingDataProvider(history, closed_analysis(strategy, history))
+    strategy.config['streaming'] = {'enabled': True, 'debounce_seconds': 10}
+    strategy.stream_feed = feed
+    strategy.ft_bot_start()
+
+    published = None
+    for second in range(60):
+        now = forming['date'].to_pydatetime() + timedelta(seconds=second)
+        feed.advance(now)
+        strategy._stream_pair(PAIR, now)
+        if published is None and PAIR in strategy._stream_published:
+            published = second
+
+    # the entry fires within the candle, once the debounce has passed
+    assert published is not None and 10 <= published < 60
+    appended = strategy.dp.analyzed.iloc[-1]
+    assert appended['date'] == forming['date'] and appended['enter_long'] == 1
+    assert appended['close'] == forming['close']
+
+    # the streamed indicators of the completed candle are the closed-candle analysis's
+    state = strategy._stream_states[PAIR]
+    streamed = strategy.streaming_indicators.update(state[2], strategy._stream_candles[PAIR].row())
+    for column, value in streamed.items():
+        np.testing.assert_allclose(value, closed[column].iloc[-1], rtol=1e-6, err_msg=column)
+    assert closed['enter_long'].iloc[-1] == 1
@@ -0,0 +1,81 @@
+"""ASHA scheduling with known candidate scores, and resuming a results file"""
+import json
+
+import numpy as np
+import pytest
+
+from strategy_utils.successive_halving import ResultsFile, Scheduler, make_score, rung_days
+
+CANDIDATES = 27
+ETA = 3
+
+
+def test_rung_days():
+    assert rung_days(30, 2, 3) == [2, 6, 18, 30]
+    assert rung_days(18, 2, 3) == [2, 6, 18]
+    assert rung_days(1, 2, 3) == [1]
+
+
+def run(scheduler: Scheduler, metrics, workers: int, seed: int) -> list:
+    """Drive the scheduler with `workers` parallel jobs finishing in random order"""
+    rng = np.random.default_rng(seed)
+    running, order = [], []
+    while True:
+        while len(running) < workers:
+            job = scheduler.next_job()
+            if job is None:
+                break
+            running.append(job)
+        if not running:
+            return order
+        candidate, rung = running.pop(rng.integers(len(running)))
+        scheduler.record(candidate, rung, metrics(candidate, rung))
+        order.append((candidate, rung))
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_best_candidate_reaches_the_full_range(workers):
+    # candidate quality is a random permutation; a third never trades enough
+    quality = np.random.default_rng(workers).permutation(CANDIDATES)
+    idle = set(np.flatnonzero(quality % 3 == 0))
+
+    def metrics(candidate, rung):
+        return {'profit': float(quality[candidate]) + 0.1 * rung,
+                'total_trades': 0 if candidate in idle else 10}
+
+    rungs = len(rung_days(54, 2, ETA))
+    scheduler = Scheduler(CANDIDATES, rungs, ETA, [make_score('profit', 5)] * rungs)
+    order = run(scheduler, metrics, workers, seed=workers)
+
+    assert len(order) == len(set(order))                          # nothing ran twice
+    assert set(scheduler.results[0]) == set(range(CANDIDATES))
+    for rung in range(1, rungs):
+        assert not set(scheduler.results[rung]) & idle            # never promoted without trades
+        assert set(scheduler.results[rung]) <= set(scheduler.results[rung - 1])
+        assert len(scheduler.results[rung]) < len(scheduler.results[rung - 1])
+    best = int(np.argmax(quality))
+    assert scheduler.best()[0] == (best, rungs - 1)
+
+
+def test_stops_after_one_full_run_when_nothing_qualifies_early():
+    # every rung-0 result scores the same: the best rung-0 candidate is still pushed to the end
+    scheduler = Scheduler(2, 3, ETA, [make_score('profit', 0)] * 3)
+    order = run(scheduler, lambda candidate, rung: {'profit': 1.0, 'total_trades': 1}, 1, seed=0)
+    assert [rung for _, rung in order] == [0, 0, 1, 2]
+    assert scheduler.next_job() is None
+
+
+def test_results_file_resumes_and_drops_a_partial_line(tmp_path):
+    path = tmp_path / 'search.jsonl'
+    results = ResultsFile(path, {'key': 'abc'})
+    results.add({'candidate': 0, 'rung': 0})
+    results.add({'candidate': 1, 'rung': 0})
+    with path.open('a') as f:
+        f.write('{"candidate": 2, "ru')
+
+    resumed = ResultsFile(path, {'key': 'abc'})
+    assert resumed.records == [{'candidate': 0, 'rung': 0}, {'candidate': 1, 'rung': 0}]
+    resumed.add({'candidate': 2, 'rung': 0})
+    assert [json.loads(line) for line in path.read_text().splitlines()][-1] == {'candidate': 2, 'rung': 0}
+    with pytest.raises(ValueError):
+        ResultsFile(path, {'key': 'other'})
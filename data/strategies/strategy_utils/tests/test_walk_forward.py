@@ -0,0 +1,47 @@
+"""Walk-forward CandleStore round trips against the frames it was written from"""
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from strategy_utils.walk_forward import OHLCV_COLUMNS, CandleStore
+
+
+def hourly_frame(start: str, candles: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, candles)))
+    frame = pd.DataFrame({'date': pd.date_range(start, periods=candles, freq='1h', tz='UTC'),
+                          'open': close * 0.999, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+                          'volume': rng.random(candles)})
+    return frame[['date', *OHLCV_COLUMNS]]
+
+
+def epoch(timestamp: str) -> int:
+    return int(pd.Timestamp(timestamp, tz='UTC').timestamp())
+
+
+def test_frames_match_the_written_candles(tmp_path):
+    frames = {
+        'BTC/USD': hourly_frame('2024-01-01', 500, 1),
+        'ETH/USD': hourly_frame('2024-01-10', 200, 2),   # listed later
+        'SOL/USD': hourly_frame('2024-01-01', 100, 3),   # delisted early
+        'NEW/USD': hourly_frame('2024-01-01', 0, 4),
+    }
+    CandleStore.write(tmp_path, frames)
+    store = CandleStore(tmp_path)
+    assert set(store.index) == {'BTC/USD', 'ETH/USD', 'SOL/USD'}
+    assert not store.ohlcv.flags.writeable
+
+    start, end = epoch('2024-01-10 12:00'), epoch('2024-01-15 00:00')
+    window = store.frames(start, end)
+    assert set(window) == {'BTC/USD', 'ETH/USD'}
+    for pair, frame in window.items():
+        source = frames[pair]
+        expected = source[(source['date'] >= pd.Timestamp(start, unit='s', tz='UTC'))
+                          & (source['date'] <= pd.Timestamp(end, unit='s', tz='UTC'))].reset_index(drop=True)
+        assert_frame_equal(frame, expected, check_dtype=False)
+        assert frame['date'].iloc[-1] == pd.Timestamp(end, unit='s', tz='UTC')   # end candle included
+
+    # windows are fresh frames, strategies may write to them
+    window['BTC/USD'].loc[:, 'close'] = 0.0
+    assert (store.frames(start, end)['BTC/USD']['close'] > 0).all()
+    assert store.frames(epoch('2025-01-01'), epoch('2025-02-01')) == {}
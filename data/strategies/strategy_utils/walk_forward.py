@@ -0,0 +1,552 @@
+# --- Parallel Walk-Forward Optimization ---
+"""
+Optimizes a strategy's IntParameter/DecimalParameter spaces on rolling
+train windows and scores the winners on the test window that follows, so
+every reported result is out-of-sample.
+
+    |--- train 1 ---|- test 1 -|
+              |--- train 2 ---|- test 2 -|
+                        |--- train 3 ---|- test 3 -|
+
+With --anchored every train window starts at the beginning of the timerange
+instead of rolling forward.
+
+Candles are loaded once, written to .npy files and memory-mapped by every
+worker process, so N workers share one copy of the data through the page
+cache instead of holding N. Each worker keeps one freqtrade Backtesting
+instance per strategy and runs freqtrade's own backtest loop per candidate:
+parameters are assigned, populate_indicators runs again (the admin
+strategies use parameters like ema_fast_period while building indicators,
+which a plain hyperopt run without --analyze-per-epoch never sees change),
+and the candidate is scored by one metric of freqtrade's backtest report
+(--objective, Sharpe ratio by default). Candidates with fewer than
+--min-trades trades lose against every candidate that has enough.
+
+The search per window is a seeded random search; candidate 0 is the
+strategy's current parameter set. The same candidates are tried on every
+window so the chosen values can be compared between windows. The best
+candidate of each train window and the current parameters are then both
+backtested on its test window.
+
+Per strategy the report shows, per window, the chosen parameters and their
+in-sample and out-of-sample results, and, over all test windows:
+- OOS profit, trades, win rate and the drawdown of the stitched OOS trades
+- the same for the current parameters, as a baseline the walk-forward
+  result has to beat
+- walk-forward efficiency: OOS profit per day / in-sample profit per day
+- parameter stability: std of the chosen value across windows relative to
+  the parameter's range (0 = same value every window)
+
+By default the optimize=True parameters of every space are searched;
+--all-params adds the optimize=False ones (DCAStrategy's DCA ladder,
+EnhancedRiskManagedStrategy's sizing and risk limits). Categorical and
+boolean parameters keep their current value.
+
+Without --strategy the admin strategies are run one after another:
+AggressiveSophisticated1m, DCAStrategy, EnhancedRiskManagedStrategy and the
+orchestrator's fallback DefaultStrategy (apps/bot-orchestrator/freqtrade-shared).
+
+Usage (from data/strategies):
+    python -m strategy_utils.walk_forward -c config.json --strategy DCAStrategy \
+        --timerange 20240101-20240701 --train-days 60 --test-days 15 --epochs 100 --workers 8
+    python -m strategy_utils.walk_forward -c config.json --timerange 20240101-20240701 \
+        --output walk_forward.json
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES_DIR = Path(__file__).resolve().parents[1]
+SHARED_STRATEGIES_DIR = STRATEGIES_DIR.parents[1] / 'apps' / 'bot-orchestrator' / 'freqtrade-shared' / 'strategies'
+
+ADMIN_STRATEGIES = ['AggressiveSophisticated1m', 'DCAStrategy', 'EnhancedRiskManagedStrategy', 'DefaultStrategy']
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+METRICS = ['total_trades', 'profit_total', 'profit_total_abs', 'winrate', 'max_drawdown_account',
+           'profit_factor', 'sharpe', 'sortino', 'calmar']
+OBJECTIVES = ['sharpe', 'sortino', 'calmar', 'profit_total', 'profit_factor']
+DAY = 86400
+
+
+# === PARAMETER SPACE ===
+
+@dataclass
+class SearchParameter:
+    """One IntParameter/DecimalParameter of a strategy"""
+    name: str
+    space: str
+    low: float
+    high: float
+    default: float
+    decimals: Optional[int] = None      # None for IntParameter
+
+    def sample(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        if self.decimals is None:
+            return rng.integers(int(self.low), int(self.high) + 1, count)
+        return np.round(rng.uniform(self.low, self.high, count), self.decimals)
+
+    def cast(self, value):
+        return int(value) if self.decimals is None else round(float(value), self.decimals)
+
+
+def search_space(strategy, spaces: Optional[List[str]] = None,
+                 include_fixed: bool = False) -> List[SearchParameter]:
+    """
+    The strategy's IntParameter/DecimalParameter declarations, optionally limited
+    to some spaces. optimize=False parameters only with include_fixed. Needs
+    the parameters loaded (ft_bot_start() or ft_load_hyper_params()).
+    """
+    from freqtrade.strategy import DecimalParameter, IntParameter
+
+    parameters = []
+    for name, parameter in strategy.enumerate_parameters():
+        if not isinstance(parameter, (IntParameter, DecimalParameter)):
+            continue
+        if spaces and parameter.space not in spaces:
+            continue
+        if not parameter.optimize and not include_fixed:
+            continue
+        decimals = parameter.decimals if isinstance(parameter, DecimalParameter) else None
+        parameters.append(SearchParameter(name=name, space=parameter.space, low=parameter.low,
+                                          high=parameter.high, default=parameter.value,
+                                          decimals=decimals))
+    return parameters
+
+
+def sample_candidates(parameters: List[SearchParameter], count: int, seed: int = 0) -> List[Dict]:
+    """count parameter sets drawn uniformly from the space; set 0 is the current one"""
+    rng = np.random.default_rng(seed)
+    columns = {p.name: p.sample(rng, count) for p in parameters}
+    candidates = []
+    for row in range(count):
+        if row == 0:
+            candidates.append({p.name: p.default for p in parameters})
+        else:
+            candidates.append({p.name: p.cast(columns[p.name][row]) for p in parameters})
+    return candidates
+
+
+# === WINDOWS ===
+
+@dataclass
+class Window:
+    index: int
+    train_start: int    # epoch seconds
+    train_end: int
+    test_start: int
+    test_end: int
+
+    def label(self, part: str) -> str:
+        start, end = (self.train_start, self.train_end) if part == 'train' else (self.test_start, self.test_end)
+        return f"{_day(start)}-{_day(end)}"
+
+
+def _day(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y%m%d')
+
+
+def walk_forward_windows(start: int, end: int, train_days: float, test_days: float,
+                         step_days: Optional[float] = None, anchored: bool = False) -> List[Window]:
+    """Rolling (or anchored) train windows, each followed by its test window, inside start..end"""
+    train, test = int(train_days * DAY), int(test_days * DAY)
+    step = int((step_days or test_days) * DAY)
+    windows = []
+    train_start = start
+    while train_start + train + test <= end:
+        train_end = train_start + train
+        windows.append(Window(index=len(windows), train_start=start if anchored else train_start,
+                              train_end=train_end, test_start=train_end, test_end=train_end + test))
+        train_start += step
+    return windows
+
+
+# === SHARED CANDLE STORE ===
+
+class CandleStore:
+    """
+    Candles of all pairs of one timeframe in two .npy files that worker
+    processes memory-map read-only: dates (N,) int64 epoch seconds and
+    ohlcv (N, 5) float64, pairs stored back to back.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index: Dict[str, Tuple[int, int]] = json.loads((self.directory / 'index.json').read_text())
+        self.dates = np.load(self.directory / 'dates.npy', mmap_mode='r')
+        self.ohlcv = np.load(self.directory / 'ohlcv.npy', mmap_mode='r')
+
+    @staticmethod
+    def write(directory: Path, frames: Dict[str, DataFrame]) -> 'CandleStore':
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        index, dates, ohlcv, row = {}, [], [], 0
+        for pair, frame in frames.items():
+            if frame.empty:
+                continue
+            dates.append(frame['date'].to_numpy(dtype='datetime64[s]').astype(np.int64))
+            ohlcv.append(frame[OHLCV_COLUMNS].to_numpy(dtype=np.float64))
+            index[pair] = (row, row + len(frame))
+            row += len(frame)
+        np.save(directory / 'dates.npy', np.concatenate(dates) if dates else np.empty(0, np.int64))
+        np.save(directory / 'ohlcv.npy', np.concatenate(ohlcv) if ohlcv else np.empty((0, 5)))
+        (directory / 'index.json').write_text(json.dumps(index))
+        return CandleStore(directory)
+
+    def frames(self, start: int, end: int) -> Dict[str, DataFrame]:
+        """
+        Fresh dataframes of the candles from start to end per pair, the end candle
+        included like freqtrade's --timerange does
+        """
+        frames = {}
+        for pair, (first, last) in self.index.items():
+            dates = self.dates[first:last]
+            lo, hi = np.searchsorted(dates, start), np.searchsorted(dates, end, side='right')
+            if lo == hi:
+                continue
+            frame = DataFrame(np.array(self.ohlcv[first + lo:first + hi]), columns=OHLCV_COLUMNS)
+            frame.insert(0, 'date', pd.to_datetime(np.array(dates[lo:hi]), unit='s', utc=True))
+            frames[pair] = frame
+        return frames
+
+
+def strategy_config(config: dict, strategy_name: str) -> dict:
+    """A copy of config for one strategy, pointing strategy_path at the directory holding it"""
+    config = copy.deepcopy(config)
+    config['strategy'] = strategy_name
+    for directory in (config.get('strategy_path'), STRATEGIES_DIR, SHARED_STRATEGIES_DIR):
+        if directory and (Path(directory) / f'{strategy_name}.py').is_file():
+            config['strategy_path'] = str(directory)
+            break
+    return config
+
+
+def load_candles(config: dict, strategy) -> Dict[str, DataFrame]:
+    """The strategy's timeframe candles of the whole timerange, startup candles included"""
+    from freqtrade.configuration import TimeRange
+    from freqtrade.data.history import load_data
+
+    return load_data(
+        datadir=config['datadir'],
+        pairs=config['exchange']['pair_whitelist'],
+        timeframe=strategy.timeframe,
+        timerange=TimeRange.parse_timerange(config.get('timerange')),
+        startup_candles=strategy.startup_candle_count,
+        data_format=config.get('dataformat_ohlcv', 'feather'),
+        candle_type=config.get('candle_type_def', 'spot'),
+    )
+
+
+# === WORKER ===
+
+_worker_config: Optional[dict] = None
+_worker_stores: Dict[str, str] = {}
+_worker_open_stores: Dict[str, CandleStore] = {}
+_worker_runners: Dict[str, 'WindowBacktester'] = {}
+
+
+class WindowBacktester:
+    """A freqtrade Backtesting instance that backtests parameter sets on sub-ranges of the data"""
+
+    def __init__(self, config: dict, store: CandleStore):
+        from freqtrade.exchange import timeframe_to_seconds
+        from freqtrade.optimize.backtesting import Backtesting
+
+        self.backtesting = Backtesting(config)
+        self.backtesting._set_strategy(self.backtesting.strategylist[0])
+        self.strategy = self.backtesting.strategy
+        self.store = store
+        self.startup_seconds = self.backtesting.required_startup * timeframe_to_seconds(self.strategy.timeframe)
+
+    def run(self, params_list: List[Dict], start: int, end: int, with_trades: bool = False) -> List[dict]:
+        """Backtest every parameter set from start to end; returns the report metrics per set"""
+        from freqtrade.configuration import TimeRange
+        from freqtrade.data.converter import trim_dataframes
+        from freqtrade.data.history import get_timerange
+        from freqtrade.optimize.optimize_reports import generate_strategy_stats
+
+        frames = self.store.frames(start - self.startup_seconds, end)
+        timerange = TimeRange('date', 'date', start, end)
+        self.backtesting.timerange = timerange
+        parameters = dict(self.strategy.enumerate_parameters())
+        results = []
+        for params in params_list:
+            for name, value in params.items():
+                parameters[name].value = value
+            processed = self.strategy.advise_all_indicators(frames)
+            trimmed = trim_dataframes(processed, timerange, self.backtesting.required_startup)
+            if not trimmed:
+                result = {metric: 0.0 for metric in METRICS}
+                if with_trades:
+                    result['trades'] = []
+                results.append(result)
+                continue
+            min_date, max_date = get_timerange(trimmed)
+            started = int(time.time())
+            content = self.backtesting.backtest(processed=processed, start_date=min_date, end_date=max_date)
+            content.update({'backtest_start_time': started, 'backtest_end_time': int(time.time())})
+            stats = generate_strategy_stats(list(frames), self.strategy.get_strategy_name(), content,
+                                            min_date, max_date, market_change=0.0, is_hyperopt=True)
+            result = {metric: float(stats.get(metric) or 0.0) for metric in METRICS}
+            if with_trades:
+                trades = content['results']
+                result['trades'] = [(int(ts) // 1000, float(profit)) for ts, profit in
+                                    zip(trades['close_timestamp'], trades['profit_abs'])] if len(trades) else []
+            results.append(result)
+        return results
+
+
+def init_worker(config: dict, stores: Dict[str, str]) -> None:
+    global _worker_config, _worker_stores
+    _worker_config = config
+    _worker_stores = stores
+    # freqtrade logs every backtest's setup at INFO level
+    logging.getLogger('freqtrade').setLevel(logging.WARNING)
+
+
+def _runner(strategy_name: str) -> WindowBacktester:
+    runner = _worker_runners.get(strategy_name)
+    if runner is None:
+        path = _worker_stores[strategy_name]
+        if path not in _worker_open_stores:
+            _worker_open_stores[path] = CandleStore(Path(path))
+        runner = _worker_runners[strategy_name] = WindowBacktester(
+            strategy_config(_worker_config, strategy_name), _worker_open_stores[path])
+    return runner
+
+
+def run_task(task) -> Tuple[tuple, List[dict]]:
+    key, strategy_name, params_list, start, end, with_trades = task
+    return key, _runner(strategy_name).run(params_list, start, end, with_trades)
+
+
+# === AGGREGATION ===
+
+def best_candidate(scores: List[dict], objective: str, min_trades: int) -> int:
+    """Index of the highest objective among candidates with enough trades (candidate 0 if none has)"""
+    values = [score[objective] if score['total_trades'] >= min_trades else -np.inf for score in scores]
+    return int(np.argmax(values)) if np.isfinite(max(values)) else 0
+
+
+def stitched_metrics(trades: List[Tuple[int, float]], starting_balance: float) -> dict:
+    """Profit, trades, win rate and max drawdown of trades from consecutive test windows"""
+    if not trades:
+        return {'trades': 0, 'profit_abs': 0.0, 'profit_ratio': 0.0, 'winrate': 0.0, 'max_drawdown': 0.0}
+    trades = sorted(trades)
+    profits = np.array([profit for _, profit in trades])
+    equity = starting_balance + np.cumsum(profits)
+    peak = np.maximum.accumulate(np.r_[starting_balance, equity])[1:]
+    return {
+        'trades': len(trades),
+        'profit_abs': float(profits.sum()),
+        'profit_ratio': float(profits.sum() / starting_balance),
+        'winrate': float((profits > 0).mean()),
+        'max_drawdown': float(((peak - equity) / peak).max()),
+    }
+
+
+def summarize_strategy(strategy_name: str, parameters: List[SearchParameter], windows: List[Window],
+                       candidates: List[Dict], train: Dict[int, List[dict]], test: Dict[int, List[dict]],
+                       chosen: Dict[int, int], starting_balance: float) -> dict:
+    """Per-window table plus OOS totals, baseline, efficiency and parameter stability"""
+    rows, oos_trades, baseline_trades = [], [], []
+    in_sample_per_day, oos_per_day = [], []
+    for window in windows:
+        scores = train[window.index]
+        best = chosen[window.index]
+        optimized, baseline = test[window.index]
+        rows.append({
+            'window': window.index,
+            'train_range': window.label('train'),
+            'test_range': window.label('test'),
+            'candidate': best,
+            'params': candidates[best],
+            'train': {metric: scores[best][metric] for metric in METRICS},
+            'test': {metric: optimized[metric] for metric in METRICS},
+            'baseline_test': {metric: baseline[metric] for metric in METRICS},
+        })
+        oos_trades.extend(optimized['trades'])
+        baseline_trades.extend(baseline['trades'])
+        in_sample_per_day.append(scores[best]['profit_total'] / ((window.train_end - window.train_start) / DAY))
+        oos_per_day.append(optimized['profit_total'] / ((window.test_end - window.test_start) / DAY))
+
+    in_sample_rate = float(np.mean(in_sample_per_day)) if windows else 0.0
+    stability = {}
+    for parameter in parameters:
+        chosen = np.array([row['params'][parameter.name] for row in rows], dtype=np.float64)
+        span = parameter.high - parameter.low
+        stability[parameter.name] = float(chosen.std() / span) if span and len(chosen) else 0.0
+
+    return {
+        'strategy': strategy_name,
+        'parameters': [asdict(parameter) for parameter in parameters],
+        'windows': rows,
+        'oos': stitched_metrics(oos_trades, starting_balance),
+        'baseline_oos': stitched_metrics(baseline_trades, starting_balance),
+        'walk_forward_efficiency': float(np.mean(oos_per_day)) / in_sample_rate if in_sample_rate > 0 else None,
+        'parameter_stability': stability,
+    }
+
+
+# === DRIVER ===
+
+def walk_forward(config: dict, strategy_names: List[str], windows: List[Window], epochs: int,
+                 objective: str = 'sharpe', min_trades: int = 1, spaces: Optional[List[str]] = None, include_fixed: bool = False, seed: int = 0,
+                 workers: Optional[int] = None, work_dir: Optional[str] = None) -> List[dict]:
+    """Run the walk-forward for every strategy in one worker pool; returns one summary per strategy"""
+    from freqtrade.resolvers import StrategyResolver
+    from freqtrade.util import get_dry_run_wallet
+
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix='walk_forward_'))
+    try:
+        stores, plans = {}, {}
+        for name in strategy_names:
+            strategy = StrategyResolver.load_strategy(strategy_config(config, name))
+            strategy.ft_load_hyper_params()
+            store_dir = work_dir / f'{strategy.timeframe}-{strategy.startup_candle_count}'
+            if not (store_dir / 'index.json').is_file():
+                CandleStore.write(store_dir, load_candles(config, strategy))
+            stores[name] = str(store_dir)
+            parameters = search_space(strategy, spaces, include_fixed)
+            candidates = sample_candidates(parameters, epochs if parameters else 1, seed)
+            plans[name] = (parameters, candidates)
+            logger.info(f"{name}: {len(parameters)} parameters, {len(candidates)} candidates, "
+                        f"{len(windows)} windows")
+
+        workers = workers or os.cpu_count() or 1
+        chunks_per_window = max(1, -(-workers // max(1, len(windows))))
+
+        train: Dict[str, Dict[int, List[dict]]] = {name: {} for name in strategy_names}
+        test: Dict[str, Dict[int, List[dict]]] = {name: {} for name in strategy_names}
+        chosen: Dict[str, Dict[int, int]] = {name: {} for name in strategy_names}
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(config, stores)) as executor:
+            tasks = []
+            for name, (_, candidates) in plans.items():
+                size = -(-len(candidates) // chunks_per_window)
+                for window in windows:
+                    for offset in range(0, len(candidates), size):
+                        tasks.append(((name, window.index, offset), name, candidates[offset:offset + size],
+                                      window.train_start, window.train_end, False))
+            parts: Dict[Tuple[str, int], Dict[int, List[dict]]] = {}
+            for (name, index, offset), results in executor.map(run_task, tasks):
+                parts.setdefault((name, index), {})[offset] = results
+            for (name, index), by_offset in parts.items():
+                train[name][index] = [result for offset in sorted(by_offset) for result in by_offset[offset]]
+            logger.info(f"Optimized {len(windows)} train windows x {len(strategy_names)} strategies")
+
+            tasks = []
+            for name, (_, candidates) in plans.items():
+                for window in windows:
+                    best = chosen[name][window.index] = best_candidate(train[name][window.index],
+                                                                       objective, min_trades)
+                    tasks.append(((name, window.index), name, [candidates[best], candidates[0]],
+                                  window.test_start, window.test_end, True))
+            for (name, index), results in executor.map(run_task, tasks):
+                test[name][index] = results
+
+        starting_balance = get_dry_run_wallet(config)
+        return [summarize_strategy(name, plans[name][0], windows, plans[name][1], train[name], test[name],
+                                   chosen[name], starting_balance)
+                for name in strategy_names]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def report(summary: dict) -> str:
+    lines = [f"== {summary['strategy']} =="]
+    table = DataFrame([{
+        'window': row['window'],
+        'train': row['train_range'],
+        'test': row['test_range'],
+        'candidate': row['candidate'],
+        'is_profit': row['train']['profit_total'],
+        'oos_profit': row['test']['profit_total'],
+        'oos_trades': int(row['test']['total_trades']),
+        'oos_dd': row['test']['max_drawdown_account'],
+        'baseline_profit': row['baseline_test']['profit_total'],
+    } for row in summary['windows']])
+    if not table.empty:
+        lines.append(table.to_string(index=False, float_format=lambda value: f'{value:.4f}'))
+    oos, baseline = summary['oos'], summary['baseline_oos']
+    lines.append(f"OOS: {oos['trades']} trades, profit {oos['profit_ratio']:.2%}, win rate {oos['winrate']:.1%}, "
+                 f"max drawdown {oos['max_drawdown']:.2%}")
+    lines.append(f"Current params OOS: {baseline['trades']} trades, profit {baseline['profit_ratio']:.2%}, "
+                 f"win rate {baseline['winrate']:.1%}, max drawdown {baseline['max_drawdown']:.2%}")
+    efficiency = summary['walk_forward_efficiency']
+    lines.append(f"Walk-forward efficiency: {'n/a' if efficiency is None else f'{efficiency:.2f}'}")
+    if summary['parameter_stability']:
+        unstable = sorted(summary['parameter_stability'].items(), key=lambda item: -item[1])[:5]
+        lines.append('Least stable parameters (std / range): '
+                     + ', '.join(f'{name} {value:.2f}' for name, value in unstable))
+    return '\n'.join(lines)
+
+
+# === COMMAND LINE ===
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from freqtrade.configuration import TimeRange
+
+    from strategy_utils.market_data import load_config
+
+    parser = argparse.ArgumentParser(description='Walk-forward optimization of strategy parameters')
+    parser.add_argument('-c', '--config', action='append', required=True)
+    parser.add_argument('--strategy', action='append',
+                        help=f"Strategy to optimize, repeatable (default: {', '.join(ADMIN_STRATEGIES)})")
+    parser.add_argument('--timerange', required=True)
+    parser.add_argument('--train-days', type=float, default=60)
+    parser.add_argument('--test-days', type=float, default=15)
+    parser.add_argument('--step-days', type=float, default=None, help='Default: --test-days')
+    parser.add_argument('--anchored', action='store_true', help='Train windows all start at the timerange start')
+    parser.add_argument('--epochs', type=int, default=100, help='Candidates tried per train window')
+    parser.add_argument('--spaces', nargs='+', default=None, help='Parameter spaces to search (default: all)')
+    parser.add_argument('--all-params', action='store_true', help='Also search optimize=False parameters')
+    parser.add_argument('--objective', default='sharpe', choices=OBJECTIVES)
+    parser.add_argument('--min-trades', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the full result as JSON to this file')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    config = load_config(args.config, timerange=args.timerange)
+    config['export'] = 'none'
+
+    timerange = TimeRange.parse_timerange(args.timerange)
+    if not timerange.startts or not timerange.stopts:
+        parser.error('--timerange needs a start and an end date')
+    windows = walk_forward_windows(timerange.startts, timerange.stopts, args.train_days, args.test_days,
+                                   args.step_days, args.anchored)
+    if not windows:
+        parser.error('The timerange is shorter than one train + test window')
+
+    summaries = walk_forward(config, args.strategy or ADMIN_STRATEGIES, windows, args.epochs,
+                             objective=args.objective, min_trades=args.min_trades, spaces=args.spaces, include_fixed=args.all_params, seed=args.seed,
+                             workers=args.workers)
+    for summary in summaries:
+        print(report(summary))
+        print()
+    if args.output:
+        Path(args.output).write_text(json.dumps(summaries, indent=2, default=str))
+        logger.info(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
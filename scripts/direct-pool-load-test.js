@@ -16,6 +16,9 @@ process.env.MAX_BOTS_PER_CONTAINER = '10';
 const { poolProvisioner, initPoolSystem } = require('../apps/bot-orchestrator/lib/pool-integration');
 const { execSync } = require('child_process');
 
+// Point the bots at a local replay exchange (scripts/replay-exchange.py) instead of kraken
+const REPLAY_EXCHANGE_URL = process.env.REPLAY_EXCHANGE_URL;
+
 const NUM_TEST_USERS = 2;
 const BOTS_PER_USER = 8;
 const TOTAL_BOTS = NUM_TEST_USERS * BOTS_PER_USER; // 16 bots total
@@ -30,6 +33,18 @@ async function provisionBot(userId, botNumber) {
   const instanceId = `${userId.substring(0, 12)}-loadtest-${botNumber}`;
 
   try {
+    const market = REPLAY_EXCHANGE_URL
+      ? await replayExchangeConfig(instanceId)
+      : {
+          exchange: 'kraken',
+          stake_currency: 'USD',
+          tradingPairs: ['BTC/USD', 'ETH/USD'],
+          exchangeConfig: {
+            name: 'kraken',
+            key: 'dummy',
+            secret: 'dummy'
+          }
+        };
     const result = await poolProvisioner.provisionBot({
       userId,
       instanceId,
@@ -38,14 +53,7 @@ async function provisionBot(userId, botNumber) {
       stake_amount: 100,
       max_open_trades: 3,
       timeframe: '15m',
-      exchange: 'kraken',
-      stake_currency: 'USD',
-      tradingPairs: ['BTC/USD', 'ETH/USD'],
-      exchangeConfig: {
-        name: 'kraken',
-        key: 'dummy',
-        secret: 'dummy'
-      },
+      ...market,
       apiUsername: 'admin',
       apiPassword: 'password'
     });
@@ -56,6 +64,32 @@ async function provisionBot(userId, botNumber) {
   }
 }
 
+async function replayExchangeConfig(instanceId) {
+  // Bots trade live against the replay exchange, so their orders and balances
+  // go through the simulator (its account holds the --balance it was started with)
+  const response = await fetch(`${REPLAY_EXCHANGE_URL}/bot/${instanceId}/config`);
+  if (!response.ok) {
+    throw new Error(`Replay exchange config failed: HTTP ${response.status}`);
+  }
+  const { dry_run, exchange, stake_currency } = await response.json();
+  return {
+    dry_run,
+    exchange: exchange.name,
+    stake_currency,
+    tradingPairs: exchange.pair_whitelist,
+    exchangeConfig: exchange
+  };
+}
+
+async function getReplayExchangeMetrics() {
+  try {
+    const response = await fetch(`${REPLAY_EXCHANGE_URL}/metrics`);
+    return response.ok ? await response.json() : null;
+  } catch (err) {
+    return null;
+  }
+}
+
 async function getDockerStats() {
   try {
     const output = execSync(
@@ -83,7 +117,8 @@ async function main() {
   console.log(`  - Users: ${NUM_TEST_USERS}`);
   console.log(`  - Bots per user: ${BOTS_PER_USER}`);
   console.log(`  - Total bots: ${TOTAL_BOTS}`);
-  console.log(`  - Max bots per pool: ${process.env.MAX_BOTS_PER_CONTAINER}\n`);
+  console.log(`  - Max bots per pool: ${process.env.MAX_BOTS_PER_CONTAINER}`);
+  console.log(`  - Exchange: ${REPLAY_EXCHANGE_URL ? `replay (${REPLAY_EXCHANGE_URL})` : 'kraken'}\n`);
 
   const results = {
     startTime: new Date(),
@@ -177,6 +212,24 @@ async function main() {
     }
   }
 
+  if (REPLAY_EXCHANGE_URL) {
+    console.log('\nCollecting replay exchange metrics...');
+    results.replayExchange = await getReplayExchangeMetrics();
+
+    if (results.replayExchange) {
+      const { totals, bots } = results.replayExchange;
+      console.log(`\nReplay Exchange:`);
+      console.log(`  - Bots Connected: ${totals.bots}`);
+      console.log(`  - Requests/s: ${totals.requests_per_s}`);
+      console.log(`  - Orders: ${totals.orders} (${totals.fills} filled)`);
+      for (const [name, bot] of Object.entries(bots)) {
+        const loop = bot.loop_latency_ms;
+        console.log(`  - ${name}: ${bot.requests_per_s_1m} req/s, loop latency ` +
+          (loop ? `p50 ${loop.p50}ms / p95 ${loop.p95}ms` : 'n/a'));
+      }
+    }
+  }
+
   // Phase 4: Health check
   console.log('\n' + '='.repeat(80));
   console.log('PHASE 4: HEALTH CHECK');
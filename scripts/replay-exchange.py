@@ -0,0 +1,958 @@
+#!/usr/bin/env python3
+"""
+Replay Exchange
+Local stand-in for the exchange REST API, for load-testing strategies and the container pool
+
+Speaks the subset of the Binance spot REST API that ccxt/freqtrade use:
+markets (exchangeInfo), OHLCV (klines), tickers, order book (depth), balances
+(account) and order placement, query, cancellation and fills (order,
+openOrders, allOrders, myTrades). Every bot gets its own URL prefix,
+/bot/<name>/api/v3, so requests, balances and orders are accounted per bot.
+
+Prices replay recorded freqtrade candles (--data-dir, <PAIR>-<tf>.feather or
+.json as written by download-data) or a seeded synthetic random walk with
+volatility regimes. Freqtrade schedules its refreshes by wall-clock time, so
+candles are stamped on the wall clock: every wall-clock minute carries
+--speed minutes of market movement (recorded candles are aggregated, the
+synthetic walk scales its volatility). A 5m strategy at --speed 60 sees five
+hours of market per candle - signals, orders and fills arrive at many times
+the live rate while the request cadence stays that of a real deployment.
+Recorded data loops when it runs out.
+
+Per bot it reports:
+  loop latency   candle close -> bot fetched that candle
+  order latency  candle close -> order arrived (signal to order)
+  fill delay     limit order placed -> filled
+  service time   time to answer a request
+  throughput     requests/s, orders, fills, cancels, rejects
+
+Usage:
+  python scripts/replay-exchange.py serve --port 8900 --speed 60 --pairs BTC/USDT,ETH/USDT
+  python scripts/replay-exchange.py serve --data-dir user_data/data/binance --data-timeframe 5m
+  python scripts/replay-exchange.py config --bot loadtest-1 --url http://host.docker.internal:8900
+
+`config` prints the exchange block for a bot config (with --user-data-dir
+also a user_data_dir, enough for a standalone backtest config); the running
+server serves the exchange block at GET /bot/<name>/config. Bots must run with
+"dry_run": false for their orders to reach the simulator - dry-run bots fill
+orders themselves and only load the market data endpoints. Metrics are
+served at GET /metrics and GET /bot/<name>/metrics, logged every
+--report-interval seconds and written to --report on exit.
+
+Pool load test: start the simulator with an --advertise-url the pool
+containers can reach, then run
+  REPLAY_EXCHANGE_URL=http://localhost:8900 node scripts/direct-pool-load-test.js
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger('replay-exchange')
+
+STEP_MS = 60_000
+TIMEFRAMES = {
+    '1m': 1, '3m': 3, '5m': 5, '15m': 15, '30m': 30,
+    '1h': 60, '2h': 120, '4h': 240, '6h': 360, '8h': 480, '12h': 720, '1d': 1440,
+}
+KLINES_LIMIT = 1000
+DEFAULT_PAIRS = 'BTC/USDT,ETH/USDT,BNB/USDT,SOL/USDT,XRP/USDT,ADA/USDT,DOGE/USDT,AVAX/USDT'
+FEE = 0.001
+SAMPLES = 5000
+
+
+class ApiError(Exception):
+    """Error in Binance's format, so ccxt maps it to the usual exception"""
+
+    def __init__(self, status, code, msg):
+        super().__init__(msg)
+        self.status = status
+        self.code = code
+        self.msg = msg
+
+
+def num(value):
+    """Decimal string the way Binance sends numbers, without float noise"""
+    return format(Decimal(repr(float(value))), 'f')
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+# === PRICE PATHS ===
+
+class SyntheticPath:
+    """
+    Seeded random walk, one step per wall-clock minute. Volatility and drift
+    wander between regimes so trend and mean-reversion strategies both trade;
+    a slow pull towards the starting price keeps long runs in a sane range.
+    """
+
+    def __init__(self, pair, seed, speed, history, volatility):
+        self.rng = random.Random(f'{seed}:{pair}')
+        self.anchor = 10 ** self.rng.uniform(-1, 4.5)
+        self.close = self.anchor
+        self.sigma = volatility * math.sqrt(speed)
+        self.volume = 50_000 * speed / self.close
+        self.regime = 0.0
+        self.trend = 0.0
+        self.first = -history
+        self.steps = []
+
+    def step(self, i):
+        index = i - self.first
+        while len(self.steps) <= index:
+            self._extend()
+        return self.steps[max(index, 0)]
+
+    def _extend(self):
+        rng = self.rng
+        self.regime = 0.98 * self.regime + rng.gauss(0, 0.1)
+        self.trend = 0.99 * self.trend + rng.gauss(0, 0.015)
+        sigma = self.sigma * math.exp(self.regime)
+        o = self.close
+        pull = -0.001 * math.log(o / self.anchor)
+        c = o * math.exp(rng.gauss(self.trend * sigma + pull, sigma))
+        h = max(o, c) * (1 + abs(rng.gauss(0, sigma)) / 2)
+        low = min(o, c) * (1 - abs(rng.gauss(0, sigma)) / 2)
+        v = self.volume * rng.lognormvariate(0, 0.5) * math.exp(self.regime)
+        self.close = c
+        self.steps.append((o, h, low, c, v))
+
+
+class RecordedPath:
+    """Recorded candles, aggregated into steps of `speed` market minutes; loops at the end"""
+
+    def __init__(self, rows, speed, history):
+        bucket_ms = STEP_MS * speed
+        start = rows[0][0]
+        steps = []
+        for ts, o, h, low, c, v in rows:
+            index = int((ts - start) // bucket_ms)
+            while len(steps) < index:
+                close = steps[-1][3]
+                steps.append((close, close, close, close, 0.0))
+            if len(steps) == index:
+                steps.append((o, h, low, c, v))
+            else:
+                po, ph, pl, _, pv = steps[-1]
+                steps[-1] = (po, max(ph, h), min(pl, low), c, pv + v)
+        if len(steps) < 2:
+            raise ValueError('need at least two steps of recorded data')
+        self.steps = steps
+        self.first = -min(history, len(steps) - 1)
+
+    def step(self, i):
+        return self.steps[(i - self.first) % len(self.steps)]
+
+
+def load_recorded(data_dir, pair, timeframe):
+    """Candles of one pair from a freqtrade data directory, as (ts_ms, o, h, l, c, v) rows"""
+    stem = f"{pair.replace('/', '_')}-{timeframe}"
+    json_file = data_dir / f'{stem}.json'
+    feather_file = data_dir / f'{stem}.feather'
+    if feather_file.exists():
+        try:
+            import pandas as pd
+        except ImportError:
+            raise SystemExit(f'pandas is required to read {feather_file}')
+        frame = pd.read_feather(feather_file)
+        dates = frame['date'].to_numpy(dtype='datetime64[ms]').astype('int64')
+        values = frame[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=float)
+        return [(int(ts), *row) for ts, row in zip(dates, values.tolist())]
+    if json_file.exists():
+        return [tuple(float(x) for x in row) for row in json.loads(json_file.read_text())]
+    raise SystemExit(f'No {timeframe} data for {pair} in {data_dir}')
+
+
+def recorded_pairs(data_dir, timeframe):
+    suffixes = (f'-{timeframe}.feather', f'-{timeframe}.json')
+    pairs = set()
+    for path in data_dir.iterdir():
+        for suffix in suffixes:
+            if path.name.endswith(suffix):
+                base, _, quote = path.name[:-len(suffix)].rpartition('_')
+                if base:
+                    pairs.add(f'{base}/{quote}')
+    return sorted(pairs)
+
+
+# === MARKETS ===
+
+class Clock:
+    """Maps wall-clock timestamps to path steps; step 0 starts at the first full minute"""
+
+    def __init__(self):
+        self.start_ms = now_ms() // STEP_MS * STEP_MS
+
+    def index(self, ts_ms):
+        return (ts_ms - self.start_ms) // STEP_MS
+
+    def ts(self, index):
+        return self.start_ms + index * STEP_MS
+
+
+class Market:
+    def __init__(self, pair, path, clock, spread):
+        self.pair = pair
+        self.base, self.quote = pair.split('/')
+        self.symbol = self.base + self.quote
+        self.path = path
+        self.clock = clock
+        self.spread = spread
+        price = path.step(0)[0]
+        self.tick = 10.0 ** (math.floor(math.log10(price)) - 5)
+        self.lot = min(10.0 ** (math.floor(math.log10(1 / price)) - 1), 1.0)
+        self._candles = {}
+
+    # --- prices ---
+
+    def price(self, t_ms):
+        """Price at t: linear between the open and close of the current step"""
+        index = self.clock.index(t_ms)
+        o, _, _, c, _ = self.path.step(index)
+        return o + (c - o) * (t_ms - self.clock.ts(index)) / STEP_MS
+
+    def quote_prices(self, t_ms):
+        price = self.price(t_ms)
+        bid = math.floor(price * (1 - self.spread / 2) / self.tick) * self.tick
+        ask = math.ceil(price * (1 + self.spread / 2) / self.tick) * self.tick
+        return price, bid, max(ask, bid + self.tick)
+
+    def price_range(self, t0_ms, t1_ms):
+        """Lowest and highest price traded between t0 and t1"""
+        t0_ms = max(t0_ms, t1_ms - 1440 * STEP_MS)
+        prices = [self.price(t0_ms), self.price(t1_ms)]
+        for index in range(self.clock.index(t0_ms) + 1, self.clock.index(t1_ms)):
+            prices.extend(self.path.step(index)[1:3])
+        if self.clock.index(t1_ms) > self.clock.index(t0_ms):
+            prices.append(self.path.step(self.clock.index(t0_ms))[3])
+            prices.append(self.path.step(self.clock.index(t1_ms))[0])
+        return min(prices), max(prices)
+
+    def first_ts(self):
+        return self.clock.ts(self.path.first)
+
+    # --- candles ---
+
+    def candle(self, tf_ms, open_ms, t_ms):
+        """OHLCV of the candle opening at open_ms as of t - partial while it is forming"""
+        closed = open_ms + tf_ms <= t_ms
+        key = (tf_ms, open_ms)
+        if closed and key in self._candles:
+            return self._candles[key]
+        current = self.clock.index(t_ms)
+        first = self.clock.index(open_ms)
+        last = min(self.clock.index(open_ms + tf_ms - 1), current)
+        o, h, low, c, v = None, -math.inf, math.inf, None, 0.0
+        for index in range(first, last + 1):
+            so, sh, sl, c, sv = self.path.step(index)
+            if index == current:
+                # forming step: only up to the current price
+                c = self.price(t_ms)
+                sh, sl = max(so, c), min(so, c)
+                sv *= (t_ms - self.clock.ts(index)) / STEP_MS
+            o = so if o is None else o
+            h, low, v = max(h, sh), min(low, sl), v + sv
+        candle = (o, h, low, c, v)
+        if closed:
+            self._candles[key] = candle
+        return candle
+
+    def klines(self, tf_ms, t_ms, start=None, end=None, limit=500):
+        last_open = t_ms // tf_ms * tf_ms
+        earliest = -(-self.first_ts() // tf_ms) * tf_ms
+        if end is not None:
+            last_open = min(last_open, end // tf_ms * tf_ms)
+        if start is not None:
+            first_open = max(earliest, -(-start // tf_ms) * tf_ms)
+            last_open = min(last_open, first_open + (limit - 1) * tf_ms)
+        else:
+            first_open = max(earliest, last_open - (limit - 1) * tf_ms)
+        rows = []
+        for open_ms in range(first_open, last_open + 1, tf_ms):
+            o, h, low, c, v = self.candle(tf_ms, open_ms, t_ms)
+            quote_volume = v * (o + c) / 2
+            rows.append([open_ms, num(o), num(h), num(low), num(c), num(v), open_ms + tf_ms - 1,
+                         num(quote_volume), max(int(v / self.lot / 50), 1), num(v / 2),
+                         num(quote_volume / 2), '0'])
+        return rows
+
+    # --- market data responses ---
+
+    def symbol_info(self):
+        return {
+            'symbol': self.symbol,
+            'status': 'TRADING',
+            'baseAsset': self.base,
+            'baseAssetPrecision': 8,
+            'quoteAsset': self.quote,
+            'quotePrecision': 8,
+            'quoteAssetPrecision': 8,
+            'orderTypes': ['LIMIT', 'MARKET'],
+            'icebergAllowed': False,
+            'ocoAllowed': False,
+            'isSpotTradingAllowed': True,
+            'isMarginTradingAllowed': False,
+            'permissions': ['SPOT'],
+            'permissionSets': [['SPOT']],
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': num(self.tick),
+                 'maxPrice': '1000000.00000000', 'tickSize': num(self.tick)},
+                {'filterType': 'LOT_SIZE', 'minQty': num(self.lot),
+                 'maxQty': '9000000.00000000', 'stepSize': num(self.lot)},
+                {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'applyMinToMarket': True,
+                 'maxNotional': '9000000.00000000', 'applyMaxToMarket': False,
+                 'avgPriceMins': 5},
+            ],
+        }
+
+    def ticker_24h(self, t_ms):
+        price, bid, ask = self.quote_prices(t_ms)
+        o, h, low, _, v = self.candle(1440 * STEP_MS, t_ms - 1440 * STEP_MS, t_ms)
+        return {
+            'symbol': self.symbol,
+            'priceChange': num(price - o),
+            'priceChangePercent': num(round((price / o - 1) * 100, 3)),
+            'weightedAvgPrice': num((h + low + price) / 3),
+            'prevClosePrice': num(o),
+            'lastPrice': num(price),
+            'lastQty': num(self.lot),
+            'bidPrice': num(bid),
+            'bidQty': num(self.lot * 100),
+            'askPrice': num(ask),
+            'askQty': num(self.lot * 100),
+            'openPrice': num(o),
+            'highPrice': num(max(h, price)),
+            'lowPrice': num(min(low, price)),
+            'volume': num(v),
+            'quoteVolume': num(v * price),
+            'openTime': t_ms - 1440 * STEP_MS,
+            'closeTime': t_ms,
+            'firstId': 0,
+            'lastId': 0,
+            'count': 0,
+        }
+
+    def book_ticker(self, t_ms):
+        _, bid, ask = self.quote_prices(t_ms)
+        return {'symbol': self.symbol, 'bidPrice': num(bid), 'bidQty': num(self.lot * 100),
+                'askPrice': num(ask), 'askQty': num(self.lot * 100)}
+
+    def depth(self, t_ms, limit):
+        price, bid, ask = self.quote_prices(t_ms)
+        spacing = max(self.tick, math.ceil(price * 0.0002 / self.tick) * self.tick)
+        bids, asks = [], []
+        for level in range(limit):
+            size = max(round(2000 * (1 + level / 2) / price / self.lot), 1) * self.lot
+            bids.append([num(bid - level * spacing), num(size)])
+            asks.append([num(ask + level * spacing), num(size)])
+        return {'lastUpdateId': t_ms, 'bids': bids, 'asks': asks}
+
+
+# === ACCOUNTS ===
+
+class BotMetrics:
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints = Counter()
+        self.recent = deque()
+        self.service_ms = deque(maxlen=SAMPLES)
+        self.loop_ms = deque(maxlen=SAMPLES)
+        self.order_ms = deque(maxlen=SAMPLES)
+        self.fill_ms = deque(maxlen=SAMPLES)
+        self.counts = Counter()
+        self.served = {}
+        self.last_close_ms = None
+
+    def request(self, endpoint, service_ms):
+        now = time.time()
+        self.endpoints[endpoint] += 1
+        self.service_ms.append(service_ms)
+        self.recent.append(now)
+        while self.recent and self.recent[0] < now - 60:
+            self.recent.popleft()
+
+    def candles_served(self, symbol, tf_ms, close_ms, t_ms):
+        """Loop latency: the first time the bot fetches a candle after it closed"""
+        key = (symbol, tf_ms)
+        if self.served.get(key, 0) < close_ms:
+            if key in self.served:
+                self.loop_ms.append(t_ms - close_ms)
+            self.served[key] = close_ms
+        if self.last_close_ms is None or close_ms > self.last_close_ms:
+            self.last_close_ms = close_ms
+
+    def summary(self):
+        elapsed = max(time.time() - self.started, 1e-9)
+        total = sum(self.endpoints.values())
+        return {
+            'requests': total,
+            'requests_per_s': round(total / elapsed, 3),
+            'requests_per_s_1m': round(len(self.recent) / min(elapsed, 60), 3),
+            'endpoints': dict(self.endpoints),
+            'orders': self.counts['orders'],
+            'fills': self.counts['fills'],
+            'cancels': self.counts['cancels'],
+            'rejects': self.counts['rejects'],
+            'orders_per_min': round(self.counts['orders'] * 60 / elapsed, 3),
+            'loop_latency_ms': percentiles(self.loop_ms),
+            'order_latency_ms': percentiles(self.order_ms),
+            'fill_delay_ms': percentiles(self.fill_ms),
+            'service_time_ms': percentiles(self.service_ms),
+        }
+
+
+def percentiles(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    pick = lambda q: round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 2)  # noqa: E731
+    return {'n': len(ordered), 'p50': pick(0.5), 'p95': pick(0.95), 'max': round(ordered[-1], 2)}
+
+
+class Account:
+    def __init__(self, name, balances):
+        self.name = name
+        self.balances = {asset: [amount, 0.0] for asset, amount in balances.items()}
+        self.orders = {}
+        self.open = set()
+        self.trades = []
+        self.metrics = BotMetrics()
+
+    def free(self, asset):
+        return self.balances.setdefault(asset, [0.0, 0.0])[0]
+
+    def move(self, asset, free=0.0, locked=0.0):
+        balance = self.balances.setdefault(asset, [0.0, 0.0])
+        balance[0] += free
+        balance[1] += locked
+
+
+# === EXCHANGE ===
+
+class ReplayExchange:
+    def __init__(self, markets, balances, advertise_url=None):
+        self.markets = {market.symbol: market for market in markets}
+        self.balances = balances
+        self.advertise_url = advertise_url
+        self.accounts = {}
+        self.lock = threading.Lock()
+        self.order_ids = 0
+        self.trade_ids = 0
+
+    def account(self, name):
+        if name not in self.accounts:
+            self.accounts[name] = Account(name, self.balances)
+            logger.info(f'New bot: {name}')
+        return self.accounts[name]
+
+    def market(self, params):
+        symbol = params.get('symbol')
+        if symbol not in self.markets:
+            raise ApiError(400, -1121, 'Invalid symbol.')
+        return self.markets[symbol]
+
+    def symbols(self, params):
+        if 'symbol' in params:
+            return [self.market(params)]
+        if 'symbols' in params:
+            return [self.market({'symbol': s}) for s in json.loads(params['symbols'])]
+        return list(self.markets.values())
+
+    def handle(self, bot, method, route, params, host):
+        t_ms = now_ms()
+        with self.lock:
+            account = self.account(bot)
+            self.match(account, t_ms)
+            handler = ROUTES.get((method, route))
+            if handler is None:
+                raise ApiError(404, -1000, f'Unsupported endpoint {method} {route}')
+            if route == 'config':
+                return handler(self, account, params, host)
+            return handler(self, account, params, t_ms)
+
+    # --- public ---
+
+    def ping(self, account, params, t_ms):
+        return {}
+
+    def server_time(self, account, params, t_ms):
+        return {'serverTime': t_ms}
+
+    def exchange_info(self, account, params, t_ms):
+        return {'timezone': 'UTC', 'serverTime': t_ms, 'rateLimits': [], 'exchangeFilters': [],
+                'symbols': [market.symbol_info() for market in self.symbols(params)]}
+
+    def klines(self, account, params, t_ms):
+        market = self.market(params)
+        if params.get('interval') not in TIMEFRAMES:
+            raise ApiError(400, -1120, 'Invalid interval.')
+        tf_ms = TIMEFRAMES[params['interval']] * STEP_MS
+        limit = min(int(params.get('limit', 500)), KLINES_LIMIT)
+        start = int(params['startTime']) if 'startTime' in params else None
+        end = int(params['endTime']) if 'endTime' in params else None
+        rows = market.klines(tf_ms, t_ms, start, end, limit)
+        closed = [row for row in rows if row[6] < t_ms]
+        if closed:
+            account.metrics.candles_served(market.symbol, tf_ms, closed[-1][6] + 1, t_ms)
+        return rows
+
+    def ticker_24h(self, account, params, t_ms):
+        tickers = [market.ticker_24h(t_ms) for market in self.symbols(params)]
+        return tickers[0] if 'symbol' in params else tickers
+
+    def ticker_price(self, account, params, t_ms):
+        tickers = [{'symbol': market.symbol, 'price': num(market.price(t_ms))}
+                   for market in self.symbols(params)]
+        return tickers[0] if 'symbol' in params else tickers
+
+    def book_ticker(self, account, params, t_ms):
+        tickers = [market.book_ticker(t_ms) for market in self.symbols(params)]
+        return tickers[0] if 'symbol' in params else tickers
+
+    def depth(self, account, params, t_ms):
+        return self.market(params).depth(t_ms, min(int(params.get('limit', 100)), 100))
+
+    def delist_schedule(self, account, params, t_ms):
+        return []
+
+    def bot_config(self, account, params, host):
+        return exchange_config(account.name, self.advertise_url or f'http://{host}',
+                               [market.pair for market in self.markets.values()])
+
+    def bot_metrics(self, account, params, t_ms):
+        return {'bot': account.name, **account.metrics.summary()}
+
+    # --- private ---
+
+    def account_info(self, account, params, t_ms):
+        return {
+            'makerCommission': 10, 'takerCommission': 10, 'buyerCommission': 0,
+            'sellerCommission': 0, 'canTrade': True, 'canWithdraw': False, 'canDeposit': False,
+            'updateTime': t_ms, 'accountType': 'SPOT', 'permissions': ['SPOT'],
+            'balances': [{'asset': asset, 'free': num(free), 'locked': num(locked)}
+                         for asset, (free, locked) in account.balances.items()],
+        }
+
+    def new_order(self, account, params, t_ms):
+        market = self.market(params)
+        side = params.get('side')
+        kind = params.get('type')
+        if side not in ('BUY', 'SELL'):
+            raise ApiError(400, -1102, "Mandatory parameter 'side' was not sent, was empty/null, or malformed.")
+        if kind not in ('LIMIT', 'MARKET'):
+            raise ApiError(400, -1116, 'Invalid orderType.')
+        _, bid, ask = market.quote_prices(t_ms)
+        quantity = float(params.get('quantity') or 0)
+        if kind == 'MARKET' and not quantity and params.get('quoteOrderQty'):
+            quantity = round(float(params['quoteOrderQty']) / ask / market.lot) * market.lot
+        price = float(params['price']) if kind == 'LIMIT' else (ask if side == 'BUY' else bid)
+        if quantity <= 0 or price <= 0:
+            raise ApiError(400, -1013, 'Filter failure: LOT_SIZE')
+        if quantity * price < 5:
+            raise ApiError(400, -1013, 'Filter failure: NOTIONAL')
+        asset, needed = (market.quote, quantity * price) if side == 'BUY' else (market.base, quantity)
+        if account.free(asset) < needed * (1 - 1e-9):
+            account.metrics.counts['rejects'] += 1
+            raise ApiError(400, -2010, 'Account has insufficient balance for requested action.')
+
+        metrics = account.metrics
+        metrics.counts['orders'] += 1
+        if metrics.last_close_ms is not None:
+            metrics.order_ms.append(t_ms - metrics.last_close_ms)
+        self.order_ids += 1
+        order = {
+            'symbol': market.symbol, 'orderId': self.order_ids, 'orderListId': -1,
+            'clientOrderId': params.get('newClientOrderId') or f'replay{self.order_ids}',
+            'price': num(price if kind == 'LIMIT' else 0), 'origQty': num(quantity),
+            'executedQty': '0', 'cummulativeQuoteQty': '0', 'status': 'NEW',
+            'timeInForce': params.get('timeInForce', 'GTC'), 'type': kind, 'side': side,
+            'stopPrice': '0', 'icebergQty': '0', 'time': t_ms, 'updateTime': t_ms,
+            'isWorking': True, 'workingTime': t_ms, 'origQuoteOrderQty': '0',
+            'selfTradePreventionMode': 'NONE', '_checked': t_ms,
+        }
+        account.orders[order['orderId']] = order
+        account.move(asset, free=-needed, locked=needed)
+        fills = []
+        marketable = ask <= price if side == 'BUY' else bid >= price
+        if kind == 'MARKET' or marketable:
+            fills.append(self.fill(account, market, order, ask if side == 'BUY' else bid, t_ms, False))
+        elif order['timeInForce'] in ('IOC', 'FOK'):
+            self.close_order(account, market, order, 'EXPIRED', t_ms)
+        else:
+            account.open.add(order['orderId'])
+        return {**self.order_view(order), 'transactTime': t_ms, 'fills': fills}
+
+    def get_order(self, account, params, t_ms):
+        return self.order_view(self.find_order(account, params, -2013, 'Order does not exist.'))
+
+    def cancel_order(self, account, params, t_ms):
+        order = self.find_order(account, params, -2011, 'Unknown order sent.')
+        if order['status'] != 'NEW':
+            raise ApiError(400, -2011, 'Unknown order sent.')
+        self.close_order(account, self.markets[order['symbol']], order, 'CANCELED', t_ms)
+        account.metrics.counts['cancels'] += 1
+        return self.order_view(order)
+
+    def cancel_open_orders(self, account, params, t_ms):
+        market = self.market(params)
+        canceled = []
+        for order_id in sorted(account.open):
+            order = account.orders[order_id]
+            if order['symbol'] == market.symbol:
+                self.close_order(account, market, order, 'CANCELED', t_ms)
+                account.metrics.counts['cancels'] += 1
+                canceled.append(self.order_view(order))
+        return canceled
+
+    def open_orders(self, account, params, t_ms):
+        symbol = params.get('symbol')
+        return [self.order_view(account.orders[order_id]) for order_id in sorted(account.open)
+                if symbol is None or account.orders[order_id]['symbol'] == symbol]
+
+    def all_orders(self, account, params, t_ms):
+        symbol = self.market(params).symbol
+        since = int(params.get('startTime', 0))
+        orders = [self.order_view(order) for order in account.orders.values()
+                  if order['symbol'] == symbol and order['time'] >= since]
+        return orders[-int(params.get('limit', 500)):]
+
+    def my_trades(self, account, params, t_ms):
+        symbol = self.market(params).symbol
+        since = int(params.get('startTime', 0))
+        order_id = int(params['orderId']) if 'orderId' in params else None
+        trades = [trade for trade in account.trades
+                  if trade['symbol'] == symbol and trade['time'] >= since
+                  and (order_id is None or trade['orderId'] == order_id)]
+        return trades[-int(params.get('limit', 500)):]
+
+    # --- matching ---
+
+    def match(self, account, t_ms):
+        """Fill resting limit orders the price traded through since they were last checked"""
+        for order_id in sorted(account.open):
+            order = account.orders[order_id]
+            market = self.markets[order['symbol']]
+            low, high = market.price_range(order['_checked'], t_ms)
+            order['_checked'] = t_ms
+            price = float(order['price'])
+            if (order['side'] == 'BUY' and low < price) or (order['side'] == 'SELL' and high > price):
+                self.fill(account, market, order, price, t_ms, True)
+                account.metrics.fill_ms.append(t_ms - order['time'])
+
+    def match_all(self):
+        t_ms = now_ms()
+        with self.lock:
+            for account in self.accounts.values():
+                self.match(account, t_ms)
+
+    def fill(self, account, market, order, price, t_ms, maker):
+        quantity = float(order['origQty'])
+        cost = quantity * price
+        if order['side'] == 'BUY':
+            locked = quantity * (float(order['price']) if order['type'] == 'LIMIT' else price)
+            account.move(market.quote, free=locked - cost, locked=-locked)
+            commission, commission_asset = quantity * FEE, market.base
+            account.move(market.base, free=quantity - commission)
+        else:
+            account.move(market.base, locked=-quantity)
+            commission, commission_asset = cost * FEE, market.quote
+            account.move(market.quote, free=cost - commission)
+        self.trade_ids += 1
+        account.trades.append({
+            'symbol': market.symbol, 'id': self.trade_ids, 'orderId': order['orderId'],
+            'orderListId': -1, 'price': num(price), 'qty': num(quantity), 'quoteQty': num(cost),
+            'commission': num(commission), 'commissionAsset': commission_asset, 'time': t_ms,
+            'isBuyer': order['side'] == 'BUY', 'isMaker': maker, 'isBestMatch': True,
+        })
+        order.update(executedQty=num(quantity), cummulativeQuoteQty=num(cost), status='FILLED',
+                     updateTime=t_ms)
+        account.open.discard(order['orderId'])
+        account.metrics.counts['fills'] += 1
+        return {'price': num(price), 'qty': num(quantity), 'commission': num(commission),
+                'commissionAsset': commission_asset, 'tradeId': self.trade_ids}
+
+    def close_order(self, account, market, order, status, t_ms):
+        quantity = float(order['origQty'])
+        if order['side'] == 'BUY':
+            locked = quantity * float(order['price'])
+            account.move(market.quote, free=locked, locked=-locked)
+        else:
+            account.move(market.base, free=quantity, locked=-quantity)
+        order.update(status=status, updateTime=t_ms)
+        account.open.discard(order['orderId'])
+
+    def find_order(self, account, params, code, msg):
+        order = None
+        if 'orderId' in params:
+            order = account.orders.get(int(params['orderId']))
+        elif 'origClientOrderId' in params:
+            order = next((o for o in account.orders.values()
+                          if o['clientOrderId'] == params['origClientOrderId']), None)
+        if order is None or order['symbol'] != params.get('symbol'):
+            raise ApiError(400, code, msg)
+        return order
+
+    @staticmethod
+    def order_view(order):
+        return {key: value for key, value in order.items() if not key.startswith('_')}
+
+    # --- reporting ---
+
+    def metrics(self):
+        with self.lock:
+            bots = {name: account.metrics.summary() for name, account in self.accounts.items()}
+        return {
+            'updated_at': now_ms(),
+            'bots': bots,
+            'totals': {
+                'bots': len(bots),
+                'requests_per_s': round(sum(b['requests_per_s_1m'] for b in bots.values()), 3),
+                'orders': sum(b['orders'] for b in bots.values()),
+                'fills': sum(b['fills'] for b in bots.values()),
+            },
+        }
+
+    def log_report(self):
+        report = self.metrics()
+        if not report['bots']:
+            return
+        fmt = lambda p: f"{p['p50']:.0f}/{p['p95']:.0f}" if p else '-'  # noqa: E731
+        logger.info(f"{'bot':<28} {'req/s':>7} {'orders':>6} {'fills':>6} "
+                    f"{'loop p50/95 ms':>16} {'order p50/95 ms':>16} {'fill p50/95 ms':>16} "
+                    f"{'svc p50/95 ms':>14}")
+        for name, bot in sorted(report['bots'].items()):
+            logger.info(f"{name[:28]:<28} {bot['requests_per_s_1m']:>7.2f} {bot['orders']:>6} "
+                        f"{bot['fills']:>6} {fmt(bot['loop_latency_ms']):>16} "
+                        f"{fmt(bot['order_latency_ms']):>16} {fmt(bot['fill_delay_ms']):>16} "
+                        f"{fmt(bot['service_time_ms']):>14}")
+        totals = report['totals']
+        logger.info(f"{totals['bots']} bots, {totals['requests_per_s']:.2f} req/s, "
+                    f"{totals['orders']} orders, {totals['fills']} fills")
+
+
+ROUTES = {
+    ('GET', 'api/v3/ping'): ReplayExchange.ping,
+    ('GET', 'api/v3/time'): ReplayExchange.server_time,
+    ('GET', 'api/v3/exchangeInfo'): ReplayExchange.exchange_info,
+    ('GET', 'api/v3/klines'): ReplayExchange.klines,
+    ('GET', 'api/v3/uiKlines'): ReplayExchange.klines,
+    ('GET', 'api/v3/ticker/24hr'): ReplayExchange.ticker_24h,
+    ('GET', 'api/v3/ticker/price'): ReplayExchange.ticker_price,
+    ('GET', 'api/v3/ticker/bookTicker'): ReplayExchange.book_ticker,
+    ('GET', 'api/v3/depth'): ReplayExchange.depth,
+    ('GET', 'api/v3/account'): ReplayExchange.account_info,
+    ('POST', 'api/v3/order'): ReplayExchange.new_order,
+    ('GET', 'api/v3/order'): ReplayExchange.get_order,
+    ('DELETE', 'api/v3/order'): ReplayExchange.cancel_order,
+    ('GET', 'api/v3/openOrders'): ReplayExchange.open_orders,
+    ('DELETE', 'api/v3/openOrders'): ReplayExchange.cancel_open_orders,
+    ('GET', 'api/v3/allOrders'): ReplayExchange.all_orders,
+    ('GET', 'api/v3/myTrades'): ReplayExchange.my_trades,
+    ('GET', 'sapi/v1/spot/delist-schedule'): ReplayExchange.delist_schedule,
+    ('GET', 'config'): ReplayExchange.bot_config,
+    ('GET', 'metrics'): ReplayExchange.bot_metrics,
+}
+
+
+def exchange_config(bot, url, pairs):
+    """Bot config overrides that point freqtrade's binance exchange at the simulator"""
+    prefix = f"{url.rstrip('/')}/bot/{bot}"
+    return {
+        'dry_run': False,
+        'stake_currency': pairs[0].split('/')[1] if pairs else 'USDT',
+        'exchange': {
+            'name': 'binance',
+            'key': f'replay-{bot}',
+            'secret': 'replay',
+            'enable_ws': False,
+            'ccxt_config': {
+                'urls': {'api': {'public': f'{prefix}/api/v3', 'private': f'{prefix}/api/v3',
+                                 'sapi': f'{prefix}/sapi/v1'}},
+                'options': {'fetchMarkets': {'types': ['spot']}, 'fetchMargins': False,
+                            'fetchCurrencies': False},
+            },
+            'ccxt_async_config': {},
+            'pair_whitelist': pairs,
+            'pair_blacklist': [],
+        },
+    }
+
+
+# === HTTP ===
+
+class Handler(BaseHTTPRequestHandler):
+    exchange: ReplayExchange = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            params.update(parse_qsl(self.rfile.read(length).decode()))
+        parts = url.path.strip('/').split('/')
+        bot = None
+        try:
+            if parts == ['metrics']:
+                status, body = 200, self.exchange.metrics()
+            elif len(parts) >= 3 and parts[0] == 'bot':
+                bot, route = parts[1], '/'.join(parts[2:])
+                status, body = 200, self.exchange.handle(bot, method, route, params,
+                                                         self.headers.get('Host', 'localhost'))
+            else:
+                raise ApiError(404, -1000, f'Unknown path {url.path}')
+        except ApiError as e:
+            status, body = e.status, {'code': e.code, 'msg': e.msg}
+        except (KeyError, ValueError) as e:
+            status, body = 400, {'code': -1102, 'msg': f'Malformed parameter: {e}'}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        if bot is not None:
+            with self.exchange.lock:
+                account = self.exchange.account(bot)
+                account.metrics.request(f"{method} {'/'.join(parts[2:])}",
+                                        (time.perf_counter() - started) * 1000)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+# === CLI ===
+
+def build_markets(args, clock):
+    history = args.history_days * 1440
+    if args.data_dir:
+        data_dir = Path(args.data_dir)
+        pairs = args.pairs.split(',') if args.pairs else recorded_pairs(data_dir, args.data_timeframe)
+        if not pairs:
+            raise SystemExit(f'No {args.data_timeframe} data in {data_dir}')
+        paths = {pair: RecordedPath(load_recorded(data_dir, pair, args.data_timeframe),
+                                    args.speed, history) for pair in pairs}
+    else:
+        pairs = (args.pairs or DEFAULT_PAIRS).split(',')
+        paths = {pair: SyntheticPath(pair, args.seed, args.speed, history, args.volatility)
+                 for pair in pairs}
+    return [Market(pair, paths[pair], clock, args.spread) for pair in pairs]
+
+
+def parse_balances(value, markets):
+    if value:
+        return {asset: float(amount) for asset, amount in
+                (item.split('=') for item in value.split(','))}
+    return {market.quote: 10_000.0 for market in markets}
+
+
+def serve(args):
+    clock = Clock()
+    markets = build_markets(args, clock)
+    exchange = ReplayExchange(markets, parse_balances(args.balance, markets), args.advertise_url)
+    Handler.exchange = exchange
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    stop = threading.Event()
+
+    def background():
+        next_report = time.time() + args.report_interval
+        while not stop.wait(1):
+            exchange.match_all()
+            if time.time() >= next_report:
+                next_report += args.report_interval
+                exchange.log_report()
+                write_report(args.report, exchange)
+
+    threading.Thread(target=background, daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    logger.info(f"Replay exchange on http://{args.host}:{args.port} - {len(markets)} pairs, "
+                f"{'recorded' if args.data_dir else 'synthetic'} prices at {args.speed}x")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        exchange.log_report()
+        write_report(args.report, exchange)
+
+
+def write_report(path, exchange):
+    if path:
+        Path(path).write_text(json.dumps(exchange.metrics(), indent=2))
+
+
+def print_config(args):
+    pairs = (args.pairs or DEFAULT_PAIRS).split(',')
+    config = exchange_config(args.bot, args.url, pairs)
+    if args.user_data_dir:
+        # freqtrade refuses a user_data_dir that does not exist
+        user_data_dir = Path(args.user_data_dir).resolve()
+        user_data_dir.mkdir(parents=True, exist_ok=True)
+        config['user_data_dir'] = str(user_data_dir)
+    print(json.dumps(config, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local replay exchange for load-testing bots')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('serve', help='run the simulator')
+    run.add_argument('--host', default='0.0.0.0')
+    run.add_argument('--port', type=int, default=8900)
+    run.add_argument('--advertise-url', help='URL bots reach the simulator at, for /bot/<name>/config')
+    run.add_argument('--pairs', help=f'comma separated (default: {DEFAULT_PAIRS}, or all in --data-dir)')
+    run.add_argument('--data-dir', help='replay freqtrade candle files from this directory')
+    run.add_argument('--data-timeframe', default='5m', choices=TIMEFRAMES)
+    run.add_argument('--speed', type=int, default=60, help='market minutes per wall-clock minute')
+    run.add_argument('--history-days', type=int, default=30, help='wall-clock days of candle history')
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--volatility', type=float, default=0.001, help='synthetic volatility per market minute')
+    run.add_argument('--spread', type=float, default=0.0005)
+    run.add_argument('--balance', help='starting balance of every bot, e.g. USDT=10000,BTC=0.1')
+    run.add_argument('--report-interval', type=int, default=60)
+    run.add_argument('--report', help='write the JSON metrics here periodically and on exit')
+    run.add_argument('--verbose', action='store_true')
+    run.set_defaults(func=serve)
+
+    config = commands.add_parser('config', help='print the exchange config of a bot')
+    config.add_argument('--bot', required=True)
+    config.add_argument('--url', default='http://localhost:8900')
+    config.add_argument('--pairs', help=f'comma separated (default: {DEFAULT_PAIRS})')
+    config.add_argument('--user-data-dir', help='also set user_data_dir (created if missing), for configs '
+                                                'used on their own, e.g. by backtests')
+    config.set_defaults(func=print_config)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if getattr(args, 'verbose', False) else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -37,8 +37,9 @@ class StrategyWatcher extends EventEmitter {
       await this._loadInitialStrategies();
       
       // Set up file system watcher
+      // strategy_utils holds shared Python helpers, not strategies
       this.watcher = chokidar.watch(STRATEGIES_DIR, {
-        ignored: /(^|[\/\\])\.|node_modules/,
+        ignored: /(^|[\/\\])\.|node_modules|strategy_utils|__pycache__/,
         persistent: true,
         awaitWriteFinish: {
           stabilityThreshold: 300, // Wait 300ms of no changes